@@ -50,6 +50,8 @@ class NetworkAwareness(app_manager.RyuApp):
 
     """
     OFP_VERSIONS = [ofproto_v1_3.OFP_VERSION]
+    # The access table is learned from the packet-ins of this process.
+    _SINGLE_WORKER = True
 
     def __init__(self, *args, **kwargs):
         super(NetworkAwareness, self).__init__(*args, **kwargs)
@@ -16,10 +16,12 @@
 
 from __future__ import division
 import copy
+import time
 from operator import attrgetter
 from ryu import cfg
 from ryu.base import app_manager
 from ryu.base.app_manager import lookup_service_brick
+from ryu.controller import controller
 from ryu.controller import ofp_event
 from ryu.controller.handler import MAIN_DISPATCHER, DEAD_DISPATCHER
 from ryu.controller.handler import CONFIG_DISPATCHER
@@ -28,6 +30,7 @@ from ryu.ofproto import ofproto_v1_3
 from ryu.lib import hub
 from ryu.lib.packet import packet
 import setting
+import traffic_matrix
 
 
 CONF = cfg.CONF
@@ -51,6 +54,8 @@ class NetworkMonitor(app_manager.RyuApp):
         self.stats = {}
         self.port_features = {}
         self.free_bandwidth = {}
+        self.traffic_matrix = traffic_matrix.TrafficMatrix(
+            setting.TRAFFIC_MATRIX_ALPHA)
         self.awareness = lookup_service_brick('awareness')
         self.graph = None
         self.capabilities = None
@@ -75,6 +80,7 @@ class NetworkMonitor(app_manager.RyuApp):
             if datapath.id in self.datapaths:
                 self.logger.debug('unregister datapath: %016x', datapath.id)
                 del self.datapaths[datapath.id]
+                self.traffic_matrix.remove(datapath.id)
 
     def _monitor(self):
         """
@@ -83,13 +89,18 @@ class NetworkMonitor(app_manager.RyuApp):
         while CONF.weight == 'bw':
             self.stats['flow'] = {}
             self.stats['port'] = {}
-            for dp in self.datapaths.values():
+            datapaths = list(self.datapaths.values())
+            for dp in datapaths:
                 self.port_features.setdefault(dp.id, {})
-                self._request_stats(dp)
+            start = time.time()
+            if datapaths:
+                self._request_stats(datapaths)
                 # refresh data.
                 self.capabilities = None
                 self.best_paths = None
-            hub.sleep(setting.MONITOR_PERIOD)
+            # Keep the sampling period while waiting for slow switches.
+            elapsed = time.time() - start
+            hub.sleep(max(0, setting.MONITOR_PERIOD - elapsed))
             if self.stats['flow'] or self.stats['port']:
                 self.show_stat('flow')
                 self.show_stat('port')
@@ -104,22 +115,38 @@ class NetworkMonitor(app_manager.RyuApp):
             self.logger.debug("save_freebandwidth")
             hub.sleep(setting.MONITOR_PERIOD)
 
-    def _request_stats(self, datapath):
+    def _request_stats(self, datapaths):
         """
-            Sending request msg to datapath
+            Request the stats of all the datapaths at once and handle
+            the replies in the order of the requests.
         """
-        self.logger.debug('send stats request: %016x', datapath.id)
-        ofproto = datapath.ofproto
-        parser = datapath.ofproto_parser
-
-        req = parser.OFPPortDescStatsRequest(datapath, 0)
-        datapath.send_msg(req)
-
-        req = parser.OFPPortStatsRequest(datapath, 0, ofproto.OFPP_ANY)
-        datapath.send_msg(req)
-
-        req = parser.OFPFlowStatsRequest(datapath)
-        datapath.send_msg(req)
+        requests = []
+        handlers = []
+        for datapath in datapaths:
+            self.logger.debug('send stats request: %016x', datapath.id)
+            ofproto = datapath.ofproto
+            parser = datapath.ofproto_parser
+
+            # port description first, for the free bandwidth of ports.
+            requests.append(parser.OFPPortDescStatsRequest(datapath, 0))
+            handlers.append(self.port_desc_stats_reply_handler)
+
+            requests.append(
+                parser.OFPPortStatsRequest(datapath, 0, ofproto.OFPP_ANY))
+            handlers.append(self._port_stats_reply_handler)
+
+            requests.append(parser.OFPFlowStatsRequest(datapath))
+            handlers.append(self._flow_stats_reply_handler)
+
+        # A switch not replying in time doesn't delay the others.
+        replies = controller.gather(requests,
+                                    timeout=setting.MONITOR_PERIOD)
+        for req, handler, body in zip(requests, handlers, replies):
+            if isinstance(body, Exception):
+                self.logger.warning('stats request to %016x failed: %s',
+                                    req.datapath.id, body)
+                continue
+            handler(req.datapath, body)
 
     def get_min_bw_of_links(self, graph, path, min_bw):
         """
@@ -229,14 +256,12 @@ class NetworkMonitor(app_manager.RyuApp):
     def _get_period(self, n_sec, n_nsec, p_sec, p_nsec):
         return self._get_time(n_sec, n_nsec) - self._get_time(p_sec, p_nsec)
 
-    @set_ev_cls(ofp_event.EventOFPFlowStatsReply, MAIN_DISPATCHER)
-    def _flow_stats_reply_handler(self, ev):
+    def _flow_stats_reply_handler(self, datapath, body):
         """
             Save flow stats reply info into self.flow_stats.
             Calculate flow speed and Save it.
         """
-        body = ev.msg.body
-        dpid = ev.msg.datapath.id
+        dpid = datapath.id
         self.stats['flow'][dpid] = body
         self.flow_stats.setdefault(dpid, {})
         self.flow_speed.setdefault(dpid, {})
@@ -263,14 +288,46 @@ class NetworkMonitor(app_manager.RyuApp):
 
             self._save_stats(self.flow_speed[dpid], key, speed, 5)
 
-    @set_ev_cls(ofp_event.EventOFPPortStatsReply, MAIN_DISPATCHER)
-    def _port_stats_reply_handler(self, ev):
+        self._save_traffic_matrix(dpid, body)
+
+    def _save_traffic_matrix(self, dpid, body):
+        """
+            Update the row of dpid in traffic matrix with the speed of
+            flows entering the network at dpid, mapped to the switch of
+            the destination host through access table.
+        """
+        if self.awareness is None:
+            # not registered yet when this app was instantiated
+            self.awareness = lookup_service_brick('awareness')
+            if self.awareness is None:
+                return
+        access_ports = self.awareness.access_ports.get(dpid, set())
+        host_to_sw = dict((host[0], sw) for (sw, port), host in
+                          self.awareness.access_table.items())
+        keys = set()
+        for stat in body:
+            if stat.priority != 1:
+                continue
+            if stat.match.get('in_port') not in access_ports:
+                continue
+            keys.add((stat.match['in_port'], stat.match.get('ipv4_dst'),
+                      stat.instructions[0].actions[0].port))
+
+        rates = {}
+        for key in keys:
+            dst_sw = host_to_sw.get(key[1])
+            if dst_sw is None:
+                continue
+            rates.setdefault(dst_sw, 0)
+            rates[dst_sw] += self.flow_speed[dpid][key][-1]
+        self.traffic_matrix.update(dpid, rates)
+
+    def _port_stats_reply_handler(self, datapath, body):
         """
             Save port's stats info
             Calculate port's speed and save it.
         """
-        body = ev.msg.body
-        dpid = ev.msg.datapath.id
+        dpid = datapath.id
         self.stats['port'][dpid] = body
         self.free_bandwidth.setdefault(dpid, {})
 
@@ -299,14 +356,12 @@ class NetworkMonitor(app_manager.RyuApp):
                 self._save_stats(self.port_speed, key, speed, 5)
                 self._save_freebandwidth(dpid, port_no, speed)
 
-    @set_ev_cls(ofp_event.EventOFPPortDescStatsReply, MAIN_DISPATCHER)
-    def port_desc_stats_reply_handler(self, ev):
+    def port_desc_stats_reply_handler(self, datapath, body):
         """
             Save port description info.
         """
-        msg = ev.msg
-        dpid = msg.datapath.id
-        ofproto = msg.datapath.ofproto
+        dpid = datapath.id
+        ofproto = datapath.ofproto
 
         config_dict = {ofproto.OFPPC_PORT_DOWN: "Down",
                        ofproto.OFPPC_NO_RECV: "No Recv",
@@ -318,7 +373,7 @@ class NetworkMonitor(app_manager.RyuApp):
                       ofproto.OFPPS_LIVE: "Live"}
 
         ports = []
-        for p in ev.msg.body:
+        for p in body:
             ports.append('port_no=%d hw_addr=%s name=%s config=0x%08x '
                          'state=0x%08x curr=0x%08x advertised=0x%08x '
                          'supported=0x%08x peer=0x%08x curr_speed=%d '
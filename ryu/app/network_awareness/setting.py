@@ -10,3 +10,5 @@ DELAY_DETECTING_PERIOD = 5			# For detecting link delay.
 TOSHOW = True						# For showing information in terminal
 	
 MAX_CAPACITY = 281474976710655		# Max capacity of link
+
+TRAFFIC_MATRIX_ALPHA = 0.5			# EWMA weight of new traffic matrix sample
@@ -0,0 +1,98 @@
+# Copyright (C) 2016 Li Cheng at Beijing University of Posts
+# and Telecommunications. www.muzixing.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import division
+import numpy as np
+
+
+class TrafficMatrix(object):
+    """
+        TrafficMatrix keeps a switch-to-switch traffic matrix in B/s.
+        Row i holds the traffic entering the network at switch dpids[i],
+        column j the traffic leaving it at switch dpids[j].
+        Every row is smoothed with an EWMA when a new sample arrives.
+    """
+
+    def __init__(self, alpha=0.5):
+        self.alpha = alpha
+        self.dpids = []              # index->dpid
+        self.index = {}              # dpid->index
+        self.matrix = np.zeros((0, 0))
+        self._sampled = np.zeros(0, dtype=bool)
+
+    def _get_index(self, dpid):
+        """
+            Get index of dpid, growing the matrix for a new switch.
+        """
+        if dpid in self.index:
+            return self.index[dpid]
+        idx = len(self.dpids)
+        self.dpids.append(dpid)
+        self.index[dpid] = idx
+        matrix = np.zeros((idx + 1, idx + 1))
+        matrix[:idx, :idx] = self.matrix
+        self.matrix = matrix
+        self._sampled = np.append(self._sampled, False)
+        return idx
+
+    def update(self, src_dpid, rates):
+        """
+            Fold a new sample of the row of src_dpid into the matrix.
+            rates: {dst_dpid: speed}, destinations not in rates are 0.
+        """
+        row = self._get_index(src_dpid)
+        for dst_dpid in rates:
+            self._get_index(dst_dpid)
+
+        sample = np.zeros(len(self.dpids))
+        for dst_dpid, speed in rates.items():
+            sample[self.index[dst_dpid]] += speed
+
+        if self._sampled[row]:
+            self.matrix[row] = (self.alpha * sample +
+                                (1 - self.alpha) * self.matrix[row])
+        else:
+            self.matrix[row] = sample
+            self._sampled[row] = True
+
+    def remove(self, dpid):
+        """
+            Drop row and column of dpid, e.g. when the switch leaves.
+        """
+        idx = self.index.pop(dpid, None)
+        if idx is None:
+            return
+        self.dpids.pop(idx)
+        self.matrix = np.delete(np.delete(self.matrix, idx, 0), idx, 1)
+        self._sampled = np.delete(self._sampled, idx)
+        for i, _dpid in enumerate(self.dpids):
+            self.index[_dpid] = i
+
+    def get(self, src_dpid, dst_dpid):
+        """
+            Get smoothed traffic from src_dpid to dst_dpid.
+        """
+        if src_dpid not in self.index or dst_dpid not in self.index:
+            return 0
+        return self.matrix[self.index[src_dpid], self.index[dst_dpid]]
+
+    def to_dict(self):
+        """
+            Get matrix as {src_dpid: {dst_dpid: speed}}.
+        """
+        return dict((src, dict((dst, self.matrix[i, j])
+                               for j, dst in enumerate(self.dpids)))
+                    for i, src in enumerate(self.dpids))
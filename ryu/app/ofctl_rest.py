@@ -18,10 +18,7 @@ import json
 import ast
 
 from ryu.base import app_manager
-from ryu.controller import ofp_event
 from ryu.controller import dpset
-from ryu.controller.handler import MAIN_DISPATCHER
-from ryu.controller.handler import set_ev_cls
 from ryu.exception import RyuException
 from ryu.ofproto import ofproto_v1_0
 from ryu.ofproto import ofproto_v1_2
@@ -296,7 +293,6 @@ class StatsController(ControllerBase):
     def __init__(self, req, link, data, **config):
         super(StatsController, self).__init__(req, link, data, **config)
         self.dpset = data['dpset']
-        self.waiters = data['waiters']
 
     def get_dpids(self, req, **_kwargs):
         dps = list(self.dpset.dps.keys())
@@ -305,37 +301,37 @@ class StatsController(ControllerBase):
 
     @stats_method
     def get_desc_stats(self, req, dp, ofctl, **kwargs):
-        return ofctl.get_desc_stats(dp, self.waiters)
+        return ofctl.get_desc_stats(dp)
 
     @stats_method
     def get_flow_desc(self, req, dp, ofctl, **kwargs):
         flow = req.json if req.body else {}
-        return ofctl.get_flow_desc(dp, self.waiters, flow)
+        return ofctl.get_flow_desc(dp, flow)
 
     @stats_method
     def get_flow_stats(self, req, dp, ofctl, **kwargs):
         flow = req.json if req.body else {}
-        return ofctl.get_flow_stats(dp, self.waiters, flow)
+        return ofctl.get_flow_stats(dp, flow)
 
     @stats_method
     def get_aggregate_flow_stats(self, req, dp, ofctl, **kwargs):
         flow = req.json if req.body else {}
-        return ofctl.get_aggregate_flow_stats(dp, self.waiters, flow)
+        return ofctl.get_aggregate_flow_stats(dp, flow)
 
     @stats_method
     def get_table_stats(self, req, dp, ofctl, **kwargs):
-        return ofctl.get_table_stats(dp, self.waiters)
+        return ofctl.get_table_stats(dp)
 
     @stats_method
     def get_table_features(self, req, dp, ofctl, **kwargs):
-        return ofctl.get_table_features(dp, self.waiters)
+        return ofctl.get_table_features(dp)
 
     @stats_method
     def get_port_stats(self, req, dp, ofctl, port=None, **kwargs):
         if port == "ALL":
             port = None
 
-        return ofctl.get_port_stats(dp, self.waiters, port)
+        return ofctl.get_port_stats(dp, port)
 
     @stats_method
     def get_queue_stats(self, req, dp, ofctl,
@@ -346,14 +342,14 @@ class StatsController(ControllerBase):
         if queue_id == "ALL":
             queue_id = None
 
-        return ofctl.get_queue_stats(dp, self.waiters, port, queue_id)
+        return ofctl.get_queue_stats(dp, port, queue_id)
 
     @stats_method
     def get_queue_config(self, req, dp, ofctl, port=None, **kwargs):
         if port == "ALL":
             port = None
 
-        return ofctl.get_queue_config(dp, self.waiters, port)
+        return ofctl.get_queue_config(dp, port)
 
     @stats_method
     def get_queue_desc(self, req, dp, ofctl,
@@ -364,61 +360,61 @@ class StatsController(ControllerBase):
         if queue == "ALL":
             queue = None
 
-        return ofctl.get_queue_desc(dp, self.waiters, port, queue)
+        return ofctl.get_queue_desc(dp, port, queue)
 
     @stats_method
     def get_meter_features(self, req, dp, ofctl, **kwargs):
-        return ofctl.get_meter_features(dp, self.waiters)
+        return ofctl.get_meter_features(dp)
 
     @stats_method
     def get_meter_config(self, req, dp, ofctl, meter_id=None, **kwargs):
         if meter_id == "ALL":
             meter_id = None
 
-        return ofctl.get_meter_config(dp, self.waiters, meter_id)
+        return ofctl.get_meter_config(dp, meter_id)
 
     @stats_method
     def get_meter_desc(self, req, dp, ofctl, meter_id=None, **kwargs):
         if meter_id == "ALL":
             meter_id = None
 
-        return ofctl.get_meter_desc(dp, self.waiters, meter_id)
+        return ofctl.get_meter_desc(dp, meter_id)
 
     @stats_method
     def get_meter_stats(self, req, dp, ofctl, meter_id=None, **kwargs):
         if meter_id == "ALL":
             meter_id = None
 
-        return ofctl.get_meter_stats(dp, self.waiters, meter_id)
+        return ofctl.get_meter_stats(dp, meter_id)
 
     @stats_method
     def get_group_features(self, req, dp, ofctl, **kwargs):
-        return ofctl.get_group_features(dp, self.waiters)
+        return ofctl.get_group_features(dp)
 
     @stats_method
     def get_group_desc(self, req, dp, ofctl, group_id=None, **kwargs):
         if dp.ofproto.OFP_VERSION < ofproto_v1_5.OFP_VERSION:
-            return ofctl.get_group_desc(dp, self.waiters)
+            return ofctl.get_group_desc(dp)
         else:
-            return ofctl.get_group_desc(dp, self.waiters, group_id)
+            return ofctl.get_group_desc(dp, group_id)
 
     @stats_method
     def get_group_stats(self, req, dp, ofctl, group_id=None, **kwargs):
         if group_id == "ALL":
             group_id = None
 
-        return ofctl.get_group_stats(dp, self.waiters, group_id)
+        return ofctl.get_group_stats(dp, group_id)
 
     @stats_method
     def get_port_desc(self, req, dp, ofctl, port_no=None, **kwargs):
         if dp.ofproto.OFP_VERSION < ofproto_v1_5.OFP_VERSION:
-            return ofctl.get_port_desc(dp, self.waiters)
+            return ofctl.get_port_desc(dp)
         else:
-            return ofctl.get_port_desc(dp, self.waiters, port_no)
+            return ofctl.get_port_desc(dp, port_no)
 
     @stats_method
     def get_role(self, req, dp, ofctl, **kwargs):
-        return ofctl.get_role(dp, self.waiters)
+        return ofctl.get_role(dp)
 
     @command_method
     def mod_flow_entry(self, req, dp, ofctl, flow, cmd, **kwargs):
@@ -514,10 +510,8 @@ class RestStatsApi(app_manager.RyuApp):
         super(RestStatsApi, self).__init__(*args, **kwargs)
         self.dpset = kwargs['dpset']
         wsgi = kwargs['wsgi']
-        self.waiters = {}
         self.data = {}
         self.data['dpset'] = self.dpset
-        self.data['waiters'] = self.waiters
         mapper = wsgi.mapper
 
         wsgi.registory['StatsController'] = self.data
@@ -717,62 +711,3 @@ class RestStatsApi(app_manager.RyuApp):
         mapper.connect('stats', uri,
                        controller=StatsController, action='set_role',
                        conditions=dict(method=['POST']))
-
-    @set_ev_cls([ofp_event.EventOFPStatsReply,
-                 ofp_event.EventOFPDescStatsReply,
-                 ofp_event.EventOFPFlowStatsReply,
-                 ofp_event.EventOFPAggregateStatsReply,
-                 ofp_event.EventOFPTableStatsReply,
-                 ofp_event.EventOFPTableFeaturesStatsReply,
-                 ofp_event.EventOFPPortStatsReply,
-                 ofp_event.EventOFPQueueStatsReply,
-                 ofp_event.EventOFPQueueDescStatsReply,
-                 ofp_event.EventOFPMeterStatsReply,
-                 ofp_event.EventOFPMeterFeaturesStatsReply,
-                 ofp_event.EventOFPMeterConfigStatsReply,
-                 ofp_event.EventOFPGroupStatsReply,
-                 ofp_event.EventOFPGroupFeaturesStatsReply,
-                 ofp_event.EventOFPGroupDescStatsReply,
-                 ofp_event.EventOFPPortDescStatsReply
-                 ], MAIN_DISPATCHER)
-    def stats_reply_handler(self, ev):
-        msg = ev.msg
-        dp = msg.datapath
-
-        if dp.id not in self.waiters:
-            return
-        if msg.xid not in self.waiters[dp.id]:
-            return
-        lock, msgs = self.waiters[dp.id][msg.xid]
-        msgs.append(msg)
-
-        flags = 0
-        if dp.ofproto.OFP_VERSION == ofproto_v1_0.OFP_VERSION:
-            flags = dp.ofproto.OFPSF_REPLY_MORE
-        elif dp.ofproto.OFP_VERSION == ofproto_v1_2.OFP_VERSION:
-            flags = dp.ofproto.OFPSF_REPLY_MORE
-        elif dp.ofproto.OFP_VERSION >= ofproto_v1_3.OFP_VERSION:
-            flags = dp.ofproto.OFPMPF_REPLY_MORE
-
-        if msg.flags & flags:
-            return
-        del self.waiters[dp.id][msg.xid]
-        lock.set()
-
-    @set_ev_cls([ofp_event.EventOFPSwitchFeatures,
-                 ofp_event.EventOFPQueueGetConfigReply,
-                 ofp_event.EventOFPRoleReply,
-                 ], MAIN_DISPATCHER)
-    def features_reply_handler(self, ev):
-        msg = ev.msg
-        dp = msg.datapath
-
-        if dp.id not in self.waiters:
-            return
-        if msg.xid not in self.waiters[dp.id]:
-            return
-        lock, msgs = self.waiters[dp.id][msg.xid]
-        msgs.append(msg)
-
-        del self.waiters[dp.id][msg.xid]
-        lock.set()
@@ -611,7 +611,7 @@ class Firewall(object):
 
     @rest_command
     def get_status(self, waiters):
-        msgs = self.ofctl.get_flow_stats(self.dp, waiters)
+        msgs = self.ofctl.get_flow_stats(self.dp)
 
         status = REST_STATUS_ENABLE
         if str(self.dp.id) in msgs:
@@ -656,7 +656,7 @@ class Firewall(object):
 
     @rest_command
     def get_log_status(self, waiters):
-        msgs = self.ofctl.get_flow_stats(self.dp, waiters)
+        msgs = self.ofctl.get_flow_stats(self.dp)
 
         status = REST_STATUS_DISABLE
         if str(self.dp.id) in msgs:
@@ -687,7 +687,7 @@ class Firewall(object):
         cmd = self.dp.ofproto.OFPFC_ADD
 
         if waiters:
-            msgs = self.ofctl.get_flow_stats(self.dp, waiters)
+            msgs = self.ofctl.get_flow_stats(self.dp)
 
             if str(self.dp.id) in msgs:
                 flow_stats = msgs[str(self.dp.id)]
@@ -773,7 +773,7 @@ class Firewall(object):
     @rest_command
     def get_rules(self, waiters, vlan_id):
         rules = {}
-        msgs = self.ofctl.get_flow_stats(self.dp, waiters)
+        msgs = self.ofctl.get_flow_stats(self.dp)
 
         if str(self.dp.id) in msgs:
             flow_stats = msgs[str(self.dp.id)]
@@ -811,7 +811,7 @@ class Firewall(object):
         vlan_list = []
         delete_list = []
 
-        msgs = self.ofctl.get_flow_stats(self.dp, waiters)
+        msgs = self.ofctl.get_flow_stats(self.dp)
         if str(self.dp.id) in msgs:
             flow_stats = msgs[str(self.dp.id)]
             for flow_stat in flow_stats:
@@ -658,7 +658,7 @@ class QoS(object):
         if self.version == ofproto_v1_0.OFP_VERSION:
             raise ValueError('get_status operation is not supported')
 
-        msgs = self.ofctl.get_queue_stats(self.dp, waiters)
+        msgs = self.ofctl.get_queue_stats(self.dp)
         return REST_COMMAND_RESULT, msgs
 
     @rest_command
@@ -801,7 +801,7 @@ class QoS(object):
     @rest_command
     def get_qos(self, rest, vlan_id, waiters):
         rules = {}
-        msgs = self.ofctl.get_flow_stats(self.dp, waiters)
+        msgs = self.ofctl.get_flow_stats(self.dp)
         if str(self.dp.id) in msgs:
             flow_stats = msgs[str(self.dp.id)]
             for flow_stat in flow_stats:
@@ -838,7 +838,7 @@ class QoS(object):
         vlan_list = []
         delete_list = []
 
-        msgs = self.ofctl.get_flow_stats(self.dp, waiters)
+        msgs = self.ofctl.get_flow_stats(self.dp)
         if str(self.dp.id) in msgs:
             flow_stats = msgs[str(self.dp.id)]
             for flow_stat in flow_stats:
@@ -917,7 +917,7 @@ class QoS(object):
                 self.version == ofproto_v1_2.OFP_VERSION):
             raise ValueError('get_meter operation is not supported')
 
-        msgs = self.ofctl.get_meter_stats(self.dp, waiters)
+        msgs = self.ofctl.get_meter_stats(self.dp)
         return REST_COMMAND_RESULT, msgs
 
     @rest_command
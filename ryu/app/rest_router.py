@@ -41,6 +41,7 @@ from ryu.lib.packet import icmp
 from ryu.lib.packet import ipv4
 from ryu.lib.packet import packet
 from ryu.lib.packet import packet_base
+from ryu.lib.packet import packet_template
 from ryu.lib.packet import tcp
 from ryu.lib.packet import udp
 from ryu.lib.packet import vlan
@@ -1469,6 +1470,8 @@ class OfCtl(object):
         self.dp = dp
         self.sw_id = {'sw_id': dpid_lib.dpid_to_str(dp.id)}
         self.logger = logger
+        # ARP packet templates by VLAN ID
+        self._arp_templates = {}
 
     def set_sw_config_for_ttl(self):
         # OpenFlow v1_2/1_3.
@@ -1483,31 +1486,39 @@ class OfCtl(object):
     def send_arp(self, arp_opcode, vlan_id, src_mac, dst_mac,
                  src_ip, dst_ip, arp_target_mac, in_port, output):
         # Generate ARP packet
-        if vlan_id != VLANID_NONE:
-            ether_proto = ether.ETH_TYPE_8021Q
-            pcp = 0
-            cfi = 0
-            vlan_ether = ether.ETH_TYPE_ARP
-            v = vlan.vlan(pcp, cfi, vlan_id, vlan_ether)
-        else:
-            ether_proto = ether.ETH_TYPE_ARP
-        hwtype = 1
-        arp_proto = ether.ETH_TYPE_IP
-        hlen = 6
-        plen = 4
-
-        pkt = packet.Packet()
-        e = ethernet.ethernet(dst_mac, src_mac, ether_proto)
-        a = arp.arp(hwtype, arp_proto, hlen, plen, arp_opcode,
-                    src_mac, src_ip, arp_target_mac, dst_ip)
-        pkt.add_protocol(e)
-        if vlan_id != VLANID_NONE:
-            pkt.add_protocol(v)
-        pkt.add_protocol(a)
-        pkt.serialize()
+        # The packets of a VLAN differ only in their fields.
+        tmpl = self._arp_templates.get(vlan_id)
+        if tmpl is None:
+            if vlan_id != VLANID_NONE:
+                ether_proto = ether.ETH_TYPE_8021Q
+                pcp = 0
+                cfi = 0
+                vlan_ether = ether.ETH_TYPE_ARP
+                v = vlan.vlan(pcp, cfi, vlan_id, vlan_ether)
+            else:
+                ether_proto = ether.ETH_TYPE_ARP
+            hwtype = 1
+            arp_proto = ether.ETH_TYPE_IP
+            hlen = 6
+            plen = 4
+
+            pkt = packet.Packet()
+            e = ethernet.ethernet(dst_mac, src_mac, ether_proto)
+            a = arp.arp(hwtype, arp_proto, hlen, plen, arp_opcode,
+                        src_mac, src_ip, arp_target_mac, dst_ip)
+            pkt.add_protocol(e)
+            if vlan_id != VLANID_NONE:
+                pkt.add_protocol(v)
+            pkt.add_protocol(a)
+            tmpl = packet_template.PacketTemplate(pkt)
+            self._arp_templates[vlan_id] = tmpl
+        data = tmpl.build(ethernet_dst=dst_mac, ethernet_src=src_mac,
+                          arp_opcode=arp_opcode, arp_src_mac=src_mac,
+                          arp_src_ip=src_ip, arp_dst_mac=arp_target_mac,
+                          arp_dst_ip=dst_ip)
 
         # Send packet out
-        self.send_packet_out(in_port, output, pkt.data, data_str=str(pkt))
+        self.send_packet_out(in_port, output, data)
 
     def send_icmp(self, in_port, protocol_list, vlan_id, icmp_type,
                   icmp_code, icmp_data=None, msg_data=None, src_ip=None):
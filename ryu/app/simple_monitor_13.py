@@ -16,6 +16,7 @@
 from operator import attrgetter
 
 from ryu.app import simple_switch_13
+from ryu.controller import controller
 from ryu.controller import ofp_event
 from ryu.controller.handler import MAIN_DISPATCHER, DEAD_DISPATCHER
 from ryu.controller.handler import set_ev_cls
@@ -44,25 +45,35 @@ class SimpleMonitor13(simple_switch_13.SimpleSwitch13):
 
     def _monitor(self):
         while True:
-            for dp in self.datapaths.values():
-                self._request_stats(dp)
+            self._request_stats(list(self.datapaths.values()))
             hub.sleep(10)
 
-    def _request_stats(self, datapath):
-        self.logger.debug('send stats request: %016x', datapath.id)
-        ofproto = datapath.ofproto
-        parser = datapath.ofproto_parser
+    def _request_stats(self, datapaths):
+        requests = []
+        handlers = []
+        for datapath in datapaths:
+            self.logger.debug('send stats request: %016x', datapath.id)
+            ofproto = datapath.ofproto
+            parser = datapath.ofproto_parser
 
-        req = parser.OFPFlowStatsRequest(datapath)
-        datapath.send_msg(req)
+            requests.append(parser.OFPFlowStatsRequest(datapath))
+            handlers.append(self._flow_stats_reply_handler)
 
-        req = parser.OFPPortStatsRequest(datapath, 0, ofproto.OFPP_ANY)
-        datapath.send_msg(req)
+            requests.append(
+                parser.OFPPortStatsRequest(datapath, 0, ofproto.OFPP_ANY))
+            handlers.append(self._port_stats_reply_handler)
 
-    @set_ev_cls(ofp_event.EventOFPFlowStatsReply, MAIN_DISPATCHER)
-    def _flow_stats_reply_handler(self, ev):
-        body = ev.msg.body
+        # All the switches are requested at once and a switch not
+        # replying in time doesn't delay the others.
+        replies = controller.gather(requests, timeout=5)
+        for req, handler, body in zip(requests, handlers, replies):
+            if isinstance(body, Exception):
+                self.logger.warning('stats request to %016x failed: %s',
+                                    req.datapath.id, body)
+                continue
+            handler(req.datapath, body)
 
+    def _flow_stats_reply_handler(self, datapath, body):
         self.logger.info('datapath         '
                          'in-port  eth-dst           '
                          'out-port packets  bytes')
@@ -73,15 +84,12 @@ class SimpleMonitor13(simple_switch_13.SimpleSwitch13):
                            key=lambda flow: (flow.match['in_port'],
                                              flow.match['eth_dst'])):
             self.logger.info('%016x %8x %17s %8x %8d %8d',
-                             ev.msg.datapath.id,
+                             datapath.id,
                              stat.match['in_port'], stat.match['eth_dst'],
                              stat.instructions[0].actions[0].port,
                              stat.packet_count, stat.byte_count)
 
-    @set_ev_cls(ofp_event.EventOFPPortStatsReply, MAIN_DISPATCHER)
-    def _port_stats_reply_handler(self, ev):
-        body = ev.msg.body
-
+    def _port_stats_reply_handler(self, datapath, body):
         self.logger.info('datapath         port     '
                          'rx-pkts  rx-bytes rx-error '
                          'tx-pkts  tx-bytes tx-error')
@@ -90,6 +98,6 @@ class SimpleMonitor13(simple_switch_13.SimpleSwitch13):
                          '-------- -------- --------')
         for stat in sorted(body, key=attrgetter('port_no')):
             self.logger.info('%016x %8x %8d %8d %8d %8d %8d %8d',
-                             ev.msg.datapath.id, stat.port_no,
+                             datapath.id, stat.port_no,
                              stat.rx_packets, stat.rx_bytes, stat.rx_errors,
                              stat.tx_packets, stat.tx_bytes, stat.tx_errors)
@@ -15,6 +15,7 @@
 # limitations under the License.
 
 import inspect
+import time
 from types import MethodType
 
 from routes import Mapper
@@ -32,6 +33,7 @@ from webob.request import Request as webob_Request
 from webob.response import Response as webob_Response
 
 from ryu import cfg
+from ryu.controller import pktin_capture
 from ryu.lib import hub
 
 DEFAULT_WSGI_HOST = '0.0.0.0'
@@ -335,9 +337,139 @@ class WSGIServer(hub.WSGIServer):
         self.serve_forever()
 
 
+def _metric(name, labels, value):
+    label_str = ','.join('%s="%s"' % (k, str(v).replace('\\', '\\\\')
+                                      .replace('"', '\\"'))
+                         for k, v in labels)
+    return '%s{%s} %s' % (name, label_str, value)
+
+
+def _format_le(le):
+    if le == float('inf'):
+        return '+Inf'
+    return '%g' % le
+
+
+_MSG_TYPE_NAMES = {}  # ofproto module name -> {msg_type: 'OFPT_*'}
+
+
+def _msg_type_names(ofproto):
+    names = _MSG_TYPE_NAMES.get(ofproto.__name__)
+    if names is None:
+        names = dict((v, k) for k, v in vars(ofproto).items()
+                     if k.startswith('OFPT_') and isinstance(v, int))
+        _MSG_TYPE_NAMES[ofproto.__name__] = names
+    return names
+
+
+def metrics_lines():
+    """
+    Yields the lines of the metrics of the running applications and the
+    connected datapaths in the Prometheus text exposition format.
+    """
+    # Note: ryu.base.app_manager and ryu.controller.controller import
+    # this module.
+    from ryu.base import app_manager
+    from ryu.controller import controller
+    from ryu.lib import dpid as dpid_lib
+
+    apps = sorted(app_manager.SERVICE_BRICKS.items())
+    for name, type_, key in [
+            ('ryu_app_event_queue_size', 'gauge', 'size'),
+            ('ryu_app_event_queue_high_water', 'gauge', 'high_water'),
+            ('ryu_app_event_queue_dropped_total', 'counter', 'dropped'),
+            ('ryu_app_event_queue_coalesced_total', 'counter', 'coalesced'),
+            ('ryu_app_event_queue_blocked_total', 'counter', 'blocked'),
+            ('ryu_app_event_queue_priority_total', 'counter', 'priority')]:
+        yield '# TYPE %s %s' % (name, type_)
+        for app_name, app in apps:
+            yield _metric(name, [('app', app_name)],
+                          app.get_event_queue_stats()[key])
+
+    handler_stats = [(app_name, key, stats)
+                     for app_name, app in apps
+                     for key, stats in sorted(
+                         app.get_handler_stats().items())]
+    yield '# TYPE ryu_handler_errors_total counter'
+    for app_name, (handler, ev_cls), stats in handler_stats:
+        labels = [('app', app_name), ('handler', handler), ('event', ev_cls)]
+        yield _metric('ryu_handler_errors_total', labels, stats['errors'])
+    yield '# TYPE ryu_handler_latency_seconds histogram'
+    for app_name, (handler, ev_cls), stats in handler_stats:
+        labels = [('app', app_name), ('handler', handler), ('event', ev_cls)]
+        for le, count in stats['buckets']:
+            yield _metric('ryu_handler_latency_seconds_bucket',
+                          labels + [('le', _format_le(le))], count)
+        yield _metric('ryu_handler_latency_seconds_sum', labels,
+                      repr(stats['sum']))
+        yield _metric('ryu_handler_latency_seconds_count', labels,
+                      stats['count'])
+
+    # datapaths still in handshake are not identified yet
+    datapaths = sorted(((dpid_lib.dpid_to_str(dp.id), dp)
+                        for dp in controller.active_datapaths()
+                        if dp.id is not None), key=lambda x: x[0])
+
+    yield '# TYPE ryu_datapath_connected_seconds gauge'
+    now = time.time()
+    for dpid, dp in datapaths:
+        yield _metric('ryu_datapath_connected_seconds',
+                      [('dpid', dpid)], '%.3f' % (now - dp.connected_at))
+    for direction in ['rx', 'tx']:
+        msgs_name = 'ryu_datapath_%s_messages_total' % direction
+        bytes_name = 'ryu_datapath_%s_bytes_total' % direction
+        samples = []
+        for dpid, dp in datapaths:
+            names = _msg_type_names(dp.ofproto)
+            for msg_type, (msgs, bytes_) in sorted(
+                    getattr(dp, '%s_stats' % direction).items()):
+                labels = [('dpid', dpid),
+                          ('type', names.get(msg_type, msg_type))]
+                samples.append((labels, msgs, bytes_))
+        yield '# TYPE %s counter' % msgs_name
+        for labels, msgs, _bytes in samples:
+            yield _metric(msgs_name, labels, msgs)
+        yield '# TYPE %s counter' % bytes_name
+        for labels, _msgs, bytes_ in samples:
+            yield _metric(bytes_name, labels, bytes_)
+
+
+class MetricsController(ControllerBase):
+    """
+    Serves the metrics of the controller at /metrics.
+
+    Rates are derived by the scraper from the counters, e.g. with
+    rate(ryu_datapath_rx_messages_total[1m]).
+    """
+
+    @route('metrics', '/metrics', methods=['GET'])
+    def get_metrics(self, req, **_kwargs):
+        body = '\n'.join(metrics_lines()) + '\n'
+        return Response(content_type='text/plain', body=body)
+
+
+class CaptureController(ControllerBase):
+    """
+    Serves the packet-ins of the capture in the pcapng format at
+    /capture, cf. ryu.controller.pktin_capture.
+    """
+
+    @route('capture', '/capture', methods=['GET'])
+    def get_capture(self, req, **_kwargs):
+        capture = pktin_capture.get_capture()
+        if capture is None:
+            return Response(status=404, body='capture is not enabled')
+        f = six.BytesIO()
+        capture.dump(f)
+        return Response(content_type='application/octet-stream',
+                        body=f.getvalue())
+
+
 def start_service(app_mgr):
     for instance in app_mgr.contexts.values():
         if instance.__class__ == WSGIApplication:
+            instance.register(MetricsController)
+            instance.register(CaptureController)
             return WSGIServer(instance)
 
     return None
@@ -23,19 +23,24 @@ The central management of Ryu applications.
 
 """
 
+import bisect
+import collections
 import inspect
 import itertools
 import logging
 import sys
 import os
 import gc
+import time
 
 from ryu import cfg
+from ryu import exception
 from ryu import utils
 from ryu.app import wsgi
 from ryu.controller.handler import register_instance, get_dependent_services
 from ryu.controller.controller import Datapath
 from ryu.controller import event
+from ryu.controller import worker
 from ryu.controller.event import EventRequestBase, EventReplyBase
 from ryu.lib import hub
 from ryu.ofproto import ofproto_protocol
@@ -88,6 +93,220 @@ def require_app(app_name, api_style=False):
     LOG.debug('require_app: %s is required by %s', app_name, m.__name__)
 
 
+# Upper bounds in seconds of the buckets of the handler latency histograms
+HANDLER_LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+                           0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+_clock = getattr(time, 'monotonic', time.time)
+
+
+class _HandlerStats(object):
+    """
+    Invocation count and latency histogram of an event handler.
+    """
+    __slots__ = ('count', 'errors', 'sum', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.sum = 0.0
+        # the last bucket counts the calls slower than every bound
+        self.buckets = [0] * (len(HANDLER_LATENCY_BUCKETS) + 1)
+
+    def observe(self, elapsed, error=False):
+        self.count += 1
+        if error:
+            self.errors += 1
+        self.sum += elapsed
+        self.buckets[bisect.bisect_left(HANDLER_LATENCY_BUCKETS,
+                                        elapsed)] += 1
+
+    def get_stats(self):
+        cumulative = 0
+        buckets = []
+        for le, count in zip(HANDLER_LATENCY_BUCKETS + (float('inf'),),
+                             self.buckets):
+            cumulative += count
+            buckets.append((le, cumulative))
+        return {'count': self.count, 'errors': self.errors,
+                'sum': self.sum, 'buckets': buckets}
+
+
+# Policies of RyuApp._EVENT_QUEUE_OVERFLOW
+QUEUE_OVERFLOW_BLOCK = 'block'
+QUEUE_OVERFLOW_DROP_OLDEST = 'drop-oldest'
+QUEUE_OVERFLOW_DROP_NEWEST = 'drop-newest'
+QUEUE_OVERFLOW_COALESCE = 'coalesce'
+
+
+class _EventQueue(object):
+    """
+    A bounded queue of (ev, state) with an overflow policy.
+
+    QUEUE_OVERFLOW_BLOCK blocks put() until there is room.
+    QUEUE_OVERFLOW_DROP_OLDEST discards the oldest queued event.
+    QUEUE_OVERFLOW_DROP_NEWEST discards the event being put.
+    QUEUE_OVERFLOW_COALESCE replaces the queued event which has the same
+    key, as computed by coalesce_key(ev, state), with the event being put,
+    keeping its position.  Events without a queued peer are put as with
+    QUEUE_OVERFLOW_BLOCK.  None key means never coalesced.
+
+    Events of PRIORITY_HIGH are queued in a lane of their own, which has
+    maxsize room apart from the other events, and are taken first.  To
+    keep the other events moving, one of them is taken after every
+    priority_burst events of PRIORITY_HIGH taken while it was waiting.
+    """
+
+    def __init__(self, maxsize, overflow=QUEUE_OVERFLOW_BLOCK,
+                 coalesce_key=None, priority_burst=16):
+        assert overflow in (QUEUE_OVERFLOW_BLOCK, QUEUE_OVERFLOW_DROP_OLDEST,
+                            QUEUE_OVERFLOW_DROP_NEWEST,
+                            QUEUE_OVERFLOW_COALESCE)
+        assert overflow != QUEUE_OVERFLOW_COALESCE or coalesce_key
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.coalesce_key = coalesce_key
+        self.priority_burst = priority_burst
+        self._queue = collections.deque()   # of [ev, state, key]
+        self._priority_queue = collections.deque()
+        self._streak = 0    # events taken from _priority_queue in a row
+        self._keys = {}                     # key -> queued entry
+        self._not_empty = hub.Event()
+        self._not_full = hub.Event()
+        self._getters = 0
+        self._putters = 0
+        self.high_water = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.blocked = 0
+        self.priority = 0
+
+    def qsize(self):
+        return len(self._queue) + len(self._priority_queue)
+
+    def empty(self):
+        return not self._queue and not self._priority_queue
+
+    def full(self):
+        return len(self._queue) >= self.maxsize
+
+    def _lane(self, priority):
+        if priority == event.PRIORITY_HIGH:
+            return self._priority_queue
+        return self._queue
+
+    def _pop(self, lane=None):
+        if lane is None:
+            if self._priority_queue and (not self._queue or
+                                         self._streak < self.priority_burst):
+                lane = self._priority_queue
+                if self._queue:
+                    self._streak += 1
+                self.priority += 1
+            else:
+                lane = self._queue
+                self._streak = 0
+        entry = lane.popleft()
+        if entry[2] is not None:
+            del self._keys[entry[2]]
+        if self._putters:
+            self._not_full.set()
+        return entry
+
+    def put(self, ev, state, priority=event.PRIORITY_NORMAL, block=True):
+        """
+        Queue (ev, state).  If block is False, returns False instead of
+        waiting for room, without queueing ev; otherwise returns True.
+        """
+        key = None
+        if self.overflow == QUEUE_OVERFLOW_COALESCE:
+            key = self.coalesce_key(ev, state)
+            entry = self._keys.get(key)
+            if entry is not None:
+                entry[0] = ev
+                entry[1] = state
+                self.coalesced += 1
+                return True
+
+        lane = self._lane(priority)
+        if len(lane) >= self.maxsize:
+            if self.overflow == QUEUE_OVERFLOW_DROP_NEWEST:
+                self.dropped += 1
+                return True
+            elif self.overflow == QUEUE_OVERFLOW_DROP_OLDEST:
+                self._pop(lane)
+                self.dropped += 1
+            elif not block:
+                return False
+            else:
+                self.blocked += 1
+                self._putters += 1
+                try:
+                    while len(lane) >= self.maxsize:
+                        self._not_full.clear()
+                        self._not_full.wait()
+                finally:
+                    self._putters -= 1
+
+        entry = [ev, state, key]
+        lane.append(entry)
+        if key is not None:
+            self._keys[key] = entry
+        self.high_water = max(self.high_water, self.qsize())
+        if self._getters:
+            self._not_empty.set()
+        return True
+
+    def get(self):
+        if self.empty():
+            self._getters += 1
+            try:
+                while self.empty():
+                    self._not_empty.clear()
+                    self._not_empty.wait()
+            finally:
+                self._getters -= 1
+        ev, state, _key = self._pop()
+        return ev, state
+
+    def get_batch(self, max_items):
+        """
+        Wait for an event and return a list of up to max_items queued
+        (ev, state).
+        """
+        batch = [self.get()]
+        while not self.empty() and len(batch) < max_items:
+            ev, state, _key = self._pop()
+            batch.append((ev, state))
+        return batch
+
+    def get_stats(self):
+        return {
+            'size': self.qsize(),
+            'maxsize': self.maxsize,
+            'high_water': self.high_water,
+            'dropped': self.dropped,
+            'coalesced': self.coalesced,
+            'blocked': self.blocked,
+            'priority': self.priority,
+        }
+
+
+_GLOBAL_EVENT_TOPIC = 'event'
+
+
+def _deliver_global_event(value):
+    name, ev, state = value
+    brick = lookup_service_brick(name)
+    if brick is None:
+        return
+    for observer in brick.get_observers(ev, state):
+        brick.send_event(observer, ev, state)
+
+
+worker.subscribe(_GLOBAL_EVENT_TOPIC, _deliver_global_event)
+
+
 class RyuApp(object):
     """
     The base class for Ryu applications.
@@ -129,6 +348,65 @@ class RyuApp(object):
     a different python module from the RyuApp subclass is.
     """
 
+    _GLOBAL_EVENTS = []
+    """
+    A list of event classes generated by this RyuApp subclass which must be
+    observed in the same order by every worker process when ryu-manager
+    runs with --ofp-workers.  Such events are sent to observers through
+    the shared-state channel of ryu.controller.worker, so they must be
+    picklable.
+    """
+
+    _SINGLE_WORKER = False
+    """
+    True if this RyuApp subclass needs to see every datapath in a single
+    process, e.g. to discover the links between them.  ryu-manager refuses
+    to load it with --ofp-workers.
+    """
+
+    _EVENT_QUEUE_SIZE = 128
+    """
+    The capacity of the event queue of this RyuApp.
+    """
+
+    _EVENT_QUEUE_OVERFLOW = QUEUE_OVERFLOW_BLOCK
+    """
+    What to do when an event is sent to this RyuApp while its event queue
+    is full.  One of QUEUE_OVERFLOW_BLOCK (the default, the sender waits),
+    QUEUE_OVERFLOW_DROP_OLDEST, QUEUE_OVERFLOW_DROP_NEWEST and
+    QUEUE_OVERFLOW_COALESCE.
+
+    With QUEUE_OVERFLOW_COALESCE, _EVENT_COALESCE_KEY must be a function
+    which takes (ev, state) and returns a hashable key, or None for the
+    events never to be coalesced.  An event replaces the queued event
+    with the same key.
+
+    Example::
+
+        _EVENT_QUEUE_OVERFLOW = app_manager.QUEUE_OVERFLOW_COALESCE
+
+        def _EVENT_COALESCE_KEY(ev, state):
+            if isinstance(ev, ofp_event.EventOFPPortStatsReply):
+                return (ev.__class__, ev.msg.datapath.id)
+            return None
+    """
+
+    _EVENT_COALESCE_KEY = None
+
+    _EVENT_PRIORITY_BURST = 16
+    """
+    The maximum number of events of PRIORITY_HIGH which the event loop
+    handles in a row while other events are waiting.  Cf. set_ev_cls and
+    EventBase.event_priority.
+    """
+
+    _EVENT_BATCH_SIZE = 64
+    """
+    The maximum number of events which the event loop takes from the queue
+    at once.  Handlers declared with set_ev_cls(..., batch=True) receive
+    the events of a batch in a single call.
+    """
+
     OFP_VERSIONS = None
     """
     A list of supported OpenFlow versions for this RyuApp.
@@ -155,10 +433,21 @@ class RyuApp(object):
         self.name = self.__class__.__name__
         self.event_handlers = {}        # ev_cls -> handlers:list
         self.observers = {}     # ev_cls -> observer-name -> states:set
+        # dispatch tables compiled on first use, cleared on registration
+        self._handlers_table = {}   # (ev_cls, state) -> handlers:tuple
+        # (ev_cls, state) -> (handlers:tuple, batch handlers:tuple)
+        self._loop_handlers_table = {}
+        self._observers_table = {}  # (ev_cls, state) -> observers:tuple
+        # ev_cls -> priority declared by the handlers or None
+        self._priority_table = {}
+        # (handler name, ev_cls name) -> _HandlerStats
+        self._handler_stats = {}
         self.threads = []
         self.main_thread = None
-        self.events = hub.Queue(128)
-        self._events_sem = hub.BoundedSemaphore(self.events.maxsize)
+        self.events = _EventQueue(self._EVENT_QUEUE_SIZE,
+                                  self._EVENT_QUEUE_OVERFLOW,
+                                  self.__class__._EVENT_COALESCE_KEY,
+                                  self._EVENT_PRIORITY_BURST)
         if hasattr(self.__class__, 'LOGGER_NAME'):
             self.logger = logging.getLogger(self.__class__.LOGGER_NAME)
         else:
@@ -196,25 +485,35 @@ class RyuApp(object):
         assert callable(handler)
         self.event_handlers.setdefault(ev_cls, [])
         self.event_handlers[ev_cls].append(handler)
+        self._invalidate_handlers()
 
     def unregister_handler(self, ev_cls, handler):
         assert callable(handler)
         self.event_handlers[ev_cls].remove(handler)
         if not self.event_handlers[ev_cls]:
             del self.event_handlers[ev_cls]
+        self._invalidate_handlers()
+
+    def _invalidate_handlers(self):
+        self._handlers_table.clear()
+        self._loop_handlers_table.clear()
+        self._priority_table.clear()
 
     def register_observer(self, ev_cls, name, states=None):
         states = states or set()
         ev_cls_observers = self.observers.setdefault(ev_cls, {})
         ev_cls_observers.setdefault(name, set()).update(states)
+        self._observers_table.clear()
 
     def unregister_observer(self, ev_cls, name):
         observers = self.observers.get(ev_cls, {})
         observers.pop(name)
+        self._observers_table.clear()
 
     def unregister_observer_all_event(self, name):
         for observers in self.observers.values():
             observers.pop(name, None)
+        self._observers_table.clear()
 
     def observe_event(self, ev_cls, states=None):
         brick = _lookup_service_brick_by_ev_cls(ev_cls)
@@ -227,7 +526,10 @@ class RyuApp(object):
             brick.unregister_observer(ev_cls, self.name)
 
     def get_handlers(self, ev, state=None):
-        """Returns a list of handlers for the specific event.
+        """Returns a sequence of handlers for the specific event.
+
+        The result is compiled once per (event class, state) and reused
+        until a handler is registered or unregistered.
 
         :param ev: The event to handle.
         :param state: The current state. ("dispatcher")
@@ -236,10 +538,18 @@ class RyuApp(object):
                       in the specified state.
                       The default is None.
         """
-        ev_cls = ev.__class__
+        key = (ev.__class__, state)
+        try:
+            return self._handlers_table[key]
+        except KeyError:
+            handlers = self._compile_handlers(*key)
+            self._handlers_table[key] = handlers
+            return handlers
+
+    def _compile_handlers(self, ev_cls, state):
         handlers = self.event_handlers.get(ev_cls, [])
         if state is None:
-            return handlers
+            return tuple(handlers)
 
         def test(h):
             if not hasattr(h, 'callers') or ev_cls not in h.callers:
@@ -252,15 +562,41 @@ class RyuApp(object):
                 return True
             return state in states
 
-        return filter(test, handlers)
+        return tuple(filter(test, handlers))
+
+    def _get_loop_handlers(self, ev, state):
+        key = (ev.__class__, state)
+        try:
+            return self._loop_handlers_table[key]
+        except KeyError:
+            pass
+
+        def is_batch(h):
+            caller = getattr(h, 'callers', {}).get(key[0])
+            return caller is not None and caller.batch
+
+        handlers = self.get_handlers(ev, state)
+        split = (tuple(h for h in handlers if not is_batch(h)),
+                 tuple(h for h in handlers if is_batch(h)))
+        self._loop_handlers_table[key] = split
+        return split
 
     def get_observers(self, ev, state):
+        key = (ev.__class__, state)
+        try:
+            return self._observers_table[key]
+        except KeyError:
+            observers = self._compile_observers(*key)
+            self._observers_table[key] = observers
+            return observers
+
+    def _compile_observers(self, ev_cls, state):
         observers = []
-        for k, v in self.observers.get(ev.__class__, {}).items():
+        for k, v in self.observers.get(ev_cls, {}).items():
             if not state or not v or state in v:
                 observers.append(k)
 
-        return observers
+        return tuple(observers)
 
     def send_request(self, req):
         """
@@ -278,29 +614,89 @@ class RyuApp(object):
         # going to sleep for the reply
         return req.reply_q.get()
 
+    def _call_handler(self, handler, ev, ev_cls):
+        error = False
+        start = _clock()
+        try:
+            handler(ev)
+        except hub.TaskExit:
+            # Normal exit.
+            # Propagate upwards, so we leave the event loop.
+            raise
+        except:
+            error = True
+            LOG.exception('%s: Exception occurred during handler processing. '
+                          'Backtrace from offending handler '
+                          '[%s] servicing event [%s] follows.',
+                          self.name, handler.__name__, ev_cls.__name__)
+        elapsed = _clock() - start
+
+        key = (handler.__name__, ev_cls.__name__)
+        stats = self._handler_stats.get(key)
+        if stats is None:
+            stats = self._handler_stats[key] = _HandlerStats()
+        stats.observe(elapsed, error)
+
     def _event_loop(self):
         while self.is_active or not self.events.empty():
-            ev, state = self.events.get()
-            self._events_sem.release()
-            if ev == self._event_stop:
-                continue
-            handlers = self.get_handlers(ev, state)
-            for handler in handlers:
-                try:
-                    handler(ev)
-                except hub.TaskExit:
-                    # Normal exit.
-                    # Propagate upwards, so we leave the event loop.
-                    raise
-                except:
-                    LOG.exception('%s: Exception occurred during handler processing. '
-                                  'Backtrace from offending handler '
-                                  '[%s] servicing event [%s] follows.',
-                                  self.name, handler.__name__, ev.__class__.__name__)
-
-    def _send_event(self, ev, state):
-        self._events_sem.acquire()
-        self.events.put((ev, state))
+            # handler -> list of events for handlers taking batches
+            batches = collections.OrderedDict()
+            for ev, state in self.events.get_batch(self._EVENT_BATCH_SIZE):
+                if ev == self._event_stop:
+                    continue
+                handlers, batch_handlers = self._get_loop_handlers(ev, state)
+                for handler in handlers:
+                    self._call_handler(handler, ev, ev.__class__)
+                for handler in batch_handlers:
+                    batches.setdefault(handler, []).append(ev)
+            for handler, evs in batches.items():
+                self._call_handler(handler, evs, evs[0].__class__)
+
+    def _get_event_priority(self, ev):
+        ev_cls = ev.__class__
+        try:
+            priority = self._priority_table[ev_cls]
+        except KeyError:
+            priority = self._compile_priority(ev_cls)
+            self._priority_table[ev_cls] = priority
+        if priority is None:
+            return getattr(ev, 'event_priority', event.PRIORITY_NORMAL)
+        return priority
+
+    def _compile_priority(self, ev_cls):
+        priorities = set()
+        for handler in self.event_handlers.get(ev_cls, []):
+            caller = getattr(handler, 'callers', {}).get(ev_cls)
+            if caller is not None and caller.priority is not None:
+                priorities.add(caller.priority)
+        if event.PRIORITY_HIGH in priorities:
+            return event.PRIORITY_HIGH
+        if priorities:
+            return event.PRIORITY_NORMAL
+        return None
+
+    def _send_event(self, ev, state, block=True):
+        return self.events.put(ev, state, self._get_event_priority(ev),
+                               block)
+
+    def get_event_queue_stats(self):
+        """
+        Returns a dict of the statistics of the event queue:
+        size, maxsize, high_water, dropped, coalesced and blocked, the
+        number of times a sender waited for room.
+        """
+        return self.events.get_stats()
+
+    def get_handler_stats(self):
+        """
+        Returns a dict of the statistics of the event handlers called by
+        the event loop, keyed by (handler name, event class name).
+        Each value is a dict of count, errors, sum, the total time in
+        seconds, and buckets, a list of (upper bound in seconds,
+        cumulative count) of the latency histogram.
+        """
+        return dict((key, stats.get_stats())
+                    for key, stats in self._handler_stats.items())
 
     def send_event(self, name, ev, state=None):
         """
@@ -322,9 +718,31 @@ class RyuApp(object):
         Send the specified event to all observers of this RyuApp.
         """
 
+        if worker.is_enabled() and ev.__class__ in self._GLOBAL_EVENTS:
+            worker.publish(_GLOBAL_EVENT_TOPIC, (self.name, ev, state))
+            return
+
         for observer in self.get_observers(ev, state):
             self.send_event(observer, ev, state)
 
+    def _send_event_to_observers_nowait(self, ev, state=None):
+        # send_event_to_observers() which doesn't wait for room in the
+        # event queues.  Returns the names of the observers whose queue
+        # is full, to which ev is not sent.
+        if worker.is_enabled() and ev.__class__ in self._GLOBAL_EVENTS:
+            worker.publish(_GLOBAL_EVENT_TOPIC, (self.name, ev, state))
+            return []
+
+        full = []
+        for observer in self.get_observers(ev, state):
+            brick = SERVICE_BRICKS.get(observer)
+            if brick is None:
+                LOG.debug("EVENT LOST %s->%s %s",
+                          self.name, observer, ev.__class__.__name__)
+            elif not brick._send_event(ev, state, block=False):
+                full.append(observer)
+        return full
+
     def reply_to_request(self, req, rep):
         """
         Send a reply for a synchronous request sent by send_request.
@@ -415,6 +833,8 @@ class AppManager(object):
             cls = self.load_app(app_cls_name)
             if cls is None:
                 continue
+            if worker.is_enabled() and cls._SINGLE_WORKER:
+                raise exception.SingleWorkerApp(app=app_cls_name)
 
             self.applications_cls[app_cls_name] = cls
 
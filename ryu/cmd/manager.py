@@ -33,6 +33,7 @@ from ryu import version
 from ryu.app import wsgi
 from ryu.base.app_manager import AppManager
 from ryu.controller import controller
+from ryu.controller import worker
 from ryu.topology import switches
 
 
@@ -89,6 +90,12 @@ def main(args=None, prog=None):
         with open(CONF.pid_file, 'w') as pid_file:
             pid_file.write(str(os.getpid()))
 
+    worker.fork_workers(CONF.ofp_workers)
+    if worker.is_enabled():
+        logger.info('started worker %d of %d',
+                    worker.worker_id(), worker.num_workers())
+    services = worker.start()
+
     app_lists = CONF.app_lists + CONF.app
     # keep old behavior, run ofp if no application is specified.
     if not app_lists:
@@ -97,10 +104,12 @@ def main(args=None, prog=None):
     app_mgr = AppManager.get_instance()
     app_mgr.load_apps(app_lists)
     contexts = app_mgr.create_contexts()
-    services = []
     services.extend(app_mgr.instantiate_apps(**contexts))
 
-    webapp = wsgi.start_service(app_mgr)
+    # Only worker 0 serves the REST API not to conflict on its port.
+    webapp = None
+    if worker.worker_id() == 0:
+        webapp = wsgi.start_service(app_mgr)
     if webapp:
         thr = hub.spawn(webapp)
         services.append(thr)
@@ -112,6 +121,7 @@ def main(args=None, prog=None):
                      "Closing RYU application manager...")
     finally:
         app_mgr.close()
+        worker.stop()
 
 
 if __name__ == "__main__":
@@ -22,9 +22,11 @@ The main component of OpenFlow controller.
 
 """
 
+import collections
 import contextlib
 import logging
 import random
+import time
 from socket import IPPROTO_TCP
 from socket import TCP_NODELAY
 from socket import SHUT_WR
@@ -32,6 +34,7 @@ from socket import timeout as SocketTimeout
 import ssl
 
 from ryu import cfg
+from ryu import exception
 from ryu.lib import hub
 from ryu.lib.hub import StreamServer
 
@@ -41,10 +44,12 @@ from ryu.ofproto import ofproto_common
 from ryu.ofproto import ofproto_parser
 from ryu.ofproto import ofproto_protocol
 from ryu.ofproto import ofproto_v1_0
-from ryu.ofproto import nx_match
 
 from ryu.controller import ofp_event
+from ryu.controller import pktin_capture
+from ryu.controller import worker
 from ryu.controller.handler import HANDSHAKE_DISPATCHER, DEAD_DISPATCHER
+from ryu.controller.handler import PRIORITY_HIGH
 
 from ryu.lib.dpid import dpid_to_str
 from ryu.lib import ip
@@ -53,6 +58,8 @@ LOG = logging.getLogger('ryu.controller.controller')
 
 DEFAULT_OFP_HOST = '0.0.0.0'
 DEFAULT_OFP_SW_CON_INTERVAL = 1
+DEFAULT_RECV_BUF_SIZE = 0x10000
+DEFAULT_DISPATCH_BACKLOG_SIZE = 0x10000
 
 CONF = cfg.CONF
 CONF.register_cli_opts([
@@ -86,10 +93,54 @@ CONF.register_opts([
     cfg.IntOpt('maximum-unreplied-echo-requests',
                default=0,
                min=0,
-               help='Maximum number of unreplied echo requests before datapath is disconnected.')
+               help='Maximum number of unreplied echo requests before datapath is disconnected.'),
+    cfg.IntOpt('ofp-send-queue-size',
+               default=16,
+               min=1,
+               help='Maximum number of messages queued to send to a datapath.'),
+    cfg.BoolOpt('ofp-lazy-decode',
+                default=False,
+                help='Decode bodies and matches of received messages on first access.'),
+    cfg.IntOpt('ofp-send-batch-bytes',
+               default=0x10000,
+               min=1,
+               help='Maximum number of bytes of queued messages sent to a datapath at once.'),
+    cfg.IntOpt('ofp-capture-size',
+               default=0,
+               min=0,
+               help='Number of the latest packet-ins kept in memory for diagnostics, 0 to disable.'),
+    cfg.IntOpt('ofp-capture-sample',
+               default=1,
+               min=1,
+               help='Keep only one of every this many packet-ins in the capture.'),
+    cfg.IntOpt('ofp-capture-snaplen',
+               default=65535,
+               min=1,
+               help='Maximum number of bytes of a packet dumped from the capture.'),
+    cfg.IntOpt('ofp-capture-trigger-rate',
+               default=0,
+               min=0,
+               help='Dump the capture when this many packet-ins are received in a second, 0 to disable.'),
+    cfg.StrOpt('ofp-capture-dir',
+               default=None,
+               help='Directory of the capture files dumped by the trigger rate.')
 ])
 
 
+# the same in all the OpenFlow versions
+_OFPT_PACKET_IN = ofproto_v1_0.OFPT_PACKET_IN
+
+# Datapaths being served, for the metrics endpoint
+_active_datapaths = set()
+
+
+def active_datapaths():
+    """
+    Returns a list of the Datapath instances currently connected.
+    """
+    return list(_active_datapaths)
+
+
 def _split_addr(addr):
     """
     Splits a str of IP address and port pair into (host, port).
@@ -143,10 +194,21 @@ class OpenFlowController(object):
         # }
         self._clients = {}
 
+        if CONF.ofp_capture_size:
+            pktin_capture.enable(
+                size=CONF.ofp_capture_size,
+                sample=CONF.ofp_capture_sample,
+                snaplen=CONF.ofp_capture_snaplen,
+                trigger_rate=CONF.ofp_capture_trigger_rate,
+                dump_dir=CONF.ofp_capture_dir)
+
     # entry point
     def __call__(self):
         # LOG.debug('call')
-        for address in CONF.ofp_switch_address_list:
+        for i, address in enumerate(CONF.ofp_switch_address_list):
+            # With multiple workers, each address is connected by only one.
+            if not worker.owns(i):
+                continue
             addr = tuple(_split_addr(address))
             self.spawn_client_loop(addr)
 
@@ -165,6 +227,9 @@ class OpenFlowController(object):
             client.stop()
 
     def server_loop(self, ofp_tcp_listen_port, ofp_ssl_listen_port):
+        # All the workers listen on the same port and the kernel
+        # distributes the switch connections among them.
+        reuse_port = True if worker.is_enabled() else None
         if CONF.ctl_privkey is not None and CONF.ctl_cert is not None:
             if not hasattr(ssl, 'SSLContext'):
                 # anything less than python 2.7.9 supports only TLSv1
@@ -193,17 +258,20 @@ class OpenFlowController(object):
                                       keyfile=CONF.ctl_privkey,
                                       certfile=CONF.ctl_cert,
                                       cert_reqs=ssl.CERT_REQUIRED,
-                                      ca_certs=CONF.ca_certs, **ssl_args)
+                                      ca_certs=CONF.ca_certs,
+                                      reuse_port=reuse_port, **ssl_args)
             else:
                 server = StreamServer((CONF.ofp_listen_host,
                                        ofp_ssl_listen_port),
                                       datapath_connection_factory,
                                       keyfile=CONF.ctl_privkey,
-                                      certfile=CONF.ctl_cert, **ssl_args)
+                                      certfile=CONF.ctl_cert,
+                                      reuse_port=reuse_port, **ssl_args)
         else:
             server = StreamServer((CONF.ofp_listen_host,
                                    ofp_tcp_listen_port),
-                                  datapath_connection_factory)
+                                  datapath_connection_factory,
+                                  reuse_port=reuse_port)
 
         # LOG.debug('loop')
         server.serve_forever()
@@ -222,6 +290,166 @@ def _deactivate(method):
     return deactivate
 
 
+class RequestFuture(object):
+    """
+    The pending reply to a request sent by Datapath.send_request().
+
+    The future resolves with the reply message, or for a multipart
+    (stats) reply, with the body reassembled from all the parts sent
+    with the REPLY_MORE flag: the lists of the parts are concatenated and
+    a single-object body is returned as is.  An error message with the
+    xid of the request fails the future with OFPErrorReply.
+
+    ``replies`` holds the reply messages received so far.
+    """
+
+    def __init__(self, datapath, xid):
+        self.datapath = datapath
+        self.xid = xid
+        self.replies = []
+        self._event = hub.Event()
+        self._result = None
+        self._multipart = False
+        self._exception = None
+        self._callbacks = []
+        self._timer = None
+
+    def done(self):
+        return self._event.is_set()
+
+    def wait(self, timeout=None):
+        """
+        Wait up to timeout seconds for the future to be resolved.
+        Returns True if it is done.
+        """
+        return self._event.wait(timeout)
+
+    def result(self, timeout=None):
+        """
+        Returns the result, raising the exception the request failed
+        with.  Raises OFPRequestTimeout if the future is not done in
+        timeout seconds; the request is still pending then.
+        """
+        if not self.wait(timeout):
+            raise exception.OFPRequestTimeout(xid=self.xid, timeout=timeout)
+        if self._exception is not None:
+            raise self._exception
+        if self._multipart:
+            self._result = self._reassemble()
+            self._multipart = False
+        return self._result
+
+    def exception(self, timeout=None):
+        if not self.wait(timeout):
+            raise exception.OFPRequestTimeout(xid=self.xid, timeout=timeout)
+        return self._exception
+
+    def add_done_callback(self, fn):
+        """
+        Call fn(future) once the future is done, immediately if it
+        already is.
+        """
+        if self.done():
+            fn(self)
+        else:
+            self._callbacks.append(fn)
+
+    def cancel(self):
+        """
+        Stop waiting for the reply.  Returns False if already done.
+        """
+        if self.done():
+            return False
+        self._set_exception(exception.OFPRequestCancelled(xid=self.xid))
+        return True
+
+    def _add_reply(self, msg):
+        ofp = self.datapath.ofproto
+        if msg.msg_type == ofp.OFPT_ERROR:
+            self._set_exception(exception.OFPErrorReply(msg))
+            return
+        self.replies.append(msg)
+        mp_type = getattr(ofp, 'OFPT_MULTIPART_REPLY', None)
+        if mp_type is None:
+            mp_type = ofp.OFPT_STATS_REPLY
+        if msg.msg_type != mp_type:
+            self._set_result(msg)
+            return
+        more = getattr(ofp, 'OFPMPF_REPLY_MORE', None)
+        if more is None:
+            more = ofp.OFPSF_REPLY_MORE
+        if msg.flags & more:
+            return
+        # the body is reassembled on demand, so that the bodies of the
+        # replies are not decoded (cf. set_lazy_decode) for the callers
+        # which only look at the replies
+        self._multipart = True
+        self._finish()
+
+    def _reassemble(self):
+        if len(self.replies) == 1:
+            return self.replies[0].body
+        body = []
+        for reply in self.replies:
+            if isinstance(reply.body, list):
+                body.extend(reply.body)
+            else:
+                body.append(reply.body)
+        return body
+
+    def _expire(self, timeout):
+        self._timer = None
+        if not self.done():
+            self._set_exception(exception.OFPRequestTimeout(
+                xid=self.xid, timeout=timeout))
+
+    def _set_result(self, result):
+        self._result = result
+        self._finish()
+
+    def _set_exception(self, exc):
+        self._exception = exc
+        self._finish()
+
+    def _finish(self):
+        self._event.set()
+        if self._timer is not None:
+            hub.kill(self._timer)
+            self._timer = None
+        callbacks, self._callbacks = self._callbacks, []
+        for fn in callbacks:
+            try:
+                fn(self)
+            except Exception:
+                LOG.exception('Exception in the done callback of xid %s',
+                              self.xid)
+
+
+def gather(requests, timeout=None):
+    """
+    Send requests, possibly to many datapaths, and wait for all of them.
+
+    requests is an iterable of request messages, which are sent with
+    msg.datapath.send_request(msg, timeout), or of RequestFuture
+    instances already sent.  Returns the list of the results in the order
+    of requests, with the exception in place of the result of a request
+    which failed, e.g. OFPRequestTimeout if it has not completed in
+    its deadline.
+    """
+    futures = []
+    for req in requests:
+        if not isinstance(req, RequestFuture):
+            req = req.datapath.send_request(req, timeout=timeout)
+        futures.append(req)
+
+    results = []
+    for future in futures:
+        future.wait()
+        exc = future.exception()
+        results.append(future.result() if exc is None else exc)
+    return results
+
+
 class Datapath(ofproto_protocol.ProtocolDesc):
     """
     A class to describe an OpenFlow switch connected to this controller.
@@ -268,6 +496,9 @@ class Datapath(ofproto_protocol.ProtocolDesc):
     send_delete_all_flows                deprecated
     send_barrier                         Queue an OpenFlow barrier message to
                                          send to the switch.
+    send_request(self, msg, timeout)     Queue a request message and return
+                                         a RequestFuture resolving with the
+                                         reply.
     send_nxt_set_flow_format             deprecated
     is_reserved_port                     deprecated
     ==================================== ======================================
@@ -281,17 +512,38 @@ class Datapath(ofproto_protocol.ProtocolDesc):
         self.socket.settimeout(CONF.socket_timeout)
         self.address = address
         self.is_active = True
-
-        # The limit is arbitrary. We need to limit queue size to
-        # prevent it from eating memory up.
-        self.send_q = hub.Queue(16)
+        self.recv_buf_size = DEFAULT_RECV_BUF_SIZE
+        # Received events waiting for room in the event queues of the
+        # applications, as [ev, state, observers]; see _dispatch().
+        self._backlog = collections.deque()
+        self._backlog_room = hub.Event()
+        self._backlog_thr = None
+        self.dispatch_backlog_size = DEFAULT_DISPATCH_BACKLOG_SIZE
+
+        # We need to limit queue size to prevent it from eating memory up.
+        self.send_q = hub.Queue(CONF.ofp_send_queue_size)
         self._send_q_sem = hub.BoundedSemaphore(self.send_q.maxsize)
+        self.send_batch_bytes = CONF.ofp_send_batch_bytes
+        # Counters of _send_loop for tuning:
+        #   bytes, msgs: sent so far
+        #   flushes: number of writes to the socket
+        #   max_flush_msgs, max_flush_bytes: largest write
+        #   queue_full: number of send() calls which blocked on a full queue
+        self.send_stats = dict.fromkeys(
+            ['bytes', 'msgs', 'flushes', 'max_flush_msgs',
+             'max_flush_bytes', 'queue_full'], 0)
+        # Counters by OpenFlow message type:
+        #   msg_type -> [messages, bytes] received or sent so far
+        self.rx_stats = {}
+        self.tx_stats = {}
+        self.connected_at = time.time()
 
         self.echo_request_interval = CONF.echo_request_interval
         self.max_unreplied_echo_requests = CONF.maximum_unreplied_echo_requests
         self.unreplied_echo_requests = []
 
         self.xid = random.randint(0, self.ofproto.MAX_XID)
+        self._requests = {}  # xid -> RequestFuture waiting for the reply
         self.id = None  # datapath_id is unknown yet
         self._ports = None
         self.flow_format = ofproto_v1_0.NXFF_OPENFLOW10
@@ -323,16 +575,20 @@ class Datapath(ofproto_protocol.ProtocolDesc):
     # Low level socket handling layer
     @_deactivate
     def _recv_loop(self):
-        buf = bytearray()
+        # Received data is kept in a buffer allocated once per connection
+        # and filled with recv_into().  buf[start:end] is not parsed yet.
+        # Messages are framed by offsets, so only the message handed to
+        # the parser is copied; the buffer is compacted or grown only
+        # when the pending message does not fit behind start.
+        buf = bytearray(self.recv_buf_size)
+        view = memoryview(buf)
+        start = end = 0
         count = 0
-        min_read_len = remaining_read_len = ofproto_common.OFP_HEADER_SIZE
+        min_read_len = ofproto_common.OFP_HEADER_SIZE
 
         while self.state != DEAD_DISPATCHER:
             try:
-                read_len = min_read_len
-                if remaining_read_len > min_read_len:
-                    read_len = remaining_read_len
-                ret = self.socket.recv(read_len)
+                ret = self.socket.recv_into(view[end:])
             except SocketTimeout:
                 continue
             except ssl.SSLError:
@@ -345,39 +601,46 @@ class Datapath(ofproto_protocol.ProtocolDesc):
             if not ret:
                 break
 
-            buf += ret
-            buf_len = len(buf)
-            while buf_len >= min_read_len:
-                (version, msg_type, msg_len, xid) = ofproto_parser.header(buf)
+            end += ret
+            msg_len = min_read_len
+            while end - start >= min_read_len:
+                (version, msg_type, msg_len, xid) = ofproto_parser.header(
+                    buf, start)
                 if msg_len < min_read_len:
                     # Someone isn't playing nicely; log it, and try something sane.
                     LOG.debug("Message with invalid length %s received from switch at address %s",
                               msg_len, self.address)
                     msg_len = min_read_len
-                if buf_len < msg_len:
-                    remaining_read_len = (msg_len - buf_len)
+                if end - start < msg_len:
                     break
 
+                stats = self.rx_stats.get(msg_type)
+                if stats is None:
+                    stats = self.rx_stats[msg_type] = [0, 0]
+                stats[0] += 1
+                stats[1] += msg_len
+
+                # The message outlives this read as it is queued to the
+                # applications, so it is the one copy we need.
                 msg = ofproto_parser.msg(
-                    self, version, msg_type, msg_len, xid, buf[:msg_len])
+                    self, version, msg_type, msg_len, xid,
+                    bytes(view[start:start + msg_len]))
                 # LOG.debug('queue msg %s cls %s', msg, msg.__class__)
+                if msg_type == _OFPT_PACKET_IN and msg:
+                    capture = pktin_capture.get_capture()
+                    if capture is not None:
+                        capture.add(self, msg)
                 if msg:
                     ev = ofp_event.ofp_msg_to_ev(msg)
                     if self.ofp_brick is not None:
-                        self.ofp_brick.send_event_to_observers(ev, self.state)
-
-                        def dispatchers(x):
-                            return x.callers[ev.__class__].dispatchers
-
-                        handlers = [handler for handler in
-                                    self.ofp_brick.get_handlers(ev) if
-                                    self.state in dispatchers(handler)]
-                        for handler in handlers:
-                            handler(ev)
+                        self._dispatch(ev)
+                    if self._requests:
+                        future = self._requests.get(xid)
+                        if future is not None:
+                            future._add_reply(msg)
 
-                buf = buf[msg_len:]
-                buf_len = len(buf)
-                remaining_read_len = min_read_len
+                start += msg_len
+                msg_len = min_read_len
 
                 # We need to schedule other greenlets. Otherwise, ryu
                 # can't accept new switches or handle the existing
@@ -388,12 +651,110 @@ class Datapath(ofproto_protocol.ProtocolDesc):
                     count = 0
                     hub.sleep(0)
 
+            if start == end:
+                start = end = 0
+            elif start + msg_len > len(buf):
+                pending = bytes(view[start:end])
+                if msg_len > len(buf):
+                    view.release()
+                    buf = bytearray(msg_len)
+                    view = memoryview(buf)
+                buf[:len(pending)] = pending
+                start, end = 0, len(pending)
+
+    def _dispatch(self, ev):
+        # Sends ev to the observers of ofp_brick and calls its handlers,
+        # without blocking the receive loop on the full event queue of a
+        # slow application: ev then waits in _backlog, which
+        # _drain_backlog() sends in order, and so do the events received
+        # after it.  Only the events of PRIORITY_HIGH for ofp_brick, e.g.
+        # echo replies and port status whose handlers it declares so, are
+        # not held behind the backlog, so echo replies are acknowledged
+        # in time whatever the applications are busy with.  The receive
+        # loop waits only when dispatch_backlog_size events are waiting.
+        brick = self.ofp_brick
+        if (self._backlog and
+                brick._get_event_priority(ev) != PRIORITY_HIGH):
+            self._hold(ev, None, None)
+            return
+        state = self.state
+        full = brick._send_event_to_observers_nowait(ev, state)
+        if full:
+            self._hold(ev, state, full)
+            return
+        for handler in brick.get_handlers(ev, self.state):
+            handler(ev)
+
+    def _hold(self, ev, state, observers):
+        while len(self._backlog) >= self.dispatch_backlog_size:
+            self._backlog_room.clear()
+            self._backlog_room.wait()
+        self._backlog.append([ev, state, observers])
+        if self._backlog_thr is None:
+            self._backlog_thr = hub.spawn(self._drain_backlog)
+
+    def _drain_backlog(self):
+        brick = self.ofp_brick
+        backlog = self._backlog
+        try:
+            while backlog:
+                ev, state, observers = backlog[0]
+                if observers is None:
+                    brick.send_event_to_observers(ev, self.state)
+                else:
+                    # the observers which had no room when received
+                    for observer in observers:
+                        brick.send_event(observer, ev, state)
+                for handler in brick.get_handlers(ev, self.state):
+                    handler(ev)
+                backlog.popleft()
+                self._backlog_room.set()
+        finally:
+            self._backlog_thr = None
+
+    def _flush(self, bufs):
+        # Green and SSL sockets have no cooperative sendmsg(), so the
+        # batch is joined and written with a single sendall().
+        if len(bufs) == 1:
+            data = bufs[0]
+        else:
+            data = b''.join(bufs)
+        self.socket.sendall(data)
+
+        stats = self.send_stats
+        stats['bytes'] += len(data)
+        stats['msgs'] += len(bufs)
+        stats['flushes'] += 1
+        stats['max_flush_msgs'] = max(stats['max_flush_msgs'], len(bufs))
+        stats['max_flush_bytes'] = max(stats['max_flush_bytes'], len(data))
+
+        tx_stats = self.tx_stats
+        for buf in bufs:
+            if len(buf) < ofproto_common.OFP_HEADER_SIZE:
+                continue
+            msg_type = ofproto_parser.header(buf)[1]
+            stats = tx_stats.get(msg_type)
+            if stats is None:
+                stats = tx_stats[msg_type] = [0, 0]
+            stats[0] += 1
+            stats[1] += len(buf)
+
     def _send_loop(self):
         try:
             while self.state != DEAD_DISPATCHER:
                 buf, close_socket = self.send_q.get()
                 self._send_q_sem.release()
-                self.socket.sendall(buf)
+                # Coalesce every message already queued, up to
+                # send_batch_bytes, into one write.
+                bufs = [buf]
+                size = len(buf)
+                while (not close_socket and size < self.send_batch_bytes
+                       and not self.send_q.empty()):
+                    buf, close_socket = self.send_q.get(block=False)
+                    self._send_q_sem.release()
+                    bufs.append(buf)
+                    size += len(buf)
+                self._flush(bufs)
                 if close_socket:
                     break
         except SocketTimeout:
@@ -420,7 +781,9 @@ class Datapath(ofproto_protocol.ProtocolDesc):
 
     def send(self, buf, close_socket=False):
         msg_enqueued = False
-        self._send_q_sem.acquire()
+        if not self._send_q_sem.acquire(blocking=False):
+            self.send_stats['queue_full'] += 1
+            self._send_q_sem.acquire()
         if self.send_q:
             self.send_q.put((buf, close_socket))
             msg_enqueued = True
@@ -445,6 +808,30 @@ class Datapath(ofproto_protocol.ProtocolDesc):
         # LOG.debug('send_msg %s', msg)
         return self.send(msg.buf, close_socket=close_socket)
 
+    def send_request(self, msg, timeout=None):
+        """
+        Send a request message and return a RequestFuture which resolves
+        with its reply.
+
+        msg is given a new xid.  If timeout is given, the future fails
+        with OFPRequestTimeout when the reply is not complete in timeout
+        seconds.  The reply is delivered to the event handlers as well.
+        """
+        self.set_xid(msg)
+        future = RequestFuture(self, msg.xid)
+        self._requests[msg.xid] = future
+        future.add_done_callback(self._request_done)
+        if not self.send_msg(msg):
+            future._set_exception(exception.OFPDatapathDisconnected(
+                dpid=self.id, xid=msg.xid))
+        elif timeout is not None:
+            future._timer = hub.spawn_after(timeout, future._expire, timeout)
+        return future
+
+    def _request_done(self, future):
+        if self._requests.get(future.xid) is future:
+            del self._requests[future.xid]
+
     def _echo_request_loop(self):
         if not self.max_unreplied_echo_requests:
             return
@@ -471,9 +858,18 @@ class Datapath(ofproto_protocol.ProtocolDesc):
 
         echo_thr = hub.spawn(self._echo_request_loop)
 
+        _active_datapaths.add(self)
         try:
             self._recv_loop()
         finally:
+            # the applications see the events received before the
+            # disconnection first.
+            if self._backlog_thr is not None:
+                hub.joinall([self._backlog_thr])
+            _active_datapaths.discard(self)
+            for future in list(self._requests.values()):
+                future._set_exception(exception.OFPDatapathDisconnected(
+                    dpid=self.id, xid=future.xid))
             hub.kill(send_thr)
             hub.kill(echo_thr)
             hub.joinall([send_thr, echo_thr])
@@ -521,6 +917,8 @@ class Datapath(ofproto_protocol.ProtocolDesc):
                            out_port=out_port)
 
     def send_delete_all_flows(self):
+        # OpenFlow 1.0 only, nx_match is not imported unless it is used
+        from ryu.ofproto import nx_match
         rule = nx_match.ClsRule()
         self.send_flow_mod(
             rule=rule, cookie=0, command=self.ofproto.OFPFC_DELETE,
@@ -15,13 +15,25 @@
 # limitations under the License.
 
 
+# Priorities of events in the event queue of RyuApp
+PRIORITY_HIGH = 'high'
+PRIORITY_NORMAL = 'normal'
+
+
 class EventBase(object):
     """
     The base of all event classes.
 
     A Ryu application can define its own event type by creating a subclass.
+
+    event_priority is the priority of the event in the event queues of
+    applications, PRIORITY_NORMAL by default.  A subclass sets it to
+    PRIORITY_HIGH for control-critical events which should be handled
+    ahead of bulk events.  Cf. set_ev_cls.
     """
 
+    event_priority = PRIORITY_NORMAL
+
     def __init__(self):
         super(EventBase, self).__init__()
 
@@ -18,6 +18,8 @@ import inspect
 import logging
 import sys
 
+from ryu.controller.event import PRIORITY_HIGH, PRIORITY_NORMAL
+
 LOG = logging.getLogger('ryu.controller.handler')
 
 # just represent OF datapath state. datapath specific so should be moved.
@@ -31,7 +33,7 @@ class _Caller(object):
     """Describe how to handle an event class.
     """
 
-    def __init__(self, dispatchers, ev_source):
+    def __init__(self, dispatchers, ev_source, batch=False, priority=None):
         """Initialize _Caller.
 
         :param dispatchers: A list of states or a state, in which this
@@ -40,13 +42,20 @@ class _Caller(object):
         :param ev_source: The module which generates the event.
                           ev_cls.__module__ for set_ev_cls.
                           None for set_ev_handler.
+        :param batch: True if the handler takes a list of events.
+        :param priority: PRIORITY_HIGH or PRIORITY_NORMAL to override
+                         the priority of the event class.
+                         None means the event's own event_priority.
         """
+        assert priority in (None, PRIORITY_HIGH, PRIORITY_NORMAL)
         self.dispatchers = dispatchers
         self.ev_source = ev_source
+        self.batch = batch
+        self.priority = priority
 
 
 # should be named something like 'observe_event'
-def set_ev_cls(ev_cls, dispatchers=None):
+def set_ev_cls(ev_cls, dispatchers=None, batch=False, priority=None):
     """
     A decorator for Ryu application to declare an event handler.
 
@@ -73,22 +82,32 @@ def set_ev_cls(ev_cls, dispatchers=None):
                                                 disconnecting due to some
                                                 unrecoverable errors.
     =========================================== ===============================
+
+    If batch is True, the handler is called with a list of the events
+    of ev_cls which the event loop took from the queue at once, instead
+    of one call per event.  Cf. RyuApp._EVENT_BATCH_SIZE.
+
+    priority overrides the event_priority of the events of ev_cls in the
+    event queue of this RyuApp.  Events of PRIORITY_HIGH are handled
+    ahead of the queued events of PRIORITY_NORMAL.
     """
     def _set_ev_cls_dec(handler):
         if 'callers' not in dir(handler):
             handler.callers = {}
         for e in _listify(ev_cls):
-            handler.callers[e] = _Caller(_listify(dispatchers), e.__module__)
+            handler.callers[e] = _Caller(_listify(dispatchers), e.__module__,
+                                         batch, priority)
         return handler
     return _set_ev_cls_dec
 
 
-def set_ev_handler(ev_cls, dispatchers=None):
+def set_ev_handler(ev_cls, dispatchers=None, priority=None):
     def _set_ev_cls_dec(handler):
         if 'callers' not in dir(handler):
             handler.callers = {}
         for e in _listify(ev_cls):
-            handler.callers[e] = _Caller(_listify(dispatchers), None)
+            handler.callers[e] = _Caller(_listify(dispatchers), None,
+                                         priority=priority)
         return handler
     return _set_ev_cls_dec
 
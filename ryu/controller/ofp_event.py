@@ -19,10 +19,13 @@ OpenFlow event definitions.
 """
 
 import inspect
+import re
+import sys
 import time
 
 from ryu.controller import handler
 from ryu import ofproto
+from ryu.ofproto import ofproto_protocol
 from . import event
 
 
@@ -74,7 +77,31 @@ def ofp_msg_to_ev(msg):
 
 def ofp_msg_to_ev_cls(msg_cls):
     name = _ofp_msg_name_to_ev_name(msg_cls.__name__)
-    return _OFP_MSG_EVENTS[name]
+    ev_cls = _OFP_MSG_EVENTS.get(name)
+    if ev_cls is None:
+        ev_cls = _create_ofp_msg_ev_class(msg_cls)
+    return ev_cls
+
+
+# ether_types.ETH_TYPE_LLDP, ryu.lib.packet is not imported here as it
+# imports all the protocols
+_LLDP_ETH_TYPE = b'\x88\xcc'
+
+
+def _packet_in_priority(self):
+    # LLDP, which detects the link failures, is control-critical.
+    if self.msg.data[12:14] == _LLDP_ETH_TYPE:
+        return event.PRIORITY_HIGH
+    return event.PRIORITY_NORMAL
+
+
+# event_priority of the control-critical events
+_OFP_MSG_EV_PRIORITIES = {
+    'EventOFPEchoRequest': event.PRIORITY_HIGH,
+    'EventOFPEchoReply': event.PRIORITY_HIGH,
+    'EventOFPPortStatus': event.PRIORITY_HIGH,
+    'EventOFPPacketIn': property(_packet_in_priority),
+}
 
 
 def _create_ofp_msg_ev_class(msg_cls):
@@ -82,13 +109,16 @@ def _create_ofp_msg_ev_class(msg_cls):
     # print 'creating ofp_event %s' % name
 
     if name in _OFP_MSG_EVENTS:
-        return
+        return _OFP_MSG_EVENTS[name]
 
-    cls = type(name, (EventOFPMsgBase,),
-               dict(__init__=lambda self, msg:
-                    super(self.__class__, self).__init__(msg)))
+    attrs = dict(__init__=lambda self, msg:
+                 super(self.__class__, self).__init__(msg))
+    if name in _OFP_MSG_EV_PRIORITIES:
+        attrs['event_priority'] = _OFP_MSG_EV_PRIORITIES[name]
+    cls = type(name, (EventOFPMsgBase,), attrs)
     globals()[name] = cls
     _OFP_MSG_EVENTS[name] = cls
+    return cls
 
 
 def _create_ofp_msg_ev_from_module(ofp_parser):
@@ -99,10 +129,60 @@ def _create_ofp_msg_ev_from_module(ofp_parser):
         _create_ofp_msg_ev_class(cls)
 
 
-for ofp_mods in ofproto.get_ofp_modules().values():
-    ofp_parser = ofp_mods[1]
-    # print 'loading module %s' % ofp_parser
-    _create_ofp_msg_ev_from_module(ofp_parser)
+def _ofp_versions_to_search():
+    # the versions already imported first, then those whose constants
+    # module is imported, e.g. by the apps declaring OFP_VERSIONS, so that
+    # an event of a message common to every version does not import all
+    # the parser modules.
+    ofp_modules = ofproto.get_ofp_modules()
+    loaded = ofp_modules.loaded()
+    imported = [version for version, mods in
+                ofproto_protocol._VERSION_MODULES.items()
+                if 'ryu.ofproto.' + mods[0] in sys.modules]
+    others = sorted(ofp_modules, reverse=True)
+    versions = []
+    for version in loaded + sorted(imported, reverse=True) + others:
+        if version not in versions:
+            versions.append(version)
+    return versions
+
+
+# the names of the message classes of the parsers, e.g. OFPPacketIn or
+# NXTPacketIn
+_OFP_MSG_NAME_RE = re.compile(r'(OFP|NX|Nicira|ONF)[A-Za-z0-9]+$')
+
+
+def _find_ofp_msg_ev_class(name):
+    msg_name = name[len(_ofp_msg_name_to_ev_name('')):]
+    for version in _ofp_versions_to_search():
+        ofp_parser = ofproto.get_ofp_module(version)[1]
+        msg_cls = getattr(ofp_parser, msg_name, None)
+        if inspect.isclass(msg_cls) and hasattr(msg_cls, 'cls_msg_type'):
+            return _create_ofp_msg_ev_class(msg_cls)
+    return None
+
+
+def __getattr__(name):
+    # The event classes are created on the first reference (PEP 562)
+    # rather than for every message of every version on import.
+    # The other names, e.g. looked up by hasattr() or introspection, are
+    # not searched for in the parser modules, which would import them all.
+    ev_cls = None
+    prefix = _ofp_msg_name_to_ev_name('')
+    if name.startswith(prefix) and \
+            _OFP_MSG_NAME_RE.match(name[len(prefix):]):
+        ev_cls = _find_ofp_msg_ev_class(name)
+    if ev_cls is None:
+        raise AttributeError("module '%s' has no attribute '%s'" %
+                             (__name__, name))
+    return ev_cls
+
+
+if sys.version_info < (3, 7):
+    # no module __getattr__
+    for ofp_mods in ofproto.get_ofp_modules().values():
+        ofp_parser = ofp_mods[1]
+        _create_ofp_msg_ev_from_module(ofp_parser)
 
 
 class EventOFPStateChange(event.EventBase):
@@ -142,6 +222,8 @@ class EventOFPPortStateChange(event.EventBase):
     ========= =================================================================
     """
 
+    event_priority = event.PRIORITY_HIGH
+
     def __init__(self, dp, reason, port_no):
         super(EventOFPPortStateChange, self).__init__()
         self.datapath = dp
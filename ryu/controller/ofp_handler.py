@@ -29,6 +29,7 @@ from ryu import utils
 from ryu.controller import ofp_event
 from ryu.controller.controller import OpenFlowController
 from ryu.controller.handler import set_ev_handler
+from ryu.controller.handler import PRIORITY_HIGH
 from ryu.controller.handler import HANDSHAKE_DISPATCHER, CONFIG_DISPATCHER,\
     MAIN_DISPATCHER
 from ryu.ofproto import ofproto_parser
@@ -56,6 +57,7 @@ class OFPHandler(ryu.base.app_manager.RyuApp):
 
     def start(self):
         super(OFPHandler, self).start()
+        ofproto_parser.set_lazy_decode(self.CONF.ofp_lazy_decode)
         self.controller = OpenFlowController()
         return hub.spawn(self.controller)
 
@@ -231,8 +233,12 @@ class OFPHandler(ryu.base.app_manager.RyuApp):
         self.logger.debug('move onto main mode')
         ev.msg.datapath.set_state(MAIN_DISPATCHER)
 
+    # The handlers of PRIORITY_HIGH are called by Datapath as it receives
+    # the message, ahead of the events waiting for room in the event
+    # queues of the applications.
     @set_ev_handler(ofp_event.EventOFPEchoRequest,
-                    [HANDSHAKE_DISPATCHER, CONFIG_DISPATCHER, MAIN_DISPATCHER])
+                    [HANDSHAKE_DISPATCHER, CONFIG_DISPATCHER, MAIN_DISPATCHER],
+                    priority=PRIORITY_HIGH)
     def echo_request_handler(self, ev):
         msg = ev.msg
         datapath = msg.datapath
@@ -242,13 +248,15 @@ class OFPHandler(ryu.base.app_manager.RyuApp):
         datapath.send_msg(echo_reply)
 
     @set_ev_handler(ofp_event.EventOFPEchoReply,
-                    [HANDSHAKE_DISPATCHER, CONFIG_DISPATCHER, MAIN_DISPATCHER])
+                    [HANDSHAKE_DISPATCHER, CONFIG_DISPATCHER, MAIN_DISPATCHER],
+                    priority=PRIORITY_HIGH)
     def echo_reply_handler(self, ev):
         msg = ev.msg
         datapath = msg.datapath
         datapath.acknowledge_echo_reply(msg.xid)
 
-    @set_ev_handler(ofp_event.EventOFPPortStatus, MAIN_DISPATCHER)
+    @set_ev_handler(ofp_event.EventOFPPortStatus, MAIN_DISPATCHER,
+                    priority=PRIORITY_HIGH)
     def port_status_handler(self, ev):
         msg = ev.msg
         datapath = msg.datapath
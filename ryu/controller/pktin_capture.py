@@ -0,0 +1,206 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Capture of the latest packet-in messages for diagnostics.
+
+When enabled, Datapath keeps the packet-in messages it receives from
+all the datapaths in a bounded ring, which is dumped to a pcapng file on
+demand, e.g. by the REST server at /capture, or when the rate of
+packet-ins exceeds a threshold.  Every packet is written with the
+datapath and port it was received on as its interface, and with a
+comment of its metadata, e.g.::
+
+    dpid=0000000000000001 in_port=3 reason=0 table_id=0 buffer_id=-1
+
+Enable it with --ofp-capture-size, or with enable() from an application.
+Capturing a packet-in costs appending the message to the ring: the
+packet data are not copied, the messages are immutable once received,
+and their metadata are only looked at when dumped.
+"""
+
+import collections
+import logging
+import os
+import tempfile
+import time
+
+from ryu.lib import dpid as dpid_lib
+from ryu.lib import hub
+from ryu.lib import pcaplib
+
+LOG = logging.getLogger('ryu.controller.pktin_capture')
+
+_capture = None
+
+
+class PacketInCapture(object):
+    """
+    Bounded ring of the latest packet-in messages.
+
+    ================ ==================================================
+    Argument         Description
+    ================ ==================================================
+    size             Max number of packet-ins kept, the oldest ones are
+                     dropped
+    sample           Only one of every *sample* packet-ins is kept
+    filter_          A callable of the packet data returning False to
+                     skip a packet-in, e.g. the filter_data() method of
+                     ofp_pktinfilter.MatchFilter
+    snaplen          Max length of the packets written (in octets)
+    trigger_rate     If not 0, the ring is dumped when this many
+                     packet-ins are received in a second
+    trigger_interval Min seconds between two dumps by trigger_rate
+    dump_dir         Directory of the files dumped by trigger()
+    ================ ==================================================
+    """
+
+    def __init__(self, size=4096, sample=1, filter_=None, snaplen=65535,
+                 trigger_rate=0, trigger_interval=60.0, dump_dir=None):
+        self.sample = sample
+        self.filter = filter_
+        self.snaplen = snaplen
+        self.trigger_rate = trigger_rate
+        self.trigger_interval = trigger_interval
+        self.dump_dir = dump_dir or tempfile.gettempdir()
+        # (receive time, dpid, msg)
+        self._ring = collections.deque(maxlen=size)
+        # the number of packet-ins seen, including those not kept
+        self.received = 0
+        self._window_start = 0
+        self._window_received = 0
+        self._triggered_at = None
+
+    def __len__(self):
+        return len(self._ring)
+
+    def add(self, datapath, msg):
+        """
+        Captures the packet-in message msg received from datapath.
+        """
+        self.received += 1
+        now = time.time()
+        if (self.sample == 1 or not self.received % self.sample) and \
+                (self.filter is None or self.filter(msg.data)):
+            self._ring.append((now, datapath.id, msg))
+        if self.trigger_rate:
+            self._count(now)
+
+    def _count(self, now):
+        if now - self._window_start >= 1:
+            self._window_start = now
+            self._window_received = 0
+        self._window_received += 1
+        if self._window_received != self.trigger_rate:
+            return
+        if self._triggered_at is not None and \
+                now - self._triggered_at < self.trigger_interval:
+            return
+        self._triggered_at = now
+        LOG.warning('%d packet-ins in a second, dumping the capture',
+                    self._window_received)
+        self.trigger()
+
+    def trigger(self):
+        """
+        Dumps the ring to a new file in dump_dir in the background and
+        returns the path of the file.
+        """
+        path = os.path.join(
+            self.dump_dir,
+            'packet-in-%s.pcapng' % time.strftime('%Y%m%d-%H%M%S'))
+        # the packet-ins received after now are not dumped
+        records = list(self._ring)
+        hub.spawn(self._dump_file, path, records)
+        return path
+
+    def _dump_file(self, path, records):
+        try:
+            with open(path, 'wb') as f:
+                self._dump(f, records)
+        except (IOError, OSError) as e:
+            LOG.error('failed to dump the capture to %s: %s', path, e)
+        else:
+            LOG.info('dumped %d packet-ins to %s', len(records), path)
+
+    def clear(self):
+        self._ring.clear()
+
+    def dump(self, file_obj):
+        """
+        Writes the packet-ins in the ring to the file object in binary
+        mode in the pcapng format.
+        """
+        self._dump(file_obj, list(self._ring))
+
+    def _dump(self, file_obj, records):
+        writer = pcaplib.PcapngWriter(file_obj, snaplen=self.snaplen)
+        interfaces = {}  # (dpid, in_port): interface ID
+        for ts, dpid, msg in records:
+            in_port = _in_port(msg)
+            interface_id = interfaces.get((dpid, in_port))
+            if interface_id is None:
+                interface_id = writer.add_interface(
+                    'dpid=%s port=%s' % (_dpid_str(dpid), in_port))
+                interfaces[(dpid, in_port)] = interface_id
+            comment = 'dpid=%s in_port=%s reason=%d table_id=%s ' \
+                'buffer_id=%d' % (_dpid_str(dpid), in_port, msg.reason,
+                                  getattr(msg, 'table_id', None),
+                                  _buffer_id(msg))
+            writer.write_pkt(msg.data, ts, interface_id,
+                             orig_len=max(msg.total_len, len(msg.data)),
+                             comment=comment)
+        writer.flush()
+
+
+def _dpid_str(dpid):
+    # still in handshake
+    return dpid_lib.dpid_to_str(dpid) if dpid is not None else None
+
+
+def _in_port(msg):
+    # OpenFlow 1.0 has no match
+    in_port = getattr(msg, 'in_port', None)
+    if in_port is None:
+        in_port = msg.match.get('in_port')
+    return in_port
+
+
+def _buffer_id(msg):
+    # OFP_NO_BUFFER as -1
+    buffer_id = msg.buffer_id
+    return -1 if buffer_id == 0xffffffff else buffer_id
+
+
+def enable(**kwargs):
+    """
+    Starts capturing the packet-ins of all the datapaths with a new
+    PacketInCapture of kwargs, and returns it.
+    """
+    global _capture
+    _capture = PacketInCapture(**kwargs)
+    return _capture
+
+
+def disable():
+    global _capture
+    _capture = None
+
+
+def get_capture():
+    """
+    Returns the PacketInCapture in use, or None if disabled.
+    """
+    return _capture
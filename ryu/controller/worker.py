@@ -0,0 +1,321 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Multi-process controller support.
+
+With ``--ofp-workers N`` (N > 1), ryu-manager forks N processes which all
+listen on the OpenFlow port with SO_REUSEPORT.  The kernel shards incoming
+switch connections among them and every process owns the datapaths it
+accepted.  Active connections to ``--ofp-switch-address-list`` are sharded
+by address index.
+
+Worker 0 (the original process) is connected to every other worker by a
+local socket pair and relays the messages published by any worker to all
+workers, including itself, so every worker observes them in one global
+order.  On top of this channel, ``SharedDict`` replicates a table (e.g. a
+host table) on every worker and ``RyuApp._GLOBAL_EVENTS`` makes events
+globally ordered.  Every worker calls the subscribers from a thread of its
+own, so publishing and relaying never wait for them.
+
+Applications which need every datapath in a single process, e.g. the link
+discovery of ryu.topology.switches, set ``RyuApp._SINGLE_WORKER`` and are
+not loaded with ``--ofp-workers``.
+
+Without ``--ofp-workers``, publish() delivers synchronously in the calling
+process, so the same application code runs unchanged.
+"""
+
+import logging
+import os
+import pickle
+import signal
+import socket
+import struct
+
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping  # Python 2
+
+from ryu import cfg
+from ryu.lib import hub
+
+LOG = logging.getLogger('ryu.controller.worker')
+
+CONF = cfg.CONF
+CONF.register_cli_opts([
+    cfg.IntOpt('ofp-workers', default=1, min=1,
+               help='number of controller processes sharing the openflow '
+                    'listen port (default 1)'),
+])
+
+# length of (seq, payload), seq
+_FRAME_HEADER = struct.Struct('!IQ')
+
+_worker_id = 0
+_num_workers = 1
+_children = []      # pids of workers 1..N-1, only in worker 0
+_peers = []         # worker 0: sockets to workers, others: [worker 0]
+_subscribers = {}   # topic -> [callback]
+_relay_sem = None   # serializes the frames written to _peers
+_delivery_q = None  # payloads to deliver, in the global order
+_seq = 0
+
+
+def worker_id():
+    """
+    Returns the index of this process among the workers.
+    """
+    return _worker_id
+
+
+def num_workers():
+    """
+    Returns the number of worker processes.
+    """
+    return _num_workers
+
+
+def is_enabled():
+    """
+    Returns True if running with more than one worker process.
+    """
+    return _num_workers > 1
+
+
+def owns(index):
+    """
+    Returns True if the object with the given index, e.g. a switch address
+    in --ofp-switch-address-list, is handled by this worker.
+    """
+    return index % _num_workers == _worker_id
+
+
+def fork_workers(num):
+    """
+    Fork num - 1 worker processes.
+
+    This must be called before any application is loaded.
+    Returns the worker id of the calling process after fork.
+    """
+    global _worker_id, _num_workers
+    if num <= 1:
+        return _worker_id
+
+    for i in range(1, num):
+        parent_sock, child_sock = socket.socketpair()
+        pid = os.fork()
+        if pid == 0:
+            parent_sock.close()
+            for sock in _peers:
+                sock.close()
+            _peers[:] = [child_sock]
+            del _children[:]
+            _worker_id = i
+            _num_workers = num
+            return _worker_id
+
+        child_sock.close()
+        _peers.append(parent_sock)
+        _children.append(pid)
+
+    _num_workers = num
+    return _worker_id
+
+
+def start():
+    """
+    Spawn the threads which read the shared-state channel.
+    """
+    global _relay_sem, _delivery_q
+    if not is_enabled():
+        return []
+
+    _relay_sem = hub.Semaphore()
+    _delivery_q = hub.Queue()
+    _peers[:] = [hub.green_socket(sock) for sock in _peers]
+    threads = [hub.spawn(_deliver_loop)]
+    if _worker_id == 0:
+        return threads + [hub.spawn(_relay_loop, sock) for sock in _peers]
+    return threads + [hub.spawn(_recv_loop, _peers[0])]
+
+
+def stop():
+    """
+    Terminate the workers forked by this process.
+    """
+    for pid in _children:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except OSError:
+            pass
+    for pid in _children:
+        try:
+            os.waitpid(pid, 0)
+        except OSError:
+            pass
+    del _children[:]
+
+
+def subscribe(topic, callback):
+    """
+    Register callback(value) to be called for every value published on
+    topic by any worker.
+    """
+    _subscribers.setdefault(topic, []).append(callback)
+
+
+def unsubscribe(topic, callback):
+    callbacks = _subscribers.get(topic, [])
+    callbacks.remove(callback)
+    if not callbacks:
+        del _subscribers[topic]
+
+
+def publish(topic, value):
+    """
+    Publish value on topic to every worker.
+
+    value must be picklable.  Without workers, the subscribers are called
+    before returning.  Otherwise, they are called asynchronously on every
+    worker, including this one, in the order decided by worker 0.
+    """
+    payload = pickle.dumps((topic, value), pickle.HIGHEST_PROTOCOL)
+    if not is_enabled():
+        _deliver(payload)
+    elif _worker_id == 0:
+        _relay(payload)
+    else:
+        # sendall() may switch to another green thread publishing too.
+        with _relay_sem:
+            _send(_peers[0], 0, payload)
+
+
+def _send(sock, seq, payload):
+    sock.sendall(_FRAME_HEADER.pack(len(payload), seq) + payload)
+
+
+def _recv_exactly(sock, size):
+    buf = bytearray()
+    while len(buf) < size:
+        ret = sock.recv(size - len(buf))
+        if not ret:
+            raise EOFError
+        buf += ret
+    return buf
+
+
+def _recv(sock):
+    length, seq = _FRAME_HEADER.unpack(
+        _recv_exactly(sock, _FRAME_HEADER.size))
+    return seq, _recv_exactly(sock, length)
+
+
+def _relay(payload):
+    global _seq
+    with _relay_sem:
+        _seq += 1
+        for sock in _peers:
+            try:
+                _send(sock, _seq, payload)
+            except (EOFError, IOError):
+                LOG.debug('worker channel closed while relaying')
+        # The subscribers are not called here, as they may wait, e.g. for
+        # room in the event queue of an application, or publish in turn.
+        _delivery_q.put(payload)
+
+
+def _deliver(payload):
+    topic, value = pickle.loads(bytes(payload))
+    for callback in _subscribers.get(topic, []):
+        try:
+            callback(value)
+        except hub.TaskExit:
+            raise
+        except:
+            LOG.exception('Exception occurred in the subscriber of %s',
+                          topic)
+
+
+def _deliver_loop():
+    while True:
+        _deliver(_delivery_q.get())
+
+
+def _relay_loop(sock):
+    try:
+        while True:
+            _seq_, payload = _recv(sock)
+            _relay(payload)
+    except (EOFError, IOError):
+        LOG.info('worker disconnected from the shared-state channel')
+
+
+def _recv_loop(sock):
+    try:
+        while True:
+            _seq_, payload = _recv(sock)
+            _delivery_q.put(payload)
+    except (EOFError, IOError):
+        LOG.info('worker 0 closed the shared-state channel')
+
+
+class SharedDict(MutableMapping):
+    """
+    A dictionary replicated on every worker.
+
+    Reads are served from the local copy.  Writes are published through
+    the shared-state channel and applied on every worker in the global
+    order, thus with multiple workers a write becomes visible only after
+    worker 0 relayed it.  Keys and values must be picklable.
+    """
+
+    def __init__(self, name):
+        super(SharedDict, self).__init__()
+        self.name = name
+        self._topic = 'dict:%s' % name
+        self._data = {}
+        subscribe(self._topic, self._apply)
+
+    def _apply(self, value):
+        op, key, item = value
+        if op == 'set':
+            self._data[key] = item
+        else:
+            self._data.pop(key, None)
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        publish(self._topic, ('set', key, value))
+
+    def __delitem__(self, key):
+        if key not in self._data:
+            raise KeyError(key)
+        publish(self._topic, ('del', key, None))
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return '%s(%r, %r)' % (self.__class__.__name__, self.name, self._data)
+
+    def close(self):
+        unsubscribe(self._topic, self._apply)
@@ -56,6 +56,34 @@ class OFPInvalidActionString(RyuException):
     message = 'unable to parse: %(action_str)s'
 
 
+class OFPRequestTimeout(RyuException):
+    message = 'no reply to the request xid %(xid)s in %(timeout)s seconds'
+
+
+class OFPRequestCancelled(RyuException):
+    message = 'request xid %(xid)s cancelled'
+
+
+class OFPDatapathDisconnected(RyuException):
+    message = 'datapath %(dpid)s disconnected before the reply to xid %(xid)s'
+
+
+class OFPErrorReply(RyuException):
+    message = 'error reply type %(type)s code %(code)s to the request ' \
+              'xid %(xid)s'
+
+    def __init__(self, error_msg, msg=None, **kwargs):
+        self.error_msg = error_msg
+        kwargs.update(xid=error_msg.xid, type=error_msg.type,
+                      code=error_msg.code)
+
+        super(OFPErrorReply, self).__init__(msg, **kwargs)
+
+
+class SingleWorkerApp(RyuException):
+    message = 'app %(app)s can not run with multiple workers (--ofp-workers)'
+
+
 class NetworkNotFound(RyuException):
     message = 'no such network id %(network_id)s'
 
@@ -55,6 +55,7 @@ from ryu.lib.packet import ipv4
 from ryu.lib.packet import udp
 from ryu.lib.packet import bfd
 from ryu.lib.packet import arp
+from ryu.lib.packet import packet_template
 from ryu.lib.packet.arp import ARP_REQUEST, ARP_REPLY
 
 LOG = logging.getLogger(__name__)
@@ -182,6 +183,8 @@ class BFDSession(object):
         self.ipv4_id = random.randint(0, UINT16_MAX)
         self.src_port = src_port
         self.dst_port = BFD_CONTROL_UDP_PORT
+        # BFD Control packets without authentication section
+        self._template = None
 
         if dst_mac == "FF:FF:FF:FF:FF:FF" or dst_ip == "255.255.255.255":
             self._remote_addr_config = False
@@ -483,16 +486,36 @@ class BFDSession(object):
         dst_port = self.dst_port
 
         # Construct BFD Control packet
-        data = BFDPacket.bfd_packet(
-            src_mac=src_mac, dst_mac=dst_mac,
-            src_ip=src_ip, dst_ip=dst_ip, ipv4_id=ipv4_id,
-            src_port=src_port, dst_port=dst_port,
-            diag=diag, state=state, flags=flags, detect_mult=detect_mult,
-            my_discr=my_discr, your_discr=your_discr,
-            desired_min_tx_interval=desired_min_tx_interval,
-            required_min_rx_interval=required_min_rx_interval,
-            required_min_echo_rx_interval=required_min_echo_rx_interval,
-            auth_cls=auth_cls)
+        if auth_cls is None:
+            # Only the fields differ from a packet to another, and most
+            # of them from the previous one.
+            if self._template is None:
+                self._template = BFDPacket.bfd_template(
+                    src_mac=src_mac, dst_mac=dst_mac,
+                    src_ip=src_ip, dst_ip=dst_ip,
+                    src_port=src_port, dst_port=dst_port)
+            self._template.update(
+                ethernet_dst=dst_mac, ipv4_dst=dst_ip,
+                ipv4_identification=ipv4_id,
+                bfd_diag=diag, bfd_state=state, bfd_flags=flags,
+                bfd_detect_mult=detect_mult,
+                bfd_my_discr=my_discr, bfd_your_discr=your_discr,
+                bfd_desired_min_tx_interval=desired_min_tx_interval,
+                bfd_required_min_rx_interval=required_min_rx_interval,
+                bfd_required_min_echo_rx_interval=(
+                    required_min_echo_rx_interval))
+            data = bytes(self._template.data)
+        else:
+            data = BFDPacket.bfd_packet(
+                src_mac=src_mac, dst_mac=dst_mac,
+                src_ip=src_ip, dst_ip=dst_ip, ipv4_id=ipv4_id,
+                src_port=src_port, dst_port=dst_port,
+                diag=diag, state=state, flags=flags, detect_mult=detect_mult,
+                my_discr=my_discr, your_discr=your_discr,
+                desired_min_tx_interval=desired_min_tx_interval,
+                required_min_rx_interval=required_min_rx_interval,
+                required_min_echo_rx_interval=required_min_echo_rx_interval,
+                auth_cls=auth_cls)
 
         # Prepare for a datapath
         datapath = self.datapath
@@ -531,6 +554,38 @@ class BFDPacket(object):
         """
         Generate BFD packet with Ethernet/IPv4/UDP encapsulated.
         """
+        pkt = BFDPacket._bfd_packet(
+            src_mac, dst_mac, src_ip, dst_ip, ipv4_id, src_port, dst_port,
+            diag=diag, state=state, flags=flags, detect_mult=detect_mult,
+            my_discr=my_discr, your_discr=your_discr,
+            desired_min_tx_interval=desired_min_tx_interval,
+            required_min_rx_interval=required_min_rx_interval,
+            required_min_echo_rx_interval=required_min_echo_rx_interval,
+            auth_cls=auth_cls)
+        pkt.serialize()
+        return pkt.data
+
+    @staticmethod
+    def bfd_template(src_mac, dst_mac, src_ip, dst_ip, src_port, dst_port):
+        """
+        Generate a template of BFD packets without authentication section
+        with Ethernet/IPv4/UDP encapsulated.
+
+        The fields of the template are rewritten for every packet
+        instead of generating a new packet. See
+        ryu.lib.packet.packet_template.
+        """
+        return packet_template.PacketTemplate(BFDPacket._bfd_packet(
+            src_mac, dst_mac, src_ip, dst_ip, 0, src_port, dst_port))
+
+    @staticmethod
+    def _bfd_packet(src_mac, dst_mac, src_ip, dst_ip, ipv4_id,
+                    src_port, dst_port,
+                    diag=0, state=0, flags=0, detect_mult=0,
+                    my_discr=0, your_discr=0, desired_min_tx_interval=0,
+                    required_min_rx_interval=0,
+                    required_min_echo_rx_interval=0,
+                    auth_cls=None):
         # Generate ethernet header first.
         pkt = packet.Packet()
         eth_pkt = ethernet.ethernet(dst_mac, src_mac, ETH_TYPE_IP)
@@ -557,9 +612,7 @@ class BFDPacket(object):
             required_min_echo_rx_interval=required_min_echo_rx_interval,
             auth_cls=auth_cls)
         pkt.add_protocol(bfd_pkt)
-
-        pkt.serialize()
-        return pkt.data
+        return pkt
 
     @staticmethod
     def bfd_parse(data):
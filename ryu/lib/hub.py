@@ -112,19 +112,21 @@ if HUB_TYPE == 'eventlet':
 
     class StreamServer(object):
         def __init__(self, listen_info, handle=None, backlog=None,
-                     spawn='default', **ssl_args):
+                     spawn='default', reuse_port=None, **ssl_args):
             assert backlog is None
             assert spawn == 'default'
 
             if ip.valid_ipv6(listen_info[0]):
                 self.server = eventlet.listen(listen_info,
-                                              family=socket.AF_INET6)
+                                              family=socket.AF_INET6,
+                                              reuse_port=reuse_port)
             elif os.path.isdir(os.path.dirname(listen_info[0])):
                 # Case for Unix domain socket
                 self.server = eventlet.listen(listen_info[0],
                                               family=socket.AF_UNIX)
             else:
-                self.server = eventlet.listen(listen_info)
+                self.server = eventlet.listen(listen_info,
+                                              reuse_port=reuse_port)
 
             if ssl_args:
                 ssl_args.setdefault('server_side', True)
@@ -198,6 +200,10 @@ if HUB_TYPE == 'eventlet':
 
     WebSocketWSGI = websocket.WebSocketWSGI
 
+    def green_socket(sock):
+        # sockets are made cooperative by patch().
+        return sock
+
     Timeout = eventlet.timeout.Timeout
 
     class Event(object):
@@ -237,3 +243,888 @@ if HUB_TYPE == 'eventlet':
                     pass
 
             return self._cond
+
+elif HUB_TYPE == 'asyncio':
+    # Green threads run as greenlets scheduled by an asyncio event loop
+    # which runs in its own greenlet, the hub.  A blocking call switches
+    # to the hub and the loop switches back when the awaited future is
+    # done, so the applications stay synchronous while asyncio libraries
+    # can share the loop through get_event_loop() and run_coroutine().
+    # The standard library is not monkey-patched; only the sockets made
+    # by this module, or passed to green_socket(), are cooperative.
+    # WebSocketWSGI accepts WebSocket connections (RFC 6455) only on
+    # WSGIServer, without extensions or subprotocols.
+    import asyncio
+    import base64
+    import collections
+    import errno
+    import greenlet
+    import hashlib
+    import queue
+    import socket
+    import ssl
+    import struct
+    import traceback
+    from wsgiref import simple_server
+
+    getcurrent = greenlet.getcurrent
+    TaskExit = greenlet.GreenletExit
+    QueueEmpty = queue.Empty
+    QueueFull = queue.Full
+
+    _loop = None
+    _hub = None
+
+    def patch(*_args, **_kwargs):
+        pass
+
+    def get_event_loop():
+        """
+        Returns the asyncio event loop running the green threads.
+        """
+        global _loop
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+        return _loop
+
+    def _run_loop():
+        get_event_loop().run_forever()
+
+    def _get_hub():
+        global _hub
+        if _hub is None or _hub.dead:
+            root = getcurrent()
+            while root.parent is not None:
+                root = root.parent
+            _hub = greenlet.greenlet(_run_loop, parent=root)
+        return _hub
+
+    def _set_result(fut, result=None):
+        if not fut.done():
+            fut.set_result(result)
+
+    def _wait(fut, timeout=None):
+        """
+        Blocks the current green thread until fut is done or timeout
+        expires.  Returns True if fut is done.
+        """
+        hub = _get_hub()
+        current = getcurrent()
+        if current is hub:
+            raise RuntimeError('cannot block in the hub')
+        if fut.done():
+            return True
+
+        # The resumption is revoked when the wait ends otherwise, e.g.
+        # by a Timeout or kill thrown into this green thread.
+        waiter = [current]
+
+        def _resume(*_args):
+            g = waiter[0]
+            if g is not None:
+                waiter[0] = None
+                g.switch()
+
+        fut.add_done_callback(_resume)
+        timer = None
+        if timeout is not None:
+            timer = get_event_loop().call_later(timeout, _resume)
+        try:
+            hub.switch()
+        finally:
+            waiter[0] = None
+            fut.remove_done_callback(_resume)
+            if timer is not None:
+                timer.cancel()
+        return fut.done()
+
+    def run_coroutine(coro):
+        """
+        Runs a coroutine on the event loop and blocks the current green
+        thread until it returns its result or raises.
+        """
+        fut = asyncio.ensure_future(coro, loop=get_event_loop())
+        try:
+            _wait(fut)
+        except BaseException:
+            fut.cancel()
+            raise
+        return fut.result()
+
+    def sleep(seconds=0):
+        loop = get_event_loop()
+        fut = loop.create_future()
+        if seconds <= 0:
+            handle = loop.call_soon(_set_result, fut)
+        else:
+            handle = loop.call_later(seconds, _set_result, fut)
+        try:
+            _wait(fut)
+        finally:
+            handle.cancel()
+
+    class GreenThread(object):
+        def __init__(self, func, args, kwargs):
+            self._func = func
+            self._args = args
+            self._kwargs = kwargs
+            self._greenlet = greenlet.greenlet(self._run, parent=_get_hub())
+            self._exit = get_event_loop().create_future()
+            self._result = None
+            self._exc = None
+            self._timer = None
+
+        def _start(self):
+            self._timer = None
+            if not self._exit.done():
+                self._greenlet.switch()
+
+        def _run(self):
+            try:
+                self._result = self._func(*self._args, **self._kwargs)
+            except BaseException as e:
+                self._exc = e
+            finally:
+                _set_result(self._exit)
+
+        @property
+        def dead(self):
+            return self._exit.done()
+
+        def wait(self):
+            _wait(self._exit)
+            if self._exc is not None:
+                raise self._exc
+            return self._result
+
+        def _throw(self):
+            if not self._greenlet.dead:
+                self._greenlet.throw(TaskExit())
+
+        def kill(self):
+            if self._exit.done():
+                return
+            if not self._greenlet:
+                # Not started yet; it never runs.
+                if self._timer is not None:
+                    self._timer.cancel()
+                self._exc = TaskExit()
+                _set_result(self._exit)
+                return
+            current = getcurrent()
+            if current is self._greenlet:
+                raise TaskExit()
+            get_event_loop().call_soon(self._throw)
+            if current is not _get_hub():
+                sleep(0)
+
+        cancel = kill
+
+    def _launch(raise_error, func, *args, **kwargs):
+        # Mimic gevent's default raise_error=False behaviour
+        # by not propagating an exception to the joiner.
+        try:
+            return func(*args, **kwargs)
+        except TaskExit:
+            pass
+        except BaseException as e:
+            if raise_error:
+                raise e
+            # Log uncaught exception.
+            # Note: this is an intentional divergence from gevent
+            # behaviour; gevent silently ignores such exceptions.
+            LOG.error('hub: uncaught exception: %s',
+                      traceback.format_exc())
+
+    def spawn(*args, **kwargs):
+        raise_error = kwargs.pop('raise_error', False)
+        thread = GreenThread(_launch, (raise_error,) + args, kwargs)
+        get_event_loop().call_soon(thread._start)
+        return thread
+
+    def spawn_after(seconds, *args, **kwargs):
+        raise_error = kwargs.pop('raise_error', False)
+        thread = GreenThread(_launch, (raise_error,) + args, kwargs)
+        thread._timer = get_event_loop().call_later(seconds, thread._start)
+        return thread
+
+    def kill(thread):
+        thread.kill()
+
+    def joinall(threads):
+        for t in threads:
+            # This try-except is necessary when killing an inactive
+            # greenthread.
+            try:
+                t.wait()
+            except TaskExit:
+                pass
+
+    class Timeout(BaseException):
+        """
+        Raises exception, or this Timeout if it is None, in the green
+        thread which started it after seconds.
+        """
+
+        def __init__(self, seconds=None, exception=None):
+            super(Timeout, self).__init__(seconds)
+            self.seconds = seconds
+            self.exception = exception
+            self._timer = None
+            self.start()
+
+        @property
+        def pending(self):
+            return self._timer is not None
+
+        def start(self):
+            self.cancel()
+            if self.seconds is not None:
+                self._greenlet = getcurrent()
+                self._timer = get_event_loop().call_later(self.seconds,
+                                                          self._fire)
+            return self
+
+        def _fire(self):
+            self._timer = None
+            if self._greenlet.dead:
+                return
+            if self.exception is None:
+                exc = self
+            elif isinstance(self.exception, BaseException):
+                exc = self.exception
+            else:
+                exc = self.exception()
+            self._greenlet.throw(exc)
+
+        def cancel(self):
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        def __enter__(self):
+            if not self.pending:
+                self.start()
+            return self
+
+        def __exit__(self, typ, value, tb):
+            self.cancel()
+            return False
+
+    class _Waiters(object):
+        def __init__(self):
+            self._futs = collections.deque()
+
+        def wait(self, timeout=None):
+            fut = get_event_loop().create_future()
+            self._futs.append(fut)
+            try:
+                done = _wait(fut, timeout)
+            except BaseException:
+                if fut.done():
+                    # pass on the notification this waiter won't use.
+                    self.notify()
+                else:
+                    self._futs.remove(fut)
+                raise
+            if not done:
+                self._futs.remove(fut)
+            return done
+
+        def notify(self):
+            if self._futs:
+                _set_result(self._futs.popleft())
+
+        def notify_all(self):
+            while self._futs:
+                _set_result(self._futs.popleft())
+
+    def _deadline(timeout):
+        if timeout is None:
+            return None
+        return get_event_loop().time() + timeout
+
+    def _remaining(deadline):
+        if deadline is None:
+            return None
+        return max(0, deadline - get_event_loop().time())
+
+    class Queue(object):
+        def __init__(self, maxsize=None):
+            if maxsize is not None and maxsize <= 0:
+                maxsize = None
+            self.maxsize = maxsize
+            self._items = collections.deque()
+            self._getters = _Waiters()
+            self._putters = _Waiters()
+
+        def qsize(self):
+            return len(self._items)
+
+        def empty(self):
+            return not self._items
+
+        def full(self):
+            return (self.maxsize is not None and
+                    len(self._items) >= self.maxsize)
+
+        def put(self, item, block=True, timeout=None):
+            deadline = _deadline(timeout)
+            while self.full():
+                if not block or not self._putters.wait(_remaining(deadline)):
+                    raise QueueFull
+            self._items.append(item)
+            self._getters.notify()
+
+        def get(self, block=True, timeout=None):
+            deadline = _deadline(timeout)
+            while not self._items:
+                if not block or not self._getters.wait(_remaining(deadline)):
+                    raise QueueEmpty
+            item = self._items.popleft()
+            self._putters.notify()
+            if self._items:
+                # pass on to the next getter in case this one was woken
+                # together with another one.
+                self._getters.notify()
+            return item
+
+        def put_nowait(self, item):
+            self.put(item, block=False)
+
+        def get_nowait(self):
+            return self.get(block=False)
+
+    class Semaphore(object):
+        def __init__(self, value=1):
+            self.counter = value
+            self._waiters = _Waiters()
+
+        def locked(self):
+            return self.counter <= 0
+
+        def acquire(self, blocking=True, timeout=None):
+            deadline = _deadline(timeout)
+            while self.counter <= 0:
+                if not blocking or not self._waiters.wait(
+                        _remaining(deadline)):
+                    return False
+            self.counter -= 1
+            return True
+
+        def release(self):
+            self.counter += 1
+            self._waiters.notify()
+            return True
+
+        def __enter__(self):
+            self.acquire()
+            return self
+
+        def __exit__(self, typ, value, tb):
+            self.release()
+
+    class BoundedSemaphore(Semaphore):
+        def __init__(self, value=1):
+            super(BoundedSemaphore, self).__init__(value)
+            self.original_counter = value
+
+        def release(self):
+            if self.counter >= self.original_counter:
+                raise ValueError('Semaphore released too many times')
+            return super(BoundedSemaphore, self).release()
+
+    class Event(object):
+        def __init__(self):
+            self._cond = False
+            self._waiters = _Waiters()
+
+        def is_set(self):
+            return self._cond
+
+        def set(self):
+            self._cond = True
+            self._waiters.notify_all()
+
+        def clear(self):
+            self._cond = False
+
+        def wait(self, timeout=None):
+            deadline = _deadline(timeout)
+            while not self._cond:
+                if not self._waiters.wait(_remaining(deadline)):
+                    break
+            return self._cond
+
+    _WOULD_BLOCK = (BlockingIOError, InterruptedError,
+                    ssl.SSLWantReadError, ssl.SSLWantWriteError)
+
+    class GreenSocket(object):
+        """
+        Cooperative wrapper of a socket.
+
+        Operations which would block wait for the socket to be ready in
+        the event loop; the timeout set by settimeout() raises
+        socket.timeout as for a blocking socket.
+        """
+
+        def __init__(self, sock):
+            sock.setblocking(False)
+            self._sock = sock
+            self._timeout = None
+            self._io_futs = set()
+            self._io_refs = 0
+            self._closed = False
+
+        def __getattr__(self, name):
+            return getattr(self._sock, name)
+
+        def settimeout(self, timeout):
+            self._timeout = timeout
+
+        def gettimeout(self):
+            return self._timeout
+
+        def setblocking(self, flag):
+            self._timeout = None if flag else 0.0
+
+        def _wait_fd(self, write):
+            loop = get_event_loop()
+            fd = self._sock.fileno()
+            if fd < 0:
+                raise socket.error(errno.EBADF, 'Bad file descriptor')
+            fut = loop.create_future()
+            if write:
+                loop.add_writer(fd, _set_result, fut)
+            else:
+                loop.add_reader(fd, _set_result, fut)
+            self._io_futs.add(fut)
+            try:
+                if not _wait(fut, self._timeout):
+                    raise socket.timeout('timed out')
+            finally:
+                self._io_futs.discard(fut)
+                if write:
+                    loop.remove_writer(fd)
+                else:
+                    loop.remove_reader(fd)
+
+        def _io(self, write, func, *args):
+            while True:
+                try:
+                    return func(*args)
+                except _WOULD_BLOCK as e:
+                    if self._timeout == 0.0:
+                        raise
+                    if isinstance(e, ssl.SSLWantReadError):
+                        write = False
+                    elif isinstance(e, ssl.SSLWantWriteError):
+                        write = True
+                    self._wait_fd(write)
+
+        def recv(self, *args):
+            return self._io(False, self._sock.recv, *args)
+
+        def recv_into(self, *args):
+            return self._io(False, self._sock.recv_into, *args)
+
+        def recvfrom(self, *args):
+            return self._io(False, self._sock.recvfrom, *args)
+
+        def send(self, *args):
+            return self._io(True, self._sock.send, *args)
+
+        def sendto(self, *args):
+            return self._io(True, self._sock.sendto, *args)
+
+        def sendall(self, data, *args):
+            view = memoryview(data).cast('B')
+            while view:
+                sent = self._io(True, self._sock.send, view, *args)
+                view = view[sent:]
+
+        def accept(self):
+            sock, addr = self._io(False, self._sock.accept)
+            return GreenSocket(sock), addr
+
+        def connect(self, addr):
+            err = self._sock.connect_ex(addr)
+            if err in (errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN):
+                self._wait_fd(True)
+                err = self._sock.getsockopt(socket.SOL_SOCKET,
+                                            socket.SO_ERROR)
+            if err:
+                raise socket.error(err, os.strerror(err))
+
+        def do_handshake(self):
+            return self._io(False, self._sock.do_handshake)
+
+        makefile = socket.socket.makefile
+
+        def _decref_socketios(self):
+            if self._io_refs > 0:
+                self._io_refs -= 1
+            if self._closed:
+                self.close()
+
+        def close(self):
+            self._closed = True
+            # wakes up the green threads waiting for this socket, which
+            # then fail on the closed socket.
+            for fut in list(self._io_futs):
+                _set_result(fut)
+            if self._io_refs <= 0:
+                self._sock.close()
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            self.close()
+
+    def green_socket(sock):
+        """
+        Makes a socket created outside this module cooperative.
+        """
+        if isinstance(sock, GreenSocket):
+            return sock
+        return GreenSocket(sock)
+
+    def listen(addr, family=socket.AF_INET, backlog=50, reuse_addr=True,
+               reuse_port=None):
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        if reuse_addr and family != socket.AF_UNIX:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if reuse_port and hasattr(socket, 'SO_REUSEPORT'):
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind(addr)
+        sock.listen(backlog)
+        return GreenSocket(sock)
+
+    def connect(addr, family=socket.AF_INET, bind=None, timeout=None):
+        sock = GreenSocket(socket.socket(family, socket.SOCK_STREAM))
+        sock.settimeout(timeout)
+        try:
+            if bind is not None:
+                sock.bind(bind)
+            sock.connect(addr)
+        except BaseException:
+            sock.close()
+            raise
+        return sock
+
+    def _ssl_context(ssl_args, server_side):
+        ctx = ssl_args.pop('ssl_ctx', None)
+        if ctx is None:
+            protocol = ssl_args.pop('ssl_version', None)
+            if protocol is None:
+                protocol = (ssl.PROTOCOL_TLS_SERVER if server_side
+                            else ssl.PROTOCOL_TLS_CLIENT)
+            ctx = ssl.SSLContext(protocol)
+            if not server_side:
+                ctx.check_hostname = False
+                ctx.verify_mode = ssl.CERT_NONE
+        certfile = ssl_args.pop('certfile', None)
+        keyfile = ssl_args.pop('keyfile', None)
+        if certfile is not None:
+            ctx.load_cert_chain(certfile, keyfile)
+        if 'cert_reqs' in ssl_args:
+            ctx.verify_mode = ssl_args.pop('cert_reqs')
+        if 'ca_certs' in ssl_args:
+            ctx.load_verify_locations(ssl_args.pop('ca_certs'))
+        if 'ciphers' in ssl_args:
+            ctx.set_ciphers(ssl_args.pop('ciphers'))
+        ssl_args.pop('server_side', None)
+        return ctx
+
+    def _wrap_ssl(sock, ctx, server_side, **kwargs):
+        timeout = sock.gettimeout()
+        sock = GreenSocket(ctx.wrap_socket(sock._sock,
+                                           server_side=server_side,
+                                           do_handshake_on_connect=False,
+                                           **kwargs))
+        sock.settimeout(timeout)
+        sock.do_handshake()
+        return sock
+
+    class StreamServer(object):
+        def __init__(self, listen_info, handle=None, backlog=None,
+                     spawn='default', reuse_port=None, **ssl_args):
+            assert backlog is None
+            assert spawn == 'default'
+
+            if ip.valid_ipv6(listen_info[0]):
+                self.server = listen(listen_info, family=socket.AF_INET6,
+                                     reuse_port=reuse_port)
+            elif os.path.isdir(os.path.dirname(listen_info[0])):
+                # Case for Unix domain socket
+                self.server = listen(listen_info[0], family=socket.AF_UNIX)
+            else:
+                self.server = listen(listen_info, reuse_port=reuse_port)
+
+            if ssl_args:
+                ctx = _ssl_context(ssl_args, server_side=True)
+
+                def wrap_and_handle_ctx(sock, addr):
+                    handle(_wrap_ssl(sock, ctx, True, **ssl_args), addr)
+
+                self.handle = wrap_and_handle_ctx
+            else:
+                self.handle = handle
+
+        def serve_forever(self):
+            while True:
+                sock, addr = self.server.accept()
+                spawn(self.handle, sock, addr)
+
+    class StreamClient(object):
+        def __init__(self, addr, timeout=None, **ssl_args):
+            assert ip.valid_ipv4(addr[0]) or ip.valid_ipv6(addr[0])
+            self.addr = addr
+            self.timeout = timeout
+            self.ssl_args = ssl_args
+            self._is_active = True
+
+        def connect(self):
+            if ip.valid_ipv6(self.addr[0]):
+                family = socket.AF_INET6
+            else:
+                family = socket.AF_INET
+            try:
+                client = connect(self.addr, family=family,
+                                 timeout=self.timeout)
+                if self.ssl_args:
+                    ssl_args = dict(self.ssl_args)
+                    ctx = _ssl_context(ssl_args, server_side=False)
+                    client = _wrap_ssl(client, ctx, False, **ssl_args)
+            except (socket.error, ssl.SSLError):
+                return None
+
+            return client
+
+        def connect_loop(self, handle, interval):
+            while self._is_active:
+                sock = self.connect()
+                if sock:
+                    handle(sock, self.addr)
+                sleep(interval)
+
+        def stop(self):
+            self._is_active = False
+
+    # the key of the socket of the request in the WSGI environment
+    _WSGI_SOCKET = 'ryu.hub.socket'
+    # the key of the response status sent by WebSocketWSGI
+    _WSGI_TAKEN_OVER = 'ryu.hub.taken_over'
+
+    class _ServerHandler(simple_server.ServerHandler):
+        def finish_response(self):
+            status = self.environ.get(_WSGI_TAKEN_OVER)
+            if status is None:
+                return super(_ServerHandler, self).finish_response()
+            # WebSocketWSGI has sent the response and used the connection.
+            self.status = status
+            self.close()
+
+    class _RequestHandler(simple_server.WSGIRequestHandler):
+        def get_environ(self):
+            env = super(_RequestHandler, self).get_environ()
+            env[_WSGI_SOCKET] = self.connection
+            return env
+
+        def handle(self):
+            # WSGIRequestHandler.handle() with _ServerHandler
+            self.raw_requestline = self.rfile.readline(65537)
+            if len(self.raw_requestline) > 65536:
+                self.requestline = ''
+                self.request_version = ''
+                self.command = ''
+                self.send_error(414)
+                return
+            if not self.parse_request():
+                return
+            handler = _ServerHandler(
+                self.rfile, self.wfile, self.get_stderr(),
+                self.get_environ(), multithread=False)
+            handler.request_handler = self
+            handler.run(self.server.get_app())
+
+        def log_message(self, format, *args):
+            LOG.info('%s - - %s', self.address_string(), format % args)
+
+    class WSGIServer(StreamServer):
+        def serve_forever(self):
+            host, port = self.server.getsockname()[:2]
+            self.base_environ = {
+                'SERVER_NAME': socket.getfqdn(host),
+                'GATEWAY_INTERFACE': 'CGI/1.1',
+                'SERVER_PORT': str(port),
+                'REMOTE_HOST': '',
+                'CONTENT_LENGTH': '',
+                'SCRIPT_NAME': '',
+            }
+
+            def _handle(sock, addr):
+                try:
+                    _RequestHandler(sock, addr, self)
+                except socket.error as e:
+                    LOG.debug('wsgi: connection from %s closed: %s',
+                              addr, e)
+                finally:
+                    sock.close()
+
+            while True:
+                sock, addr = self.server.accept()
+                spawn(_handle, sock, addr)
+
+        def get_app(self):
+            return self.handle
+
+    _WS_GUID = b'258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+    _WS_CONTINUATION = 0x0
+    _WS_TEXT = 0x1
+    _WS_BINARY = 0x2
+    _WS_CLOSE = 0x8
+    _WS_PING = 0x9
+    _WS_PONG = 0xa
+
+    def _ws_unmask(data, mask):
+        n = len(data)
+        key = (mask * (n // 4 + 1))[:n]
+        return (int.from_bytes(data, 'big') ^
+                int.from_bytes(key, 'big')).to_bytes(n, 'big')
+
+    class WebSocket(object):
+        """
+        Server side of a WebSocket connection, as passed to the handler
+        of WebSocketWSGI.
+        """
+
+        def __init__(self, sock, rfile, environ):
+            self.socket = sock
+            self.environ = environ
+            self._rfile = rfile
+            self._send_sem = Semaphore()
+            self.closed = False
+
+        def _recv(self, length):
+            data = self._rfile.read(length)
+            if len(data) < length:
+                raise EOFError()
+            return data
+
+        def _recv_frame(self):
+            b0, b1 = struct.unpack('!BB', self._recv(2))
+            length = b1 & 0x7f
+            if length == 126:
+                length, = struct.unpack('!H', self._recv(2))
+            elif length == 127:
+                length, = struct.unpack('!Q', self._recv(8))
+            mask = self._recv(4) if b1 & 0x80 else None
+            payload = self._recv(length)
+            if mask is not None:
+                payload = _ws_unmask(payload, mask)
+            return b0 & 0x80, b0 & 0x0f, payload
+
+        def _send_frame(self, opcode, payload):
+            length = len(payload)
+            if length < 126:
+                header = struct.pack('!BB', 0x80 | opcode, length)
+            elif length < 0x10000:
+                header = struct.pack('!BBH', 0x80 | opcode, 126, length)
+            else:
+                header = struct.pack('!BBQ', 0x80 | opcode, 127, length)
+            # green threads sharing the connection must not interleave
+            # their frames.
+            with self._send_sem:
+                self.socket.sendall(header + payload)
+
+        def send(self, message):
+            """
+            Sends message, as a text message if it is a str and as a
+            binary one otherwise.
+            """
+            if isinstance(message, str):
+                self._send_frame(_WS_TEXT, message.encode('utf-8'))
+            else:
+                self._send_frame(_WS_BINARY, bytes(message))
+
+        def wait(self):
+            """
+            Returns the next message received, a str for a text message
+            and bytes for a binary one, or None once the connection is
+            closed.
+            """
+            opcode = None
+            fragments = []
+            while not self.closed:
+                try:
+                    fin, frame_opcode, payload = self._recv_frame()
+                except (EOFError, socket.error):
+                    self.closed = True
+                    break
+                if frame_opcode == _WS_CLOSE:
+                    self.close()
+                    break
+                elif frame_opcode == _WS_PING:
+                    self._send_frame(_WS_PONG, payload)
+                    continue
+                elif frame_opcode == _WS_PONG:
+                    continue
+                elif frame_opcode != _WS_CONTINUATION:
+                    opcode = frame_opcode
+                    fragments = []
+                fragments.append(payload)
+                if fin:
+                    message = b''.join(fragments)
+                    if opcode == _WS_TEXT:
+                        return message.decode('utf-8')
+                    return message
+            return None
+
+        def close(self):
+            if self.closed:
+                return
+            self.closed = True
+            try:
+                self._send_frame(_WS_CLOSE, b'')
+            except socket.error:
+                pass
+
+    class WebSocketWSGI(object):
+        """
+        WSGI application which accepts a WebSocket connection and calls
+        handler with its WebSocket.  It is served by WSGIServer only.
+        """
+
+        def __init__(self, handler):
+            self.handler = handler
+
+        def __call__(self, environ, start_response):
+            sock = environ[_WSGI_SOCKET]
+            key = environ.get('HTTP_SEC_WEBSOCKET_KEY')
+            if (environ.get('HTTP_UPGRADE', '').lower() != 'websocket' or
+                    'upgrade' not in
+                    environ.get('HTTP_CONNECTION', '').lower() or
+                    environ.get('HTTP_SEC_WEBSOCKET_VERSION') != '13' or
+                    not key):
+                environ[_WSGI_TAKEN_OVER] = '400 Bad Request'
+                sock.sendall(b'HTTP/1.1 400 Bad Request\r\n'
+                             b'Content-Length: 0\r\n'
+                             b'Connection: close\r\n\r\n')
+                return []
+
+            accept = base64.b64encode(
+                hashlib.sha1(key.encode('ascii') + _WS_GUID).digest())
+            environ[_WSGI_TAKEN_OVER] = '101 Switching Protocols'
+            sock.sendall(b'HTTP/1.1 101 Switching Protocols\r\n'
+                         b'Upgrade: websocket\r\n'
+                         b'Connection: Upgrade\r\n'
+                         b'Sec-WebSocket-Accept: ' + accept +
+                         b'\r\n\r\n')
+            ws = WebSocket(sock, environ['wsgi.input'], environ)
+            try:
+                self.handler(ws)
+            finally:
+                ws.close()
+            return []
@@ -19,13 +19,17 @@ Information Export Format [RFC6396].
 """
 
 import abc
+import array
 import logging
+import mmap
+import multiprocessing
 import struct
 import time
 
 import netaddr
 import six
 
+from ryu import utils
 from ryu.lib import addrconv
 from ryu.lib import ip
 from ryu.lib import stringify
@@ -1320,6 +1324,299 @@ class Reader(object):
         self.close()
 
 
+# TABLE_DUMP_V2 subtypes of the records of a prefix:
+#   subtype: (length of the address, whether entries have path_id)
+_TABLE_DUMP_V2_RIB_SUBTYPES = {
+    TableDump2MrtRecord.SUBTYPE_RIB_IPV4_UNICAST: (4, False),
+    TableDump2MrtRecord.SUBTYPE_RIB_IPV4_MULTICAST: (4, False),
+    TableDump2MrtRecord.SUBTYPE_RIB_IPV6_UNICAST: (16, False),
+    TableDump2MrtRecord.SUBTYPE_RIB_IPV6_MULTICAST: (16, False),
+    TableDump2MrtRecord.SUBTYPE_RIB_IPV4_UNICAST_ADDPATH: (4, True),
+    TableDump2MrtRecord.SUBTYPE_RIB_IPV4_MULTICAST_ADDPATH: (4, True),
+    TableDump2MrtRecord.SUBTYPE_RIB_IPV6_UNICAST_ADDPATH: (16, True),
+    TableDump2MrtRecord.SUBTYPE_RIB_IPV6_MULTICAST_ADDPATH: (16, True),
+}
+
+
+def _decode_records(conn, path, spans, func):
+    # runs in a worker process of IndexedReader.decode(), sends the list
+    # of the results or the exception raised
+    try:
+        with open(path, 'rb') as f:
+            buf = utils.map_file(f)
+        records = (MrtRecord.parse(buf[offset:offset + size])[0]
+                   for offset, size in spans)
+        if func is None:
+            result = list(records)
+        else:
+            result = [func(record) for record in records]
+    except Exception as e:
+        result = e
+    conn.send(result)
+    conn.close()
+
+
+class IndexedReader(object):
+    """
+    MRT format file reader with an index of the records.
+
+    ========= ================================================
+    Argument  Description
+    ========= ================================================
+    f         File object which reading MRT format file
+              in binary mode.
+    ========= ================================================
+
+    The file is mapped in memory if it is a regular file, otherwise read
+    at once, e.g. a compressed file.  The index is built by reading only
+    the headers of the records: the i-th record of the file is at
+    ``offsets[i]`` and has the MRT type ``types[i]``, the subtype
+    ``subtypes[i]`` and the timestamp ``timestamps[i]``, which are
+    array.array.
+
+    The records are decoded on access, e.g. ``reader[i]``, or all at once
+    by decode().  select() finds the records by type, time, prefix or
+    peer without decoding them.
+
+    Example of Usage::
+
+        from ryu.lib import mrtlib
+
+        reader = mrtlib.IndexedReader(open('rib.YYYYMMDD.hhmm', 'rb'))
+        indexes = reader.select(prefixes=['10.0.0.0/8'],
+                                peers=['192.168.1.1'])
+        for record in reader.decode(indexes):
+            print(record.message.prefix)
+    """
+
+    def __init__(self, f):
+        self._f = f
+        # decode() in processes maps the file again
+        self._path = getattr(f, 'name', None)
+        self._buf = utils.map_file(f)
+        if not isinstance(self._buf, mmap.mmap):
+            self._path = None
+        self.offsets = array.array('Q')
+        self.types = array.array('H')
+        self.subtypes = array.array('H')
+        self.timestamps = array.array('I')
+        self._sizes = array.array('I')
+        # peer IP address: set of TABLE_DUMP_V2 indexes
+        self._peer_indexes = None
+        self._build_index()
+
+    def _build_index(self):
+        buf = self._buf
+        end = len(buf)
+        unpack_from = struct.Struct(MrtRecord._HEADER_FMT).unpack_from
+        ext_ts_types = MrtRecord._EXT_TS_TYPES
+        offset = 0
+        while offset + MrtRecord.HEADER_SIZE <= end:
+            timestamp, type_, subtype, length = unpack_from(buf, offset)
+            if type_ in ext_ts_types:
+                size = ExtendedTimestampMrtRecord.HEADER_SIZE + length
+            else:
+                size = MrtCommonRecord.HEADER_SIZE + length
+            if offset + size > end:
+                # truncated
+                break
+            self.offsets.append(offset)
+            self.types.append(type_)
+            self.subtypes.append(subtype)
+            self.timestamps.append(timestamp)
+            self._sizes.append(size)
+            offset += size
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, index):
+        offset = self.offsets[index]
+        record, _ = MrtRecord.parse(
+            self._buf[offset:offset + self._sizes[index]])
+        return record
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def decode(self, indexes=None, processes=None, func=None):
+        """
+        Returns the list of the records of *indexes*, or of all the
+        records if None, or of func(record) if *func* is given.
+
+        With *processes*, the records are decoded by as many worker
+        processes, which also call *func*, a function picklable by name.
+        The records sent back from the workers cost about as much to
+        unpickle as to decode, so *func* should rather return only what
+        is needed of them, e.g. the prefix and the AS paths.
+        The records are decoded in this process if the file is not a
+        regular file.
+        """
+        if indexes is None:
+            indexes = range(len(self))
+        if processes is None or self._path is None:
+            records = (self[index] for index in indexes)
+            if func is None:
+                return list(records)
+            return [func(record) for record in records]
+
+        # Note: not multiprocessing.Pool, whose threads hang once the
+        # hub patched threading.
+        spans = [(self.offsets[index], self._sizes[index])
+                 for index in indexes]
+        part_size = -(-len(spans) // processes) or 1
+        workers = []
+        for i in range(0, len(spans), part_size):
+            conn, child_conn = multiprocessing.Pipe(duplex=False)
+            worker = multiprocessing.Process(
+                target=_decode_records,
+                args=(child_conn, self._path, spans[i:i + part_size], func))
+            worker.start()
+            child_conn.close()
+            workers.append((worker, conn))
+        results = []
+        error = None
+        for worker, conn in workers:
+            result = conn.recv()
+            conn.close()
+            worker.join()
+            if isinstance(result, Exception):
+                error = error or result
+            else:
+                results.extend(result)
+        if error is not None:
+            raise error
+        return results
+
+    def select(self, types=None, subtypes=None, start=None, end=None,
+               prefixes=None, peers=None):
+        """
+        Returns the list of the indexes of the records which match all
+        the given conditions.
+
+        ========= ================================================
+        Argument  Description
+        ========= ================================================
+        types     List of MRT types
+        subtypes  List of MRT subtypes
+        start     Min timestamp (inclusive)
+        end       Max timestamp (exclusive)
+        prefixes  List of prefixes, e.g. '10.0.0.0/8', in which the
+                  prefix of a record is
+        peers     List of IP addresses of peers, one of which has
+                  an entry in a record
+        ========= ================================================
+
+        *prefixes* and *peers* select TABLE_DUMP_V2 RIB records of
+        AFI/SAFI specific subtypes, e.g. SUBTYPE_RIB_IPV4_UNICAST, whose
+        prefix and entries are read without decoding the records.
+        """
+        ranges = None
+        if prefixes is not None:
+            ranges = []
+            for prefix in prefixes:
+                net = netaddr.IPNetwork(prefix)
+                bits = 32 if net.version == 4 else 128
+                ranges.append((bits // 8, net.prefixlen,
+                               int(net.network) >> (bits - net.prefixlen)))
+        peer_indexes = None
+        if peers is not None:
+            table = self._get_peer_indexes()
+            peer_indexes = set()
+            for peer in peers:
+                peer_indexes.update(
+                    table.get(str(netaddr.IPAddress(peer)), ()))
+        if ranges is not None or peer_indexes is not None:
+            if types is not None and \
+                    MrtRecord.TYPE_TABLE_DUMP_V2 not in types:
+                return []
+            types = [MrtRecord.TYPE_TABLE_DUMP_V2]
+            rib_subtypes = set(_TABLE_DUMP_V2_RIB_SUBTYPES)
+            subtypes = rib_subtypes if subtypes is None else \
+                rib_subtypes.intersection(subtypes)
+
+        types = None if types is None else set(types)
+        subtypes = None if subtypes is None else set(subtypes)
+        indexes = []
+        for index in range(len(self)):
+            if types is not None and self.types[index] not in types:
+                continue
+            if subtypes is not None and \
+                    self.subtypes[index] not in subtypes:
+                continue
+            timestamp = self.timestamps[index]
+            if start is not None and timestamp < start:
+                continue
+            if end is not None and timestamp >= end:
+                continue
+            if (ranges is not None or peer_indexes is not None) and \
+                    not self._match_rib(index, ranges, peer_indexes):
+                continue
+            indexes.append(index)
+        return indexes
+
+    def _match_rib(self, index, ranges, peer_indexes):
+        # the TABLE_DUMP_V2 RIB record: sequence number, prefix length,
+        # prefix, entry count and entries
+        buf = self._buf
+        addr_len, is_addpath = _TABLE_DUMP_V2_RIB_SUBTYPES[
+            self.subtypes[index]]
+        offset = self.offsets[index] + MrtCommonRecord.HEADER_SIZE + 4
+        prefix_len = six.indexbytes(buf, offset)
+        prefix_bin = buf[offset + 1:offset + 1 + (prefix_len + 7) // 8]
+        offset += 1 + len(prefix_bin)
+        if ranges is not None:
+            prefix = int.from_bytes(prefix_bin, 'big') << (
+                (addr_len - len(prefix_bin)) * 8)
+            for range_addr_len, range_len, range_net in ranges:
+                if range_addr_len == addr_len and range_len <= prefix_len \
+                        and prefix >> (addr_len * 8 - range_len) == range_net:
+                    break
+            else:
+                return False
+        if peer_indexes is None:
+            return True
+        (entry_count,) = struct.unpack_from('!H', buf, offset)
+        offset += 2
+        # peer_index, originated_time, (path_id) and attr_len
+        attr_len_offset = 10 if is_addpath else 6
+        for _i in range(entry_count):
+            (peer_index,) = struct.unpack_from('!H', buf, offset)
+            if peer_index in peer_indexes:
+                return True
+            (attr_len,) = struct.unpack_from('!H', buf,
+                                             offset + attr_len_offset)
+            offset += attr_len_offset + 2 + attr_len
+        return False
+
+    def _get_peer_indexes(self):
+        # from the first PEER_INDEX_TABLE record, which may list a peer
+        # IP address under several indexes, e.g. with different BGP IDs
+        if self._peer_indexes is None:
+            self._peer_indexes = {}
+            for index in range(len(self)):
+                if self.types[index] == MrtRecord.TYPE_TABLE_DUMP_V2 and \
+                        self.subtypes[index] == \
+                        TableDump2MrtRecord.SUBTYPE_PEER_INDEX_TABLE:
+                    for i, peer in enumerate(self[index].message.peer_entries):
+                        self._peer_indexes.setdefault(
+                            str(netaddr.IPAddress(peer.ip_addr)),
+                            set()).add(i)
+                    break
+        return self._peer_indexes
+
+    def close(self):
+        if isinstance(self._buf, mmap.mmap):
+            self._buf.close()
+        self._f.close()
+
+    def __del__(self):
+        # __init__ may have failed before mapping the file
+        if hasattr(self, '_buf'):
+            self.close()
+
+
 class Writer(object):
     """
     MRT format file writer.
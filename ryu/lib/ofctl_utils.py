@@ -19,13 +19,15 @@ import logging
 import netaddr
 import six
 
+from ryu import exception
 from ryu.lib import dpid
-from ryu.lib import hub
 from ryu.ofproto import ofproto_v1_2
 
 
 LOG = logging.getLogger(__name__)
 DEFAULT_TIMEOUT = 1.0
+# deadline of a stats request, for all the parts of the reply
+DEFAULT_STATS_TIMEOUT = 10.0
 
 # NOTE(jkoelker) Constants for converting actions
 OUTPUT = 'OUTPUT'
@@ -242,35 +244,39 @@ def send_msg(dp, msg, logger=None):
     dp.send_msg(msg)
 
 
-def send_stats_request(dp, stats, waiters, msgs, logger=None):
-    dp.set_xid(stats)
-    waiters_per_dp = waiters.setdefault(dp.id, {})
-    lock = hub.Event()
-    previous_msg_len = len(msgs)
-    waiters_per_dp[stats.xid] = (lock, msgs)
-    send_msg(dp, stats, logger)
+def send_stats_request(dp, stats, msgs, logger=None,
+                       timeout=DEFAULT_STATS_TIMEOUT):
+    future = dp.send_request(stats, timeout=timeout)
 
-    lock.wait(timeout=DEFAULT_TIMEOUT)
-    current_msg_len = len(msgs)
+    log = get_logger(logger)
+    log_msg = ('Sent request with xid(%x) to '
+               'datapath(' + dpid._DPID_FMT + '): %s')
+    log.debug(log_msg, stats.xid, dp.id, stats)
 
-    while current_msg_len > previous_msg_len:
-        previous_msg_len = current_msg_len
-        lock.wait(timeout=DEFAULT_TIMEOUT)
-        current_msg_len = len(msgs)
+    # The future is done once all the parts of the reply are received,
+    # or fails when the deadline passes.
+    try:
+        future.result()
+    except exception.OFPRequestTimeout:
+        log.debug('No complete reply to xid(%x) in %s seconds',
+                  stats.xid, timeout)
+    except (exception.OFPErrorReply,
+            exception.OFPDatapathDisconnected) as e:
+        log.debug('%s', e)
 
-    if not lock.is_set():
-        del waiters_per_dp[stats.xid]
+    # the parts received before a failure, as the callers expect
+    msgs.extend(future.replies)
 
 
 def str_to_int(str_num):
     return int(str(str_num), 0)
 
 
-def get_role(dp, waiters, to_user):
+def get_role(dp, to_user):
     stats = dp.ofproto_parser.OFPRoleRequest(
         dp, dp.ofproto.OFPCR_ROLE_NOCHANGE, generation_id=0)
     msgs = []
-    send_stats_request(dp, stats, waiters, msgs, LOG)
+    send_stats_request(dp, stats, msgs, LOG)
     descs = []
 
     for msg in msgs:
@@ -278,10 +278,10 @@ def nw_dst_to_str(wildcards, addr):
     return ip
 
 
-def get_desc_stats(dp, waiters):
+def get_desc_stats(dp):
     stats = dp.ofproto_parser.OFPDescStatsRequest(dp, 0)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
     s = {}
 
     for msg in msgs:
@@ -291,7 +291,7 @@ def get_desc_stats(dp, waiters):
     return {str(dp.id): s}
 
 
-def get_queue_stats(dp, waiters, port=None, queue_id=None):
+def get_queue_stats(dp, port=None, queue_id=None):
     if port is None:
         port = dp.ofproto.OFPP_ALL
     else:
@@ -305,7 +305,7 @@ def get_queue_stats(dp, waiters, port=None, queue_id=None):
     stats = dp.ofproto_parser.OFPQueueStatsRequest(dp, 0, port,
                                                    queue_id)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     s = []
     for msg in msgs:
@@ -320,7 +320,7 @@ def get_queue_stats(dp, waiters, port=None, queue_id=None):
     return {str(dp.id): s}
 
 
-def get_flow_stats(dp, waiters, flow=None):
+def get_flow_stats(dp, flow=None):
     flow = flow if flow else {}
     match = to_match(dp, flow.get('match', {}))
     table_id = UTIL.ofp_table_from_user(
@@ -335,7 +335,7 @@ def get_flow_stats(dp, waiters, flow=None):
         dp, 0, match, table_id, out_port)
 
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     flows = []
     for msg in msgs:
@@ -362,7 +362,7 @@ def get_flow_stats(dp, waiters, flow=None):
     return {str(dp.id): flows}
 
 
-def get_aggregate_flow_stats(dp, waiters, flow=None):
+def get_aggregate_flow_stats(dp, flow=None):
     flow = flow if flow else {}
     match = to_match(dp, flow.get('match', {}))
     table_id = UTIL.ofp_table_from_user(
@@ -374,7 +374,7 @@ def get_aggregate_flow_stats(dp, waiters, flow=None):
         dp, 0, match, table_id, out_port)
 
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     flows = []
     for msg in msgs:
@@ -388,11 +388,11 @@ def get_aggregate_flow_stats(dp, waiters, flow=None):
     return {str(dp.id): flows}
 
 
-def get_table_stats(dp, waiters):
+def get_table_stats(dp):
     stats = dp.ofproto_parser.OFPTableStatsRequest(dp, 0)
     ofp = dp.ofproto
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     match_convert = {ofp.OFPFW_IN_PORT: 'IN_PORT',
                      ofp.OFPFW_DL_VLAN: 'DL_VLAN',
@@ -438,7 +438,7 @@ def get_table_stats(dp, waiters):
     return {str(dp.id): tables}
 
 
-def get_port_stats(dp, waiters, port=None):
+def get_port_stats(dp, port=None):
     if port is None:
         port = dp.ofproto.OFPP_NONE
     else:
@@ -447,7 +447,7 @@ def get_port_stats(dp, waiters, port=None):
     stats = dp.ofproto_parser.OFPPortStatsRequest(
         dp, 0, port)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     ports = []
     for msg in msgs:
@@ -470,11 +470,11 @@ def get_port_stats(dp, waiters, port=None):
     return {str(dp.id): ports}
 
 
-def get_port_desc(dp, waiters):
+def get_port_desc(dp):
 
     stats = dp.ofproto_parser.OFPFeaturesRequest(dp)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     descs = []
     for msg in msgs:
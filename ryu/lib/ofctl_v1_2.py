@@ -298,10 +298,10 @@ def match_vid_to_str(value, mask):
         value, mask, ofproto_v1_2.OFPVID_PRESENT)
 
 
-def get_desc_stats(dp, waiters):
+def get_desc_stats(dp):
     stats = dp.ofproto_parser.OFPDescStatsRequest(dp)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     s = {}
     for msg in msgs:
@@ -311,7 +311,7 @@ def get_desc_stats(dp, waiters):
     return {str(dp.id): s}
 
 
-def get_queue_stats(dp, waiters, port=None, queue_id=None):
+def get_queue_stats(dp, port=None, queue_id=None):
     ofp = dp.ofproto
 
     if port is None:
@@ -327,7 +327,7 @@ def get_queue_stats(dp, waiters, port=None, queue_id=None):
     stats = dp.ofproto_parser.OFPQueueStatsRequest(dp, port,
                                                    queue_id, 0)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     s = []
     for msg in msgs:
@@ -342,7 +342,7 @@ def get_queue_stats(dp, waiters, port=None, queue_id=None):
     return {str(dp.id): s}
 
 
-def get_queue_config(dp, waiters, port=None):
+def get_queue_config(dp, port=None):
     ofp = dp.ofproto
     if port is None:
         port = ofp.OFPP_ANY
@@ -350,7 +350,7 @@ def get_queue_config(dp, waiters, port=None):
         port = UTIL.ofp_port_from_user(str_to_int(port))
     stats = dp.ofproto_parser.OFPQueueGetConfigRequest(dp, port)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     prop_type = {
         dp.ofproto.OFPQT_MIN_RATE: 'MIN_RATE',
@@ -383,7 +383,7 @@ def get_queue_config(dp, waiters, port=None):
     return {str(dp.id): configs}
 
 
-def get_flow_stats(dp, waiters, flow=None):
+def get_flow_stats(dp, flow=None):
     flow = flow if flow else {}
     table_id = UTIL.ofp_table_from_user(
         flow.get('table_id', dp.ofproto.OFPTT_ALL))
@@ -402,7 +402,7 @@ def get_flow_stats(dp, waiters, flow=None):
         dp, table_id, out_port, out_group, cookie, cookie_mask, match)
 
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     flows = []
     for msg in msgs:
@@ -429,7 +429,7 @@ def get_flow_stats(dp, waiters, flow=None):
     return {str(dp.id): flows}
 
 
-def get_aggregate_flow_stats(dp, waiters, flow=None):
+def get_aggregate_flow_stats(dp, flow=None):
     flow = flow if flow else {}
     table_id = UTIL.ofp_table_from_user(
         flow.get('table_id', dp.ofproto.OFPTT_ALL))
@@ -445,7 +445,7 @@ def get_aggregate_flow_stats(dp, waiters, flow=None):
         dp, table_id, out_port, out_group, cookie, cookie_mask, match)
 
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     flows = []
     for msg in msgs:
@@ -458,11 +458,11 @@ def get_aggregate_flow_stats(dp, waiters, flow=None):
     return {str(dp.id): flows}
 
 
-def get_table_stats(dp, waiters):
+def get_table_stats(dp):
     stats = dp.ofproto_parser.OFPTableStatsRequest(dp)
     ofp = dp.ofproto
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     oxm_type_convert = {ofp.OFPXMT_OFB_IN_PORT: 'IN_PORT',
                         ofp.OFPXMT_OFB_IN_PHY_PORT: 'IN_PHY_PORT',
@@ -582,7 +582,7 @@ def get_table_stats(dp, waiters):
     return {str(dp.id): tables}
 
 
-def get_port_stats(dp, waiters, port=None):
+def get_port_stats(dp, port=None):
     if port is None:
         port = dp.ofproto.OFPP_ANY
     else:
@@ -591,7 +591,7 @@ def get_port_stats(dp, waiters, port=None):
     stats = dp.ofproto_parser.OFPPortStatsRequest(
         dp, port, 0)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     ports = []
     for msg in msgs:
@@ -614,7 +614,7 @@ def get_port_stats(dp, waiters, port=None):
     return {str(dp.id): ports}
 
 
-def get_group_stats(dp, waiters, group_id=None):
+def get_group_stats(dp, group_id=None):
     if group_id is None:
         group_id = dp.ofproto.OFPG_ALL
     else:
@@ -623,7 +623,7 @@ def get_group_stats(dp, waiters, group_id=None):
     stats = dp.ofproto_parser.OFPGroupStatsRequest(
         dp, group_id, 0)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     groups = []
     for msg in msgs:
@@ -644,7 +644,7 @@ def get_group_stats(dp, waiters, group_id=None):
     return {str(dp.id): groups}
 
 
-def get_group_features(dp, waiters):
+def get_group_features(dp):
 
     ofp = dp.ofproto
     type_convert = {ofp.OFPGT_ALL: 'ALL',
@@ -672,7 +672,7 @@ def get_group_features(dp, waiters):
 
     stats = dp.ofproto_parser.OFPGroupFeaturesStatsRequest(dp, 0)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     features = []
     for msg in msgs:
@@ -704,7 +704,7 @@ def get_group_features(dp, waiters):
     return {str(dp.id): features}
 
 
-def get_group_desc(dp, waiters):
+def get_group_desc(dp):
 
     type_convert = {dp.ofproto.OFPGT_ALL: 'ALL',
                     dp.ofproto.OFPGT_SELECT: 'SELECT',
@@ -713,7 +713,7 @@ def get_group_desc(dp, waiters):
 
     stats = dp.ofproto_parser.OFPGroupDescStatsRequest(dp, 0)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     descs = []
     for msg in msgs:
@@ -736,11 +736,11 @@ def get_group_desc(dp, waiters):
     return {str(dp.id): descs}
 
 
-def get_port_desc(dp, waiters):
+def get_port_desc(dp):
 
     stats = dp.ofproto_parser.OFPFeaturesRequest(dp)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     descs = []
 
@@ -763,8 +763,8 @@ def get_port_desc(dp, waiters):
     return {str(dp.id): descs}
 
 
-def get_role(dp, waiters, to_user=True):
-    return ofctl_utils.get_role(dp, waiters, to_user)
+def get_role(dp, to_user=True):
+    return ofctl_utils.get_role(dp, to_user)
 
 
 def mod_flow_entry(dp, flow, cmd):
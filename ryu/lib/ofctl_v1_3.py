@@ -337,10 +337,10 @@ def wrap_dpid_dict(dp, value, to_user=True):
     return {dp.id: value}
 
 
-def get_desc_stats(dp, waiters, to_user=True):
+def get_desc_stats(dp, to_user=True):
     stats = dp.ofproto_parser.OFPDescStatsRequest(dp, 0)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
     s = {}
 
     for msg in msgs:
@@ -350,7 +350,7 @@ def get_desc_stats(dp, waiters, to_user=True):
     return wrap_dpid_dict(dp, s, to_user)
 
 
-def get_queue_stats(dp, waiters, port=None, queue_id=None, to_user=True):
+def get_queue_stats(dp, port=None, queue_id=None, to_user=True):
     ofp = dp.ofproto
 
     if port is None:
@@ -366,7 +366,7 @@ def get_queue_stats(dp, waiters, port=None, queue_id=None, to_user=True):
     stats = dp.ofproto_parser.OFPQueueStatsRequest(dp, 0, port,
                                                    queue_id)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     s = []
     for msg in msgs:
@@ -383,7 +383,7 @@ def get_queue_stats(dp, waiters, port=None, queue_id=None, to_user=True):
     return wrap_dpid_dict(dp, s, to_user)
 
 
-def get_queue_config(dp, waiters, port=None, to_user=True):
+def get_queue_config(dp, port=None, to_user=True):
     ofp = dp.ofproto
     if port is None:
         port = ofp.OFPP_ANY
@@ -391,7 +391,7 @@ def get_queue_config(dp, waiters, port=None, to_user=True):
         port = UTIL.ofp_port_from_user(str_to_int(port))
     stats = dp.ofproto_parser.OFPQueueGetConfigRequest(dp, port)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     prop_type = {dp.ofproto.OFPQT_MIN_RATE: 'MIN_RATE',
                  dp.ofproto.OFPQT_MAX_RATE: 'MAX_RATE',
@@ -437,7 +437,7 @@ def get_queue_config(dp, waiters, port=None, to_user=True):
     return wrap_dpid_dict(dp, configs, to_user)
 
 
-def get_flow_stats(dp, waiters, flow=None, to_user=True):
+def get_flow_stats(dp, flow=None, to_user=True):
     flow = flow if flow else {}
     table_id = UTIL.ofp_table_from_user(
         flow.get('table_id', dp.ofproto.OFPTT_ALL))
@@ -458,7 +458,7 @@ def get_flow_stats(dp, waiters, flow=None, to_user=True):
         match)
 
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     flows = []
     for msg in msgs:
@@ -493,7 +493,7 @@ def get_flow_stats(dp, waiters, flow=None, to_user=True):
     return wrap_dpid_dict(dp, flows, to_user)
 
 
-def get_aggregate_flow_stats(dp, waiters, flow=None, to_user=True):
+def get_aggregate_flow_stats(dp, flow=None, to_user=True):
     flow = flow if flow else {}
     table_id = UTIL.ofp_table_from_user(
         flow.get('table_id', dp.ofproto.OFPTT_ALL))
@@ -511,7 +511,7 @@ def get_aggregate_flow_stats(dp, waiters, flow=None, to_user=True):
         match)
 
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     flows = []
     for msg in msgs:
@@ -524,10 +524,10 @@ def get_aggregate_flow_stats(dp, waiters, flow=None, to_user=True):
     return wrap_dpid_dict(dp, flows, to_user)
 
 
-def get_table_stats(dp, waiters, to_user=True):
+def get_table_stats(dp, to_user=True):
     stats = dp.ofproto_parser.OFPTableStatsRequest(dp, 0)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     tables = []
     for msg in msgs:
@@ -548,11 +548,11 @@ def get_table_stats(dp, waiters, to_user=True):
     return wrap_dpid_dict(dp, tables, to_user)
 
 
-def get_table_features(dp, waiters, to_user=True):
+def get_table_features(dp, to_user=True):
     stats = dp.ofproto_parser.OFPTableFeaturesStatsRequest(dp, 0, [])
     msgs = []
     ofproto = dp.ofproto
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     prop_type = {ofproto.OFPTFPT_INSTRUCTIONS: 'INSTRUCTIONS',
                  ofproto.OFPTFPT_INSTRUCTIONS_MISS: 'INSTRUCTIONS_MISS',
@@ -652,7 +652,7 @@ def get_table_features(dp, waiters, to_user=True):
     return wrap_dpid_dict(dp, tables, to_user)
 
 
-def get_port_stats(dp, waiters, port=None, to_user=True):
+def get_port_stats(dp, port=None, to_user=True):
     if port is None:
         port = dp.ofproto.OFPP_ANY
     else:
@@ -661,7 +661,7 @@ def get_port_stats(dp, waiters, port=None, to_user=True):
     stats = dp.ofproto_parser.OFPPortStatsRequest(
         dp, 0, port)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     ports = []
     for msg in msgs:
@@ -692,7 +692,7 @@ def get_port_stats(dp, waiters, port=None, to_user=True):
     return wrap_dpid_dict(dp, ports, to_user)
 
 
-def get_meter_stats(dp, waiters, meter_id=None, to_user=True):
+def get_meter_stats(dp, meter_id=None, to_user=True):
     if meter_id is None:
         meter_id = dp.ofproto.OFPM_ALL
     else:
@@ -701,7 +701,7 @@ def get_meter_stats(dp, waiters, meter_id=None, to_user=True):
     stats = dp.ofproto_parser.OFPMeterStatsRequest(
         dp, 0, meter_id)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     meters = []
     for msg in msgs:
@@ -730,7 +730,7 @@ def get_meter_stats(dp, waiters, meter_id=None, to_user=True):
     return wrap_dpid_dict(dp, meters, to_user)
 
 
-def get_meter_features(dp, waiters, to_user=True):
+def get_meter_features(dp, to_user=True):
 
     ofp = dp.ofproto
     type_convert = {ofp.OFPMBT_DROP: 'DROP',
@@ -743,7 +743,7 @@ def get_meter_features(dp, waiters, to_user=True):
 
     stats = dp.ofproto_parser.OFPMeterFeaturesStatsRequest(dp, 0)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     features = []
     for msg in msgs:
@@ -778,7 +778,7 @@ def get_meter_features(dp, waiters, to_user=True):
     return wrap_dpid_dict(dp, features, to_user)
 
 
-def get_meter_config(dp, waiters, meter_id=None, to_user=True):
+def get_meter_config(dp, meter_id=None, to_user=True):
     flags = {dp.ofproto.OFPMF_KBPS: 'KBPS',
              dp.ofproto.OFPMF_PKTPS: 'PKTPS',
              dp.ofproto.OFPMF_BURST: 'BURST',
@@ -796,7 +796,7 @@ def get_meter_config(dp, waiters, meter_id=None, to_user=True):
     stats = dp.ofproto_parser.OFPMeterConfigStatsRequest(
         dp, 0, meter_id)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     configs = []
     for msg in msgs:
@@ -840,7 +840,7 @@ def get_meter_config(dp, waiters, meter_id=None, to_user=True):
     return wrap_dpid_dict(dp, configs, to_user)
 
 
-def get_group_stats(dp, waiters, group_id=None, to_user=True):
+def get_group_stats(dp, group_id=None, to_user=True):
     if group_id is None:
         group_id = dp.ofproto.OFPG_ALL
     else:
@@ -849,7 +849,7 @@ def get_group_stats(dp, waiters, group_id=None, to_user=True):
     stats = dp.ofproto_parser.OFPGroupStatsRequest(
         dp, 0, group_id)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     groups = []
     for msg in msgs:
@@ -878,7 +878,7 @@ def get_group_stats(dp, waiters, group_id=None, to_user=True):
     return wrap_dpid_dict(dp, groups, to_user)
 
 
-def get_group_features(dp, waiters, to_user=True):
+def get_group_features(dp, to_user=True):
 
     ofp = dp.ofproto
     type_convert = {ofp.OFPGT_ALL: 'ALL',
@@ -908,7 +908,7 @@ def get_group_features(dp, waiters, to_user=True):
 
     stats = dp.ofproto_parser.OFPGroupFeaturesStatsRequest(dp, 0)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     features = []
     for msg in msgs:
@@ -965,7 +965,7 @@ def get_group_features(dp, waiters, to_user=True):
     return wrap_dpid_dict(dp, features, to_user)
 
 
-def get_group_desc(dp, waiters, to_user=True):
+def get_group_desc(dp, to_user=True):
 
     type_convert = {dp.ofproto.OFPGT_ALL: 'ALL',
                     dp.ofproto.OFPGT_SELECT: 'SELECT',
@@ -974,7 +974,7 @@ def get_group_desc(dp, waiters, to_user=True):
 
     stats = dp.ofproto_parser.OFPGroupDescStatsRequest(dp, 0)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     descs = []
     for msg in msgs:
@@ -1009,11 +1009,11 @@ def get_group_desc(dp, waiters, to_user=True):
     return wrap_dpid_dict(dp, descs, to_user)
 
 
-def get_port_desc(dp, waiters, to_user=True):
+def get_port_desc(dp, to_user=True):
 
     stats = dp.ofproto_parser.OFPPortDescStatsRequest(dp, 0)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     descs = []
 
@@ -1042,8 +1042,8 @@ def get_port_desc(dp, waiters, to_user=True):
     return wrap_dpid_dict(dp, descs, to_user)
 
 
-def get_role(dp, waiters, to_user=True):
-    return ofctl_utils.get_role(dp, waiters, to_user)
+def get_role(dp, to_user=True):
+    return ofctl_utils.get_role(dp, to_user)
 
 
 def mod_flow_entry(dp, flow, cmd):
@@ -237,10 +237,10 @@ def wrap_dpid_dict(dp, value, to_user=True):
     return {dp.id: value}
 
 
-def get_desc_stats(dp, waiters, to_user=True):
+def get_desc_stats(dp, to_user=True):
     stats = dp.ofproto_parser.OFPDescStatsRequest(dp, 0)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
     s = {}
 
     for msg in msgs:
@@ -250,7 +250,7 @@ def get_desc_stats(dp, waiters, to_user=True):
     return wrap_dpid_dict(dp, s, to_user)
 
 
-def get_queue_stats(dp, waiters, port_no=None, queue_id=None, to_user=True):
+def get_queue_stats(dp, port_no=None, queue_id=None, to_user=True):
     if port_no is None:
         port_no = dp.ofproto.OFPP_ANY
     else:
@@ -263,7 +263,7 @@ def get_queue_stats(dp, waiters, port_no=None, queue_id=None, to_user=True):
     stats = dp.ofproto_parser.OFPQueueStatsRequest(
         dp, 0, port_no, queue_id)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     desc = []
     for msg in msgs:
@@ -283,7 +283,7 @@ def get_queue_stats(dp, waiters, port_no=None, queue_id=None, to_user=True):
     return wrap_dpid_dict(dp, desc, to_user)
 
 
-def get_queue_desc(dp, waiters, port_no=None, queue_id=None, to_user=True):
+def get_queue_desc(dp, port_no=None, queue_id=None, to_user=True):
     if port_no is None:
         port_no = dp.ofproto.OFPP_ANY
     else:
@@ -296,7 +296,7 @@ def get_queue_desc(dp, waiters, port_no=None, queue_id=None, to_user=True):
     stats = dp.ofproto_parser.OFPQueueDescStatsRequest(
         dp, 0, port_no, queue_id)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     configs = []
     for msg in msgs:
@@ -315,7 +315,7 @@ def get_queue_desc(dp, waiters, port_no=None, queue_id=None, to_user=True):
     return wrap_dpid_dict(dp, configs, to_user)
 
 
-def get_flow_stats(dp, waiters, flow=None, to_user=True):
+def get_flow_stats(dp, flow=None, to_user=True):
     flow = flow if flow else {}
     table_id = UTIL.ofp_table_from_user(
         flow.get('table_id', dp.ofproto.OFPTT_ALL))
@@ -336,7 +336,7 @@ def get_flow_stats(dp, waiters, flow=None, to_user=True):
         match)
 
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     flows = []
     for msg in msgs:
@@ -352,7 +352,7 @@ def get_flow_stats(dp, waiters, flow=None, to_user=True):
     return wrap_dpid_dict(dp, flows, to_user)
 
 
-def get_aggregate_flow_stats(dp, waiters, flow=None, to_user=True):
+def get_aggregate_flow_stats(dp, flow=None, to_user=True):
     flow = flow if flow else {}
     table_id = UTIL.ofp_table_from_user(
         flow.get('table_id', dp.ofproto.OFPTT_ALL))
@@ -370,7 +370,7 @@ def get_aggregate_flow_stats(dp, waiters, flow=None, to_user=True):
         match)
 
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     flows = []
     for msg in msgs:
@@ -381,10 +381,10 @@ def get_aggregate_flow_stats(dp, waiters, flow=None, to_user=True):
     return wrap_dpid_dict(dp, flows, to_user)
 
 
-def get_table_stats(dp, waiters, to_user=True):
+def get_table_stats(dp, to_user=True):
     stats = dp.ofproto_parser.OFPTableStatsRequest(dp, 0)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     tables = []
     for msg in msgs:
@@ -400,11 +400,11 @@ def get_table_stats(dp, waiters, to_user=True):
     return wrap_dpid_dict(dp, tables, to_user)
 
 
-def get_table_features(dp, waiters, to_user=True):
+def get_table_features(dp, to_user=True):
     stats = dp.ofproto_parser.OFPTableFeaturesStatsRequest(dp, 0, [])
     msgs = []
     ofproto = dp.ofproto
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     p_type_instructions = [ofproto.OFPTFPT_INSTRUCTIONS,
                            ofproto.OFPTFPT_INSTRUCTIONS_MISS]
@@ -476,7 +476,7 @@ def get_table_features(dp, waiters, to_user=True):
     return wrap_dpid_dict(dp, tables, to_user)
 
 
-def get_port_stats(dp, waiters, port_no=None, to_user=True):
+def get_port_stats(dp, port_no=None, to_user=True):
     if port_no is None:
         port_no = dp.ofproto.OFPP_ANY
     else:
@@ -484,7 +484,7 @@ def get_port_stats(dp, waiters, port_no=None, to_user=True):
 
     stats = dp.ofproto_parser.OFPPortStatsRequest(dp, 0, port_no)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     ports = []
     for msg in msgs:
@@ -506,7 +506,7 @@ def get_port_stats(dp, waiters, port_no=None, to_user=True):
     return wrap_dpid_dict(dp, ports, to_user)
 
 
-def get_meter_stats(dp, waiters, meter_id=None, to_user=True):
+def get_meter_stats(dp, meter_id=None, to_user=True):
     if meter_id is None:
         meter_id = dp.ofproto.OFPM_ALL
     else:
@@ -515,7 +515,7 @@ def get_meter_stats(dp, waiters, meter_id=None, to_user=True):
     stats = dp.ofproto_parser.OFPMeterStatsRequest(
         dp, 0, meter_id)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     meters = []
     for msg in msgs:
@@ -535,7 +535,7 @@ def get_meter_stats(dp, waiters, meter_id=None, to_user=True):
     return wrap_dpid_dict(dp, meters, to_user)
 
 
-def get_meter_features(dp, waiters, to_user=True):
+def get_meter_features(dp, to_user=True):
     ofp = dp.ofproto
     type_convert = {ofp.OFPMBT_DROP: 'DROP',
                     ofp.OFPMBT_DSCP_REMARK: 'DSCP_REMARK'}
@@ -547,7 +547,7 @@ def get_meter_features(dp, waiters, to_user=True):
 
     stats = dp.ofproto_parser.OFPMeterFeaturesStatsRequest(dp, 0)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     features = []
     for msg in msgs:
@@ -582,7 +582,7 @@ def get_meter_features(dp, waiters, to_user=True):
     return wrap_dpid_dict(dp, features, to_user)
 
 
-def get_meter_config(dp, waiters, meter_id=None, to_user=True):
+def get_meter_config(dp, meter_id=None, to_user=True):
     flags = {dp.ofproto.OFPMF_KBPS: 'KBPS',
              dp.ofproto.OFPMF_PKTPS: 'PKTPS',
              dp.ofproto.OFPMF_BURST: 'BURST',
@@ -596,7 +596,7 @@ def get_meter_config(dp, waiters, meter_id=None, to_user=True):
     stats = dp.ofproto_parser.OFPMeterConfigStatsRequest(
         dp, 0, meter_id)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     configs = []
     for msg in msgs:
@@ -631,7 +631,7 @@ def get_meter_config(dp, waiters, meter_id=None, to_user=True):
     return wrap_dpid_dict(dp, configs, to_user)
 
 
-def get_group_stats(dp, waiters, group_id=None, to_user=True):
+def get_group_stats(dp, group_id=None, to_user=True):
     if group_id is None:
         group_id = dp.ofproto.OFPG_ALL
     else:
@@ -640,7 +640,7 @@ def get_group_stats(dp, waiters, group_id=None, to_user=True):
     stats = dp.ofproto_parser.OFPGroupStatsRequest(
         dp, 0, group_id)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     groups = []
     for msg in msgs:
@@ -660,7 +660,7 @@ def get_group_stats(dp, waiters, group_id=None, to_user=True):
     return wrap_dpid_dict(dp, groups, to_user)
 
 
-def get_group_features(dp, waiters, to_user=True):
+def get_group_features(dp, to_user=True):
 
     ofp = dp.ofproto
     type_convert = {ofp.OFPGT_ALL: 'ALL',
@@ -691,7 +691,7 @@ def get_group_features(dp, waiters, to_user=True):
 
     stats = dp.ofproto_parser.OFPGroupFeaturesStatsRequest(dp, 0)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     features = []
     for msg in msgs:
@@ -748,10 +748,10 @@ def get_group_features(dp, waiters, to_user=True):
     return wrap_dpid_dict(dp, features, to_user)
 
 
-def get_group_desc(dp, waiters, to_user=True):
+def get_group_desc(dp, to_user=True):
     stats = dp.ofproto_parser.OFPGroupDescStatsRequest(dp, 0)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     descs = []
     for msg in msgs:
@@ -781,7 +781,7 @@ def get_group_desc(dp, waiters, to_user=True):
     return wrap_dpid_dict(dp, descs, to_user)
 
 
-def get_port_desc(dp, waiters, port_no=None, to_user=True):
+def get_port_desc(dp, port_no=None, to_user=True):
     if port_no is None:
         port_no = dp.ofproto.OFPP_ANY
     else:
@@ -789,7 +789,7 @@ def get_port_desc(dp, waiters, port_no=None, to_user=True):
 
     stats = dp.ofproto_parser.OFPPortDescStatsRequest(dp, 0, port_no)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     descs = []
 
@@ -817,8 +817,8 @@ def get_port_desc(dp, waiters, port_no=None, to_user=True):
     return wrap_dpid_dict(dp, descs, to_user)
 
 
-def get_role(dp, waiters, to_user=True):
-    return ofctl_utils.get_role(dp, waiters, to_user)
+def get_role(dp, to_user=True):
+    return ofctl_utils.get_role(dp, to_user)
 
 
 def mod_flow_entry(dp, flow, cmd):
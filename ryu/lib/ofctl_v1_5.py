@@ -269,10 +269,10 @@ def stats_to_str(ofstats):
     return stats
 
 
-def get_desc_stats(dp, waiters, to_user=True):
+def get_desc_stats(dp, to_user=True):
     stats = dp.ofproto_parser.OFPDescStatsRequest(dp, 0)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
     s = {}
 
     for msg in msgs:
@@ -282,7 +282,7 @@ def get_desc_stats(dp, waiters, to_user=True):
     return wrap_dpid_dict(dp, s, to_user)
 
 
-def get_queue_stats(dp, waiters, port_no=None, queue_id=None, to_user=True):
+def get_queue_stats(dp, port_no=None, queue_id=None, to_user=True):
     if port_no is None:
         port_no = dp.ofproto.OFPP_ANY
     else:
@@ -295,7 +295,7 @@ def get_queue_stats(dp, waiters, port_no=None, queue_id=None, to_user=True):
     stats = dp.ofproto_parser.OFPQueueStatsRequest(
         dp, 0, port_no, queue_id)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     desc = []
     for msg in msgs:
@@ -315,7 +315,7 @@ def get_queue_stats(dp, waiters, port_no=None, queue_id=None, to_user=True):
     return wrap_dpid_dict(dp, desc, to_user)
 
 
-def get_queue_desc(dp, waiters, port_no=None, queue_id=None, to_user=True):
+def get_queue_desc(dp, port_no=None, queue_id=None, to_user=True):
     if port_no is None:
         port_no = dp.ofproto.OFPP_ANY
     else:
@@ -328,7 +328,7 @@ def get_queue_desc(dp, waiters, port_no=None, queue_id=None, to_user=True):
     stats = dp.ofproto_parser.OFPQueueDescStatsRequest(
         dp, 0, port_no, queue_id)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     configs = []
     for msg in msgs:
@@ -347,7 +347,7 @@ def get_queue_desc(dp, waiters, port_no=None, queue_id=None, to_user=True):
     return wrap_dpid_dict(dp, configs, to_user)
 
 
-def get_flow_desc_stats(dp, waiters, flow=None, to_user=True):
+def get_flow_desc_stats(dp, flow=None, to_user=True):
     flow = flow if flow else {}
     table_id = UTIL.ofp_table_from_user(
         flow.get('table_id', dp.ofproto.OFPTT_ALL))
@@ -368,7 +368,7 @@ def get_flow_desc_stats(dp, waiters, flow=None, to_user=True):
         match)
 
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     flows = []
     for msg in msgs:
@@ -385,7 +385,7 @@ def get_flow_desc_stats(dp, waiters, flow=None, to_user=True):
     return wrap_dpid_dict(dp, flows, to_user)
 
 
-def get_flow_stats(dp, waiters, flow=None, to_user=True):
+def get_flow_stats(dp, flow=None, to_user=True):
     flow = flow if flow else {}
     table_id = UTIL.ofp_table_from_user(
         flow.get('table_id', dp.ofproto.OFPTT_ALL))
@@ -406,7 +406,7 @@ def get_flow_stats(dp, waiters, flow=None, to_user=True):
         match)
 
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     flows = []
     for msg in msgs:
@@ -422,7 +422,7 @@ def get_flow_stats(dp, waiters, flow=None, to_user=True):
     return wrap_dpid_dict(dp, flows, to_user)
 
 
-def get_aggregate_flow_stats(dp, waiters, flow=None, to_user=True):
+def get_aggregate_flow_stats(dp, flow=None, to_user=True):
     flow = flow if flow else {}
     table_id = UTIL.ofp_table_from_user(
         flow.get('table_id', dp.ofproto.OFPTT_ALL))
@@ -440,7 +440,7 @@ def get_aggregate_flow_stats(dp, waiters, flow=None, to_user=True):
         match)
 
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     flows = []
     for msg in msgs:
@@ -452,10 +452,10 @@ def get_aggregate_flow_stats(dp, waiters, flow=None, to_user=True):
     return wrap_dpid_dict(dp, flows, to_user)
 
 
-def get_table_stats(dp, waiters, to_user=True):
+def get_table_stats(dp, to_user=True):
     stats = dp.ofproto_parser.OFPTableStatsRequest(dp, 0)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     tables = []
     for msg in msgs:
@@ -471,11 +471,11 @@ def get_table_stats(dp, waiters, to_user=True):
     return wrap_dpid_dict(dp, tables, to_user)
 
 
-def get_table_features(dp, waiters, to_user=True):
+def get_table_features(dp, to_user=True):
     stats = dp.ofproto_parser.OFPTableFeaturesStatsRequest(dp, 0, [])
     msgs = []
     ofproto = dp.ofproto
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     p_type_instructions = [ofproto.OFPTFPT_INSTRUCTIONS,
                            ofproto.OFPTFPT_INSTRUCTIONS_MISS]
@@ -559,7 +559,7 @@ def get_table_features(dp, waiters, to_user=True):
     return wrap_dpid_dict(dp, tables, to_user)
 
 
-def get_port_stats(dp, waiters, port_no=None, to_user=True):
+def get_port_stats(dp, port_no=None, to_user=True):
     if port_no is None:
         port_no = dp.ofproto.OFPP_ANY
     else:
@@ -567,7 +567,7 @@ def get_port_stats(dp, waiters, port_no=None, to_user=True):
 
     stats = dp.ofproto_parser.OFPPortStatsRequest(dp, 0, port_no)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     ports = []
     for msg in msgs:
@@ -589,7 +589,7 @@ def get_port_stats(dp, waiters, port_no=None, to_user=True):
     return wrap_dpid_dict(dp, ports, to_user)
 
 
-def get_meter_stats(dp, waiters, meter_id=None, to_user=True):
+def get_meter_stats(dp, meter_id=None, to_user=True):
     if meter_id is None:
         meter_id = dp.ofproto.OFPM_ALL
     else:
@@ -598,7 +598,7 @@ def get_meter_stats(dp, waiters, meter_id=None, to_user=True):
     stats = dp.ofproto_parser.OFPMeterStatsRequest(
         dp, 0, meter_id)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     meters = []
     for msg in msgs:
@@ -618,7 +618,7 @@ def get_meter_stats(dp, waiters, meter_id=None, to_user=True):
     return wrap_dpid_dict(dp, meters, to_user)
 
 
-def get_meter_features(dp, waiters, to_user=True):
+def get_meter_features(dp, to_user=True):
     ofp = dp.ofproto
     type_convert = {ofp.OFPMBT_DROP: 'DROP',
                     ofp.OFPMBT_DSCP_REMARK: 'DSCP_REMARK'}
@@ -630,7 +630,7 @@ def get_meter_features(dp, waiters, to_user=True):
 
     stats = dp.ofproto_parser.OFPMeterFeaturesStatsRequest(dp, 0)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     features = []
     for msg in msgs:
@@ -665,7 +665,7 @@ def get_meter_features(dp, waiters, to_user=True):
     return wrap_dpid_dict(dp, features, to_user)
 
 
-def get_meter_desc(dp, waiters, meter_id=None, to_user=True):
+def get_meter_desc(dp, meter_id=None, to_user=True):
     flags = {dp.ofproto.OFPMF_KBPS: 'KBPS',
              dp.ofproto.OFPMF_PKTPS: 'PKTPS',
              dp.ofproto.OFPMF_BURST: 'BURST',
@@ -679,7 +679,7 @@ def get_meter_desc(dp, waiters, meter_id=None, to_user=True):
     stats = dp.ofproto_parser.OFPMeterDescStatsRequest(
         dp, 0, meter_id)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     configs = []
     for msg in msgs:
@@ -714,7 +714,7 @@ def get_meter_desc(dp, waiters, meter_id=None, to_user=True):
     return wrap_dpid_dict(dp, configs, to_user)
 
 
-def get_group_stats(dp, waiters, group_id=None, to_user=True):
+def get_group_stats(dp, group_id=None, to_user=True):
     if group_id is None:
         group_id = dp.ofproto.OFPG_ALL
     else:
@@ -723,7 +723,7 @@ def get_group_stats(dp, waiters, group_id=None, to_user=True):
     stats = dp.ofproto_parser.OFPGroupStatsRequest(
         dp, 0, group_id)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     groups = []
     for msg in msgs:
@@ -743,7 +743,7 @@ def get_group_stats(dp, waiters, group_id=None, to_user=True):
     return wrap_dpid_dict(dp, groups, to_user)
 
 
-def get_group_features(dp, waiters, to_user=True):
+def get_group_features(dp, to_user=True):
 
     ofp = dp.ofproto
     type_convert = {ofp.OFPGT_ALL: 'ALL',
@@ -776,7 +776,7 @@ def get_group_features(dp, waiters, to_user=True):
 
     stats = dp.ofproto_parser.OFPGroupFeaturesStatsRequest(dp, 0)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     features = []
     for msg in msgs:
@@ -833,7 +833,7 @@ def get_group_features(dp, waiters, to_user=True):
     return wrap_dpid_dict(dp, features, to_user)
 
 
-def get_group_desc(dp, waiters, group_id=None, to_user=True):
+def get_group_desc(dp, group_id=None, to_user=True):
     if group_id is None:
         group_id = dp.ofproto.OFPG_ALL
     else:
@@ -841,7 +841,7 @@ def get_group_desc(dp, waiters, group_id=None, to_user=True):
 
     stats = dp.ofproto_parser.OFPGroupDescStatsRequest(dp, 0, group_id)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     descs = []
     for msg in msgs:
@@ -878,7 +878,7 @@ def get_group_desc(dp, waiters, group_id=None, to_user=True):
     return wrap_dpid_dict(dp, descs, to_user)
 
 
-def get_port_desc(dp, waiters, port_no=None, to_user=True):
+def get_port_desc(dp, port_no=None, to_user=True):
     if port_no is None:
         port_no = dp.ofproto.OFPP_ANY
     else:
@@ -886,7 +886,7 @@ def get_port_desc(dp, waiters, port_no=None, to_user=True):
 
     stats = dp.ofproto_parser.OFPPortDescStatsRequest(dp, 0, port_no)
     msgs = []
-    ofctl_utils.send_stats_request(dp, stats, waiters, msgs, LOG)
+    ofctl_utils.send_stats_request(dp, stats, msgs, LOG)
 
     descs = []
 
@@ -914,8 +914,8 @@ def get_port_desc(dp, waiters, port_no=None, to_user=True):
     return wrap_dpid_dict(dp, descs, to_user)
 
 
-def get_role(dp, waiters, to_user=True):
-    return ofctl_utils.get_role(dp, waiters, to_user)
+def get_role(dp, to_user=True):
+    return ofctl_utils.get_role(dp, to_user)
 
 
 def mod_flow_entry(dp, flow, cmd):
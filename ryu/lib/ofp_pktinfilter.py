@@ -14,22 +14,38 @@
 # limitations under the License.
 # vim: tabstop=4 shiftwidth=4 softtabstop=4
 
-import logging
+# aliased, as packet_in_filter() takes an argument named logging
+import logging as _logging
+import struct
 from abc import ABCMeta, abstractmethod
 import six
 
+from ryu.lib import addrconv
+from ryu.lib.packet import ether_types
+from ryu.lib.packet import in_proto
 from ryu.lib.packet import packet
 
-LOG = logging.getLogger(__name__)
+LOG = _logging.getLogger(__name__)
 
 
 def packet_in_filter(cls, args=None, logging=False):
     def _packet_in_filter(packet_in_handler):
         def __packet_in_filter(self, ev):
-            pkt = packet.Packet(ev.msg.data)
-            if not packet_in_handler.pkt_in_filter.filter(pkt):
-                if logging:
-                    LOG.debug('The packet is discarded by %s: %s', cls, pkt)
+            pkt_in_filter = packet_in_handler.pkt_in_filter
+            data = ev.msg.data
+            pkt = None
+            # the raw data is checked first, the packet is decoded only
+            # if the filter can not decide on it, and then only as far
+            # as the filter looks into it
+            result = pkt_in_filter.filter_data(data)
+            if result is None:
+                pkt = packet.Packet(data, lazy=True)
+                result = pkt_in_filter.filter(pkt)
+            if not result:
+                # the discarded packet is decoded only to be logged
+                if logging and LOG.isEnabledFor(_logging.DEBUG):
+                    LOG.debug('The packet is discarded by %s: %s', cls,
+                              pkt or packet.Packet(data))
                 return
             return packet_in_handler(self, ev)
         pkt_in_filter = cls(args)
@@ -47,6 +63,15 @@ class PacketInFilterBase(object):
     def filter(self, pkt):
         pass
 
+    def filter_data(self, data):
+        """
+        Decides on a packet from its raw data before it is decoded.
+
+        Returns True to pass the packet, False to discard it, or None to
+        decide on the decoded packet by filter().
+        """
+        return None
+
 
 class RequiredTypeFilter(PacketInFilterBase):
 
@@ -56,3 +81,208 @@ class RequiredTypeFilter(PacketInFilterBase):
             if not pkt.get_protocol(required_type):
                 return False
         return True
+
+
+_UNPACK_H = struct.Struct('!H').unpack_from
+_UNPACK_B = struct.Struct('!B').unpack_from
+
+_ETH_TYPE_OFFSET = 12
+_ETH_HEADER_LEN = 14
+_VLAN_HEADER_LEN = 4
+_VLAN_TPIDS = (ether_types.ETH_TYPE_8021Q, ether_types.ETH_TYPE_8021AD)
+_IPV6_HEADER_LEN = 40
+_IPV4_OFFSET_MASK = 0x1fff
+
+# the depth of decoding that a field needs
+_L2, _VLAN, _L3, _L4 = range(4)
+
+# name: (depth, conversion of the value)
+_MATCH_FIELDS = {
+    'eth_dst': (_L2, addrconv.mac.text_to_bin),
+    'eth_src': (_L2, addrconv.mac.text_to_bin),
+    'eth_type': (_VLAN, int),
+    'vlan_vid': (_VLAN, int),
+    'ip_proto': (_L3, int),
+    'ipv4_src': (_L3, addrconv.ipv4.text_to_bin),
+    'ipv4_dst': (_L3, addrconv.ipv4.text_to_bin),
+    'ipv6_src': (_L3, addrconv.ipv6.text_to_bin),
+    'ipv6_dst': (_L3, addrconv.ipv6.text_to_bin),
+    'arp_op': (_L3, int),
+    'tcp_src': (_L4, int),
+    'tcp_dst': (_L4, int),
+    'udp_src': (_L4, int),
+    'udp_dst': (_L4, int),
+}
+
+
+class MatchFilter(PacketInFilterBase):
+    """
+    Filters packets by the values of the fields of their headers.
+
+    args is a dict of field names and values, which are OpenFlow match
+    field names:
+
+    =========== ==========================================
+    Field       Value
+    =========== ==========================================
+    eth_dst     MAC address string
+    eth_src     MAC address string
+    eth_type    Ethernet type after the VLAN tags, if any
+    vlan_vid    VLAN ID of the outermost VLAN tag
+    ip_proto    IP protocol of IPv4 or IPv6
+    ipv4_src    IPv4 address string
+    ipv4_dst    IPv4 address string
+    ipv6_src    IPv6 address string
+    ipv6_dst    IPv6 address string
+    arp_op      ARP opcode
+    tcp_src     TCP source port
+    tcp_dst     TCP destination port
+    udp_src     UDP source port
+    udp_dst     UDP destination port
+    =========== ==========================================
+
+    A value can also be a list of values, any of which matches.
+    A packet passes if all the fields match, where the fields of upper
+    layers imply those of lower ones, e.g. udp_dst implies ip_proto UDP
+    of IPv4 or IPv6.  e.g. LLDP packets and DNS queries over UDP
+    respectively::
+
+        @packet_in_filter(MatchFilter,
+                          {'eth_type': ether_types.ETH_TYPE_LLDP})
+
+        @packet_in_filter(MatchFilter, {'udp_dst': 53})
+
+    The fields are compiled into checks of the raw data at the offsets
+    of the headers, so that packets are filtered without being decoded.
+    Only the outer headers are looked at: the IPv6 next header must be
+    the transport protocol itself, without extension headers, and the
+    ports are those of the first IPv4 fragment.
+    """
+
+    def __init__(self, args):
+        super(MatchFilter, self).__init__(args)
+        self._depth = -1
+        self._values = {}
+        for name, value in (args or {}).items():
+            if name not in _MATCH_FIELDS:
+                raise ValueError('unknown field %s' % name)
+            depth, conv = _MATCH_FIELDS[name]
+            if not isinstance(value, (list, tuple, set, frozenset)):
+                value = [value]
+            self._values[name] = frozenset(conv(v) for v in value)
+            self._depth = max(self._depth, depth)
+        # the fields implied by the others
+        for proto, names in [(in_proto.IPPROTO_TCP, ('tcp_src', 'tcp_dst')),
+                             (in_proto.IPPROTO_UDP, ('udp_src', 'udp_dst'))]:
+            if any(name in self._values for name in names):
+                self._restrict('ip_proto', proto)
+        for eth_type, names in [
+                (ether_types.ETH_TYPE_IP, ('ipv4_src', 'ipv4_dst')),
+                (ether_types.ETH_TYPE_IPV6, ('ipv6_src', 'ipv6_dst')),
+                (ether_types.ETH_TYPE_ARP, ('arp_op',))]:
+            if any(name in self._values for name in names):
+                self._restrict('eth_type', eth_type)
+        if 'ip_proto' in self._values:
+            self._restrict('eth_type', ether_types.ETH_TYPE_IP,
+                           ether_types.ETH_TYPE_IPV6)
+        get = self._values.get
+        self._eth_dst = get('eth_dst')
+        self._eth_src = get('eth_src')
+        self._eth_type = get('eth_type')
+        self._vlan_vid = get('vlan_vid')
+        self._ip_proto = get('ip_proto')
+        self._l3_fields = [
+            # (offset in the header, length, values)
+            (offset, length, self._values[name])
+            for name, offset, length in [('ipv4_src', 12, 4),
+                                         ('ipv4_dst', 16, 4),
+                                         ('ipv6_src', 8, 16),
+                                         ('ipv6_dst', 24, 16)]
+            if name in self._values]
+        self._arp_op = get('arp_op')
+        self._ports = [
+            # (offset in the header, values)
+            (offset, self._values[name])
+            for name, offset in [('tcp_src', 0), ('tcp_dst', 2),
+                                 ('udp_src', 0), ('udp_dst', 2)]
+            if name in self._values]
+
+    def _restrict(self, name, *values):
+        current = self._values.get(name)
+        values = frozenset(values)
+        self._values[name] = values if current is None else current & values
+
+    def filter(self, pkt):
+        return self.filter_data(pkt.data)
+
+    def filter_data(self, data):
+        try:
+            return self._match(data)
+        except struct.error:
+            # truncated
+            return False
+
+    def _match(self, data):
+        if self._depth < _L2:
+            return True
+        if len(data) < _ETH_HEADER_LEN:
+            return False
+        if self._eth_dst is not None and \
+                bytes(data[0:6]) not in self._eth_dst:
+            return False
+        if self._eth_src is not None and \
+                bytes(data[6:12]) not in self._eth_src:
+            return False
+        if self._depth < _VLAN:
+            return True
+
+        offset = _ETH_TYPE_OFFSET
+        eth_type, = _UNPACK_H(data, offset)
+        if self._vlan_vid is not None:
+            if eth_type not in _VLAN_TPIDS:
+                return False
+            tci, = _UNPACK_H(data, offset + 2)
+            if tci & 0xfff not in self._vlan_vid:
+                return False
+        while eth_type in _VLAN_TPIDS:
+            offset += _VLAN_HEADER_LEN
+            eth_type, = _UNPACK_H(data, offset)
+        if self._eth_type is not None and eth_type not in self._eth_type:
+            return False
+        if self._depth < _L3:
+            return True
+
+        # the fields of IPv4 or IPv6 are only given with their eth_type
+        l3 = offset + 2
+        for field_offset, length, values in self._l3_fields:
+            start = l3 + field_offset
+            if bytes(data[start:start + length]) not in values:
+                return False
+        if self._arp_op is not None:
+            opcode, = _UNPACK_H(data, l3 + 6)
+            if opcode not in self._arp_op:
+                return False
+        if self._ip_proto is None:
+            return True
+
+        if eth_type == ether_types.ETH_TYPE_IP:
+            ver_ihl, = _UNPACK_B(data, l3)
+            proto, = _UNPACK_B(data, l3 + 9)
+            l4 = l3 + (ver_ihl & 0xf) * 4
+            fragment, = _UNPACK_H(data, l3 + 6)
+            first_fragment = not fragment & _IPV4_OFFSET_MASK
+        else:
+            proto, = _UNPACK_B(data, l3 + 6)
+            l4 = l3 + _IPV6_HEADER_LEN
+            first_fragment = True
+        if proto not in self._ip_proto:
+            return False
+        if not self._ports:
+            return True
+        if not first_fragment:
+            return False
+        for field_offset, values in self._ports:
+            port, = _UNPACK_H(data, l4 + field_offset)
+            if port not in values:
+                return False
+        return True
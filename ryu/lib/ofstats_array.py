@@ -0,0 +1,233 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Columnar decoding of flow and port statistics replies.
+
+flow_stats() and port_stats() decode the fixed-size fields of the body
+of OpenFlow flow and port statistics replies into a NumPy structured
+array, one row per entry, without building OFPFlowStats/OFPPortStats
+objects.  Combined with lazy decoding (cf. ofproto_parser.set_lazy_decode)
+the ``body`` of the replies is then never decoded at all.
+
+The variable parts of the entries are left in the message buffers.
+Every row has the columns ``part``, the index of the reply message it is
+in, and ``offset``, the offset of the entry in the buffer of that
+message; rows of flow statistics also have ``instructions_offset``.
+An entry can be decoded in full with the parser of the version, e.g.::
+
+    flows = ofstats_array.flow_stats(future.replies)
+    row = flows[flows['byte_count'].argmax()]
+    stats = parser.OFPFlowStats.parser(future.replies[row['part']].buf,
+                                       row['offset'])
+
+NumPy is not a dependency of Ryu; these functions raise ImportError if
+it is not installed.
+"""
+
+import re
+import struct
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from ryu import exception
+from ryu.ofproto import ofproto_v1_2
+from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_4
+from ryu.ofproto import ofproto_v1_5
+
+
+_FLOW_STATS_LAYOUTS = {
+    # version: (pack str of the fixed part, field names)
+    ofproto_v1_2.OFP_VERSION: (
+        ofproto_v1_2.OFP_FLOW_STATS_PACK_STR,
+        ['length', 'table_id', 'duration_sec', 'duration_nsec', 'priority',
+         'idle_timeout', 'hard_timeout', 'cookie', 'packet_count',
+         'byte_count']),
+    ofproto_v1_3.OFP_VERSION: (
+        ofproto_v1_3.OFP_FLOW_STATS_0_PACK_STR,
+        ['length', 'table_id', 'duration_sec', 'duration_nsec', 'priority',
+         'idle_timeout', 'hard_timeout', 'flags', 'cookie', 'packet_count',
+         'byte_count']),
+    ofproto_v1_4.OFP_VERSION: (
+        ofproto_v1_4.OFP_FLOW_STATS_0_PACK_STR,
+        ['length', 'table_id', 'duration_sec', 'duration_nsec', 'priority',
+         'idle_timeout', 'hard_timeout', 'flags', 'importance', 'cookie',
+         'packet_count', 'byte_count']),
+}
+
+_PORT_STATS_V1_2 = [
+    'port_no', 'rx_packets', 'tx_packets', 'rx_bytes', 'tx_bytes',
+    'rx_dropped', 'tx_dropped', 'rx_errors', 'tx_errors', 'rx_frame_err',
+    'rx_over_err', 'rx_crc_err', 'collisions']
+
+_PORT_STATS_V1_4 = [
+    'length', 'port_no', 'duration_sec', 'duration_nsec', 'rx_packets',
+    'tx_packets', 'rx_bytes', 'tx_bytes', 'rx_dropped', 'tx_dropped',
+    'rx_errors', 'tx_errors']
+
+_PORT_STATS_LAYOUTS = {
+    ofproto_v1_2.OFP_VERSION: (
+        ofproto_v1_2.OFP_PORT_STATS_PACK_STR, _PORT_STATS_V1_2),
+    ofproto_v1_3.OFP_VERSION: (
+        ofproto_v1_3.OFP_PORT_STATS_PACK_STR,
+        _PORT_STATS_V1_2 + ['duration_sec', 'duration_nsec']),
+    # the properties, e.g. the ethernet error counters, are not decoded
+    ofproto_v1_4.OFP_VERSION: (
+        ofproto_v1_4.OFP_PORT_STATS_PACK_STR, _PORT_STATS_V1_4),
+    ofproto_v1_5.OFP_VERSION: (
+        ofproto_v1_5.OFP_PORT_STATS_PACK_STR, _PORT_STATS_V1_4),
+}
+
+# the same in OpenFlow 1.2 (OFPST_*) and later (OFPMP_*)
+_FLOW = ofproto_v1_3.OFPMP_FLOW
+_PORT_STATS = ofproto_v1_3.OFPMP_PORT_STATS
+
+# ofp_multipart_reply and ofp_stats_reply are of the same size
+_REPLY_HEADER_SIZE = ofproto_v1_3.OFP_MULTIPART_REPLY_SIZE
+
+# the match follows the fixed part of ofp_flow_stats
+_FLOW_STATS_MATCH_OFFSET = (ofproto_v1_3.OFP_FLOW_STATS_SIZE -
+                            ofproto_v1_3.OFP_MATCH_SIZE)
+
+_FORMAT_RE = re.compile(r'(\d*)([xBHIQ])')
+
+_layouts = {}
+
+
+class _Layout(object):
+    def __init__(self, pack_str, names, extra):
+        self.size = struct.calcsize(pack_str)
+        self.variable = names[0] == 'length'
+        self.fields = []  # (name, big endian dtype, offset)
+        offset = 0
+        names = iter(names)
+        for count, char in _FORMAT_RE.findall(pack_str):
+            if char == 'x':
+                offset += int(count or 1)
+                continue
+            size = struct.calcsize(char)
+            self.fields.append((next(names), '>u%d' % size, offset))
+            offset += size
+        assert offset == self.size
+        self.dtype = numpy.dtype(
+            [(name, fmt[1:]) for name, fmt, _off in self.fields] +
+            [(name, 'u4') for name in ['part', 'offset'] + extra])
+
+    def offsets(self, buf, msg_len):
+        if not self.variable:
+            return numpy.arange(_REPLY_HEADER_SIZE, msg_len, self.size,
+                                dtype=numpy.intp)
+        offsets = []
+        offset = _REPLY_HEADER_SIZE
+        unpack_from = struct.Struct('!H').unpack_from
+        while offset < msg_len:
+            offsets.append(offset)
+            length, = unpack_from(buf, offset)
+            if length < self.size:
+                raise exception.OFPMalformedMessage()
+            offset += length
+        if offset != msg_len:
+            raise exception.OFPMalformedMessage()
+        return numpy.array(offsets, dtype=numpy.intp)
+
+
+def _column_view(buf, fmt):
+    # every byte of buf viewed as the first byte of a fmt integer, so that
+    # a field of all the entries is gathered by a single fancy indexing
+    size = numpy.dtype(fmt).itemsize
+    return numpy.ndarray((len(buf) - size + 1,), dtype=fmt, buffer=buf,
+                         strides=(1,))
+
+
+def _get_layout(layouts, msg_type, version, extra):
+    if numpy is None:
+        raise ImportError('numpy is required for the columnar decoding')
+    layout = _layouts.get((msg_type, version))
+    if layout is None:
+        if version not in layouts:
+            raise ValueError('unsupported OpenFlow version 0x%x' % version)
+        pack_str, names = layouts[version]
+        layout = _Layout(pack_str, names, extra)
+        _layouts[(msg_type, version)] = layout
+    return layout
+
+
+def _decode(msgs, stats_type, layouts, extra=()):
+    if not isinstance(msgs, (list, tuple)):
+        msgs = [msgs]
+    layout = version = None
+    parts = []
+    for msg in msgs:
+        if msg.type != stats_type:
+            raise ValueError('not a reply of stats type %d: %s' %
+                             (stats_type, msg.__class__.__name__))
+        if layout is not None and msg.version != version:
+            raise ValueError('replies of different OpenFlow versions')
+        version = msg.version
+        layout = _get_layout(layouts, stats_type, version, list(extra))
+        buf = msg.buf
+        parts.append((buf, layout.offsets(buf, msg.msg_len)))
+
+    if layout is None:
+        # no replies, the version does not matter
+        layout = _get_layout(layouts, stats_type, ofproto_v1_3.OFP_VERSION,
+                             list(extra))
+    out = numpy.empty(sum(len(offsets) for _buf, offsets in parts),
+                      dtype=layout.dtype)
+    start = 0
+    for part, (buf, offsets) in enumerate(parts):
+        end = start + len(offsets)
+        rows = out[start:end]
+        for name, fmt, field_offset in layout.fields:
+            rows[name] = _column_view(buf, fmt)[offsets + field_offset]
+        rows['part'] = part
+        rows['offset'] = offsets
+        if 'instructions_offset' in layout.dtype.names:
+            # the instructions follow the match padded to 8 bytes
+            match_len = _column_view(buf, '>u2')[
+                offsets + _FLOW_STATS_MATCH_OFFSET + 2]
+            rows['instructions_offset'] = (
+                offsets + _FLOW_STATS_MATCH_OFFSET +
+                ((match_len.astype(numpy.intp) + 7) & ~7))
+        start = end
+    return out
+
+
+def flow_stats(msgs):
+    """
+    Decode flow statistics replies into a NumPy structured array.
+
+    msgs is a flow statistics reply message or a list of them, e.g. the
+    parts of a multipart reply.  The array has a column for every fixed
+    field of ofp_flow_stats of the OpenFlow version (1.2 to 1.4) and the
+    columns ``part``, ``offset`` and ``instructions_offset``.
+    """
+    return _decode(msgs, _FLOW, _FLOW_STATS_LAYOUTS,
+                   ['instructions_offset'])
+
+
+def port_stats(msgs):
+    """
+    Decode port statistics replies into a NumPy structured array.
+
+    msgs is a port statistics reply message or a list of them.  The array
+    has a column for every fixed field of ofp_port_stats of the OpenFlow
+    version (1.2 to 1.5) and the columns ``part`` and ``offset``.
+    """
+    return _decode(msgs, _PORT_STATS, _PORT_STATS_LAYOUTS)
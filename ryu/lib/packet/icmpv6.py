@@ -144,7 +144,7 @@ class icmpv6(packet_base.PacketBase):
             else:
                 hdr += self.data
         if self.csum == 0:
-            self.csum = packet_utils.checksum_ip(prev, len(hdr), hdr + payload)
+            self.csum = packet_utils.checksum_ip(prev, len(hdr), hdr, payload)
             struct.pack_into('!H', hdr, 2, self.csum)
 
         return hdr
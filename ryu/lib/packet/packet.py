@@ -39,6 +39,17 @@ for _, m in mod:
 PKT_CLS_DICT = dict(cls_list)
 
 
+def _is_padding(buf):
+    # True if buf is empty or all zeros.  The last byte is checked first
+    # so that the usual buffer is not scanned, and count() does not copy
+    # buf as strip() does.
+    if not isinstance(buf, (bytes, bytearray)):
+        buf = six.binary_type(buf)
+    if buf[-1:] not in (b'', b'\x00'):
+        return False
+    return buf.count(b'\x00') == len(buf)
+
+
 class Packet(StringifyMixin):
     """A packet decoder/encoder class.
 
@@ -50,37 +61,125 @@ class Packet(StringifyMixin):
     Protocol headers are instances of subclass of packet_base.PacketBase.
     The payload is a bytearray.  They are iterated in on-wire order.
 
+    If *lazy* is True, the protocol headers are decoded on demand:
+    iteration, get_protocol() and ``in`` decode the headers only as far as
+    they need to, while the other methods and ``protocols`` decode all of
+    them.  e.g. get_protocol(ethernet.ethernet) does not decode the IP
+    and TCP headers and the options.
+
     *data* should be omitted when encoding a packet.
+
+    get_protocol() and get_protocols() look up an index of the protocols
+    by class, which is updated as protocols are decoded or added.  The
+    protocols should be replaced or removed through this object, not
+    the ``protocols`` list, so that the index is updated.
     """
 
     # Ignore data field when outputting json representation.
     _base_attributes = ['data']
 
-    def __init__(self, data=None, protocols=None, parse_cls=ethernet.ethernet):
+    # protocols is a property
+    _opt_attributes = ['protocols']
+
+    def __init__(self, data=None, protocols=None, parse_cls=ethernet.ethernet,
+                 lazy=False):
         super(Packet, self).__init__()
         self.data = data
         if protocols is None:
-            self.protocols = []
+            self._protocols = []
         else:
-            self.protocols = protocols
+            self._protocols = protocols
+        # the class and the buffer of the next protocol to decode
+        self._parse_cls = None
+        self._rest_data = None
+        self._clear_index()
         if self.data:
-            self._parser(parse_cls)
-
-    def _parser(self, cls):
-        rest_data = self.data
-        while cls:
-            # Ignores an empty buffer
-            if not six.binary_type(rest_data).strip(b'\x00'):
-                break
+            self._parse_cls = parse_cls
+            self._rest_data = self.data
+            if not lazy:
+                self._parser()
+
+    @property
+    def protocols(self):
+        if self._parse_cls is not None:
+            self._parser()
+        return self._protocols
+
+    @protocols.setter
+    def protocols(self, protocols):
+        self._parse_cls = None
+        self._rest_data = None
+        self._protocols = protocols
+        self._clear_index()
+
+    def _clear_index(self):
+        # class: positions of the protocols of the class
+        self._index = {}
+        # the number of protocols in the index
+        self._indexed = 0
+        # requested class: positions of the protocols of it or subclasses
+        self._resolved = {}
+
+    def _update_index(self):
+        protocols = self._protocols
+        if len(protocols) == self._indexed:
+            return
+        if len(protocols) < self._indexed:
+            self._clear_index()
+        index = self._index
+        for i in range(self._indexed, len(protocols)):
+            index.setdefault(protocols[i].__class__, []).append(i)
+        self._indexed = len(protocols)
+        self._resolved = {}
+
+    def _positions(self, protocol):
+        # positions of the protocols of the class protocol, of those
+        # decoded so far
+        self._update_index()
+        positions = self._resolved.get(protocol)
+        if positions is None:
+            if isinstance(protocol, packet_base.PacketBase):
+                return self._positions(protocol.__class__)
+            assert issubclass(protocol, packet_base.PacketBase)
+            classes = [cls for cls in self._index
+                       if issubclass(cls, protocol)]
+            if len(classes) == 1:
+                positions = self._index[classes[0]]
+            else:
+                positions = sorted(i for cls in classes
+                                   for i in self._index[cls])
+            self._resolved[protocol] = positions
+        return positions
+
+    def _parse_next(self):
+        # decodes the next protocol, returns False if all are decoded
+        cls = self._parse_cls
+        if cls is None:
+            return False
+        rest_data = self._rest_data
+        # Ignores an empty buffer
+        if _is_padding(rest_data):
+            cls = None
+        else:
             try:
                 proto, cls, rest_data = cls.parser(rest_data)
             except struct.error:
-                break
-            if proto:
-                self.protocols.append(proto)
-        # If rest_data is all padding, we ignore rest_data
-        if rest_data and six.binary_type(rest_data).strip(b'\x00'):
-            self.protocols.append(rest_data)
+                cls = None
+            else:
+                if proto:
+                    self._protocols.append(proto)
+        if not cls:
+            # If rest_data is all padding, we ignore rest_data
+            if rest_data and not _is_padding(rest_data):
+                self._protocols.append(rest_data)
+            cls = rest_data = None
+        self._parse_cls = cls
+        self._rest_data = rest_data
+        return True
+
+    def _parser(self):
+        while self._parse_next():
+            pass
 
     def serialize(self):
         """Encode a packet and store the resulted bytearray in self.data.
@@ -88,18 +187,20 @@ class Packet(StringifyMixin):
         This method is legal only when encoding a packet.
         """
 
-        self.data = bytearray()
-        r = self.protocols[::-1]
-        for i, p in enumerate(r):
-            if isinstance(p, packet_base.PacketBase):
-                if i == len(r) - 1:
-                    prev = None
-                else:
-                    prev = r[i + 1]
-                data = p.serialize(self.data, prev)
+        # Every header is inserted in front of the payload in place,
+        # instead of building a new bytearray from the concatenation of
+        # the header and the payload, which copies the payload twice per
+        # protocol.
+        protocols = self.protocols
+        base = packet_base.PacketBase
+        data = bytearray()
+        for i in range(len(protocols) - 1, -1, -1):
+            p = protocols[i]
+            if isinstance(p, base):
+                data[:0] = p.serialize(data, protocols[i - 1] if i else None)
             else:
-                data = six.binary_type(p)
-            self.data = bytearray(data + self.data)
+                data[:0] = p
+        self.data = data
 
     @classmethod
     def from_jsondict(cls, dict_, decode_string=base64.b64decode,
@@ -131,19 +232,19 @@ class Packet(StringifyMixin):
     def get_protocols(self, protocol):
         """Returns a list of protocols that matches to the specified protocol.
         """
-        if isinstance(protocol, packet_base.PacketBase):
-            protocol = protocol.__class__
-        assert issubclass(protocol, packet_base.PacketBase)
-        return [p for p in self.protocols if isinstance(p, protocol)]
+        protocols = self.protocols
+        return [protocols[i] for i in self._positions(protocol)]
 
     def get_protocol(self, protocol):
         """Returns the firstly found protocol that matches to the
         specified protocol.
         """
-        result = self.get_protocols(protocol)
-        if len(result) > 0:
-            return result[0]
-        return None
+        while True:
+            positions = self._positions(protocol)
+            if positions:
+                return self._protocols[positions[0]]
+            if not self._parse_next():
+                return None
 
     def __div__(self, trailer):
         self.add_protocol(trailer)
@@ -153,16 +254,24 @@ class Packet(StringifyMixin):
         return self.__div__(trailer)
 
     def __iter__(self):
-        return iter(self.protocols)
+        i = 0
+        while True:
+            while i >= len(self._protocols):
+                if not self._parse_next():
+                    return
+            yield self._protocols[i]
+            i += 1
 
     def __getitem__(self, idx):
         return self.protocols[idx]
 
     def __setitem__(self, idx, item):
         self.protocols[idx] = item
+        self._clear_index()
 
     def __delitem__(self, idx):
         del self.protocols[idx]
+        self._clear_index()
 
     def __len__(self):
         return len(self.protocols)
@@ -170,7 +279,12 @@ class Packet(StringifyMixin):
     def __contains__(self, protocol):
         if (inspect.isclass(protocol) and
                 issubclass(protocol, packet_base.PacketBase)):
-            return protocol in [p.__class__ for p in self.protocols]
+            while True:
+                self._update_index()
+                if protocol in self._index:
+                    return True
+                if not self._parse_next():
+                    return False
         return protocol in self.protocols
 
     def __str__(self):
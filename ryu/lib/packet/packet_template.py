@@ -0,0 +1,371 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Templates of serialized packets.
+
+A PacketTemplate serializes a packet once.  The fixed-size fields of its
+protocols are then rewritten in the serialized bytes, and the checksums
+covering them are updated incrementally (RFC 1624), instead of building
+and serializing a new packet for every frame, e.g.::
+
+    pkt = packet.Packet()
+    pkt.add_protocol(ethernet.ethernet(ethertype=ether.ETH_TYPE_ARP,
+                                       src=src_mac))
+    pkt.add_protocol(arp.arp(opcode=arp.ARP_REQUEST,
+                             src_mac=src_mac, src_ip=src_ip))
+    tmpl = packet_template.PacketTemplate(pkt)
+
+    data = tmpl.build(ethernet_dst=dst_mac, arp_dst_ip=dst_ip)
+
+A field is named after the protocol and the attribute of the protocol
+class, e.g. ``ipv4_dst`` or ``bfd_your_discr``.  Only the first
+occurrence of a protocol in the packet has its fields named.
+"""
+
+import struct
+
+from ryu.lib import addrconv
+from ryu.lib.packet import arp
+from ryu.lib.packet import bfd
+from ryu.lib.packet import ethernet
+from ryu.lib.packet import icmp
+from ryu.lib.packet import icmpv6
+from ryu.lib.packet import ipv4
+from ryu.lib.packet import ipv6
+from ryu.lib.packet import packet_base
+from ryu.lib.packet import packet_utils
+from ryu.lib.packet import tcp
+from ryu.lib.packet import udp
+from ryu.lib.packet import vlan
+
+
+class _Int(object):
+    def __init__(self, offset, fmt):
+        self.offset = offset
+        self.size = struct.calcsize(fmt)
+        self._struct = struct.Struct(fmt)
+
+    def get(self, buf, offset):
+        return self._struct.unpack_from(buf, offset)[0]
+
+    def to_bin(self, buf, offset, value):
+        return self._struct.pack(value)
+
+
+class _Bits(_Int):
+    # width bits of an integer from the shift-th least significant bit
+    def __init__(self, offset, fmt, shift, width):
+        super(_Bits, self).__init__(offset, fmt)
+        self._shift = shift
+        self._mask = ((1 << width) - 1) << shift
+
+    def get(self, buf, offset):
+        value = super(_Bits, self).get(buf, offset)
+        return (value & self._mask) >> self._shift
+
+    def to_bin(self, buf, offset, value):
+        value = ((super(_Bits, self).get(buf, offset) & ~self._mask) |
+                 ((value << self._shift) & self._mask))
+        return self._struct.pack(value)
+
+
+class _Addr(object):
+    def __init__(self, offset, conv, size):
+        self.offset = offset
+        self.size = size
+        self._conv = conv
+
+    def get(self, buf, offset):
+        return self._conv.bin_to_text(bytes(buf[offset:offset + self.size]))
+
+    def to_bin(self, buf, offset, value):
+        return self._conv.text_to_bin(value)
+
+
+def _mac(offset):
+    return _Addr(offset, addrconv.mac, 6)
+
+
+def _ipv4(offset):
+    return _Addr(offset, addrconv.ipv4, 4)
+
+
+def _ipv6(offset):
+    return _Addr(offset, addrconv.ipv6, 16)
+
+
+_VLAN_FIELDS = {
+    'pcp': _Bits(0, '!H', 13, 3),
+    'cfi': _Bits(0, '!H', 12, 1),
+    'vid': _Bits(0, '!H', 0, 12),
+    'ethertype': _Int(2, '!H'),
+}
+
+# the fields, which can be rewritten, of the protocols
+_FIELDS = {
+    ethernet.ethernet: {
+        'dst': _mac(0),
+        'src': _mac(6),
+        'ethertype': _Int(12, '!H'),
+    },
+    vlan.vlan: _VLAN_FIELDS,
+    vlan.svlan: _VLAN_FIELDS,
+    arp.arp: {
+        'opcode': _Int(6, '!H'),
+        'src_mac': _mac(8),
+        'src_ip': _ipv4(14),
+        'dst_mac': _mac(18),
+        'dst_ip': _ipv4(24),
+    },
+    ipv4.ipv4: {
+        'tos': _Int(1, '!B'),
+        'identification': _Int(4, '!H'),
+        'ttl': _Int(8, '!B'),
+        'src': _ipv4(12),
+        'dst': _ipv4(16),
+    },
+    ipv6.ipv6: {
+        'hop_limit': _Int(7, '!B'),
+        'src': _ipv6(8),
+        'dst': _ipv6(24),
+    },
+    icmp.icmp: {
+        'type': _Int(0, '!B'),
+        'code': _Int(1, '!B'),
+    },
+    icmpv6.icmpv6: {
+        'type_': _Int(0, '!B'),
+        'code': _Int(1, '!B'),
+    },
+    tcp.tcp: {
+        'src_port': _Int(0, '!H'),
+        'dst_port': _Int(2, '!H'),
+        'seq': _Int(4, '!I'),
+        'ack': _Int(8, '!I'),
+        'bits': _Int(13, '!B'),
+        'window_size': _Int(14, '!H'),
+        'urgent': _Int(18, '!H'),
+    },
+    udp.udp: {
+        'src_port': _Int(0, '!H'),
+        'dst_port': _Int(2, '!H'),
+    },
+    bfd.bfd: {
+        'diag': _Bits(0, '!B', 0, 5),
+        'state': _Bits(1, '!B', 6, 2),
+        'flags': _Bits(1, '!B', 0, 6),
+        'detect_mult': _Int(2, '!B'),
+        'my_discr': _Int(4, '!I'),
+        'your_discr': _Int(8, '!I'),
+        'desired_min_tx_interval': _Int(12, '!I'),
+        'required_min_rx_interval': _Int(16, '!I'),
+        'required_min_echo_rx_interval': _Int(20, '!I'),
+    },
+}
+
+# the offsets of the checksums of the protocols and what they cover
+_CHECKSUM_HEADER = 0    # the header
+_CHECKSUM_PAYLOAD = 1   # the header and the rest of the IP payload
+_CHECKSUM_IP = 2        # the same and the IP pseudo header
+
+_CHECKSUMS = {
+    ipv4.ipv4: (10, _CHECKSUM_HEADER),
+    icmp.icmp: (2, _CHECKSUM_PAYLOAD),
+    icmpv6.icmpv6: (2, _CHECKSUM_IP),
+    tcp.tcp: (16, _CHECKSUM_IP),
+    udp.udp: (6, _CHECKSUM_IP),
+}
+
+# the addresses of the IP pseudo header, (offset, size)
+_PSEUDO_HEADERS = {
+    ipv4.ipv4: (12, 8),
+    ipv6.ipv6: (8, 32),
+}
+
+
+def _lookup(table, cls):
+    for c in cls.__mro__:
+        if c in table:
+            return table[c]
+    return None
+
+
+class _Checksum(object):
+    def __init__(self, offset, ranges, zero_is_none):
+        self.offset = offset
+        # the parts of the covered bytes, (start, end), whose words are
+        # aligned to start
+        self.ranges = ranges
+        # True if 0 means no checksum (UDP over IPv4)
+        self.zero_is_none = zero_is_none
+
+    def covers(self, start, end):
+        for range_ in self.ranges:
+            if range_[0] <= start and end <= range_[1]:
+                return range_
+        return None
+
+
+class PacketTemplate(object):
+    """A serialized packet whose fields are rewritten in place.
+
+    *pkt* is a packet.Packet to encode, which is serialized.  ``data``
+    is the serialized bytearray, ``offsets`` is a dict of the names of
+    the fields and their offsets in ``data``.
+
+    A field is read and written with ``tmpl[name]``; build() returns a
+    copy of ``data`` with some fields rewritten, leaving the template as
+    it is.  The fields are in the same representation as the attributes
+    of the protocols, e.g. a MAC address is a string.
+    """
+
+    def __init__(self, pkt):
+        pkt.serialize()
+        self.data = pkt.data
+        self.offsets = {}
+        self._fields = {}
+        self._checksums = []
+        self._coverages = {}
+
+        offset = 0
+        ip = None
+        for p in pkt.protocols:
+            if not isinstance(p, packet_base.PacketBase):
+                break
+            cls = p.__class__
+            fields = _lookup(_FIELDS, cls) or {}
+            for attr, field in fields.items():
+                name = '%s_%s' % (p.protocol_name, attr)
+                if name not in self._fields:
+                    self._fields[name] = field
+                    self.offsets[name] = offset + field.offset
+            checksum = _lookup(_CHECKSUMS, cls)
+            if checksum is not None:
+                self._add_checksum(p, offset, ip, *checksum)
+            if _lookup(_PSEUDO_HEADERS, cls) is not None:
+                ip = (p, offset)
+            offset += len(p)
+        # the values of the fields in data, a field is not rewritten by
+        # build() if it is given the same value
+        self._values = dict((name, self[name]) for name in self._fields)
+
+    def _add_checksum(self, p, offset, ip, csum_offset, kind):
+        if kind == _CHECKSUM_HEADER:
+            end = offset + len(p)
+        elif ip is None:
+            return
+        else:
+            ip_p, ip_offset = ip
+            if isinstance(ip_p, ipv4.ipv4):
+                end = ip_offset + ip_p.total_length
+            else:
+                end = ip_offset + ip_p._MIN_LEN + ip_p.payload_length
+        ranges = [(offset, end)]
+        zero_is_none = False
+        if kind == _CHECKSUM_IP:
+            pseudo_offset, size = _lookup(_PSEUDO_HEADERS, ip_p.__class__)
+            # the addresses are at an even offset from the payload
+            ranges.append((ip_offset + pseudo_offset,
+                           ip_offset + pseudo_offset + size))
+            zero_is_none = (isinstance(p, udp.udp) and
+                            isinstance(ip_p, ipv4.ipv4))
+        self._checksums.append(
+            _Checksum(offset + csum_offset, ranges, zero_is_none))
+
+    def __contains__(self, name):
+        return name in self._fields
+
+    def __getitem__(self, name):
+        return self._fields[name].get(self.data, self.offsets[name])
+
+    def __setitem__(self, name, value):
+        self._set(self.data, name, value)
+        self._values[name] = value
+
+    def update(self, **fields):
+        """Rewrites the given fields of ``data`` in place.
+
+        The fields which already have the given values are skipped.
+        """
+        values = self._values
+        for name, value in fields.items():
+            if name not in values or values[name] != value:
+                self[name] = value
+
+    def build(self, **fields):
+        """Returns a copy of ``data`` with the given fields rewritten.
+
+        e.g. tmpl.build(ipv4_dst='10.0.0.2', udp_dst_port=53)
+        """
+        buf = bytearray(self.data)
+        values = self._values
+        for name, value in fields.items():
+            if name not in values or values[name] != value:
+                self._set(buf, name, value)
+        return buf
+
+    def _set(self, buf, name, value):
+        try:
+            field = self._fields[name]
+        except KeyError:
+            raise KeyError('no field %s in the template' % name)
+        offset = self.offsets[name]
+        self._write(buf, offset, field.to_bin(buf, offset, value))
+
+    def _write(self, buf, offset, new):
+        end = offset + len(new)
+        if buf[offset:end] == new:
+            return
+        updates = [(update, self._words(buf, *update[1:]))
+                   for update in self._coverage(offset, end)]
+        buf[offset:end] = new
+        for (checksum, start, stop, range_end), old in updates:
+            csum, = struct.unpack_from('!H', buf, checksum.offset)
+            if checksum.zero_is_none and csum == 0:
+                continue
+            csum = packet_utils.checksum_update(
+                csum, old, self._words(buf, start, stop, range_end))
+            if checksum.zero_is_none and csum == 0:
+                csum = 0xffff
+            # updates the checksums covering this one
+            self._write(buf, checksum.offset, struct.pack('!H', csum))
+
+    def _coverage(self, offset, end):
+        # the checksums covering buf[offset:end] but the checksum there,
+        # and the words of the covered bytes including it, (checksum,
+        # start, stop, end of the covered bytes)
+        coverage = self._coverages.get((offset, end))
+        if coverage is None:
+            coverage = []
+            for checksum in self._checksums:
+                if offset <= checksum.offset < end:
+                    continue
+                range_ = checksum.covers(offset, end)
+                if range_ is None:
+                    continue
+                start = offset - ((offset - range_[0]) & 1)
+                stop = end + ((end - range_[0]) & 1)
+                coverage.append((checksum, start, stop, range_[1]))
+            self._coverages[(offset, end)] = coverage
+        return coverage
+
+    @staticmethod
+    def _words(buf, start, stop, end):
+        # buf[start:stop], the byte beyond the end of the covered bytes
+        # is the zero padding of the checksum
+        if stop > end:
+            return bytes(buf[start:end]) + b'\x00'
+        return bytes(buf[start:stop])
@@ -13,9 +13,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import array
-import six
-import socket
 import struct
 from ryu.lib import addrconv
 
@@ -25,26 +22,99 @@ def carry_around_add(a, b):
     return (c & 0xffff) + (c >> 16)
 
 
-def checksum(data):
-    data = six.binary_type(data)    # input can be bytearray.
-    if len(data) % 2:
-        data += b'\x00'
+# buffers from this length are summed with NumPy if it is installed
+_NUMPY_MIN_LEN = 1024
 
-    s = sum(array.array('H', data))
-    s = (s & 0xffff) + (s >> 16)
-    s += (s >> 16)
-    return socket.ntohs(~s & 0xffff)
+# NumPy is imported on the first long buffer as it is slow to import,
+# False if it is not installed
+_numpy = None
 
 
-# avoid circular import
-_IPV4_PSEUDO_HEADER_PACK_STR = '!4s4sxBH'
-_IPV6_PSEUDO_HEADER_PACK_STR = '!16s16sI3xB'
+def _get_numpy():
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _numpy = numpy
+    return _numpy
 
 
-def checksum_ip(ipvx, length, payload):
+def _value(data):
+    # the bytes of data as a big endian integer modulo 0xffff, but 0xffff
+    # rather than 0 if any byte is not zero.  As 0x10000 is 1 modulo
+    # 0xffff, it is the one's complement sum of the 16 bits words of data
+    # if data is of even length.
+    length = len(data)
+    numpy = length >= _NUMPY_MIN_LEN and _get_numpy()
+    if numpy:
+        s = int(numpy.frombuffer(data, '>u2', length // 2).sum(
+            dtype=numpy.uint64))
+        if length % 2:
+            s = (s << 8) + data[-1]
+    else:
+        s = int.from_bytes(data, 'big')
+    return s % 0xffff or (0xffff if s else 0)
+
+
+def _sum(parts, s=0):
+    # the one's complement sum of the 16 bits words of the concatenation
+    # of parts, padded with a zero byte to an even length.  The parts are
+    # not concatenated: a part following an odd number of bytes shifts
+    # the sum of the bytes preceding it by a byte, as 0x100 ** 2 is 1
+    # modulo 0xffff.
+    odd = False
+    for part in parts:
+        if len(part) % 2:
+            s <<= 8
+            odd = not odd
+        s += _value(part)
+    if odd:
+        s <<= 8
+    return s % 0xffff or (0xffff if s else 0)
+
+
+def checksum(data, *more):
+    """
+    calculate the internet checksum (RFC 1071) of data
+
+    data is any object supporting the buffer protocol, it is not copied
+    and is summed with NumPy if it is long and NumPy is installed.
+    data can be given in several parts, e.g. a header and its payload,
+    which are not concatenated.
+    """
+    return ~_sum((data,) + more) & 0xffff
+
+
+def checksum_update(csum, old, new):
+    """
+    update the internet checksum csum for a rewrite of data (RFC 1624)
+
+    old are the bytes of the checksummed data replaced with new, e.g. the
+    previous and the new values of a field.  They are of the same even
+    length and at an even offset of the data, which is not summed again.
+    The result differs from checksum() of the new data only if it is all
+    zeros, 0 instead of 0xffff.
+    """
+    if len(old) != len(new) or len(old) % 2:
+        raise ValueError('old and new must be of the same even length')
+    n = len(old) // 2
+    fmt = '!%dH' % n
+    # HC' = ~(~HC + ~m + m'), eqn. 3 of RFC 1624
+    s = ((~csum & 0xffff) + 0xffff * n - sum(struct.unpack(fmt, old)) +
+         sum(struct.unpack(fmt, new)))
+    s = s % 0xffff or (0xffff if s else 0)
+    return ~s & 0xffff
+
+
+def checksum_ip(ipvx, length, payload, *more):
     """
     calculate checksum of IP pseudo header
 
+    The pseudo header is summed without being built, and the payload
+    can be given in several parts as to checksum().
+
     IPv4 pseudo header
     UDP RFC768
     TCP RFC793 3.1
@@ -84,20 +154,17 @@ def checksum_ip(ipvx, length, payload):
     +-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+
     """
     if ipvx.version == 4:
-        header = struct.pack(_IPV4_PSEUDO_HEADER_PACK_STR,
-                             addrconv.ipv4.text_to_bin(ipvx.src),
-                             addrconv.ipv4.text_to_bin(ipvx.dst),
-                             ipvx.proto, length)
+        s = (_value(addrconv.ipv4.text_to_bin(ipvx.src)) +
+             _value(addrconv.ipv4.text_to_bin(ipvx.dst)) +
+             ipvx.proto + length)
     elif ipvx.version == 6:
-        header = struct.pack(_IPV6_PSEUDO_HEADER_PACK_STR,
-                             addrconv.ipv6.text_to_bin(ipvx.src),
-                             addrconv.ipv6.text_to_bin(ipvx.dst),
-                             length, ipvx.nxt)
+        s = (_value(addrconv.ipv6.text_to_bin(ipvx.src)) +
+             _value(addrconv.ipv6.text_to_bin(ipvx.dst)) +
+             (length >> 16) + (length & 0xffff) + ipvx.nxt)
     else:
         raise ValueError('Unknown IP version %d' % ipvx.version)
 
-    buf = header + payload
-    return checksum(buf)
+    return ~_sum((payload,) + more, s) & 0xffff
 
 
 _MODX = 4102
@@ -14,7 +14,7 @@
 # limitations under the License.
 
 """
-Parsing libpcap and reading/writing PCAP file.
+Parsing libpcap and reading/writing PCAP file, and writing pcapng file.
 Reference source: http://wiki.wireshark.org/Development/LibpcapFileFormat
 
 
@@ -37,10 +37,14 @@ Reference source: http://wiki.wireshark.org/Development/LibpcapFileFormat
                 +---------------------+
 """
 
+import array
+import mmap
 import struct
 import sys
 import time
 
+from ryu import utils
+
 
 class PcapFileHdr(object):
     """
@@ -199,8 +203,17 @@ class Reader(object):
     ================ ===================================
     file_obj         File object which reading PCAP file
                      in binary mode
+    copy             If False, the packet data are
+                     memoryview slices of the file
+                     instead of bytes
     ================ ===================================
 
+    The file is mapped in memory if it is a regular file, otherwise read
+    at once, and the packets are read from it without copying the rest
+    of the file.  If *copy* is False, the packet data are memoryview
+    slices of the mapped file, which are valid until close() and must be
+    released before it.
+
     Example of usage::
 
         from ryu.lib import pcaplib
@@ -213,51 +226,119 @@ class Reader(object):
             frame_count += 1
             pkt = packet.Packet(buf)
             print("%d, %f, %s" % (frame_count, ts, pkt))
+
+    read_batch() reads the headers of many packets at once, e.g.::
+
+        reader = pcaplib.Reader(open('test.pcap', 'rb'), copy=False)
+        timestamps, offsets, lengths = reader.read_batch()
+        for offset, length in zip(offsets, lengths):
+            pkt = packet.Packet(bytes(reader.buf[offset:offset + length]))
     """
 
-    def __init__(self, file_obj):
+    def __init__(self, file_obj, copy=True):
         self._fp = file_obj
-        buf = self._fp.read(PcapFileHdr.FILE_HDR_SIZE)
-        # Read only pcap file header
-        self.pcap_header, self._file_byteorder = PcapFileHdr.parser(buf)
-        # Read pcap data with out header
-        self._pcap_body = self._fp.read()
+        data = utils.map_file(file_obj)
+        self._mmap = data if isinstance(data, mmap.mmap) else None
         self._fp.close()
-        self._next_pos = 0
+        # Read only pcap file header
+        self.pcap_header, self._file_byteorder = PcapFileHdr.parser(
+            data[:PcapFileHdr.FILE_HDR_SIZE])
+        if self._file_byteorder == 'big':
+            fmt = PcapPktHdr._PKT_HDR_FMT_BIG_ENDIAN
+        else:
+            fmt = PcapPktHdr._PKT_HDR_FMT_LITTLE_ENDIAN
+        self._unpack_pkt_hdr = struct.Struct(fmt).unpack_from
+        #: The data of the whole file, which the offsets returned by
+        #: read_batch() point in.
+        self.buf = memoryview(data)
+        self._copy = copy
+        self._next_pos = PcapFileHdr.FILE_HDR_SIZE
 
     def __iter__(self):
         return self
 
     def next(self):
-        try:
-            pkt_hdr, pkt_data = PcapPktHdr.parser(
-                self._pcap_body[self._next_pos:], self._file_byteorder)
-            self._next_pos += pkt_hdr.incl_len + PcapPktHdr.PKT_HDR_SIZE
-
-        except IndexError:
+        pos = self._next_pos
+        if pos >= len(self.buf):
             raise StopIteration()
+        ts_sec, ts_usec, incl_len, _orig_len = self._unpack_pkt_hdr(
+            self.buf, pos)
+        pos += PcapPktHdr.PKT_HDR_SIZE
+        self._next_pos = pos + incl_len
+        pkt_data = self.buf[pos:pos + incl_len]
+        if self._copy:
+            pkt_data = pkt_data.tobytes()
 
-        return pkt_hdr.ts_sec + (pkt_hdr.ts_usec / 1e6), pkt_data
+        return ts_sec + (ts_usec / 1e6), pkt_data
 
     # for Python 3 compatible
     __next__ = next
 
+    def read_batch(self, count=None):
+        """
+        Reads the headers of the next *count* packets, or of all the
+        rest if *count* is None, and returns the tuple of arrays
+        (timestamps, offsets, lengths) of the packets.
+
+        The offsets and the lengths are those of the packet data in
+        ``buf``.  The packets are skipped by the iteration.
+        """
+        timestamps = array.array('d')
+        offsets = array.array('Q')
+        lengths = array.array('I')
+        buf = self.buf
+        end = len(buf)
+        unpack_pkt_hdr = self._unpack_pkt_hdr
+        hdr_size = PcapPktHdr.PKT_HDR_SIZE
+        pos = self._next_pos
+        n = 0
+        while pos < end and (count is None or n < count):
+            ts_sec, ts_usec, incl_len, _orig_len = unpack_pkt_hdr(buf, pos)
+            pos += hdr_size
+            timestamps.append(ts_sec + (ts_usec / 1e6))
+            offsets.append(pos)
+            # truncated at the end of the file
+            lengths.append(min(incl_len, end - pos))
+            pos += incl_len
+            n += 1
+        self._next_pos = pos
+        return timestamps, offsets, lengths
+
+    def close(self):
+        """
+        Unmaps the file.  The packet data returned as memoryview slices
+        must be released before.
+        """
+        self.buf.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
 
 class Writer(object):
     """
     PCAP file writer
 
-    ========== ==================================================
-    Argument   Description
-    ========== ==================================================
-    file_obj   File object which writing PCAP file in binary mode
-    snaplen    Max length of captured packets (in octets)
-    network    Data link type. (e.g. 1 for Ethernet,
-               see `tcpdump.org`_ for details)
-    ========== ==================================================
+    ============== ==================================================
+    Argument       Description
+    ============== ==================================================
+    file_obj       File object which writing PCAP file in binary mode
+    snaplen        Max length of captured packets (in octets)
+    network        Data link type. (e.g. 1 for Ethernet,
+                   see `tcpdump.org`_ for details)
+    buffer_size    If not 0, the packets are buffered and written to
+                   the file once this many octets are buffered
+    flush_interval If not None, the buffered packets are also written
+                   when a packet is written this many seconds after
+                   the last flush
+    ============== ==================================================
 
     .. _tcpdump.org: http://www.tcpdump.org/linktypes.html
 
+    With *buffer_size*, a packet is not written by a system call of its
+    own.  flush() writes the buffered packets, which are also written
+    when the writer is deleted.
+
     Example of usage::
 
         ...
@@ -285,16 +366,27 @@ class Writer(object):
                 ...
     """
 
-    def __init__(self, file_obj, snaplen=65535, network=1):
+    def __init__(self, file_obj, snaplen=65535, network=1, buffer_size=0,
+                 flush_interval=None):
         self._f = file_obj
         self.snaplen = snaplen
         self.network = network
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._buf = bytearray()
+        self._flushed_at = time.time()
         self._write_pcap_file_hdr()
 
+    def _write(self, buf):
+        if not self.buffer_size:
+            self._f.write(buf)
+            return
+        self._buf += buf
+
     def _write_pcap_file_hdr(self):
         pcap_file_hdr = PcapFileHdr(snaplen=self.snaplen,
                                     network=self.network)
-        self._f.write(pcap_file_hdr.serialize())
+        self._write(pcap_file_hdr.serialize())
 
     def _write_pkt_hdr(self, ts, buf_len):
         sec = int(ts)
@@ -303,7 +395,7 @@ class Writer(object):
         pc_pkt_hdr = PcapPktHdr(ts_sec=sec, ts_usec=usec,
                                 incl_len=buf_len, orig_len=buf_len)
 
-        self._f.write(pc_pkt_hdr.serialize())
+        self._write(pc_pkt_hdr.serialize())
 
     def write_pkt(self, buf, ts=None):
         ts = time.time() if ts is None else ts
@@ -316,7 +408,147 @@ class Writer(object):
 
         self._write_pkt_hdr(ts, buf_len)
 
-        self._f.write(buf)
+        self._write(buf)
+
+        if self.buffer_size and (
+                len(self._buf) >= self.buffer_size or
+                (self.flush_interval is not None and
+                 time.time() - self._flushed_at >= self.flush_interval)):
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the buffered packets to the file.
+        """
+        if self._buf:
+            self._f.write(self._buf)
+            self._buf = bytearray()
+        self._flushed_at = time.time()
+        flush = getattr(self._f, 'flush', None)
+        if flush is not None:
+            flush()
 
     def __del__(self):
+        if self._buf:
+            self._f.write(self._buf)
         self._f.close()
+
+
+class PcapngWriter(object):
+    """
+    PCAP Next Generation (pcapng) file writer
+
+    ========== ==================================================
+    Argument   Description
+    ========== ==================================================
+    file_obj   File object which writing pcapng file in binary mode
+    snaplen    Max length of captured packets (in octets)
+    network    Default data link type of the interfaces
+    ========== ==================================================
+
+    The file is a single section.  A packet is written with the
+    interface it was captured on, which is added by add_interface()
+    before, and optionally a comment, e.g.::
+
+        writer = pcaplib.PcapngWriter(open('mypcap.pcapng', 'wb'))
+        port1 = writer.add_interface('port1')
+        writer.write_pkt(ev.msg.data, interface_id=port1,
+                         comment='reason=0')
+
+    Reference source: https://github.com/pcapng/pcapng
+    """
+
+    _SECTION_HEADER_BLOCK = 0x0a0d0d0a
+    _INTERFACE_DESCRIPTION_BLOCK = 1
+    _ENHANCED_PACKET_BLOCK = 6
+    _BYTE_ORDER_MAGIC = 0x1a2b3c4d
+
+    _OPT_ENDOFOPT = 0
+    _OPT_COMMENT = 1
+    _IF_NAME = 2
+
+    # native byte order, as told by the byte order magic
+    _BLOCK_HDR_FMT = '=II'
+    _BLOCK_TRAILER_FMT = '=I'
+    _OPTION_HDR_FMT = '=HH'
+    _SECTION_HEADER_FMT = '=IHHq'
+    _INTERFACE_DESCRIPTION_FMT = '=HHI'
+    _ENHANCED_PACKET_FMT = '=IIIII'
+
+    def __init__(self, file_obj, snaplen=65535, network=1):
+        self._f = file_obj
+        self.snaplen = snaplen
+        self.network = network
+        self._n_interfaces = 0
+        # unknown section length
+        self._write_block(
+            self._SECTION_HEADER_BLOCK,
+            [struct.pack(self._SECTION_HEADER_FMT, self._BYTE_ORDER_MAGIC,
+                         1, 0, -1)])
+
+    @staticmethod
+    def _padding(length):
+        return b'\x00' * (-length % 4)
+
+    def _write_block(self, block_type, body, options=None):
+        if options:
+            for code, value in options:
+                body.append(struct.pack(self._OPTION_HDR_FMT, code,
+                                        len(value)))
+                body.append(value)
+                body.append(self._padding(len(value)))
+            body.append(struct.pack(self._OPTION_HDR_FMT,
+                                    self._OPT_ENDOFOPT, 0))
+        # the block header and trailer and the body
+        total_len = 12 + sum(len(b) for b in body)
+        body.insert(0, struct.pack(self._BLOCK_HDR_FMT, block_type,
+                                   total_len))
+        body.append(struct.pack(self._BLOCK_TRAILER_FMT, total_len))
+        self._f.write(b''.join(body))
+
+    def add_interface(self, name=None, network=None):
+        """
+        Adds an interface named *name* and returns its interface ID.
+        """
+        options = []
+        if name is not None:
+            options.append((self._IF_NAME, name.encode('utf-8')))
+        self._write_block(
+            self._INTERFACE_DESCRIPTION_BLOCK,
+            [struct.pack(self._INTERFACE_DESCRIPTION_FMT,
+                         self.network if network is None else network, 0,
+                         self.snaplen)],
+            options)
+        interface_id = self._n_interfaces
+        self._n_interfaces += 1
+        return interface_id
+
+    def write_pkt(self, buf, ts=None, interface_id=0, orig_len=None,
+                  comment=None):
+        if interface_id >= self._n_interfaces:
+            raise ValueError('unknown interface %d' % interface_id)
+        ts = time.time() if ts is None else ts
+        # microseconds, the default resolution
+        usec = int(round(ts * 1e6))
+        orig_len = len(buf) if orig_len is None else orig_len
+
+        # Check the max length of captured packets
+        buf_len = len(buf)
+        if buf_len > self.snaplen:
+            buf_len = self.snaplen
+            buf = buf[:self.snaplen]
+
+        options = []
+        if comment is not None:
+            options.append((self._OPT_COMMENT, comment.encode('utf-8')))
+        self._write_block(
+            self._ENHANCED_PACKET_BLOCK,
+            [struct.pack(self._ENHANCED_PACKET_FMT, interface_id,
+                         usec >> 32, usec & 0xffffffff, buf_len, orig_len),
+             bytes(buf), self._padding(buf_len)],
+            options)
+
+    def flush(self):
+        flush = getattr(self._f, 'flush', None)
+        if flush is not None:
+            flush()
@@ -17,7 +17,6 @@
 from __future__ import print_function
 
 import base64
-import inspect
 
 import six
 
@@ -38,11 +37,20 @@ import six
 # 'len', 'property', 'set', 'type'
 # A bit more generic way is adopted
 
-_RESERVED_KEYWORD = dir(six.moves.builtins)
+_RESERVED_KEYWORD = frozenset(dir(six.moves.builtins))
 
 _mapdict = lambda f, d: dict([(k, f(v)) for k, v in d.items()])
 _mapdict_key = lambda f, d: dict([(f(k), v) for k, v in d.items()])
-_mapdict_kv = lambda f, d: dict([(k, f(k, v)) for k, v in d.items()])
+
+
+# the number of encoders and decoders cached per class
+_MAX_CACHED_CODECS = 8
+
+
+def _restore_arg(k):
+    if k in _RESERVED_KEYWORD:
+        return k + '_'
+    return k
 
 
 class TypeDescr(object):
@@ -157,6 +165,102 @@ class StringifyMixin(object):
         """an override point for sub classes"""
         return obj_python_attrs(self)
 
+    @classmethod
+    def _jsondict_codecs(cls):
+        # the encoders and decoders generated for this class, which are
+        # not inherited by the subclasses
+        codecs = cls.__dict__.get('_jsondict_codecs_cache')
+        if codecs is None or len(codecs) >= _MAX_CACHED_CODECS:
+            # the limit is for callers passing a new encode_string or
+            # decode_string function every time
+            codecs = {}
+            setattr(cls, '_jsondict_codecs_cache', codecs)
+        return codecs
+
+    @classmethod
+    def _type_codecs(cls, codec):
+        # attribute name: codec ('encode' or 'decode') of its _TYPE
+        codecs = {}
+        for t, attrs in getattr(cls, '_TYPE', {}).items():
+            for k in attrs:
+                # the first one as _get_type() does
+                codecs.setdefault(k, getattr(_types[t], codec))
+        return codecs
+
+    @classmethod
+    def _jsondict_encoder(cls, encode_string):
+        """
+        Returns encode(obj), which returns the JSON style dict of the
+        attributes of obj as to_jsondict() does.  It is generated on the
+        first use for every encode_string and cached.
+        """
+        codecs = cls._jsondict_codecs()
+        encoder = codecs.get(('encode', encode_string))
+        if encoder is not None:
+            return encoder
+
+        if (cls._encode_value.__func__ is
+                StringifyMixin._encode_value.__func__ and
+                cls._get_encoder.__func__ is
+                StringifyMixin._get_encoder.__func__ and
+                cls._get_type.__func__ is StringifyMixin._get_type.__func__):
+            get_encoder = cls._type_codecs('encode').get
+            default = cls._get_default_encoder(encode_string)
+
+            def encoder(obj):
+                return dict((k, get_encoder(k, default)(v))
+                            for k, v in obj_attrs(obj))
+        else:
+            # the hooks are overridden, call them
+            def encoder(obj):
+                return dict((k, cls._encode_value(k, v, encode_string))
+                            for k, v in obj_attrs(obj))
+
+        codecs[('encode', encode_string)] = encoder
+        return encoder
+
+    @classmethod
+    def _jsondict_decoder(cls, decode_string):
+        """
+        Returns decode(dict_, additional_args), which returns the keyword
+        arguments of the constructor as from_jsondict() does.  It is
+        generated on the first use for every decode_string and cached.
+        """
+        codecs = cls._jsondict_codecs()
+        decoder = codecs.get(('decode', decode_string))
+        if decoder is not None:
+            return decoder
+
+        if (cls._decode_value.__func__ is
+                StringifyMixin._decode_value.__func__ and
+                cls._get_decoder.__func__ is
+                StringifyMixin._get_decoder.__func__ and
+                cls._get_type.__func__ is StringifyMixin._get_type.__func__):
+            # additional_args are not passed to the decoders, cf.
+            # _decode_value()
+            get_decoder = cls._type_codecs('decode').get
+            default = cls._get_default_decoder(decode_string)
+
+            def decode_value(k, v, additional_args):
+                return get_decoder(k, default)(v)
+        else:
+            def decode_value(k, v, additional_args):
+                return cls._decode_value(k, v, decode_string,
+                                         **additional_args)
+
+        restore_args = cls._restore_args is StringifyMixin._restore_args
+
+        def decoder(dict_, additional_args):
+            if not restore_args:
+                return cls._restore_args(dict(
+                    (k, decode_value(k, v, additional_args))
+                    for k, v in dict_.items()))
+            return dict((_restore_arg(k), decode_value(k, v, additional_args))
+                        for k, v in dict_.items())
+
+        codecs[('decode', decode_string)] = decoder
+        return decoder
+
     def __str__(self):
         # repr() to escape binaries
         return self.__class__.__name__ + '(' + \
@@ -222,10 +326,14 @@ class StringifyMixin(object):
                 json_value = _mapdict_key(str, json_value)
                 assert not cls._is_class(json_value)
             else:
-                try:
-                    json_value = v.to_jsondict()
-                except Exception:
+                to_jsondict = getattr(v, 'to_jsondict', None)
+                if to_jsondict is None:
                     json_value = v
+                else:
+                    try:
+                        json_value = to_jsondict()
+                    except Exception:
+                        json_value = v
             return json_value
         return _encode
 
@@ -258,11 +366,8 @@ class StringifyMixin(object):
                        have explicit type annotations in _TYPE class attribute.
         =============  =====================================================
         """
-        dict_ = {}
-        encode = lambda key, val: self._encode_value(key, val, encode_string)
-        for k, v in obj_attrs(self):
-            dict_[k] = encode(k, v)
-        return {self.__class__.__name__: dict_}
+        encoder = self._jsondict_encoder(encode_string)
+        return {self.__class__.__name__: encoder(self)}
 
     @classmethod
     def cls_from_jsondict_key(cls, k):
@@ -318,11 +423,7 @@ class StringifyMixin(object):
 
     @staticmethod
     def _restore_args(dict_):
-        def restore(k):
-            if k in _RESERVED_KEYWORD:
-                return k + '_'
-            return k
-        return _mapdict_key(restore, dict_)
+        return _mapdict_key(_restore_arg, dict_)
 
     @classmethod
     def from_jsondict(cls, dict_, decode_string=base64.b64decode,
@@ -348,9 +449,7 @@ class StringifyMixin(object):
         additional_args (Optional) Additional kwargs for constructor.
         =============== =====================================================
         """
-        decode = lambda k, x: cls._decode_value(k, x, decode_string,
-                                                **additional_args)
-        kwargs = cls._restore_args(_mapdict_kv(decode, dict_))
+        kwargs = cls._jsondict_decoder(decode_string)(dict_, additional_args)
         try:
             return cls(**dict(kwargs, **additional_args))
         except TypeError:
@@ -376,18 +475,27 @@ def obj_python_attrs(msg_):
         for k in msg_._fields:
             yield(k, getattr(msg_, k))
         return
+    cls = msg_.__class__
     base = getattr(msg_, '_base_attributes', [])
     opt = getattr(msg_, '_opt_attributes', [])
-    for k, v in inspect.getmembers(msg_):
-        if k in opt:
-            pass
-        elif k.startswith('_'):
-            continue
-        elif callable(v):
-            continue
-        elif k in base:
+    if (getattr(cls, '__dir__', None) is getattr(object, '__dir__', None) and
+            hasattr(msg_, '__dict__')):
+        # dir() without the class attributes, which are skipped but opt
+        names = msg_.__dict__
+    else:
+        names = set(dir(msg_))
+    # the same as filtering inspect.getmembers(msg_) but getattr() is done
+    # only for the attributes to yield
+    keys = [k for k in names
+            if not (k.startswith('_') or k in base or hasattr(cls, k))]
+    keys.extend(k for k in opt
+                if k not in keys and (k in names or hasattr(cls, k)))
+    for k in sorted(keys):
+        try:
+            v = getattr(msg_, k)
+        except AttributeError:
             continue
-        elif hasattr(msg_.__class__, k):
+        if callable(v) and k not in opt:
             continue
         yield (k, v)
 
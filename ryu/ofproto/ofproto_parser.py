@@ -35,15 +35,35 @@ if six.PY3:
     buffer = bytes
 
 
-def header(buf):
-    assert len(buf) >= ofproto_common.OFP_HEADER_SIZE
+def header(buf, offset=0):
+    assert len(buf) - offset >= ofproto_common.OFP_HEADER_SIZE
     # LOG.debug('len %d bufsize %d', len(buf), ofproto.OFP_HEADER_SIZE)
     return struct.unpack_from(ofproto_common.OFP_HEADER_PACK_STR,
-                              six.binary_type(buf))
+                              buf, offset)
 
 
 _MSG_PARSERS = {}
 
+_LAZY_DECODE = False
+
+
+def set_lazy_decode(enabled):
+    """
+    Enable or disable lazy decoding of received messages.
+
+    When enabled, the parsers decode the header fields of a message eagerly
+    but defer decoding of bulky attributes, e.g. ``match`` of OFPPacketIn
+    or ``body`` of OFPMultipartReply, until they are accessed first.
+    Thus the attributes nobody reads, or every attribute of a message
+    nobody handles, are never decoded.
+    """
+    global _LAZY_DECODE
+    _LAZY_DECODE = enabled
+
+
+def lazy_decode():
+    return _LAZY_DECODE
+
 
 def register_msg_parser(version):
     def register(msg_parser):
@@ -52,6 +72,17 @@ def register_msg_parser(version):
     return register
 
 
+def _load_msg_parser(version):
+    # the parser module of a version registers its msg parser on import,
+    # which ofproto_protocol does on demand
+    from ryu.ofproto import ofproto_protocol
+    try:
+        ofproto_protocol._versions[version]
+    except KeyError:
+        raise exception.OFPUnknownVersion(version=version)
+    return _MSG_PARSERS[version]
+
+
 def msg(datapath, version, msg_type, msg_len, xid, buf):
     exp = None
     try:
@@ -61,7 +92,7 @@ def msg(datapath, version, msg_type, msg_len, xid, buf):
 
     msg_parser = _MSG_PARSERS.get(version)
     if msg_parser is None:
-        raise exception.OFPUnknownVersion(version=version)
+        msg_parser = _load_msg_parser(version)
 
     try:
         msg = msg_parser(datapath, version, msg_type, msg_len, xid, buf)
@@ -227,6 +258,35 @@ class MsgBase(StringifyMixin):
     def set_buf(self, buf):
         self.buf = buffer(buf)
 
+    def set_lazy(self, name, decoder):
+        """
+        Set attribute name to decoder(self).
+
+        If lazy decoding is enabled (cf. set_lazy_decode), decoder is
+        called on first access to the attribute instead.
+        """
+        if not _LAZY_DECODE:
+            setattr(self, name, decoder(self))
+            return
+        # drop the placeholder set by __init__ so that __getattr__ is used
+        self.__dict__.pop(name, None)
+        self.__dict__.setdefault('_lazy_attrs', {})[name] = decoder
+
+    def __getattr__(self, name):
+        # Only called if name is not found in the usual places.
+        lazy_attrs = self.__dict__.get('_lazy_attrs')
+        if not lazy_attrs or name not in lazy_attrs:
+            raise AttributeError("'%s' object has no attribute '%s'" %
+                                 (self.__class__.__name__, name))
+        value = lazy_attrs.pop(name)(self)
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self):
+        names = set(super(MsgBase, self).__dir__())
+        names.update(self.__dict__.get('_lazy_attrs', {}))
+        return sorted(names)
+
     def __str__(self):
         def hexify(x):
             return hex(x) if isinstance(x, six.integer_types) else x
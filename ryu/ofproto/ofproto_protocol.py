@@ -14,27 +14,61 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from ryu.ofproto import ofproto_v1_0
-from ryu.ofproto import ofproto_v1_0_parser
-from ryu.ofproto import ofproto_v1_2
-from ryu.ofproto import ofproto_v1_2_parser
-from ryu.ofproto import ofproto_v1_3
-from ryu.ofproto import ofproto_v1_3_parser
-from ryu.ofproto import ofproto_v1_4
-from ryu.ofproto import ofproto_v1_4_parser
-from ryu.ofproto import ofproto_v1_5
-from ryu.ofproto import ofproto_v1_5_parser
-
-
-_versions = {
-    ofproto_v1_0.OFP_VERSION: (ofproto_v1_0, ofproto_v1_0_parser),
-    ofproto_v1_2.OFP_VERSION: (ofproto_v1_2, ofproto_v1_2_parser),
-    ofproto_v1_3.OFP_VERSION: (ofproto_v1_3, ofproto_v1_3_parser),
-    ofproto_v1_4.OFP_VERSION: (ofproto_v1_4, ofproto_v1_4_parser),
-    ofproto_v1_5.OFP_VERSION: (ofproto_v1_5, ofproto_v1_5_parser),
+import importlib
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping  # Python 2
+
+
+# OF version: the names of the modules for the constants and parser.
+# The modules are imported on demand; a controller whose apps support
+# OpenFlow 1.3 only never imports the other versions.
+_VERSION_MODULES = {
+    0x01: ('ofproto_v1_0', 'ofproto_v1_0_parser'),
+    0x03: ('ofproto_v1_2', 'ofproto_v1_2_parser'),
+    0x04: ('ofproto_v1_3', 'ofproto_v1_3_parser'),
+    0x05: ('ofproto_v1_4', 'ofproto_v1_4_parser'),
+    0x06: ('ofproto_v1_5', 'ofproto_v1_5_parser'),
 }
 
 
+class _VersionModules(Mapping):
+    """
+    OF version to (ofproto, ofproto_parser) modules, imported on the
+    first lookup of the version
+    """
+
+    def __init__(self):
+        self._modules = {}
+
+    def __getitem__(self, version):
+        mods = self._modules.get(version)
+        if mods is None:
+            ofproto, parser = _VERSION_MODULES[version]
+            mods = (importlib.import_module('ryu.ofproto.' + ofproto),
+                    importlib.import_module('ryu.ofproto.' + parser))
+            assert mods[0].OFP_VERSION == version
+            self._modules[version] = mods
+        return mods
+
+    def __iter__(self):
+        return iter(sorted(_VERSION_MODULES))
+
+    def __len__(self):
+        return len(_VERSION_MODULES)
+
+    def loaded(self):
+        """
+        Returns the versions whose modules are already imported.
+        """
+        return sorted(self._modules)
+
+
+_versions = _VersionModules()
+
+
 # OF versions supported by every apps in this process (intersection)
 _supported_versions = set(_versions.keys())
 
@@ -44,6 +78,10 @@ def set_app_supported_versions(vers):
 
     _supported_versions &= set(vers)
     assert _supported_versions, 'No OpenFlow version is available'
+    # the modules of the versions an app declares are imported at startup
+    # rather than on the first connection of a switch
+    for version in _supported_versions:
+        _versions[version]
 
 
 class ProtocolDesc(object):
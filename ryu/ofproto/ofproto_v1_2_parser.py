@@ -3567,11 +3567,32 @@ class OFPMatch(StringifyMixin):
             self._fields2 = [ofproto.oxm_to_user(n, v, m) for (n, v, m)
                              in fields]
 
+    def __getattr__(self, name):
+        # Only called if name is not found in the usual places, i.e. for
+        # the attributes of the old API of a match made by parser().
+        if name == '_wc':
+            value = FlowWildcards()
+        elif name == '_flow':
+            value = Flow()
+        elif name == 'fields' and '_old_fields_buf' in self.__dict__:
+            value = self.fields = []
+            self.parser_old(self, *self._old_fields_buf)
+            return value
+        else:
+            raise AttributeError("'%s' object has no attribute '%s'" %
+                                 (self.__class__.__name__, name))
+        setattr(self, name, value)
+        return value
+
     def __getitem__(self, key):
-        return dict(self._fields2)[key]
+        return ofproto.oxm_get_field(self._fields2, key)
 
     def __contains__(self, key):
-        return key in dict(self._fields2)
+        try:
+            ofproto.oxm_get_field(self._fields2, key)
+        except KeyError:
+            return False
+        return True
 
     def iteritems(self):
         return iter(dict(self._fields2).items())
@@ -3580,7 +3601,10 @@ class OFPMatch(StringifyMixin):
         return self._fields2
 
     def get(self, key, default=None):
-        return dict(self._fields2).get(key, default)
+        try:
+            return ofproto.oxm_get_field(self._fields2, key)
+        except KeyError:
+            return default
 
     def stringify_attrs(self):
         yield "oxm_fields", dict(self._fields2)
@@ -3699,8 +3723,10 @@ class OFPMatch(StringifyMixin):
         self.fields.append(OFPMatchField.make(header, value, mask))
 
     def _composed_with_old_api(self):
-        return (self.fields and not self._fields2) or \
-            self._wc.__dict__ != FlowWildcards().__dict__
+        # _wc of a received match is made only if the old API is used
+        wc = self.__dict__.get('_wc')
+        return (not self._fields2 and self.fields) or \
+            (wc is not None and wc.__dict__ != FlowWildcards().__dict__)
 
     def serialize(self, buf, offset):
         """
@@ -3942,27 +3968,22 @@ class OFPMatch(StringifyMixin):
         Returns an object which is generated from a buffer including the
         expression of the wire protocol of the flow match.
         """
-        match = OFPMatch()
         type_, length = struct.unpack_from('!HH', buf, offset)
 
-        match.type = type_
-        match.length = length
-
         # ofp_match adjustment
         offset += 4
         length -= 4
 
-        # XXXcompat
-        cls.parser_old(match, buf, offset, length)
-
-        fields = []
-        while length > 0:
-            n, value, mask, field_len = ofproto.oxm_parse(buf, offset)
-            k, uv = ofproto.oxm_to_user(n, value, mask)
-            fields.append((k, uv))
-            offset += field_len
-            length -= field_len
+        # The values are converted when accessed, cf. OXMFields, and
+        # the attributes of the old API are made by __getattr__.
+        fields, end = ofproto.oxm_parse_fields(buf, offset, length)
+        if end < offset + length:
+            raise struct.error('truncated OXM TLV at offset %d' % end)
+        match = cls.__new__(cls)
+        match.type = type_
+        match.length = length + 4
         match._fields2 = fields
+        match._old_fields_buf = (buf, offset, length)
         return match
 
     @staticmethod
@@ -42,11 +42,13 @@ The following extensions are not implemented yet.
 
 import struct
 import base64
+import functools
 
 import six
 
 from ryu.lib import addrconv
 from ryu.lib import mac
+from ryu.lib import type_desc
 from ryu.lib.pack_utils import msg_pack_into
 from ryu.lib.packet import packet
 from ryu import exception
@@ -900,11 +902,32 @@ class OFPMatch(StringifyMixin):
             self._fields2 = [ofproto.oxm_to_user(n, v, m) for (n, v, m)
                              in fields]
 
+    def __getattr__(self, name):
+        # Only called if name is not found in the usual places, i.e. for
+        # the attributes of the old API of a match made by parser().
+        if name == '_wc':
+            value = FlowWildcards()
+        elif name == '_flow':
+            value = Flow()
+        elif name == 'fields' and '_old_fields_buf' in self.__dict__:
+            value = self.fields = []
+            self.parser_old(self, *self._old_fields_buf)
+            return value
+        else:
+            raise AttributeError("'%s' object has no attribute '%s'" %
+                                 (self.__class__.__name__, name))
+        setattr(self, name, value)
+        return value
+
     def __getitem__(self, key):
-        return dict(self._fields2)[key]
+        return ofproto.oxm_get_field(self._fields2, key)
 
     def __contains__(self, key):
-        return key in dict(self._fields2)
+        try:
+            ofproto.oxm_get_field(self._fields2, key)
+        except KeyError:
+            return False
+        return True
 
     def iteritems(self):
         return iter(dict(self._fields2).items())
@@ -913,7 +936,10 @@ class OFPMatch(StringifyMixin):
         return self._fields2
 
     def get(self, key, default=None):
-        return dict(self._fields2).get(key, default)
+        try:
+            return ofproto.oxm_get_field(self._fields2, key)
+        except KeyError:
+            return default
 
     def stringify_attrs(self):
         yield "oxm_fields", dict(self._fields2)
@@ -1036,8 +1062,10 @@ class OFPMatch(StringifyMixin):
         self.fields.append(OFPMatchField.make(header, value, mask))
 
     def _composed_with_old_api(self):
-        return (self.fields and not self._fields2) or \
-            self._wc.__dict__ != FlowWildcards().__dict__
+        # _wc of a received match is made only if the old API is used
+        wc = self.__dict__.get('_wc')
+        return (not self._fields2 and self.fields) or \
+            (wc is not None and wc.__dict__ != FlowWildcards().__dict__)
 
     def serialize(self, buf, offset):
         """
@@ -1307,38 +1335,25 @@ class OFPMatch(StringifyMixin):
         Returns an object which is generated from a buffer including the
         expression of the wire protocol of the flow match.
         """
-        match = OFPMatch()
         type_, length = struct.unpack_from('!HH', buf, offset)
 
-        match.type = type_
-        match.length = length
-
         # ofp_match adjustment
         offset += 4
         length -= 4
 
-        exc = None
-        residue = None
-        # XXXcompat
-        try:
-            cls.parser_old(match, buf, offset, length)
-        except struct.error as e:
-            exc = e
-
-        fields = []
-        try:
-            while length > 0:
-                n, value, mask, field_len = ofproto.oxm_parse(buf, offset)
-                k, uv = ofproto.oxm_to_user(n, value, mask)
-                fields.append((k, uv))
-                offset += field_len
-                length -= field_len
-        except struct.error as e:
-            exc = e
-            residue = buf[offset:]
+        # The values are converted when accessed, cf. OXMFields, and
+        # the attributes of the old API are made by __getattr__.
+        fields, end = ofproto.oxm_parse_fields(buf, offset, length)
+        match = cls.__new__(cls)
+        match.type = type_
+        match.length = length + 4
         match._fields2 = fields
-        if exc is not None:
-            raise exception.OFPTruncatedMessage(match, residue, exc)
+        if end < offset + length:
+            match._old_fields_buf = (buf, offset, end - offset)
+            raise exception.OFPTruncatedMessage(
+                match, buf[end:],
+                struct.error('truncated OXM TLV at offset %d' % end))
+        match._old_fields_buf = (buf, offset, length)
         return match
 
     @staticmethod
@@ -2328,12 +2343,14 @@ class OFPPacketIn(MsgBase):
             ofproto.OFP_PACKET_IN_PACK_STR,
             msg.buf, ofproto.OFP_HEADER_SIZE)
 
-        msg.match = OFPMatch.parser(msg.buf, ofproto.OFP_PACKET_IN_SIZE -
-                                    ofproto.OFP_MATCH_SIZE)
+        offset = ofproto.OFP_PACKET_IN_SIZE - ofproto.OFP_MATCH_SIZE
+        msg.set_lazy('match', lambda msg: OFPMatch.parser(msg.buf, offset))
 
-        match_len = utils.round_up(msg.match.length, 8)
-        msg.data = msg.buf[(ofproto.OFP_PACKET_IN_SIZE -
-                            ofproto.OFP_MATCH_SIZE + match_len + 2):]
+        # Locate data without decoding the match.
+        (_match_type, match_len) = struct.unpack_from(
+            ofproto.OFP_MATCH_PACK_STR, msg.buf, offset)[:2]
+        match_len = utils.round_up(match_len, 8)
+        msg.data = msg.buf[(offset + match_len + 2):]
 
         if msg.total_len < len(msg.data):
             # discard padding for 8-byte alignment of OFP packet
@@ -2791,6 +2808,203 @@ class OFPFlowMod(MsgBase):
         return msg
 
 
+# struct format characters of the OXM values packed natively
+_OXM_INT_FORMATS = {1: 'B', 2: 'H', 4: 'I', 8: 'Q'}
+
+
+class OFPFlowModTemplate(object):
+    """
+    Precompiled serializer of flow-mod messages of a fixed shape
+
+    Forwarding applications typically send flow-mods which differ only
+    in the values of the same match fields and output ports.  A template
+    compiles such a shape once: an exact match on ``match_fields``, in
+    any order, and an apply-actions instruction with ``n_outputs``
+    output actions.  The whole message is then packed by a single
+    ``struct`` call, without building OFPMatch and instruction objects.
+
+    The serialized message is the same as the one of the equivalent
+    OFPFlowMod.  Masked fields are not supported.
+
+    Example::
+
+        tmpl = parser.OFPFlowModTemplate.compile(
+            ('in_port', 'eth_dst', 'eth_src'))
+        req = tmpl.build(datapath, (in_port, dst, src), [out_port],
+                         priority=1, idle_timeout=10)
+        datapath.send_msg(req)
+
+    ``compile`` returns a template cached by shape.
+    """
+
+    _templates = {}
+
+    def __init__(self, match_fields, n_outputs=1,
+                 max_len=ofproto.OFPCML_MAX):
+        self.match_fields = tuple(match_fields)
+        self.n_outputs = n_outputs
+        self.max_len = max_len
+
+        # OFPMatch orders the fields by OXM type
+        def _key(i):
+            n = ofproto.oxm_from_user_header(self.match_fields[i])
+            return n[0] if isinstance(n, tuple) else n
+        order = sorted(range(len(self.match_fields)), key=_key)
+
+        fmt = (ofproto.OFP_HEADER_PACK_STR +
+               ofproto.OFP_FLOW_MOD_PACK_STR0[1:] + 'HH')
+        match_args = [ofproto.OFPMT_OXM, None]
+        # (position in match_args, index of the value, converter)
+        self._match_plan = []
+        match_len = 4  # type and length
+        for i in order:
+            name = self.match_fields[i]
+            hdr = bytearray()
+            ofproto.oxm_serialize_header(
+                ofproto.oxm_from_user_header(name), hdr, 0)
+            _num, type_ = ofproto.oxm_get_field_info_by_name(name)
+            conv = type_.from_user
+            if isinstance(type_, type_desc.IntDescr):
+                value_fmt = _OXM_INT_FORMATS.get(type_.size)
+                if value_fmt is not None:
+                    conv = None
+            else:
+                value_fmt = None
+            if value_fmt is None:
+                value_fmt = '%ds' % type_.size
+            fmt += '%ds%s' % (len(hdr), value_fmt)
+            match_args.append(bytes(hdr))
+            self._match_plan.append((len(match_args), i, conv))
+            match_args.append(None)
+            match_len += len(hdr) + type_.size
+        match_args[1] = match_len
+        self._match_args = match_args
+        self._match_len = match_len
+        fmt += '%dx' % (utils.round_up(match_len, 8) - match_len)
+
+        inst_len = (ofproto.OFP_INSTRUCTION_ACTIONS_SIZE +
+                    n_outputs * ofproto.OFP_ACTION_OUTPUT_SIZE)
+        fmt += ofproto.OFP_INSTRUCTION_ACTIONS_PACK_STR[1:]
+        fmt += ofproto.OFP_ACTION_OUTPUT_PACK_STR[1:] * n_outputs
+        self._inst_args = [ofproto.OFPIT_APPLY_ACTIONS, inst_len]
+        self._inst_len = inst_len
+        self._action_args = [ofproto.OFPAT_OUTPUT,
+                             ofproto.OFP_ACTION_OUTPUT_SIZE, None, max_len]
+
+        self._struct = struct.Struct(fmt)
+
+    @classmethod
+    def compile(cls, match_fields, n_outputs=1, max_len=ofproto.OFPCML_MAX):
+        """
+        Returns the template of the shape, compiling it on first use.
+        """
+        key = (tuple(match_fields), n_outputs, max_len)
+        tmpl = cls._templates.get(key)
+        if tmpl is None:
+            tmpl = cls._templates[key] = cls(*key)
+        return tmpl
+
+    def build(self, datapath, match_values, out_ports, **kwargs):
+        """
+        Returns a flow-mod message to be sent with Datapath.send_msg.
+
+        match_values are the values of match_fields in the same order,
+        out_ports the ports of the output actions.  The other arguments
+        are the ones of OFPFlowMod except match and instructions.
+        """
+        return _CompiledFlowMod(self, datapath, match_values, out_ports,
+                                **kwargs)
+
+    def pack(self, msg):
+        values = msg.match_values
+        if len(values) != len(self.match_fields):
+            raise ValueError('%d match values for the fields %s' %
+                             (len(values), self.match_fields))
+        ports = msg.out_ports
+        if len(ports) != self.n_outputs:
+            raise ValueError('%d output ports for %d actions' %
+                             (len(ports), self.n_outputs))
+
+        match_args = self._match_args[:]
+        for pos, i, conv in self._match_plan:
+            match_args[pos] = values[i] if conv is None else conv(values[i])
+        action_args = self._action_args * self.n_outputs
+        action_args[2::4] = ports
+
+        args = [ofproto.OFP_VERSION, ofproto.OFPT_FLOW_MOD,
+                self._struct.size, msg.xid or 0,
+                msg.cookie, msg.cookie_mask, msg.table_id, msg.command,
+                msg.idle_timeout, msg.hard_timeout, msg.priority,
+                msg.buffer_id, msg.out_port, msg.out_group, msg.flags]
+        args += match_args
+        args += self._inst_args
+        args += action_args
+        return bytearray(self._struct.pack(*args))
+
+
+class _CompiledFlowMod(OFPFlowMod):
+    # A flow-mod serialized by OFPFlowModTemplate.  match and instructions
+    # are built only when accessed, e.g. for logging.
+
+    def __init__(self, template, datapath, match_values, out_ports,
+                 cookie=0, cookie_mask=0, table_id=0,
+                 command=ofproto.OFPFC_ADD,
+                 idle_timeout=0, hard_timeout=0,
+                 priority=ofproto.OFP_DEFAULT_PRIORITY,
+                 buffer_id=ofproto.OFP_NO_BUFFER,
+                 out_port=0, out_group=0, flags=0):
+        MsgBase.__init__(self, datapath)
+        self.cookie = cookie
+        self.cookie_mask = cookie_mask
+        self.table_id = table_id
+        self.command = command
+        self.idle_timeout = idle_timeout
+        self.hard_timeout = hard_timeout
+        self.priority = priority
+        self.buffer_id = buffer_id
+        self.out_port = out_port
+        self.out_group = out_group
+        self.flags = flags
+        self._template = template
+        self.match_values = match_values
+        self.out_ports = out_ports
+        self.__dict__['_lazy_attrs'] = {
+            'match': _CompiledFlowMod._make_match,
+            'instructions': _CompiledFlowMod._make_instructions,
+        }
+
+    def _make_match(self):
+        match = OFPMatch(**dict(zip(self._template.match_fields,
+                                    self.match_values)))
+        match.length = self._template._match_len
+        return match
+
+    def _make_instructions(self):
+        actions = [OFPActionOutput(port, self._template.max_len)
+                   for port in self.out_ports]
+        inst = OFPInstructionActions(ofproto.OFPIT_APPLY_ACTIONS, actions)
+        inst.len = self._template._inst_len
+        return [inst]
+
+    def stringify_attrs(self):
+        for k, v in super(_CompiledFlowMod, self).stringify_attrs():
+            if k not in ('match_values', 'out_ports'):
+                yield k, v
+
+    def to_jsondict(self, encode_string=base64.b64encode):
+        # described as the equivalent OFPFlowMod
+        dict_ = super(_CompiledFlowMod, self).to_jsondict(encode_string)
+        return {OFPFlowMod.__name__: dict_[self.__class__.__name__]}
+
+    def serialize(self):
+        self.version = ofproto.OFP_VERSION
+        self.msg_type = self.cls_msg_type
+        if self.xid is None:
+            self.xid = 0
+        self.buf = self._template.pack(self)
+        self.msg_len = len(self.buf)
+
+
 class OFPInstruction(StringifyMixin):
     _INSTRUCTION_TYPES = {}
 
@@ -3941,19 +4155,23 @@ class OFPMultipartReply(MsgBase):
         msg.flags = flags
 
         if stats_type_cls is not None:
-            offset = ofproto.OFP_MULTIPART_REPLY_SIZE
-            body = []
-            while offset < msg_len:
-                b = stats_type_cls.cls_stats_body_cls.parser(msg.buf, offset)
-                body.append(b)
-                offset += b.length if hasattr(b, 'length') else b.len
-
-            if stats_type_cls.cls_body_single_struct:
-                msg.body = body[0]
-            else:
-                msg.body = body
+            msg.set_lazy('body', functools.partial(
+                stats_type_cls._parser_body, msg_len=msg_len))
         return msg
 
+    @classmethod
+    def _parser_body(cls, msg, msg_len):
+        offset = ofproto.OFP_MULTIPART_REPLY_SIZE
+        body = []
+        while offset < msg_len:
+            b = cls.cls_stats_body_cls.parser(msg.buf, offset)
+            body.append(b)
+            offset += b.length if hasattr(b, 'length') else b.len
+
+        if cls.cls_body_single_struct:
+            return body[0]
+        return body
+
 
 class OFPDescStats(ofproto_parser.namedtuple('OFPDescStats', (
         'mfr_desc', 'hw_desc', 'sw_desc', 'serial_num', 'dp_desc'))):
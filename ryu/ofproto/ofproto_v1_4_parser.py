@@ -20,6 +20,7 @@ Decoder/Encoder implementations of OpenFlow 1.4.
 
 import struct
 import base64
+import functools
 
 import six
 
@@ -772,24 +773,18 @@ class OFPMatch(StringifyMixin):
         Returns an object which is generated from a buffer including the
         expression of the wire protocol of the flow match.
         """
-        match = OFPMatch()
         type_, length = struct.unpack_from('!HH', buf, offset)
 
-        match.type = type_
-        match.length = length
-
         # ofp_match adjustment
         offset += 4
-        length -= 4
-
-        fields = []
-        while length > 0:
-            n, value, mask, field_len = ofproto.oxm_parse(buf, offset)
-            k, uv = ofproto.oxm_to_user(n, value, mask)
-            fields.append((k, uv))
-            offset += field_len
-            length -= field_len
-        match._fields2 = fields
+
+        # The values are converted when accessed, cf. OXMFields.
+        fields, end = ofproto.oxm_parse_fields(buf, offset, length - 4)
+        if end < offset + length - 4:
+            raise struct.error('truncated OXM TLV at offset %d' % end)
+        match = OFPMatch(_ordered_fields=fields)
+        match.type = type_
+        match.length = length
         return match
 
     def serialize(self, buf, offset):
@@ -817,10 +812,14 @@ class OFPMatch(StringifyMixin):
         return length + pad_len
 
     def __getitem__(self, key):
-        return dict(self._fields2)[key]
+        return ofproto.oxm_get_field(self._fields2, key)
 
     def __contains__(self, key):
-        return key in dict(self._fields2)
+        try:
+            ofproto.oxm_get_field(self._fields2, key)
+        except KeyError:
+            return False
+        return True
 
     def iteritems(self):
         return iter(dict(self._fields2).items())
@@ -829,7 +828,10 @@ class OFPMatch(StringifyMixin):
         return self._fields2
 
     def get(self, key, default=None):
-        return dict(self._fields2).get(key, default)
+        try:
+            return ofproto.oxm_get_field(self._fields2, key)
+        except KeyError:
+            return default
 
     def stringify_attrs(self):
         yield "oxm_fields", dict(self._fields2)
@@ -1235,12 +1237,14 @@ class OFPPacketIn(MsgBase):
             ofproto.OFP_PACKET_IN_PACK_STR,
             msg.buf, ofproto.OFP_HEADER_SIZE)
 
-        msg.match = OFPMatch.parser(msg.buf, ofproto.OFP_PACKET_IN_SIZE -
-                                    ofproto.OFP_MATCH_SIZE)
+        offset = ofproto.OFP_PACKET_IN_SIZE - ofproto.OFP_MATCH_SIZE
+        msg.set_lazy('match', lambda msg: OFPMatch.parser(msg.buf, offset))
 
-        match_len = utils.round_up(msg.match.length, 8)
-        msg.data = msg.buf[(ofproto.OFP_PACKET_IN_SIZE -
-                            ofproto.OFP_MATCH_SIZE + match_len + 2):]
+        # Locate data without decoding the match.
+        (_match_type, match_len) = struct.unpack_from(
+            ofproto.OFP_MATCH_PACK_STR, msg.buf, offset)[:2]
+        match_len = utils.round_up(match_len, 8)
+        msg.data = msg.buf[(offset + match_len + 2):]
 
         if msg.total_len < len(msg.data):
             # discard padding for 8-byte alignment of OFP packet
@@ -1652,18 +1656,22 @@ class OFPMultipartReply(MsgBase):
         msg.type = type_
         msg.flags = flags
 
+        msg.set_lazy('body', functools.partial(
+            stats_type_cls._parser_body, msg_len=msg_len))
+        return msg
+
+    @classmethod
+    def _parser_body(cls, msg, msg_len):
         offset = ofproto.OFP_MULTIPART_REPLY_SIZE
         body = []
         while offset < msg_len:
-            b = stats_type_cls.cls_stats_body_cls.parser(msg.buf, offset)
+            b = cls.cls_stats_body_cls.parser(msg.buf, offset)
             body.append(b)
             offset += b.length if hasattr(b, 'length') else b.len
 
-        if stats_type_cls.cls_body_single_struct:
-            msg.body = body[0]
-        else:
-            msg.body = body
-        return msg
+        if cls.cls_body_single_struct:
+            return body[0]
+        return body
 
 
 class OFPDescStats(ofproto_parser.namedtuple('OFPDescStats', (
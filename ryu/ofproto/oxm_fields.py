@@ -64,6 +64,9 @@
 # | reserved, should be zero      | pbb_uca       |
 # +-------------------------------+---------------+
 
+import struct
+
+from ryu.lib import type_desc
 from ryu.ofproto.oxx_fields import (
     _get_field_info_by_name,
     _from_user,
@@ -208,6 +211,185 @@ def generate(modname):
     add_attr('oxm_to_jsondict', _to_jsondict)
     add_attr('oxm_from_jsondict', _from_jsondict)
 
+    table = _make_decode_table(mod.oxm_types)
+    add_attr('oxm_parse_fields',
+             functools.partial(_parse_fields, mod, table))
+    add_attr('oxm_get_field', get_field)
+
+
+# struct to unpack the OXM values natively, by the value length
+_INT_STRUCTS = dict((size, struct.Struct('!' + fmt)) for (size, fmt)
+                    in [(1, 'B'), (2, 'H'), (4, 'I'), (8, 'Q')])
+_HEADER = struct.Struct('!I')
+
+
+def _make_decode_table(oxm_types):
+    # 32-bit OXM header, including the hasmask bit and the length,
+    # -> (name, to_user(buf, offset), value length, hasmask)
+    # The experimenter OXMs are left to the generic decoder.
+    table = {}
+    for f in oxm_types:
+        if isinstance(f.num, tuple):
+            continue
+        size = f.type.size
+        if isinstance(f.type, type_desc.IntDescr) and size in _INT_STRUCTS:
+            unpack_from = _INT_STRUCTS[size].unpack_from
+
+            def to_user(buf, offset, unpack_from=unpack_from):
+                return unpack_from(buf, offset)[0]
+        else:
+            def to_user(buf, offset, t=f.type, size=size):
+                return t.to_user(bytes(buf[offset:offset + size]))
+        for hasmask in (0, 1):
+            header = ((f.num << 9) | (hasmask << 8) |
+                      (size * (hasmask + 1)))
+            table[header] = (f.name, to_user, size, hasmask)
+    return table
+
+
+def _parse_fields(mod, table, buf, offset, length):
+    # Checks the framing of the TLVs in buf[offset:offset + length].
+    # The values of the TLVs in table are well-formed by their header;
+    # the others, experimenter, unknown or malformed fields, are decoded
+    # once here so that a malformed one fails the parser as before.
+    # Returns OXMFields of the complete TLVs and the offset after them.
+    start = offset
+    end = offset + length
+    buf_len = len(buf)
+    while offset < end:
+        if offset + 4 > buf_len:
+            break
+        (header, ) = _HEADER.unpack_from(buf, offset)
+        field_end = offset + 4 + (header & 0xff)
+        if field_end > buf_len:
+            break
+        if header not in table:
+            try:
+                n, value, mask, _len = mod.oxm_parse(buf, offset)
+            except struct.error:
+                break
+            mod.oxm_to_user(n, value, mask)
+        offset = field_end
+    return OXMFields(mod, table, buf, start, offset), offset
+
+
+class OXMFields(object):
+    """
+    The OXM TLVs of a received match, decoded on demand.
+
+    This stands for the list of (name, user value) pairs which OFPMatch
+    keeps in _fields2.  get_field() converts the value of the requested
+    field only; iterating converts every field once and keeps the list.
+    """
+
+    __slots__ = ('_mod', '_table', '_buf', '_start', '_end', '_items')
+
+    def __init__(self, mod, table, buf, start, end):
+        self._mod = mod
+        self._table = table
+        self._buf = buf
+        self._start = start
+        self._end = end
+        self._items = None
+
+    def _header(self, offset):
+        # Returns (table entry or None, offset of the next TLV)
+        (header, ) = _HEADER.unpack_from(self._buf, offset)
+        return self._table.get(header), offset + 4 + (header & 0xff)
+
+    def _decode(self, entry, offset):
+        if entry is None:
+            n, value, mask, _len = self._mod.oxm_parse(self._buf, offset)
+            return self._mod.oxm_to_user(n, value, mask)
+        (name, to_user, size, hasmask) = entry
+        value = to_user(self._buf, offset + 4)
+        if hasmask:
+            return name, (value, to_user(self._buf, offset + 4 + size))
+        return name, value
+
+    def _name(self, entry, offset):
+        if entry is None:
+            n, _len = self._mod.oxm_parse_header(self._buf, offset)
+            return self._mod.oxm_to_user_header(n)
+        return entry[0]
+
+    def _list(self):
+        if self._items is None:
+            items = []
+            offset = self._start
+            while offset < self._end:
+                entry, next_offset = self._header(offset)
+                items.append(self._decode(entry, offset))
+                offset = next_offset
+            self._items = items
+            self._buf = None
+        return self._items
+
+    def get_field(self, key):
+        """
+        Returns the user value of the field key, the last one if the match
+        has several.  Raises KeyError if the match does not have it.
+        """
+        if self._items is not None:
+            return get_field(self._items, key)
+        found = None
+        offset = self._start
+        while offset < self._end:
+            entry, next_offset = self._header(offset)
+            if self._name(entry, offset) == key:
+                found = (entry, offset)
+            offset = next_offset
+        if found is None:
+            raise KeyError(key)
+        return self._decode(*found)[1]
+
+    def __iter__(self):
+        return iter(self._list())
+
+    def __len__(self):
+        return len(self._list())
+
+    def __bool__(self):
+        if self._items is not None:
+            return bool(self._items)
+        return self._start < self._end
+
+    __nonzero__ = __bool__  # Python 2
+
+    def __getitem__(self, index):
+        return self._list()[index]
+
+    def __eq__(self, other):
+        if isinstance(other, OXMFields):
+            other = other._list()
+        return self._list() == other
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def __reduce__(self):
+        # copied or pickled as the plain list
+        return list, (self._list(), )
+
+    def __repr__(self):
+        return repr(self._list())
+
+
+def get_field(fields, key):
+    """
+    Returns the user value of key in fields, the list of (name, user
+    value) pairs of OFPMatch or OXMFields.  As with dict(fields)[key], the
+    last one wins if key is repeated.  Raises KeyError if not found.
+    """
+    if isinstance(fields, OXMFields):
+        return fields.get_field(key)
+    for k, uv in reversed(fields):
+        if k == key:
+            return uv
+    raise KeyError(key)
+
 
 def _to_jsondict(k, uv):
     if isinstance(uv, tuple):
@@ -0,0 +1,85 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from nose.tools import eq_
+
+from ryu.app.network_awareness.traffic_matrix import TrafficMatrix
+
+
+class Test_TrafficMatrix(unittest.TestCase):
+    """ Test case for ryu.app.network_awareness.traffic_matrix
+    """
+
+    def test_first_update(self):
+        tm = TrafficMatrix(alpha=0.5)
+        tm.update(1, {2: 100.0, 3: 50.0})
+        # the first sample of a row is taken as is.
+        eq_([1, 2, 3], tm.dpids)
+        eq_(100.0, tm.get(1, 2))
+        eq_(50.0, tm.get(1, 3))
+        eq_(0, tm.get(2, 1))
+
+    def test_ewma(self):
+        tm = TrafficMatrix(alpha=0.25)
+        tm.update(1, {2: 100.0})
+        tm.update(1, {2: 200.0})
+        eq_(0.25 * 200.0 + 0.75 * 100.0, tm.get(1, 2))
+        # a destination missing from the sample counts as 0.
+        tm.update(1, {})
+        eq_(0.75 * 125.0, tm.get(1, 2))
+
+    def test_grow(self):
+        tm = TrafficMatrix()
+        tm.update(1, {2: 10.0})
+        tm.update(3, {1: 30.0})
+        eq_((3, 3), tm.matrix.shape)
+        eq_({1: 0, 2: 1, 3: 2}, tm.index)
+        # the rows sampled before keep their values.
+        eq_(10.0, tm.get(1, 2))
+        eq_(0, tm.get(1, 3))
+        eq_(30.0, tm.get(3, 1))
+        # the first sample of the new row is not smoothed.
+        tm.update(2, {3: 20.0})
+        eq_(20.0, tm.get(2, 3))
+
+    def test_remove(self):
+        tm = TrafficMatrix()
+        tm.update(1, {2: 12.0, 3: 13.0})
+        tm.update(2, {1: 21.0, 3: 23.0})
+        tm.update(3, {1: 31.0, 2: 32.0})
+        tm.remove(2)
+        eq_([1, 3], tm.dpids)
+        eq_({1: 0, 3: 1}, tm.index)
+        eq_((2, 2), tm.matrix.shape)
+        eq_({1: {1: 0, 3: 13.0}, 3: {1: 31.0, 3: 0}}, tm.to_dict())
+        # the index of the removed switch is free for a new one.
+        tm.update(4, {1: 41.0})
+        eq_({1: 0, 3: 1, 4: 2}, tm.index)
+        eq_(41.0, tm.get(4, 1))
+        eq_(13.0, tm.get(1, 3))
+        # unknown dpid
+        tm.remove(2)
+        eq_([1, 3, 4], tm.dpids)
+
+    def test_unknown_dpid(self):
+        tm = TrafficMatrix()
+        eq_(0, tm.get(1, 2))
+        eq_({}, tm.to_dict())
+        tm.update(1, {2: 10.0})
+        eq_(0, tm.get(1, 5))
+        eq_(0, tm.get(5, 2))
+        eq_({1: {1: 0, 2: 10.0}, 2: {1: 0, 2: 0}}, tm.to_dict())
@@ -18,14 +18,25 @@
 import unittest
 import logging
 
+try:
+    import mock  # Python 2
+except ImportError:
+    from unittest import mock  # Python 3
+
 import nose
-from nose.tools import eq_
+from nose.tools import eq_, ok_
 
 from ryu.app.wsgi import ControllerBase
 from ryu.app.wsgi import WSGIApplication
 from ryu.app.wsgi import Response
 from ryu.app.wsgi import route
+from ryu.app.wsgi import MetricsController
+from ryu.app.wsgi import CaptureController
+from ryu.base import app_manager
+from ryu.controller import controller
+from ryu.controller import pktin_capture
 from ryu.lib import dpid as dpidlib
+from ryu.ofproto import ofproto_v1_3
 
 LOG = logging.getLogger('test_wsgi')
 
@@ -100,5 +111,77 @@ class Test_wsgi(unittest.TestCase):
         eq_(r[0], b'root')
 
 
+class Test_metrics(unittest.TestCase):
+
+    """ Test case for the metrics endpoint
+    """
+
+    def setUp(self):
+        self.wsgi_app = WSGIApplication()
+        self.wsgi_app.register(MetricsController)
+        self.app = app_manager.RyuApp()
+        self.app.name = 'test_metrics_app'
+        app_manager.register_app(self.app)
+        self.dp = mock.Mock(id=1, ofproto=ofproto_v1_3,
+                            connected_at=0,
+                            rx_stats={ofproto_v1_3.OFPT_PACKET_IN: [3, 300]},
+                            tx_stats={})
+        controller._active_datapaths.add(self.dp)
+
+    def tearDown(self):
+        controller._active_datapaths.discard(self.dp)
+        app_manager.unregister_app(self.app)
+
+    def test_get_metrics(self):
+        def handler(ev):
+            pass
+        self.app._call_handler(handler, None, app_manager.RyuApp)
+
+        r = self.wsgi_app({'REQUEST_METHOD': 'GET',
+                           'PATH_INFO': '/metrics'},
+                          lambda s, _: eq_(s, '200 OK'))
+        lines = b''.join(r).decode().splitlines()
+        ok_('ryu_app_event_queue_dropped_total{app="test_metrics_app"} 0'
+            in lines)
+        ok_('ryu_handler_latency_seconds_count{app="test_metrics_app",'
+            'handler="handler",event="RyuApp"} 1' in lines)
+        ok_('ryu_handler_latency_seconds_bucket{app="test_metrics_app",'
+            'handler="handler",event="RyuApp",le="+Inf"} 1' in lines)
+        ok_('ryu_datapath_rx_messages_total{dpid="0000000000000001",'
+            'type="OFPT_PACKET_IN"} 3' in lines)
+        ok_('ryu_datapath_rx_bytes_total{dpid="0000000000000001",'
+            'type="OFPT_PACKET_IN"} 300' in lines)
+
+
+class Test_capture(unittest.TestCase):
+
+    """ Test case for the capture endpoint
+    """
+
+    def setUp(self):
+        self.wsgi_app = WSGIApplication()
+        self.wsgi_app.register(CaptureController)
+
+    def test_get_capture(self):
+        capture = pktin_capture.enable()
+        try:
+            capture.add(mock.Mock(id=1),
+                        mock.Mock(in_port=1, reason=0, buffer_id=1,
+                                  total_len=4, data=b'\x01\x02\x03\x04'))
+            r = self.wsgi_app({'REQUEST_METHOD': 'GET',
+                               'PATH_INFO': '/capture'},
+                              lambda s, _: eq_(s, '200 OK'))
+        finally:
+            pktin_capture.disable()
+        body = b''.join(r)
+        # the section header block
+        eq_(b'\x0a\x0d\x0d\x0a', body[:4])
+        ok_(b'\x01\x02\x03\x04' in body)
+
+    def test_get_capture_disabled(self):
+        self.wsgi_app({'REQUEST_METHOD': 'GET', 'PATH_INFO': '/capture'},
+                      lambda s, _: eq_(s, '404 Not Found'))
+
+
 if __name__ == '__main__':
     nose.main(argv=['nosetests', '-s', '-v'], defaultTest=__file__)
@@ -0,0 +1,254 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+try:
+    import mock  # Python 2
+except ImportError:
+    from unittest import mock  # Python 3
+
+import unittest
+from nose.tools import eq_, ok_, raises
+
+from ryu import exception
+from ryu.base import app_manager
+from ryu.controller import event
+from ryu.controller import worker
+from ryu.controller.handler import set_ev_cls
+from ryu.controller.handler import MAIN_DISPATCHER, CONFIG_DISPATCHER
+from ryu.controller.handler import PRIORITY_HIGH, PRIORITY_NORMAL
+from ryu.lib import hub
+
+
+class _Event(event.EventBase):
+    pass
+
+
+class _OtherEvent(event.EventBase):
+    pass
+
+
+class _PriorityEvent(event.EventBase):
+    event_priority = PRIORITY_HIGH
+
+
+class _KeyEvent(event.EventBase):
+    def __init__(self, key, value):
+        super(_KeyEvent, self).__init__()
+        self.key = key
+        self.value = value
+
+
+class _App(app_manager.RyuApp):
+    @set_ev_cls(_Event, MAIN_DISPATCHER)
+    def main_handler(self, ev):
+        pass
+
+    @set_ev_cls(_Event)
+    def any_state_handler(self, ev):
+        pass
+
+    @set_ev_cls(_OtherEvent, priority=PRIORITY_HIGH)
+    def priority_handler(self, ev):
+        pass
+
+
+class Test_RyuApp(unittest.TestCase):
+    """ Test case for dispatch tables of RyuApp
+    """
+
+    def setUp(self):
+        self.app = _App()
+        for handler in [self.app.main_handler, self.app.any_state_handler]:
+            self.app.register_handler(_Event, handler)
+
+    def test_get_handlers(self):
+        ev = _Event()
+        eq_(2, len(self.app.get_handlers(ev)))
+        eq_((self.app.main_handler, self.app.any_state_handler),
+            self.app.get_handlers(ev, MAIN_DISPATCHER))
+        eq_((self.app.any_state_handler,),
+            self.app.get_handlers(ev, CONFIG_DISPATCHER))
+        eq_((), self.app.get_handlers(_OtherEvent(), MAIN_DISPATCHER))
+
+    def test_get_handlers_invalidated(self):
+        ev = _Event()
+        eq_(2, len(self.app.get_handlers(ev, MAIN_DISPATCHER)))
+
+        def dynamic_handler(ev):
+            pass
+
+        self.app.register_handler(_Event, dynamic_handler)
+        eq_((self.app.any_state_handler, dynamic_handler),
+            self.app.get_handlers(ev, CONFIG_DISPATCHER))
+        self.app.unregister_handler(_Event, self.app.any_state_handler)
+        eq_((dynamic_handler,),
+            self.app.get_handlers(ev, CONFIG_DISPATCHER))
+
+    def test_get_observers_invalidated(self):
+        ev = _Event()
+        eq_((), self.app.get_observers(ev, MAIN_DISPATCHER))
+        self.app.register_observer(_Event, 'foo', [MAIN_DISPATCHER])
+        self.app.register_observer(_Event, 'bar')
+        eq_(['bar', 'foo'],
+            sorted(self.app.get_observers(ev, MAIN_DISPATCHER)))
+        eq_(('bar',), self.app.get_observers(ev, CONFIG_DISPATCHER))
+        self.app.unregister_observer(_Event, 'bar')
+        eq_((), self.app.get_observers(ev, CONFIG_DISPATCHER))
+        self.app.unregister_observer_all_event('foo')
+        eq_((), self.app.get_observers(ev, MAIN_DISPATCHER))
+
+    def test_event_priority(self):
+        eq_(PRIORITY_NORMAL, self.app._get_event_priority(_Event()))
+        eq_(PRIORITY_HIGH, self.app._get_event_priority(_PriorityEvent()))
+        # declared by the handler
+        eq_(PRIORITY_NORMAL, self.app._get_event_priority(_OtherEvent()))
+        self.app.register_handler(_OtherEvent, self.app.priority_handler)
+        eq_(PRIORITY_HIGH, self.app._get_event_priority(_OtherEvent()))
+
+    def test_handler_stats(self):
+        def failing_handler(ev):
+            raise ValueError
+
+        ev = _Event()
+        self.app._call_handler(self.app.main_handler, ev, _Event)
+        self.app._call_handler(self.app.main_handler, ev, _Event)
+        self.app._call_handler(failing_handler, ev, _Event)
+
+        stats = self.app.get_handler_stats()
+        eq_(['failing_handler', 'main_handler'],
+            sorted(name for name, _ev_cls in stats))
+        main = stats[('main_handler', '_Event')]
+        eq_(2, main['count'])
+        eq_(0, main['errors'])
+        eq_(float('inf'), main['buckets'][-1][0])
+        eq_(2, main['buckets'][-1][1])
+        eq_(1, stats[('failing_handler', '_Event')]['errors'])
+
+
+class _BatchApp(app_manager.RyuApp):
+    _EVENT_BATCH_SIZE = 3
+
+    def __init__(self, *args, **kwargs):
+        super(_BatchApp, self).__init__(*args, **kwargs)
+        self.received = []
+
+    @set_ev_cls(_KeyEvent)
+    def single_handler(self, ev):
+        self.received.append(('single', ev.value))
+
+    @set_ev_cls(_KeyEvent, batch=True)
+    def batch_handler(self, evs):
+        self.received.append(('batch', [ev.value for ev in evs]))
+
+
+class Test_EventQueue(unittest.TestCase):
+    """ Test case for the event queue of RyuApp
+    """
+
+    def _put(self, q, *values):
+        for value in values:
+            q.put(_KeyEvent(value % 2, value), None)
+
+    def _values(self, q):
+        values = []
+        while not q.empty():
+            ev, _state = q.get()
+            values.append(ev.value)
+        return values
+
+    def test_drop_newest(self):
+        q = app_manager._EventQueue(
+            2, app_manager.QUEUE_OVERFLOW_DROP_NEWEST)
+        self._put(q, 1, 2, 3)
+        eq_([1, 2], self._values(q))
+        eq_(1, q.get_stats()['dropped'])
+        eq_(2, q.get_stats()['high_water'])
+
+    def test_priority(self):
+        q = app_manager._EventQueue(
+            2, app_manager.QUEUE_OVERFLOW_DROP_NEWEST, priority_burst=2)
+        self._put(q, 1, 2, 3)
+        for value in [10, 11, 12, 13, 14]:
+            q.put(_KeyEvent(value, value), None, PRIORITY_HIGH)
+        # each lane has its own room and the others are taken after every
+        # two events of the priority lane.
+        eq_([10, 11, 1, 2], self._values(q))
+        eq_(1 + 3, q.get_stats()['dropped'])
+        eq_(2, q.get_stats()['priority'])
+
+    def test_drop_oldest(self):
+        q = app_manager._EventQueue(
+            2, app_manager.QUEUE_OVERFLOW_DROP_OLDEST)
+        self._put(q, 1, 2, 3)
+        eq_([2, 3], self._values(q))
+        eq_(1, q.get_stats()['dropped'])
+
+    def test_coalesce(self):
+        q = app_manager._EventQueue(
+            4, app_manager.QUEUE_OVERFLOW_COALESCE,
+            lambda ev, state: ev.key)
+        self._put(q, 1, 2, 3, 4, 5)
+        eq_([5, 4], self._values(q))
+        eq_(3, q.get_stats()['coalesced'])
+        # the key is free again once the event is taken.
+        self._put(q, 7)
+        eq_([7], self._values(q))
+
+    def test_block(self):
+        q = app_manager._EventQueue(1)
+        self._put(q, 1)
+        putter = hub.spawn(self._put, q, 2)
+        hub.sleep(0)
+        eq_(1, q.qsize())
+        eq_(1, q.get_stats()['blocked'])
+        eq_(1, q.get()[0].value)
+        hub.joinall([putter])
+        eq_([2], self._values(q))
+
+    def test_put_nowait(self):
+        q = app_manager._EventQueue(1)
+        ok_(q.put(_KeyEvent(1, 1), None, block=False))
+        ok_(not q.put(_KeyEvent(2, 2), None, block=False))
+        # the priority lane has its own room.
+        ok_(q.put(_KeyEvent(3, 3), None, PRIORITY_HIGH, block=False))
+        eq_([3, 1], self._values(q))
+        eq_(0, q.get_stats()['blocked'])
+
+    def test_batch_handler(self):
+        app = _BatchApp()
+        for handler in [app.single_handler, app.batch_handler]:
+            app.register_handler(_KeyEvent, handler)
+        for value in range(4):
+            app._send_event(_KeyEvent(value, value), None)
+        app.is_active = False
+        app._event_loop()
+        eq_([('single', 0), ('single', 1), ('single', 2),
+             ('batch', [0, 1, 2]),
+             ('single', 3), ('batch', [3])], app.received)
+
+
+class Test_AppManager(unittest.TestCase):
+    """ Test case for AppManager
+    """
+
+    def test_load_apps(self):
+        app_mgr = app_manager.AppManager()
+        app_mgr.load_apps(['ryu.topology.switches'])
+        ok_('ryu.topology.switches' in app_mgr.applications_cls)
+
+    @raises(exception.SingleWorkerApp)
+    @mock.patch.object(worker, '_num_workers', 2)
+    def test_load_apps_single_worker(self):
+        app_manager.AppManager().load_apps(['ryu.topology.switches'])
@@ -27,14 +27,20 @@ import sys
 import warnings
 import logging
 import random
+import struct
 import unittest
 
-from nose.tools import eq_, raises
+from nose.tools import eq_, ok_, raises
 
 from ryu.base import app_manager  # To suppress cyclic import
+from ryu import exception
 from ryu.controller import controller
 from ryu.controller import handler
+from ryu.controller import ofp_event
+from ryu.controller import ofp_handler
+from ryu.controller import pktin_capture
 from ryu.lib import hub
+from ryu.ofproto import ofproto_v1_3
 from ryu.ofproto import ofproto_v1_3_parser
 from ryu.ofproto import ofproto_v1_2_parser
 from ryu.ofproto import ofproto_v1_0_parser
@@ -118,7 +124,7 @@ class Test_Datapath(unittest.TestCase):
         self._test_ports_accessibility(ofproto_v1_0_parser, 0)
 
     @mock.patch("ryu.base.app_manager", spec=app_manager)
-    def test_recv_loop(self, app_manager_mock):
+    def _test_recv_loop(self, recv_buf_size, app_manager_mock):
         # Prepare test data
         test_messages = [
             "4-6-ofp_features_reply.packet",
@@ -153,8 +159,14 @@ class Test_Datapath(unittest.TestCase):
                 self.buf = self.buf[size:]
                 return out
 
+            def recv_into(self, buffer):
+                out = self.recv(len(buffer))
+                buffer[:len(out)] = out
+                return len(out)
+
         # Prepare mock
         ofp_brick_mock = mock.MagicMock(spec=app_manager.RyuApp)
+        ofp_brick_mock._send_event_to_observers_nowait.return_value = []
         app_manager_mock.lookup_service_brick.return_value = ofp_brick_mock
         sock_mock = SocketMock()
         sock_mock.buf = packet_buf
@@ -163,6 +175,8 @@ class Test_Datapath(unittest.TestCase):
 
         # Prepare test target
         dp = controller.Datapath(sock_mock, addr_mock)
+        if recv_buf_size is not None:
+            dp.recv_buf_size = recv_buf_size
         dp.set_state(handler.MAIN_DISPATCHER)
         ofp_brick_mock.reset_mock()
 
@@ -171,7 +185,8 @@ class Test_Datapath(unittest.TestCase):
 
         # Assert calls
         output_json = list()
-        for call in ofp_brick_mock.send_event_to_observers.call_args_list:
+        for call in (ofp_brick_mock._send_event_to_observers_nowait
+                     .call_args_list):
             args, kwargs = call
             ev, state = args
             if not hasattr(ev, 'msg'):
@@ -181,6 +196,188 @@ class Test_Datapath(unittest.TestCase):
             self.assertEqual(kwargs, {})
         self.assertEqual(expected_json, output_json)
 
+        # OFPT_FEATURES_REPLY, OFPT_PACKET_IN and OFPT_ECHO_REPLY
+        eq_([1, 1, 4], [dp.rx_stats[t][0] for t in [6, 10, 3]])
+        eq_(len(packet_buf), sum(b for _m, b in dp.rx_stats.values()))
+
+    def test_recv_loop(self):
+        self._test_recv_loop(None)
+
+    def test_recv_loop_small_buffer(self):
+        # The receive buffer is compacted and grown for larger messages.
+        self._test_recv_loop(16)
+
+    def test_recv_loop_capture(self):
+        capture = pktin_capture.enable(size=8)
+        try:
+            self._test_recv_loop(None)
+        finally:
+            pktin_capture.disable()
+        eq_(1, len(capture))
+
+    def test_send_loop_coalesce(self):
+        sock_mock = mock.MagicMock()
+        addr_mock = mock.MagicMock()
+        dp = controller.Datapath(sock_mock, addr_mock)
+        dp.send_batch_bytes = 6
+        for buf in [b'ab', b'cd', b'ef', b'gh']:
+            dp.send(buf)
+        dp.send(b'ij', close_socket=True)
+
+        dp._send_loop()
+
+        # The first three buffers reach send_batch_bytes, the rest are
+        # sent together up to the one closing the socket.
+        eq_([mock.call(b'abcdef'), mock.call(b'ghij')],
+            sock_mock.sendall.call_args_list)
+        eq_(10, dp.send_stats['bytes'])
+        eq_(5, dp.send_stats['msgs'])
+        eq_(2, dp.send_stats['flushes'])
+        eq_(3, dp.send_stats['max_flush_msgs'])
+        eq_(6, dp.send_stats['max_flush_bytes'])
+        eq_(0, dp.send_stats['queue_full'])
+
+    def test_send_loop_tx_stats(self):
+        sock_mock = mock.MagicMock()
+        addr_mock = mock.MagicMock()
+        dp = controller.Datapath(sock_mock, addr_mock)
+        dp.ofproto_parser = ofproto_v1_3_parser
+        dp.send_msg(ofproto_v1_3_parser.OFPEchoRequest(dp))
+        dp.send_msg(ofproto_v1_3_parser.OFPEchoRequest(dp, data=b'ab'))
+        dp.send_msg(ofproto_v1_3_parser.OFPBarrierRequest(dp),
+                    close_socket=True)
+
+        dp._send_loop()
+
+        # OFPT_ECHO_REQUEST and OFPT_BARRIER_REQUEST
+        eq_({2: [2, 18], 20: [1, 8]}, dp.tx_stats)
+
+    def _recv_replies(self, dp, bufs):
+        class SocketMock(mock.MagicMock):
+            def recv_into(self, buffer):
+                if not bufs:
+                    return 0
+                out = bufs.pop(0)
+                buffer[:len(out)] = out
+                return len(out)
+
+        dp.socket = SocketMock()
+        dp._recv_loop()
+
+    def _read_reply(self, name, xid, flags=None):
+        this_dir = os.path.dirname(sys.modules[__name__].__file__)
+        packet_data_file = os.path.join(
+            this_dir, '../../packet_data/of13', name)
+        buf = bytearray(open(packet_data_file, 'rb').read())
+        struct.pack_into('!I', buf, 4, xid)
+        if flags is not None:
+            # ofp_multipart_reply.flags
+            struct.pack_into('!H', buf, 10, flags)
+        return bytes(buf)
+
+    def _datapath(self):
+        dp = controller.Datapath(mock.MagicMock(), mock.MagicMock())
+        dp.set_version(ofproto_v1_3.OFP_VERSION)
+        dp.set_state(handler.MAIN_DISPATCHER)
+        return dp
+
+    def test_recv_loop_full_queue(self):
+        # The echo replies are acknowledged while the events received
+        # before wait for room in the full event queue of an application.
+        # The applications are defined here, as cmd/test_manager reloads
+        # app_manager and the classes derived from the previous RyuApp
+        # can no longer be instantiated.
+        class _Brick(app_manager.RyuApp):
+            echo_reply_handler = ofp_handler.OFPHandler.echo_reply_handler
+
+        class _SlowApp(app_manager.RyuApp):
+            _EVENT_QUEUE_SIZE = 1
+
+        saved = app_manager.SERVICE_BRICKS.pop(ofp_event.NAME, None)
+        brick = _Brick()
+        brick.name = ofp_event.NAME
+        app = _SlowApp()
+        app_manager.register_app(brick)
+        app_manager.register_app(app)
+        try:
+            brick.register_observer(ofp_event.EventOFPBarrierReply, app.name)
+            dp = self._datapath()
+            dp.unreplied_echo_requests = [1]
+            name = '4-18-ofp_barrier_reply.packet'
+            self._recv_replies(dp, [
+                self._read_reply(name, 10),
+                self._read_reply(name, 11),
+                self._read_reply('4-14-ofp_echo_reply.packet', 1),
+            ])
+
+            eq_([], dp.unreplied_echo_requests)
+            eq_(1, app.events.qsize())
+            eq_(1, len(dp._backlog))
+            drain = dp._backlog_thr
+            # the backlog is sent in order as the application goes on.
+            eq_(10, app.events.get()[0].msg.xid)
+            hub.joinall([drain])
+            eq_(11, app.events.get()[0].msg.xid)
+            eq_(0, len(dp._backlog))
+        finally:
+            app_manager.unregister_app(app)
+            app_manager.unregister_app(brick)
+            if saved is not None:
+                app_manager.SERVICE_BRICKS[ofp_event.NAME] = saved
+
+    def test_send_request_multipart(self):
+        dp = self._datapath()
+        req = ofproto_v1_3_parser.OFPPortStatsRequest(
+            dp, 0, ofproto_v1_3.OFPP_ANY)
+        future = dp.send_request(req)
+        other = dp.send_request(ofproto_v1_3_parser.OFPEchoRequest(dp))
+        name = '4-30-ofp_port_stats_reply.packet'
+
+        self._recv_replies(dp, [
+            self._read_reply(name, future.xid,
+                             ofproto_v1_3.OFPMPF_REPLY_MORE),
+            self._read_reply(name, future.xid + 100, 0),
+            self._read_reply(name, future.xid, 0),
+        ])
+
+        ok_(future.done())
+        ok_(not other.done())
+        eq_(2, len(future.replies))
+        body = future.result()
+        eq_(future.replies[0].body + future.replies[1].body, body)
+        ok_(isinstance(body[0], ofproto_v1_3_parser.OFPPortStats))
+        eq_([other.xid], list(dp._requests))
+
+    def test_send_request_error(self):
+        dp = self._datapath()
+        future = dp.send_request(ofproto_v1_3_parser.OFPEchoRequest(dp))
+
+        self._recv_replies(dp, [
+            self._read_reply('4-15-ofp_error_msg.packet', future.xid)])
+
+        exc = future.exception()
+        ok_(isinstance(exc, exception.OFPErrorReply))
+        eq_(future.xid, exc.error_msg.xid)
+        self.assertRaises(exception.OFPErrorReply, future.result)
+        eq_({}, dp._requests)
+
+    def test_gather(self):
+        dp = self._datapath()
+        replied = dp.send_request(ofproto_v1_3_parser.OFPBarrierRequest(dp))
+        cancelled = dp.send_request(ofproto_v1_3_parser.OFPEchoRequest(dp))
+        cancelled.cancel()
+        expired = ofproto_v1_3_parser.OFPEchoRequest(dp)
+        hub.spawn_after(0, self._recv_replies, dp, [
+            self._read_reply('4-18-ofp_barrier_reply.packet', replied.xid)])
+
+        results = controller.gather([replied, cancelled, expired],
+                                    timeout=0.1)
+
+        ok_(isinstance(results[0], ofproto_v1_3_parser.OFPBarrierReply))
+        ok_(isinstance(results[1], exception.OFPRequestCancelled))
+        ok_(isinstance(results[2], exception.OFPRequestTimeout))
+        eq_({}, dp._requests)
+
 
 class TestOpenFlowController(unittest.TestCase):
     """
@@ -192,6 +389,7 @@ class TestOpenFlowController(unittest.TestCase):
         conf_mock.ofp_listen_host = "127.0.0.1"
         conf_mock.ca_certs = None
         conf_mock.ciphers = None
+        conf_mock.ofp_capture_size = 0
         conf_mock.ctl_cert = os.path.join(this_dir, 'cert.crt')
         conf_mock.ctl_privkey = os.path.join(this_dir, 'cert.key')
         c = controller.OpenFlowController()
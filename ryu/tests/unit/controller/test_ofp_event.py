@@ -0,0 +1,53 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from nose.tools import eq_
+
+from ryu.base import app_manager  # To suppress cyclic import
+from ryu.controller import ofp_event
+from ryu.controller.handler import PRIORITY_HIGH, PRIORITY_NORMAL
+from ryu.lib.packet import ether_types
+from ryu.lib.packet import ethernet
+from ryu.ofproto import ofproto_protocol
+from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_3_parser
+
+
+class Test_ofp_event_priority(unittest.TestCase):
+    """ Test case for event_priority of OpenFlow events
+    """
+
+    def setUp(self):
+        self.dp = ofproto_protocol.ProtocolDesc(
+            version=ofproto_v1_3.OFP_VERSION)
+
+    def _packet_in(self, ethertype):
+        eth = ethernet.ethernet(ethertype=ethertype)
+        msg = ofproto_v1_3_parser.OFPPacketIn(
+            self.dp, data=bytes(eth.serialize(bytearray(46), None)))
+        return ofp_event.ofp_msg_to_ev(msg)
+
+    def test_packet_in(self):
+        eq_(PRIORITY_HIGH,
+            self._packet_in(ether_types.ETH_TYPE_LLDP).event_priority)
+        eq_(PRIORITY_NORMAL,
+            self._packet_in(ether_types.ETH_TYPE_IP).event_priority)
+
+    def test_echo(self):
+        msg = ofproto_v1_3_parser.OFPEchoReply(self.dp)
+        eq_(PRIORITY_HIGH, ofp_event.ofp_msg_to_ev(msg).event_priority)
+        msg = ofproto_v1_3_parser.OFPFlowStatsReply(self.dp)
+        eq_(PRIORITY_NORMAL, ofp_event.ofp_msg_to_ev(msg).event_priority)
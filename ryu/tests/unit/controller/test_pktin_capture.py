@@ -0,0 +1,165 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+try:
+    import mock  # Python 2
+except ImportError:
+    from unittest import mock  # Python 3
+
+import io
+import struct
+import unittest
+
+from nose.tools import eq_, ok_
+
+from ryu.controller import pktin_capture
+from ryu.lib.ofp_pktinfilter import MatchFilter
+from ryu.lib.packet import ethernet
+from ryu.lib.packet import ether_types
+from ryu.lib.packet import ipv4
+from ryu.lib.packet import packet
+from ryu.ofproto import ofproto_protocol
+from ryu.ofproto import ofproto_v1_0
+from ryu.ofproto import ofproto_v1_0_parser
+from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_3_parser
+
+
+def _blocks(buf):
+    # (block type, body) of the blocks of a pcapng file
+    offset = 0
+    while offset < len(buf):
+        block_type, length = struct.unpack_from('=II', buf, offset)
+        yield block_type, buf[offset + 8:offset + length - 4]
+        offset += length
+
+
+def _options(buf):
+    options = {}
+    offset = 0
+    while True:
+        code, length = struct.unpack_from('=HH', buf, offset)
+        if code == 0:
+            return options
+        options[code] = buf[offset + 4:offset + 4 + length].decode()
+        offset += 4 + length + (-length % 4)
+
+
+class Test_pktin_capture(unittest.TestCase):
+    """ Test case for ryu.controller.pktin_capture
+    """
+
+    def setUp(self):
+        self.dp = mock.Mock(id=1)
+
+    def _packet_in(self, in_port=1, eth_type=ether_types.ETH_TYPE_IP):
+        pkt = packet.Packet(protocols=[ethernet.ethernet(ethertype=eth_type),
+                                       ipv4.ipv4()])
+        pkt.serialize()
+        datapath = ofproto_protocol.ProtocolDesc(
+            version=ofproto_v1_3.OFP_VERSION)
+        return ofproto_v1_3_parser.OFPPacketIn(
+            datapath, buffer_id=ofproto_v1_3.OFP_NO_BUFFER,
+            total_len=len(pkt.data), reason=ofproto_v1_3.OFPR_NO_MATCH,
+            table_id=2, match=ofproto_v1_3_parser.OFPMatch(in_port=in_port),
+            data=bytes(pkt.data))
+
+    def test_ring(self):
+        capture = pktin_capture.PacketInCapture(size=2)
+        msgs = [self._packet_in(in_port=i) for i in range(3)]
+        for msg in msgs:
+            capture.add(self.dp, msg)
+        eq_(2, len(capture))
+        eq_(3, capture.received)
+        eq_(msgs[1:], [msg for _ts, _dpid, msg in capture._ring])
+        capture.clear()
+        eq_(0, len(capture))
+
+    def test_sample(self):
+        capture = pktin_capture.PacketInCapture(sample=3)
+        for _i in range(7):
+            capture.add(self.dp, self._packet_in())
+        eq_(2, len(capture))
+
+    def test_filter(self):
+        capture = pktin_capture.PacketInCapture(
+            filter_=MatchFilter(
+                {'eth_type': ether_types.ETH_TYPE_IP}).filter_data)
+        capture.add(self.dp, self._packet_in())
+        capture.add(self.dp,
+                    self._packet_in(eth_type=ether_types.ETH_TYPE_IPV6))
+        eq_(1, len(capture))
+
+    def test_dump(self):
+        capture = pktin_capture.PacketInCapture(snaplen=16)
+        msgs = [self._packet_in(in_port=1), self._packet_in(in_port=2),
+                self._packet_in(in_port=1)]
+        for msg in msgs:
+            capture.add(self.dp, msg)
+        f = io.BytesIO()
+        capture.dump(f)
+        blocks = list(_blocks(f.getvalue()))
+
+        # a section header, an interface per port and the packets
+        eq_([0x0a0d0d0a, 1, 6, 1, 6, 6], [t for t, _b in blocks])
+        eq_('dpid=0000000000000001 port=2', _options(blocks[3][1][8:])[2])
+        packets = [body for block_type, body in blocks if block_type == 6]
+        eq_([0, 1, 0], [struct.unpack_from('=I', body)[0]
+                        for body in packets])
+        for msg, body in zip(msgs, packets):
+            captured_len, orig_len = struct.unpack_from('=II', body, 12)
+            eq_(16, captured_len)
+            eq_(len(msg.data), orig_len)
+            eq_(msg.data[:16], body[20:36])
+        eq_('dpid=0000000000000001 in_port=2 reason=0 table_id=2 '
+            'buffer_id=-1', _options(packets[1][36:])[1])
+
+    def test_dump_of10(self):
+        datapath = ofproto_protocol.ProtocolDesc(
+            version=ofproto_v1_0.OFP_VERSION)
+        msg = ofproto_v1_0_parser.OFPPacketIn(
+            datapath, buffer_id=1, total_len=4, in_port=3,
+            reason=ofproto_v1_0.OFPR_ACTION, data=b'\x01\x02\x03\x04')
+        capture = pktin_capture.PacketInCapture()
+        capture.add(self.dp, msg)
+        f = io.BytesIO()
+        capture.dump(f)
+        body = list(_blocks(f.getvalue()))[-1][1]
+        eq_('dpid=0000000000000001 in_port=3 reason=1 table_id=None '
+            'buffer_id=1', _options(body[24:])[1])
+
+    @mock.patch('ryu.lib.hub.spawn')
+    def test_trigger_rate(self, spawn_mock):
+        capture = pktin_capture.PacketInCapture(trigger_rate=3,
+                                                dump_dir='/tmp')
+        for _i in range(5):
+            capture.add(self.dp, self._packet_in())
+        eq_(1, spawn_mock.call_count)
+        path, records = spawn_mock.call_args[0][1:]
+        ok_(path.startswith('/tmp/packet-in-'))
+        eq_(3, len(records))
+        # not again within trigger_interval
+        capture._window_start = 0
+        for _i in range(5):
+            capture.add(self.dp, self._packet_in())
+        eq_(1, spawn_mock.call_count)
+
+    def test_enable(self):
+        try:
+            capture = pktin_capture.enable(size=1)
+            ok_(capture is pktin_capture.get_capture())
+        finally:
+            pktin_capture.disable()
+        ok_(pktin_capture.get_capture() is None)
@@ -0,0 +1,185 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+try:
+    import mock  # Python 2
+except ImportError:
+    from unittest import mock  # Python 3
+
+import pickle
+import socket
+import unittest
+
+from nose.tools import eq_, ok_
+
+from ryu.base import app_manager  # To suppress cyclic import
+from ryu.controller import event
+from ryu.controller import worker
+from ryu.lib import hub
+
+
+class _GlobalEvent(event.EventBase):
+    def __init__(self, value):
+        super(_GlobalEvent, self).__init__()
+        self.value = value
+
+
+class Test_worker(unittest.TestCase):
+    """
+    Test cases for ryu.controller.worker
+    """
+
+    def setUp(self):
+        self._threads = []
+
+    def tearDown(self):
+        for thread in self._threads:
+            hub.kill(thread)
+        worker._num_workers = 1
+        worker._worker_id = 0
+        worker._delivery_q = None
+        del worker._peers[:]
+
+    def _start_worker0(self, sock):
+        worker._num_workers = 2
+        worker._peers[:] = [sock]
+        worker._relay_sem = hub.Semaphore()
+        worker._delivery_q = hub.Queue()
+        self._threads.append(hub.spawn(worker._deliver_loop))
+
+    def test_single_worker(self):
+        eq_(0, worker.worker_id())
+        eq_(1, worker.num_workers())
+        ok_(not worker.is_enabled())
+        ok_(worker.owns(0))
+        ok_(worker.owns(5))
+        eq_([], worker.start())
+
+    def test_owns(self):
+        worker._num_workers = 3
+        worker._worker_id = 1
+        eq_([1, 4], [i for i in range(6) if worker.owns(i)])
+
+    def test_publish_without_workers(self):
+        received = []
+        worker.subscribe('test', received.append)
+        try:
+            worker.publish('test', {'a': 1})
+        finally:
+            worker.unsubscribe('test', received.append)
+        eq_([{'a': 1}], received)
+
+    def test_shared_dict(self):
+        d = worker.SharedDict('test')
+        try:
+            d['h1'] = ('10.0.0.1', '00:00:00:00:00:01')
+            d.setdefault('h2', ('10.0.0.2', '00:00:00:00:00:02'))
+            eq_(('10.0.0.1', '00:00:00:00:00:01'), d['h1'])
+            eq_(2, len(d))
+            del d['h1']
+            eq_(['h2'], list(d))
+            self.assertRaises(KeyError, d.__delitem__, 'h1')
+        finally:
+            d.close()
+
+    def test_relay(self):
+        sock0, sock1 = socket.socketpair()
+        self._start_worker0(sock0)
+        received = []
+        worker.subscribe('test', received.append)
+        try:
+            worker.publish('test', 1)
+            worker.publish('test', 2)
+            for expected_seq, expected in [(1, 1), (2, 2)]:
+                seq, payload = worker._recv(sock1)
+                eq_(('test', expected), pickle.loads(bytes(payload)))
+                eq_(worker._seq - 2 + expected_seq, seq)
+            hub.sleep(0)
+        finally:
+            worker.unsubscribe('test', received.append)
+            sock0.close()
+            sock1.close()
+        # worker 0 delivers locally in the relayed order too.
+        eq_([1, 2], received)
+
+    def test_publish_concurrently(self):
+        class _SlowSocket(object):
+            # writes a byte at a time, switching to the other publisher
+            def __init__(self, sock):
+                self.sock = sock
+
+            def sendall(self, data):
+                for i in range(len(data)):
+                    self.sock.sendall(data[i:i + 1])
+                    hub.sleep(0)
+
+        sock0, sock1 = socket.socketpair()
+        worker._num_workers = 2
+        worker._worker_id = 1
+        worker._peers[:] = [_SlowSocket(sock0)]
+        worker._relay_sem = hub.Semaphore()
+        try:
+            hub.joinall([hub.spawn(worker.publish, 'test', value)
+                         for value in [1, 2]])
+            # the frames are not interleaved.
+            values = [pickle.loads(bytes(worker._recv(sock1)[1]))[1]
+                      for _i in range(2)]
+        finally:
+            sock0.close()
+            sock1.close()
+        eq_([1, 2], values)
+
+    # The reloads of app_manager by cmd/test_manager subscribe
+    # _deliver_global_event once more each.
+    @mock.patch.object(worker, '_subscribers', {})
+    def test_relay_to_full_queue(self):
+        worker.subscribe(app_manager._GLOBAL_EVENT_TOPIC,
+                         app_manager._deliver_global_event)
+
+        # The applications are defined here, as cmd/test_manager reloads
+        # app_manager and the classes derived from the previous RyuApp
+        # can no longer be instantiated.
+        class _Brick(app_manager.RyuApp):
+            _GLOBAL_EVENTS = [_GlobalEvent]
+
+        class _SlowApp(app_manager.RyuApp):
+            _EVENT_QUEUE_SIZE = 1
+
+        sock0, sock1 = socket.socketpair()
+        self._start_worker0(sock0)
+        brick = _Brick()
+        app = _SlowApp()
+        app_manager.register_app(brick)
+        app_manager.register_app(app)
+        try:
+            brick.register_observer(_GlobalEvent, app.name)
+            # the second event waits for room in the event queue of app,
+            # while the others are still published and relayed.
+            for value in range(3):
+                eq_([], brick._send_event_to_observers_nowait(
+                    _GlobalEvent(value)))
+            brick.send_event_to_observers(_GlobalEvent(3))
+            for value in range(4):
+                payload = worker._recv(sock1)[1]
+                eq_(value, pickle.loads(bytes(payload))[1][1].value)
+            hub.sleep(0)
+            eq_(1, app.events.qsize())
+            eq_(list(range(4)), [app.events.get()[0].value
+                                 for _i in range(4)])
+        finally:
+            app_manager.unregister_app(app)
+            app_manager.unregister_app(brick)
+            sock0.close()
+            sock1.close()
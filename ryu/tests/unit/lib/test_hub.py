@@ -14,9 +14,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+import subprocess
+import sys
 import time
 import unittest
-from nose.tools import raises
+from nose.tools import eq_, ok_, raises
 
 from ryu.lib import hub
 hub.patch()
@@ -101,6 +104,8 @@ class Test_hub(unittest.TestCase):
             ev.wait(timeout=1)
         assert len(result) == 2
 
+    @unittest.skipUnless(hub.HUB_TYPE == 'eventlet',
+                         'select is patched by eventlet only')
     def test_spawn_select1(self):
         import select
         import socket
@@ -115,6 +120,8 @@ class Test_hub(unittest.TestCase):
             select.select([s2.fileno()], [], [])
             select.select([s2.fileno()], [], [])  # return immediately
 
+    @unittest.skipUnless(hub.HUB_TYPE == 'eventlet',
+                         'select is patched by eventlet only')
     @raises(MyException)
     def test_select1(self):
         import select
@@ -124,12 +131,16 @@ class Test_hub(unittest.TestCase):
         with hub.Timeout(1, MyException):
             select.select([s2.fileno()], [], [])
 
+    @unittest.skipUnless(hub.HUB_TYPE == 'eventlet',
+                         'select is patched by eventlet only')
     def test_select2(self):
         import select
 
         with hub.Timeout(1, MyException):
             select.select([], [], [], 0)  # timeout immediately
 
+    @unittest.skipUnless(hub.HUB_TYPE == 'eventlet',
+                         'select is patched by eventlet only')
     def test_select3(self):
         import select
         import socket
@@ -237,3 +248,158 @@ class Test_hub(unittest.TestCase):
         # allow multiple sets unlike eventlet Event
         ev.set()
         ev.set()
+
+    def test_queue(self):
+        q = hub.Queue(1)
+        result = []
+
+        def _child():
+            result.append(q.get())
+            result.append(q.get())
+
+        with hub.Timeout(2):
+            t = hub.spawn(_child)
+            q.put(1)
+            q.put(2)  # blocks until the child got 1
+            ok_(q.full() or result == [1, 2])
+            hub.joinall([t])
+        eq_([1, 2], result)
+        self.assertRaises(hub.QueueEmpty, q.get, block=False)
+
+    def test_semaphore(self):
+        sem = hub.BoundedSemaphore(1)
+        result = []
+
+        def _child():
+            with sem:
+                result.append(1)
+
+        with hub.Timeout(2):
+            sem.acquire()
+            t = hub.spawn(_child)
+            hub.sleep(0.1)
+            eq_([], result)
+            sem.release()
+            hub.joinall([t])
+        eq_([1], result)
+        ok_(sem.acquire(blocking=False))
+        ok_(not sem.acquire(blocking=False))
+        sem.release()
+        self.assertRaises(ValueError, sem.release)
+
+    def test_stream_server_client(self):
+        def _echo(sock, addr):
+            buf = sock.recv(4)
+            sock.sendall(buf)
+            sock.close()
+
+        server = hub.StreamServer(('127.0.0.1', 0), _echo)
+        port = server.server.getsockname()[1]
+        thr = hub.spawn(server.serve_forever)
+        try:
+            with hub.Timeout(2):
+                client = hub.StreamClient(('127.0.0.1', port)).connect()
+                client.sendall(b'hoge')
+                buf = bytearray(4)
+                eq_(4, client.recv_into(buf))
+                eq_(b'hoge', bytes(buf))
+                client.close()
+        finally:
+            hub.kill(thr)
+            hub.joinall([thr])
+
+    def test_wsgi_server(self):
+        def _app(environ, start_response):
+            start_response('200 OK', [('Content-Type', 'text/plain')])
+            return [environ['PATH_INFO'].encode()]
+
+        server = hub.WSGIServer(('127.0.0.1', 0), _app)
+        port = server.server.getsockname()[1]
+        thr = hub.spawn(server.serve_forever)
+        try:
+            with hub.Timeout(2):
+                client = hub.StreamClient(('127.0.0.1', port)).connect()
+                client.sendall(b'GET /hoge HTTP/1.0\r\n\r\n')
+                resp = b''
+                while True:
+                    buf = client.recv(4096)
+                    if not buf:
+                        break
+                    resp += buf
+                client.close()
+        finally:
+            hub.kill(thr)
+            hub.joinall([thr])
+        ok_(resp.split(b'\r\n')[0].endswith(b' 200 OK'))
+        ok_(resp.endswith(b'\r\n\r\n/hoge'))
+
+    def test_websocket(self):
+        def _echo(ws):
+            while True:
+                msg = ws.wait()
+                if msg is None:
+                    break
+                ws.send(msg)
+
+        def _recv_frame(sock):
+            header = sock.recv(2)
+            return header[0] & 0x0f, sock.recv(header[1] & 0x7f)
+
+        server = hub.WSGIServer(('127.0.0.1', 0), hub.WebSocketWSGI(_echo))
+        port = server.server.getsockname()[1]
+        thr = hub.spawn(server.serve_forever)
+        try:
+            with hub.Timeout(2):
+                client = hub.StreamClient(('127.0.0.1', port)).connect()
+                client.sendall(b'GET / HTTP/1.1\r\n'
+                               b'Host: localhost\r\n'
+                               b'Upgrade: websocket\r\n'
+                               b'Connection: Upgrade\r\n'
+                               b'Sec-WebSocket-Key: '
+                               b'dGhlIHNhbXBsZSBub25jZQ==\r\n'
+                               b'Sec-WebSocket-Version: 13\r\n\r\n')
+                resp = b''
+                while not resp.endswith(b'\r\n\r\n'):
+                    resp += client.recv(1)
+                # a masked text frame, then a masked close frame
+                mask = b'\x01\x02\x03\x04'
+                client.sendall(b'\x81\x84' + mask + bytes(
+                    c ^ mask[i % 4] for i, c in enumerate(b'hoge')))
+                text = _recv_frame(client)
+                client.sendall(b'\x88\x80' + mask)
+                close = _recv_frame(client)
+                client.close()
+        finally:
+            hub.kill(thr)
+            hub.joinall([thr])
+        ok_(resp.startswith(b'HTTP/1.1 101 '))
+        ok_(b'\r\nSec-WebSocket-Accept: s3pPLMBiTxaQ9kYGzzhZRbK+xOo=\r\n'
+            in resp)
+        eq_((0x1, b'hoge'), text)
+        eq_(0x8, close[0])
+
+    @unittest.skipUnless(hub.HUB_TYPE == 'asyncio', 'asyncio hub only')
+    def test_run_coroutine(self):
+        import asyncio
+
+        async def _coro():
+            await asyncio.sleep(0.1)
+            return 1
+
+        with hub.Timeout(2):
+            eq_(1, hub.run_coroutine(_coro()))
+
+
+class Test_hub_asyncio(unittest.TestCase):
+    """ Test case for ryu.lib.hub with RYU_HUB_TYPE=asyncio
+    """
+
+    @unittest.skipUnless(hub.HUB_TYPE == 'eventlet', 'already running')
+    def test_hub(self):
+        # The hub type is fixed when importing ryu.lib.hub.
+        env = dict(os.environ, RYU_HUB_TYPE='asyncio')
+        proc = subprocess.Popen(
+            [sys.executable, '-m', 'unittest', '-q', __name__],
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, env=env)
+        out, _err = proc.communicate()
+        eq_(0, proc.returncode, out.decode(errors='replace'))
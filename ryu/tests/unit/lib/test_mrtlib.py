@@ -19,8 +19,10 @@ import bz2
 import io
 import logging
 import os
+import shutil
 import struct
 import sys
+import tempfile
 import unittest
 
 try:
@@ -30,6 +32,7 @@ except ImportError:
 
 from nose.tools import eq_
 from nose.tools import ok_
+from nose.tools import raises
 
 from ryu.lib import addrconv
 from ryu.lib import mrtlib
@@ -93,6 +96,116 @@ class TestMrtlib(unittest.TestCase):
             eq_(True, mrt_writer._f.closed)
 
 
+def _record_prefix(record):
+    return record.message.prefix.prefix
+
+
+def _no_prefix(record):
+    raise ValueError(record.message.prefix.prefix)
+
+
+class TestMrtlibIndexedReader(unittest.TestCase):
+    """
+    Test case for ryu.lib.mrtlib.IndexedReader.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _open(self, name):
+        # uncompressed to be mapped in memory
+        path = os.path.join(self.tmp_dir, name[:-len('.bz2')])
+        with open(path, 'wb') as f:
+            f.write(bz2.BZ2File(os.path.join(MRT_DATA_DIR, name)).read())
+        return mrtlib.IndexedReader(open(path, 'rb'))
+
+    def test_index(self):
+        for name in ['rib.20161101.0000_pick.bz2',
+                     'updates.20161101.0000.bz2']:
+            reader = self._open(name)
+            expected = list(mrtlib.Reader(
+                bz2.BZ2File(os.path.join(MRT_DATA_DIR, name), 'rb')))
+            eq_(len(expected), len(reader))
+            eq_([r.type for r in expected], list(reader.types))
+            eq_([r.subtype for r in expected], list(reader.subtypes))
+            eq_([r.timestamp for r in expected], list(reader.timestamps))
+            eq_([r.to_jsondict() for r in expected],
+                [r.to_jsondict() for r in reader])
+            eq_(expected[-1].to_jsondict(), reader[-1].to_jsondict())
+            reader.close()
+
+    def test_compressed(self):
+        name = 'rib.20161101.0000_pick.bz2'
+        reader = mrtlib.IndexedReader(
+            bz2.BZ2File(os.path.join(MRT_DATA_DIR, name), 'rb'))
+        eq_(3, len(reader))
+        # decoded in this process
+        eq_(['1.0.4.0/24', '1.0.5.0/24'],
+            reader.decode([1, 2], processes=2, func=_record_prefix))
+
+    def test_select(self):
+        reader = self._open('rib.20161101.0000_pick.bz2')
+        td2 = mrtlib.TableDump2MrtRecord
+        eq_([1, 2], reader.select(types=[mrtlib.MrtRecord.TYPE_TABLE_DUMP_V2],
+                                  subtypes=[td2.SUBTYPE_RIB_IPV4_UNICAST]))
+        eq_([], reader.select(types=[mrtlib.MrtRecord.TYPE_BGP4MP]))
+        timestamp = reader.timestamps[0]
+        eq_([0, 1, 2], reader.select(start=timestamp, end=timestamp + 1))
+        eq_([], reader.select(end=timestamp))
+
+        eq_([1, 2], reader.select(prefixes=['1.0.0.0/8']))
+        eq_([2], reader.select(prefixes=['1.0.5.0/24', '10.0.0.0/8']))
+        eq_([], reader.select(prefixes=['1.0.4.0/25', '::/0']))
+        eq_([1, 2], reader.select(prefixes=['0.0.0.0/0']))
+
+        peers = reader[0].message.peer_entries
+        # the entries are of the peers of the index 3 and 4
+        eq_([1, 2], reader.select(peers=[peers[3].ip_addr]))
+        eq_([], reader.select(peers=[peers[0].ip_addr, '192.0.2.1']))
+        eq_([2], reader.select(prefixes=['1.0.5.0/24'],
+                               peers=[peers[4].ip_addr]))
+
+    def test_select_duplicated_peer(self):
+        reader = self._open('rib.20161101.0000_pick.bz2')
+        table = reader[0]
+        rest = reader._buf[reader.offsets[1]:]
+        reader.close()
+        # the peer of the index 3 is listed under the index 0 too
+        peers = table.message.peer_entries
+        peers[0].ip_addr = peers[3].ip_addr
+        path = os.path.join(self.tmp_dir, 'rib.duplicated')
+        with open(path, 'wb') as f:
+            f.write(table.serialize())
+            f.write(rest)
+        reader = mrtlib.IndexedReader(open(path, 'rb'))
+        eq_([1, 2], reader.select(peers=[peers[3].ip_addr]))
+        reader.close()
+
+    def test_del_after_init_error(self):
+        # __init__ failed to map the file
+        reader = mrtlib.IndexedReader.__new__(mrtlib.IndexedReader)
+        reader._f = mock.Mock()
+        reader.__del__()
+
+    def test_decode(self):
+        reader = self._open('rib.20161101.0000_pick.bz2')
+        eq_(['1.0.4.0/24', '1.0.5.0/24'],
+            reader.decode([1, 2], func=_record_prefix))
+        eq_(['1.0.4.0/24', '1.0.5.0/24'],
+            reader.decode([1, 2], processes=2, func=_record_prefix))
+        eq_([r.to_jsondict() for r in reader],
+            [r.to_jsondict() for r in reader.decode(processes=2)])
+        eq_([], reader.decode([], processes=2))
+
+    @raises(ValueError)
+    def test_decode_error(self):
+        reader = self._open('rib.20161101.0000_pick.bz2')
+        reader.decode([1, 2], processes=2, func=_no_prefix)
+
+
 class TestMrtlibMrtRecord(unittest.TestCase):
     """
     Test case for ryu.lib.mrtlib.MrtRecord.
@@ -21,6 +21,8 @@ import os
 import sys
 import unittest
 
+from ryu.base import app_manager  # To suppress cyclic import
+from ryu.controller import controller
 from ryu.lib import ofctl_v1_0
 from ryu.lib import ofctl_v1_2
 from ryu.lib import ofctl_v1_3
@@ -40,7 +42,6 @@ class DummyDatapath(ProtocolDesc):
         self.id = 1  # XXX
         self.request_msg = None
         self.reply_msg = None
-        self.waiters = None
 
     @staticmethod
     def set_xid(msg):
@@ -51,27 +52,24 @@ class DummyDatapath(ProtocolDesc):
         msg.serialize()
         self.request_msg = msg
 
+    def send_request(self, msg, timeout=None):
+        self.set_xid(msg)
+        self.send_msg(msg)
+        future = controller.RequestFuture(self, msg.xid)
         if self.reply_msg:
-            lock, msgs = self.waiters[self.id][msg.xid]
-            msgs.append(self.reply_msg)
-            del self.waiters[self.id][msg.xid]
-            lock.set()
+            future._add_reply(self.reply_msg)
+        return future
 
-    def set_reply(self, msg, waiters):
+    def set_reply(self, msg):
         self.reply_msg = msg
-        self.waiters = waiters
 
 
 class Test_ofctl(unittest.TestCase):
 
     def _test(self, name, dp, method, args, request, reply, expected):
         print('processing %s ...' % name)
-        waiters = {}
-        dp.set_reply(reply, waiters)
-        if reply:
-            output = method(dp=dp, waiters=waiters, **args)
-        else:
-            output = method(dp=dp, **args)
+        dp.set_reply(reply)
+        output = method(dp=dp, **args)
 
         # expected message <--> sent message
         request.serialize()
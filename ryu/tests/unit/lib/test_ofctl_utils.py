@@ -13,11 +13,22 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+try:
+    import mock  # Python 2
+except ImportError:
+    from unittest import mock  # Python 3
+
 import logging
 import unittest
 
+from nose.tools import eq_
+
+from ryu.base import app_manager  # To suppress cyclic import
+from ryu.controller import controller
+from ryu.lib import hub
 from ryu.lib import ofctl_utils
 from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_3_parser
 
 
 LOG = logging.getLogger(__name__)
@@ -140,3 +151,26 @@ class Test_ofctl_utils(unittest.TestCase):
             'ALL',
             self.util.ofp_queue_to_user(ofproto_v1_3.OFPQ_ALL)
         )
+
+    def test_send_stats_request_timeout(self):
+        dp = controller.Datapath(mock.MagicMock(), mock.MagicMock())
+        dp.set_version(ofproto_v1_3.OFP_VERSION)
+        dp.id = 1
+        stats = ofproto_v1_3_parser.OFPPortStatsRequest(
+            dp, 0, ofproto_v1_3.OFPP_ANY)
+        part = ofproto_v1_3_parser.OFPPortStatsReply(
+            dp, flags=ofproto_v1_3.OFPMPF_REPLY_MORE, body=[])
+        part.msg_type = ofproto_v1_3.OFPT_MULTIPART_REPLY
+
+        def _reply():
+            part.xid = stats.xid
+            dp._requests[stats.xid]._add_reply(part)
+
+        # the last part never comes.
+        hub.spawn_after(0, _reply)
+        msgs = []
+        with hub.Timeout(1):
+            ofctl_utils.send_stats_request(dp, stats, msgs, LOG,
+                                           timeout=0.1)
+        eq_([part], msgs)
+        eq_({}, dp._requests)
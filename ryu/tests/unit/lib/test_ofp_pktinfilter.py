@@ -18,6 +18,10 @@
 import unittest
 import logging
 import six
+try:
+    import mock  # Python 2
+except ImportError:
+    from unittest import mock  # Python 3
 
 from nose.tools import *
 
@@ -27,7 +31,10 @@ from ryu.controller.handler import (
     MAIN_DISPATCHER,
 )
 from ryu.lib.packet import vlan, ethernet, ipv4
+from ryu.lib.packet import arp, ipv6, lldp, packet, tcp, udp
+from ryu.lib.packet import ether_types, in_proto
 from ryu.lib.ofp_pktinfilter import packet_in_filter, RequiredTypeFilter
+from ryu.lib.ofp_pktinfilter import MatchFilter
 from ryu.lib import mac
 from ryu.ofproto import ether, ofproto_v1_3, ofproto_v1_3_parser
 from ryu.ofproto.ofproto_protocol import ProtocolDesc
@@ -45,6 +52,29 @@ class _PacketInFilterApp(object):
         return True
 
 
+class _MatchFilterApp(object):
+    @set_ev_cls(ofp_event.EventOFPPacketIn, MAIN_DISPATCHER)
+    @packet_in_filter(MatchFilter, {'vlan_vid': [10, 20], 'udp_dst': 53})
+    def packet_in_handler(self, ev):
+        return True
+
+
+class _LoggingMatchFilterApp(object):
+    @set_ev_cls(ofp_event.EventOFPPacketIn, MAIN_DISPATCHER)
+    @packet_in_filter(MatchFilter, {'udp_dst': 53}, logging=True)
+    def packet_in_handler(self, ev):
+        return True
+
+
+def _packet_in(*protocols):
+    datapath = ProtocolDesc(version=ofproto_v1_3.OFP_VERSION)
+    pkt = packet.Packet(protocols=list(protocols))
+    pkt.serialize()
+    pkt_in = ofproto_v1_3_parser.OFPPacketIn(datapath,
+                                             data=six.binary_type(pkt.data))
+    return ofp_event.EventOFPPacketIn(pkt_in)
+
+
 class Test_packet_in_filter(unittest.TestCase):
 
     """ Test case for pktinfilter
@@ -90,3 +120,134 @@ class Test_packet_in_filter(unittest.TestCase):
                                                  data=truncated_data)
         ev = ofp_event.EventOFPPacketIn(pkt_in)
         ok_(not self.app.packet_in_handler(ev))
+
+
+class Test_match_filter(unittest.TestCase):
+
+    """ Test case for MatchFilter
+    """
+
+    def _udp(self, vid=10, dst_port=53, ihl=5, offset=0):
+        options = b'\x01' * (ihl - 5) * 4
+        return [ethernet.ethernet(ethertype=ether_types.ETH_TYPE_8021Q),
+                vlan.vlan(vid=vid, ethertype=ether_types.ETH_TYPE_IP),
+                ipv4.ipv4(header_length=ihl, proto=in_proto.IPPROTO_UDP,
+                          option=options, offset=offset),
+                udp.udp(src_port=1024, dst_port=dst_port)]
+
+    def _test(self, args, protocols, result):
+        ev = _packet_in(*protocols)
+        eq_(result, MatchFilter(args).filter_data(ev.msg.data))
+
+    def test_decorator(self):
+        app = _MatchFilterApp()
+        ok_(app.packet_in_handler(_packet_in(*self._udp(vid=20))))
+        ok_(not app.packet_in_handler(_packet_in(*self._udp(vid=30))))
+        ok_(not app.packet_in_handler(_packet_in(*self._udp(dst_port=54))))
+
+    def test_discard_without_decoding(self):
+        app = _MatchFilterApp()
+        discarded = _packet_in(*self._udp(dst_port=54))
+        passed = _packet_in(*self._udp())
+        with mock.patch.object(packet, 'Packet') as packet_cls:
+            ok_(not app.packet_in_handler(discarded))
+            ok_(app.packet_in_handler(passed))
+        eq_(0, packet_cls.call_count)
+
+    def test_discard_logging(self):
+        app = _LoggingMatchFilterApp()
+        discarded = _packet_in(*self._udp(dst_port=54))
+        log = logging.getLogger('ryu.lib.ofp_pktinfilter')
+        with mock.patch.object(packet, 'Packet') as packet_cls:
+            with mock.patch.object(log, 'isEnabledFor', return_value=False):
+                ok_(not app.packet_in_handler(discarded))
+            eq_(0, packet_cls.call_count)
+            with mock.patch.object(log, 'isEnabledFor', return_value=True):
+                ok_(not app.packet_in_handler(discarded))
+            packet_cls.assert_called_once_with(discarded.msg.data)
+
+    def test_eth(self):
+        protocols = [ethernet.ethernet('00:00:00:00:00:02',
+                                       '00:00:00:00:00:01'),
+                     ipv4.ipv4()]
+        self._test({'eth_dst': '00:00:00:00:00:02'}, protocols, True)
+        self._test({'eth_dst': '00:00:00:00:00:01'}, protocols, False)
+        self._test({'eth_src': ['00:00:00:00:00:03', '00:00:00:00:00:01'],
+                    'eth_type': ether_types.ETH_TYPE_IP}, protocols, True)
+        self._test({'eth_type': ether_types.ETH_TYPE_ARP}, protocols, False)
+        self._test({}, protocols, True)
+
+    def test_lldp(self):
+        protocols = [
+            ethernet.ethernet(lldp.LLDP_MAC_NEAREST_BRIDGE,
+                              '00:00:00:00:00:01',
+                              ether_types.ETH_TYPE_LLDP),
+            lldp.lldp([
+                lldp.ChassisID(subtype=lldp.ChassisID.SUB_LOCALLY_ASSIGNED,
+                               chassis_id=b'dpid:1'),
+                lldp.PortID(subtype=lldp.PortID.SUB_PORT_COMPONENT,
+                            port_id=b'1'),
+                lldp.TTL(ttl=120), lldp.End()])]
+        self._test({'eth_type': ether_types.ETH_TYPE_LLDP}, protocols, True)
+        self._test({'ip_proto': in_proto.IPPROTO_UDP}, protocols, False)
+
+    def test_arp(self):
+        protocols = [
+            ethernet.ethernet(ethertype=ether_types.ETH_TYPE_8021AD),
+            vlan.svlan(vid=100, ethertype=ether_types.ETH_TYPE_8021Q),
+            vlan.vlan(vid=10, ethertype=ether_types.ETH_TYPE_ARP),
+            arp.arp(opcode=arp.ARP_REPLY)]
+        self._test({'arp_op': arp.ARP_REPLY}, protocols, True)
+        self._test({'arp_op': arp.ARP_REQUEST}, protocols, False)
+        # the VLAN ID of the outermost tag
+        self._test({'vlan_vid': 100, 'eth_type': ether_types.ETH_TYPE_ARP},
+                   protocols, True)
+        self._test({'vlan_vid': 10}, protocols, False)
+
+    def test_vlan(self):
+        self._test({'vlan_vid': 10}, self._udp(), True)
+        untagged = self._udp()[2:]
+        untagged.insert(0, ethernet.ethernet(
+            ethertype=ether_types.ETH_TYPE_IP))
+        self._test({'vlan_vid': 10}, untagged, False)
+        self._test({'udp_dst': 53}, untagged, True)
+
+    def test_ipv4(self):
+        protocols = self._udp()
+        self._test({'ipv4_src': '10.0.0.1'}, protocols, True)
+        self._test({'ipv4_dst': ['10.0.0.1', '10.0.0.2']}, protocols, True)
+        self._test({'ipv4_dst': '10.0.0.3'}, protocols, False)
+        self._test({'ipv6_dst': '::1'}, protocols, False)
+
+    def test_ports(self):
+        self._test({'udp_dst': 53, 'udp_src': 1024}, self._udp(), True)
+        self._test({'udp_dst': 53}, self._udp(ihl=7), True)
+        self._test({'udp_dst': 54}, self._udp(ihl=7), False)
+        self._test({'tcp_dst': 53}, self._udp(), False)
+        # not the first fragment
+        self._test({'udp_dst': 53}, self._udp(offset=8), False)
+        self._test({'ip_proto': in_proto.IPPROTO_UDP}, self._udp(offset=8),
+                   True)
+
+    def test_ipv6(self):
+        protocols = [ethernet.ethernet(ethertype=ether_types.ETH_TYPE_IPV6),
+                     ipv6.ipv6(nxt=in_proto.IPPROTO_TCP, src='2001:db8::1'),
+                     tcp.tcp(src_port=1, dst_port=443)]
+        self._test({'tcp_dst': [80, 443]}, protocols, True)
+        self._test({'ip_proto': in_proto.IPPROTO_TCP,
+                    'ipv6_src': '2001:db8::1'}, protocols, True)
+        self._test({'ipv6_src': '2001:db8::2'}, protocols, False)
+        self._test({'udp_dst': 443}, protocols, False)
+
+    def test_truncated(self):
+        data = _packet_in(*self._udp()).msg.data
+        match = MatchFilter({'udp_dst': 53})
+        ok_(match.filter_data(data))
+        # up to the destination port after the ethernet, VLAN and IPv4
+        # headers
+        for length in range(14 + 4 + 20 + 4):
+            ok_(not match.filter_data(data[:length]))
+
+    @raises(ValueError)
+    def test_unknown_field(self):
+        MatchFilter({'udp_port': 53})
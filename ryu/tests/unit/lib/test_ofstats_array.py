@@ -0,0 +1,149 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import struct
+import unittest
+
+from nose.tools import eq_, ok_, raises
+
+from ryu import exception
+from ryu.lib import ofstats_array
+from ryu.ofproto import ofproto_parser
+from ryu.ofproto import ofproto_protocol
+from ryu.ofproto import ofproto_v1_3
+
+
+PACKET_DATA_DIR = os.path.join(
+    os.path.dirname(__file__), '../../packet_data')
+
+
+def _read(path, n_entries=1):
+    # the message with its body repeated n_entries times
+    with open(os.path.join(PACKET_DATA_DIR, path), 'rb') as f:
+        buf = f.read()
+    header_size = ofproto_v1_3.OFP_MULTIPART_REPLY_SIZE
+    buf = buf[:header_size] + buf[header_size:] * n_entries
+    buf = bytearray(buf)
+    struct.pack_into('!H', buf, 2, len(buf))
+    version, msg_type, msg_len, xid = ofproto_parser.header(buf)
+    dp = ofproto_protocol.ProtocolDesc(version=version)
+    return ofproto_parser.msg(dp, version, msg_type, msg_len, xid,
+                              bytes(buf))
+
+
+@unittest.skipIf(ofstats_array.numpy is None, 'numpy is not installed')
+class Test_ofstats_array(unittest.TestCase):
+    """ Test case for ryu.lib.ofstats_array
+    """
+
+    def _test(self, func, msgs, extra):
+        array = func(msgs)
+        body = []
+        for part, msg in enumerate(msgs):
+            offset = ofproto_v1_3.OFP_MULTIPART_REPLY_SIZE
+            # the size of the entries without length field
+            size = (msg.msg_len - offset) // len(msg.body)
+            for stats in msg.body:
+                body.append((part, offset, stats))
+                offset += getattr(stats, 'length', size)
+        eq_(len(body), len(array))
+        names = set(array.dtype.names) - set(['part', 'offset'] + extra)
+        ok_(names)
+        for row, (part, offset, stats) in zip(array, body):
+            eq_(part, row['part'])
+            eq_(offset, row['offset'])
+            for name in names:
+                eq_(getattr(stats, name), row[name], name)
+        return array
+
+    def _test_flow_stats(self, path):
+        msgs = [_read(path), _read(path, 3)]
+        array = self._test(ofstats_array.flow_stats, msgs,
+                           ['instructions_offset'])
+        for row, stats in zip(array, msgs[0].body + msgs[1].body):
+            msg = msgs[row['part']]
+            eq_(row['offset'] + stats.length - row['instructions_offset'],
+                sum(len(self._serialize(msg, inst)) for inst in
+                    stats.instructions))
+
+    @staticmethod
+    def _serialize(msg, inst):
+        buf = bytearray()
+        inst.serialize(buf, 0)
+        return buf
+
+    def test_flow_stats_of12(self):
+        self._test_flow_stats('of12/3-12-ofp_flow_stats_reply.packet')
+
+    def test_flow_stats_of13(self):
+        self._test_flow_stats('of13/4-12-ofp_flow_stats_reply.packet')
+
+    def test_flow_stats_of14(self):
+        self._test_flow_stats('of14/5-12-ofp_flow_stats_reply.packet')
+
+    def _test_port_stats(self, path):
+        self._test(ofstats_array.port_stats,
+                   [_read(path, 2), _read(path)], [])
+
+    def test_port_stats_of12(self):
+        self._test_port_stats('of12/3-30-ofp_port_stats_reply.packet')
+
+    def test_port_stats_of13(self):
+        self._test_port_stats('of13/4-30-ofp_port_stats_reply.packet')
+
+    def test_port_stats_of14(self):
+        self._test_port_stats('of14/5-30-ofp_port_stats_reply.packet')
+
+    def test_port_stats_of15(self):
+        self._test_port_stats('of15/libofproto-OFP15-port_stats_reply.packet')
+
+    def test_single_message(self):
+        path = 'of13/4-30-ofp_port_stats_reply.packet'
+        eq_(4 * len(_read(path).body),
+            len(ofstats_array.port_stats(_read(path, 4))))
+
+    def test_lazy_decode(self):
+        path = 'of13/4-12-ofp_flow_stats_reply.packet'
+        ofproto_parser.set_lazy_decode(True)
+        try:
+            msg = _read(path, 2)
+        finally:
+            ofproto_parser.set_lazy_decode(False)
+        eq_(2 * len(_read(path).body), len(ofstats_array.flow_stats([msg])))
+        ok_('body' not in msg.__dict__)
+
+    def test_empty(self):
+        array = ofstats_array.flow_stats([])
+        eq_(0, len(array))
+        ok_('byte_count' in array.dtype.names)
+
+    @raises(ValueError)
+    def test_wrong_stats_type(self):
+        ofstats_array.port_stats(
+            [_read('of13/4-12-ofp_flow_stats_reply.packet')])
+
+    @raises(ValueError)
+    def test_unsupported_version(self):
+        ofstats_array.flow_stats(
+            [_read('of15/libofproto-OFP15-flow_stats_reply.packet')])
+
+    @raises(exception.OFPMalformedMessage)
+    def test_malformed(self):
+        msg = _read('of13/4-12-ofp_flow_stats_reply.packet')
+        buf = bytearray(msg.buf)
+        struct.pack_into('!H', buf, ofproto_v1_3.OFP_MULTIPART_REPLY_SIZE, 8)
+        msg.buf = bytes(buf)
+        ofstats_array.flow_stats(msg)
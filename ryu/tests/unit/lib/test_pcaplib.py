@@ -15,10 +15,14 @@
 
 from __future__ import print_function
 
+import gzip
+import io
 import logging
 import os
+import shutil
 import struct
 import sys
+import tempfile
 import unittest
 
 try:
@@ -182,6 +186,51 @@ class Test_pcaplib_Reader(unittest.TestCase):
     def test_with_little_endian(self):
         self._test(os.path.join(PCAP_PACKET_DATA_DIR, 'little_endian.pcap'))
 
+    def test_without_copy(self):
+        reader = pcaplib.Reader(
+            open(os.path.join(PCAP_PACKET_DATA_DIR, 'big_endian.pcap'), 'rb'),
+            copy=False)
+        outputs = list(reader)
+        for ts, buf in outputs:
+            eq_(memoryview, type(buf))
+        eq_(self.expected_outputs, [(ts, buf.tobytes())
+                                    for ts, buf in outputs])
+        for _ts, buf in outputs:
+            buf.release()
+        reader.close()
+
+    def test_not_mapped(self):
+        file_name = os.path.join(PCAP_PACKET_DATA_DIR, 'little_endian.pcap')
+        reader = pcaplib.Reader(io.BytesIO(open(file_name, 'rb').read()))
+        eq_(self.expected_outputs, list(reader))
+
+    def test_compressed(self):
+        # not mapped, although the compressed file has fileno()
+        file_name = os.path.join(PCAP_PACKET_DATA_DIR, 'big_endian.pcap')
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            gz_file_name = os.path.join(tmp_dir, 'big_endian.pcap.gz')
+            with gzip.open(gz_file_name, 'wb') as f:
+                f.write(open(file_name, 'rb').read())
+            reader = pcaplib.Reader(gzip.open(gz_file_name, 'rb'))
+            eq_(self.expected_outputs, list(reader))
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_read_batch(self):
+        file_name = os.path.join(PCAP_PACKET_DATA_DIR, 'little_endian.pcap')
+        reader = pcaplib.Reader(open(file_name, 'rb'))
+        timestamps, offsets, lengths = reader.read_batch(1)
+        eq_([self.expected_outputs[0][0]], list(timestamps))
+        eq_([40], list(offsets))
+        eq_([11], list(lengths))
+        timestamps, offsets, lengths = reader.read_batch()
+        eq_([self.expected_outputs[1][0]], list(timestamps))
+        eq_([self.expected_outputs[1][1]],
+            [reader.buf[o:o + n].tobytes() for o, n in zip(offsets, lengths)])
+        eq_([], list(reader))
+        eq_(0, len(reader.read_batch()[0]))
+
 
 class DummyFile(object):
 
@@ -228,3 +277,64 @@ class Test_pcaplib_Writer(unittest.TestCase):
         expected_buf = b'hoge'  # b'hogehoge'[:snaplen]
         eq_(expected_buf, f.buf)
         eq_(snaplen, len(f.buf))
+
+    def test_buffered(self):
+        file_name = os.path.join(PCAP_PACKET_DATA_DIR, 'little_endian.pcap')
+        expected_buf = open(file_name, 'rb').read()
+        f = DummyFile()
+        with mock.patch('sys.byteorder', 'little'):
+            # the file header and the first packet
+            w = pcaplib.Writer(f, buffer_size=len(expected_buf) - 1)
+            w.write_pkt(b'test_data_1', ts=(0x1234 + (0x5678 / 1e6)))
+            eq_(b'', f.buf)
+            w.write_pkt(b'test_data_2', ts=(0x2345 + (0x6789 / 1e6)))
+        eq_(expected_buf, f.buf)
+
+    def test_flush(self):
+        f = DummyFile()
+        w = pcaplib.Writer(f, buffer_size=1 << 20)
+        w.write_pkt(b'test_data_1', ts=0)
+        eq_(b'', f.buf)
+        w.flush()
+        eq_(pcaplib.PcapFileHdr.FILE_HDR_SIZE + pcaplib.PcapPktHdr.PKT_HDR_SIZE
+            + len(b'test_data_1'), len(f.buf))
+        w.write_pkt(b'test_data_2', ts=0)
+        del w
+        eq_(b'test_data_2', f.buf[-len(b'test_data_2'):])
+
+    def test_flush_interval(self):
+        f = DummyFile()
+        w = pcaplib.Writer(f, buffer_size=1 << 20, flush_interval=0)
+        w.write_pkt(b'test_data_1', ts=0)
+        eq_(b'test_data_1', f.buf[-len(b'test_data_1'):])
+
+
+class Test_pcaplib_PcapngWriter(unittest.TestCase):
+    """
+    Test case for pcaplib.PcapngWriter class
+    """
+
+    def test_write_pkt(self):
+        f = DummyFile()
+        w = pcaplib.PcapngWriter(f, snaplen=8)
+        eq_(0, w.add_interface('port1'))
+        w.write_pkt(b'test_data_1', ts=(0x1234 + (0x5678 / 1e6)),
+                    interface_id=0, comment='abcde')
+        usec = 0x1234 * 1000000 + 0x5678
+        expected_buf = (
+            # Section Header Block
+            struct.pack('=IIIHHqI', 0x0a0d0d0a, 28, 0x1a2b3c4d, 1, 0, -1, 28)
+            # Interface Description Block with if_name
+            + struct.pack('=IIHHIHH', 1, 36, 1, 0, 8, 2, 5) + b'port1\0\0\0'
+            + struct.pack('=HHI', 0, 0, 36)
+            # Enhanced Packet Block truncated to snaplen, with a comment
+            + struct.pack('=IIIIIII', 6, 56, 0, usec >> 32,
+                          usec & 0xffffffff, 8, 11)
+            + b'test_dat' + struct.pack('=HH', 1, 5) + b'abcde\0\0\0'
+            + struct.pack('=HHI', 0, 0, 56))
+        eq_(binary_str(expected_buf), binary_str(f.buf))
+
+    @raises(ValueError)
+    def test_unknown_interface(self):
+        w = pcaplib.PcapngWriter(DummyFile())
+        w.write_pkt(b'test_data_1', ts=0)
@@ -19,7 +19,7 @@ from __future__ import print_function
 import base64
 import six
 import unittest
-from nose.tools import eq_
+from nose.tools import eq_, ok_
 
 from ryu.lib import stringify
 
@@ -73,3 +73,63 @@ class Test_stringify(unittest.TestCase):
         eq_(c.__class__, c2.__class__)
         eq_(c.__dict__, c2.__dict__)
         eq_(j, c.to_jsondict(encode_string=my_encode))
+
+
+class C2(stringify.StringifyMixin):
+    _TYPE = {
+        'ascii': ['name'],
+    }
+    _opt_attributes = ['prop']
+    _class_prefixes = ['C1']
+    cls_attr = 1
+
+    def __init__(self, name, type_=None, c1=None):
+        self.name = name
+        self.type = type_
+        self.c1 = c1
+        self._private = 0
+
+    @property
+    def prop(self):
+        return self.type
+
+    def method(self):
+        pass
+
+
+class C3(C2):
+    @classmethod
+    def _encode_value(cls, k, v, encode_string=base64.b64encode):
+        if k == 'name':
+            return v.upper()
+        return super(C3, cls)._encode_value(k, v, encode_string)
+
+
+class Test_stringify_codecs(unittest.TestCase):
+    """ Test case for the generated encoders and decoders
+    """
+
+    def test_jsondict(self):
+        c = C2(name='foo', type_=3, c1=C1(a=b'AAA', c=b'CCC'))
+        j = {'C2': {'name': 'foo', 'type': 3, 'prop': 3,
+                    'c1': {'C1': {'a': 'QUFB', 'c': 'Q0ND'}}}}
+        eq_(j, c.to_jsondict())
+        eq_(['c1', 'name', 'prop', 'type'],
+            [k for k, v in stringify.obj_python_attrs(c)])
+
+        c2 = C2.from_jsondict(
+            dict((k, v) for k, v in j['C2'].items() if k != 'prop'))
+        eq_(c.name, c2.name)
+        eq_(c.type, c2.type)
+        eq_(c.c1.__dict__, c2.c1.__dict__)
+
+    def test_cached(self):
+        encoder = C2._jsondict_encoder(base64.b64encode)
+        ok_(encoder is C2._jsondict_encoder(base64.b64encode))
+        ok_(encoder is not C3._jsondict_encoder(base64.b64encode))
+        decoder = C2._jsondict_decoder(base64.b64decode)
+        ok_(decoder is C2._jsondict_decoder(base64.b64decode))
+
+    def test_overridden_hook(self):
+        eq_({'C3': {'name': 'FOO', 'type': None, 'prop': None, 'c1': None}},
+            C3(name='foo').to_jsondict())
@@ -23,9 +23,12 @@ except ImportError:
     # Python 2
     pass
 
+import os
+import subprocess
+import sys
 import unittest
 import logging
-from nose.tools import eq_
+from nose.tools import eq_, raises
 
 
 LOG = logging.getLogger('test_ofproto')
@@ -79,3 +82,41 @@ class TestOfprotCommon(unittest.TestCase):
                               ryu.ofproto.ofproto_v1_4_parser,
                               ryu.ofproto.ofproto_v1_5_parser,
                               ]))
+
+    def test_load_on_demand(self):
+        # the modules of a version are imported on the first use, in a
+        # fresh process as this one has imported every version
+        code = """
+import sys
+from ryu.base import app_manager
+from ryu.controller import ofp_event
+from ryu.ofproto import ofproto_parser
+from ryu.ofproto import ofproto_v1_3
+
+class App(app_manager.RyuApp):
+    OFP_VERSIONS = [ofproto_v1_3.OFP_VERSION]
+
+app_manager.AppManager.get_instance().instantiate(App)
+ofp_event.EventOFPPacketIn
+# not the event of a message
+assert not hasattr(ofp_event, 'Event__wrapped__')
+assert not hasattr(ofp_event, 'EventSwitchEnter')
+print(sorted(m for m in sys.modules if m.endswith('_parser') and
+                 m.startswith('ryu.ofproto.ofproto_v')))
+ofproto_parser.msg(None, 0x05, 0, 8, 0, b'\\x05\\x00\\x00\\x08\\x00\\x00\\x00\\x00')
+print(sorted(m for m in sys.modules if m.endswith('_parser') and
+                 m.startswith('ryu.ofproto.ofproto_v')))
+"""
+        root = os.path.join(os.path.dirname(__file__), '../../../..')
+        env = dict(os.environ, PYTHONPATH=os.path.abspath(root))
+        out = subprocess.check_output([sys.executable, '-W', 'ignore',
+                                       '-c', code], env=env)
+        lines = out.decode().splitlines()
+        eq_("['ryu.ofproto.ofproto_v1_3_parser']", lines[-2])
+        eq_("['ryu.ofproto.ofproto_v1_3_parser', "
+            "'ryu.ofproto.ofproto_v1_4_parser']", lines[-1])
+
+    @raises(AttributeError)
+    def test_ofp_event_unknown(self):
+        import ryu.controller.ofp_event
+        ryu.controller.ofp_event.EventOFPNoSuchMessage
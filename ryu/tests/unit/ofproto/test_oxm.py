@@ -14,9 +14,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
 import unittest
 
 import ryu.ofproto.ofproto_v1_3 as ofp
+import ryu.ofproto.ofproto_v1_3_parser as ofpp
 
 
 class Test_OXM(unittest.TestCase):
@@ -33,6 +35,14 @@ class Test_OXM(unittest.TestCase):
         (f, uv) = ofp.oxm_to_user(n, v, m)
         self.assertEqual(user, (f, uv))
 
+    def _test_decode_fields(self, user, on_wire):
+        # table driven decoder, with a preceding field
+        buf = b'\x80\x00\x00\x04\x00\x00\x00\x01' + on_wire
+        (fields, end) = ofp.oxm_parse_fields(buf, 0, len(buf))
+        self.assertEqual(len(buf), end)
+        self.assertEqual(user[1], fields.get_field(user[0]))
+        self.assertEqual([('in_port', 1), user], list(fields))
+
     def _test_encode_header(self, user, on_wire):
         f = user
         n = ofp.oxm_from_user_header(f)
@@ -49,6 +59,7 @@ class Test_OXM(unittest.TestCase):
     def _test(self, user, on_wire, header_bytes):
         self._test_encode(user, on_wire)
         self._test_decode(user, on_wire)
+        self._test_decode_fields(user, on_wire)
         if isinstance(user[1], tuple):  # has mask?
             return
         user_header = user[0]
@@ -186,3 +197,58 @@ class Test_OXM(unittest.TestCase):
             b'fugafuga'
         )
         self._test(user, on_wire, 4)
+
+    def test_parse_fields(self):
+        match = ofpp.OFPMatch(in_port=1, eth_dst='00:00:00:00:00:01',
+                              ipv4_src=('10.0.0.0', '255.0.0.0'),
+                              eth_type=0x800)
+        buf = bytearray()
+        match.serialize(buf, 0)
+        (fields, end) = ofp.oxm_parse_fields(bytes(buf), 4, match.length - 4)
+        self.assertEqual(match.length, end)
+        self.assertTrue(fields)
+        # looking up a field does not decode the others
+        self.assertEqual(('10.0.0.0', '255.0.0.0'),
+                         fields.get_field('ipv4_src'))
+        self.assertEqual(None, fields._items)
+        self.assertRaises(KeyError, fields.get_field, 'ipv6_src')
+        self.assertEqual(match._fields2, list(fields))
+        self.assertEqual(match._fields2, copy.deepcopy(fields))
+        self.assertEqual(1, fields.get_field('in_port'))
+
+    def test_parse_fields_truncated(self):
+        buf = b'\x80\x00\x00\x04\x00\x00\x00\x01\x80\x00\x16\x04\xc0'
+        (fields, end) = ofp.oxm_parse_fields(buf, 0, len(buf))
+        self.assertEqual(8, end)
+        self.assertEqual([('in_port', 1)], list(fields))
+
+    def test_parse_fields_duplicated(self):
+        # in_port 1 then in_port 2: the last one wins as with a dict
+        buf = b'\x80\x00\x00\x04\x00\x00\x00\x01' \
+            b'\x80\x00\x00\x04\x00\x00\x00\x02'
+        (fields, end) = ofp.oxm_parse_fields(buf, 0, len(buf))
+        self.assertEqual(2, fields.get_field('in_port'))
+        self.assertEqual([('in_port', 1), ('in_port', 2)], list(fields))
+        self.assertEqual(2, fields.get_field('in_port'))
+        self.assertEqual(2, ofp.oxm_get_field(list(fields), 'in_port'))
+
+    def test_parse_fields_malformed(self):
+        # eth_dst of 4 octets fails the parser, not the lookup
+        buf = b'\x80\x00\x06\x04\x00\x00\x00\x01'
+        self.assertRaises(Exception, ofp.oxm_parse_fields, buf, 0, len(buf))
+
+    def test_match_old_api(self):
+        match = ofpp.OFPMatch(in_port=1, eth_type=0x800)
+        buf = bytearray()
+        match.serialize(buf, 0)
+        parsed = ofpp.OFPMatch.parser(bytes(buf), 0)
+        self.assertEqual(1, parsed['in_port'])
+        self.assertTrue('eth_type' in parsed)
+        self.assertFalse('ipv4_src' in parsed)
+        self.assertEqual(None, parsed.get('ipv4_src'))
+        # the old API attributes are made on first access
+        self.assertFalse('fields' in parsed.__dict__)
+        self.assertEqual([ofp.OXM_OF_IN_PORT, ofp.OXM_OF_ETH_TYPE],
+                         [f.header for f in parsed.fields])
+        self.assertFalse(parsed._composed_with_old_api())
+        self.assertEqual(match.to_jsondict(), parsed.to_jsondict())
@@ -0,0 +1,95 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from nose.tools import eq_, ok_, raises
+
+from ryu.ofproto import ofproto_protocol
+from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_3_parser
+
+
+class Test_OFPFlowModTemplate(unittest.TestCase):
+    """ Test case for ofproto_v1_3_parser.OFPFlowModTemplate
+    """
+
+    def setUp(self):
+        self.dp = ofproto_protocol.ProtocolDesc(
+            version=ofproto_v1_3.OFP_VERSION)
+
+    def _generic(self, fields, values, ports, **kwargs):
+        parser = ofproto_v1_3_parser
+        actions = [parser.OFPActionOutput(port) for port in ports]
+        inst = [parser.OFPInstructionActions(
+            ofproto_v1_3.OFPIT_APPLY_ACTIONS, actions)]
+        match = parser.OFPMatch(**dict(zip(fields, values)))
+        msg = parser.OFPFlowMod(self.dp, match=match, instructions=inst,
+                                **kwargs)
+        msg.set_xid(1234)
+        msg.serialize()
+        return msg
+
+    def _test(self, fields, values, ports, **kwargs):
+        tmpl = ofproto_v1_3_parser.OFPFlowModTemplate.compile(
+            fields, n_outputs=len(ports))
+        msg = tmpl.build(self.dp, values, ports, **kwargs)
+        ok_(isinstance(msg, ofproto_v1_3_parser.OFPFlowMod))
+        msg.set_xid(1234)
+        msg.serialize()
+
+        expected = self._generic(fields, values, ports, **kwargs)
+        eq_(bytes(expected.buf), bytes(msg.buf))
+        eq_(expected.msg_len, msg.msg_len)
+        eq_(expected.to_jsondict(), msg.to_jsondict())
+
+    def test_ipv4(self):
+        self._test(('in_port', 'eth_type', 'ipv4_src', 'ipv4_dst'),
+                   (1, 0x800, '10.0.0.1', '10.0.0.2'), [2],
+                   priority=1, idle_timeout=10, hard_timeout=30)
+
+    def test_field_order(self):
+        # the fields are ordered as OFPMatch does
+        self._test(('eth_dst', 'in_port', 'eth_src'),
+                   ('00:00:00:00:00:02', 3, '00:00:00:00:00:01'), [1, 4],
+                   cookie=0x12345678, buffer_id=7,
+                   flags=ofproto_v1_3.OFPFF_SEND_FLOW_REM)
+
+    def test_ipv6_vlan(self):
+        self._test(('vlan_vid', 'eth_type', 'ipv6_dst', 'ip_proto',
+                    'udp_dst'),
+                   (0x1000 | 10, 0x86dd, '2001:db8::1', 17, 53), [1])
+
+    def test_experimenter_field(self):
+        self._test(('in_port', 'tcp_flags', 'pbb_uca'), (1, 0x12, 1), [2])
+
+    def test_no_actions(self):
+        self._test(('in_port',), (1,), [], priority=0,
+                   command=ofproto_v1_3.OFPFC_DELETE,
+                   out_port=ofproto_v1_3.OFPP_ANY,
+                   out_group=ofproto_v1_3.OFPG_ANY)
+
+    def test_compile_cached(self):
+        tmpl = ofproto_v1_3_parser.OFPFlowModTemplate.compile(
+            ['in_port', 'eth_dst'])
+        ok_(tmpl is ofproto_v1_3_parser.OFPFlowModTemplate.compile(
+            ('in_port', 'eth_dst')))
+        ok_(tmpl is not ofproto_v1_3_parser.OFPFlowModTemplate.compile(
+            ('in_port', 'eth_dst'), n_outputs=2))
+
+    @raises(ValueError)
+    def test_wrong_number_of_values(self):
+        tmpl = ofproto_v1_3_parser.OFPFlowModTemplate.compile(
+            ('in_port', 'eth_dst'))
+        tmpl.build(self.dp, (1,), [2]).serialize()
@@ -0,0 +1,89 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sys
+import unittest
+from nose.tools import eq_, ok_
+
+from ryu.ofproto import ofproto_parser
+from ryu.ofproto import ofproto_protocol
+from ryu.ofproto import ofproto_v1_3_parser
+
+
+class Test_Parser_Lazy(unittest.TestCase):
+    """ Test case for lazy decoding of received messages
+    """
+
+    def setUp(self):
+        ofproto_parser.set_lazy_decode(True)
+
+    def tearDown(self):
+        ofproto_parser.set_lazy_decode(False)
+
+    def _parse(self, wire_msg):
+        (version, msg_type, msg_len, xid) = ofproto_parser.header(wire_msg)
+        dp = ofproto_protocol.ProtocolDesc(version=version)
+        return ofproto_parser.msg(dp, version, msg_type, msg_len, xid,
+                                  wire_msg)
+
+    def _read(self, ver, name):
+        this_dir = os.path.dirname(sys.modules[__name__].__file__)
+        path = os.path.join(this_dir, '../../packet_data', ver, name)
+        return open(path, 'rb').read()
+
+    def test_packet_in(self):
+        wire_msg = self._read('of13', '4-4-ofp_packet_in.packet')
+        msg = self._parse(wire_msg)
+        ok_('match' not in msg.__dict__)
+        ok_(msg.data)
+        ok_('match' not in msg.__dict__)
+        ok_(isinstance(msg.match, ofproto_v1_3_parser.OFPMatch))
+        ok_('match' in msg.__dict__)
+        ok_(not msg._lazy_attrs)
+
+    def test_flow_stats_reply(self):
+        wire_msg = self._read('of13', '4-12-ofp_flow_stats_reply.packet')
+        msg = self._parse(wire_msg)
+        ok_('body' not in msg.__dict__)
+        ok_(isinstance(msg.body[0], ofproto_v1_3_parser.OFPFlowStats))
+
+    def test_same_as_eager(self):
+        for ver in ['of13', 'of14', 'of15']:
+            this_dir = os.path.dirname(sys.modules[__name__].__file__)
+            pdir = os.path.join(this_dir, '../../packet_data', ver)
+            for name in sorted(os.listdir(pdir)):
+                if not name.endswith('.packet'):
+                    continue
+                wire_msg = self._read(ver, name)
+                (version, msg_type, _len, _xid) = ofproto_parser.header(
+                    wire_msg)
+                parser = ofproto_protocol.ProtocolDesc(
+                    version=version).ofproto_parser
+                if parser._MSG_PARSERS.get(msg_type) is None:
+                    # no parser for the controller-to-switch messages
+                    continue
+                lazy_json = self._parse(wire_msg).to_jsondict()
+                ofproto_parser.set_lazy_decode(False)
+                try:
+                    eager_json = self._parse(wire_msg).to_jsondict()
+                finally:
+                    ofproto_parser.set_lazy_decode(True)
+                eq_(eager_json, lazy_json, '%s/%s' % (ver, name))
+
+    def test_missing_attribute(self):
+        wire_msg = self._read('of13', '4-4-ofp_packet_in.packet')
+        msg = self._parse(wire_msg)
+        ok_(not hasattr(msg, 'no_such_attribute'))
@@ -28,7 +28,7 @@ from ryu.lib.packet import ethernet
 from ryu.lib.packet import icmp, icmpv6
 from ryu.lib.packet import ipv4, ipv6
 from ryu.lib.packet import llc
-from ryu.lib.packet import packet, packet_utils
+from ryu.lib.packet import packet, packet_base, packet_utils
 from ryu.lib.packet import sctp
 from ryu.lib.packet import tcp, udp
 from ryu.lib.packet import vlan
@@ -1551,3 +1551,107 @@ class TestPacket(unittest.TestCase):
         ok_(isinstance(pkt.protocols[0], ethernet.ethernet))
         ok_(isinstance(pkt.protocols[1], ipv4.ipv4))
         ok_(isinstance(pkt.protocols[2], udp.udp))
+
+    def _tcp_packet(self):
+        e = ethernet.ethernet(self.dst_mac, self.src_mac, ether.ETH_TYPE_IP)
+        i = ipv4.ipv4(src=self.src_ip, dst=self.dst_ip,
+                      proto=inet.IPPROTO_TCP)
+        t = tcp.tcp(self.src_port, self.dst_port,
+                    option=[tcp.TCPOptionMaximumSegmentSize(1460)])
+        pkt = e / i / t / self.payload
+        pkt.serialize()
+        return pkt.data
+
+    def test_lazy(self):
+        data = self._tcp_packet()
+        eager = packet.Packet(data)
+        pkt = packet.Packet(data, lazy=True)
+
+        eq_(self.src_mac, pkt.get_protocol(ethernet.ethernet).src)
+        # only the ethernet header is decoded
+        eq_(1, len(pkt._protocols))
+        ok_(ipv4.ipv4 in pkt)
+        eq_(2, len(pkt._protocols))
+        ok_(udp.udp not in pkt)
+        eq_(str(eager), str(pkt))
+        eq_(eager.to_jsondict(), pkt.to_jsondict())
+
+        pkt = packet.Packet(data, lazy=True)
+        for p in pkt:
+            if isinstance(p, ipv4.ipv4):
+                break
+        eq_(2, len(pkt._protocols))
+        eq_([p.__class__ for p in eager],
+            [p.__class__ for p in pkt.protocols])
+
+    def test_padding(self):
+        e = ethernet.ethernet(self.dst_mac, self.src_mac, ether.ETH_TYPE_ARP)
+        a = arp.arp_ip(arp.ARP_REQUEST, self.src_mac, self.src_ip,
+                       self.dst_mac, self.dst_ip)
+        pkt = e / a
+        pkt.serialize()
+        # without the padding added by serialize()
+        data = six.binary_type(pkt.data)[
+            :ethernet.ethernet._MIN_LEN + arp.arp._MIN_LEN]
+
+        for lazy in (False, True):
+            # the trailing zeros are padding
+            pkt = packet.Packet(data + b'\x00' * 18, lazy=lazy)
+            eq_([ethernet.ethernet, arp.arp],
+                [p.__class__ for p in pkt])
+            # not if something follows
+            pkt = packet.Packet(data + b'\x00' * 17 + b'\x01', lazy=lazy)
+            eq_(3, len(pkt))
+            eq_(b'\x00' * 17 + b'\x01', pkt[2])
+
+    def test_protocol_index(self):
+        pkt = packet.Packet(self._tcp_packet())
+        t = pkt.get_protocol(tcp.tcp)
+        ok_(isinstance(t, tcp.tcp))
+        ok_(t is pkt.get_protocol(t))
+        eq_(None, pkt.get_protocol(udp.udp))
+        # subclasses, in on-wire order
+        eq_([ethernet.ethernet, ipv4.ipv4, tcp.tcp],
+            [p.__class__ for p in
+             pkt.get_protocols(packet_base.PacketBase)])
+
+        u = udp.udp(self.src_port, self.dst_port)
+        pkt[2] = u
+        eq_(None, pkt.get_protocol(tcp.tcp))
+        eq_([u], pkt.get_protocols(udp.udp))
+        del pkt[2]
+        eq_([], pkt.get_protocols(udp.udp))
+        pkt.add_protocol(u)
+        eq_([u], pkt.get_protocols(udp.udp))
+        pkt.protocols.append(t)
+        eq_([u, t], pkt.get_protocols(packet_base.PacketBase)[2:])
+        pkt.protocols = [t]
+        eq_([t], pkt.get_protocols(packet_base.PacketBase))
+
+    def test_checksum_parts(self):
+        data = bytes(bytearray(range(1, 50)))
+        csum = packet_utils.checksum(data)
+        eq_(csum, packet_utils.checksum(data[:20], memoryview(data)[20:]))
+        # parts of odd length
+        eq_(csum, packet_utils.checksum(data[:21], bytearray(data[21:])))
+        eq_(csum, packet_utils.checksum(data[:11], data[11:30], data[30:]))
+
+    def test_checksum_long(self):
+        # summed with NumPy if installed
+        data = bytes(bytearray(range(256))) * 20 + b'\x01'
+        s = sum(struct.unpack('!%dH' % (len(data) // 2), data[:-1])) + 0x100
+        while s >> 16:
+            s = (s & 0xffff) + (s >> 16)
+        eq_(~s & 0xffff, packet_utils.checksum(data))
+        eq_(~s & 0xffff, packet_utils.checksum(data[:1001], data[1001:]))
+        eq_(0xffff, packet_utils.checksum(bytearray(2000)))
+
+    def test_checksum_update(self):
+        data = bytearray(self._tcp_packet()[ethernet.ethernet._MIN_LEN:])
+        csum = packet_utils.checksum(data)
+        # the destination address and the TTL of the IPv4 header
+        for offset, new in [(16, b'\xc0\xa8\x00\x01'), (8, b'\x3f\x06')]:
+            old = bytes(data[offset:offset + len(new)])
+            data[offset:offset + len(new)] = new
+            csum = packet_utils.checksum_update(csum, old, new)
+            eq_(packet_utils.checksum(data), csum)
@@ -0,0 +1,182 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from nose.tools import eq_, ok_, raises
+
+from ryu.lib.packet import arp
+from ryu.lib.packet import bfd
+from ryu.lib.packet import ethernet
+from ryu.lib.packet import icmp
+from ryu.lib.packet import icmpv6
+from ryu.lib.packet import ipv4
+from ryu.lib.packet import ipv6
+from ryu.lib.packet import packet
+from ryu.lib.packet import packet_template
+from ryu.lib.packet import tcp
+from ryu.lib.packet import udp
+from ryu.lib.packet import vlan
+from ryu.ofproto import ether
+from ryu.ofproto import inet
+
+
+class Test_packet_template(unittest.TestCase):
+    """ Test case for ryu.lib.packet.packet_template
+    """
+
+    def _test(self, make, fields):
+        # make(**kwargs) returns the protocols of a packet, whose argument
+        # protocol__attr is the field protocol_attr of the template
+        for kwargs in fields:
+            tmpl = packet_template.PacketTemplate(
+                packet.Packet(protocols=make()))
+            data = bytes(tmpl.data)
+            pkt = packet.Packet(protocols=make(**kwargs))
+            pkt.serialize()
+            values = dict((k.replace('__', '_'), v)
+                          for k, v in kwargs.items())
+            eq_(bytes(pkt.data), bytes(tmpl.build(**values)))
+            # the template itself is not modified by build()
+            eq_(data, bytes(tmpl.data))
+            for name, value in values.items():
+                tmpl[name] = value
+                eq_(value, tmpl[name])
+            eq_(bytes(pkt.data), bytes(tmpl.data))
+
+    def test_arp(self):
+        def make(ethernet__dst='ff:ff:ff:ff:ff:ff',
+                 arp__opcode=arp.ARP_REQUEST,
+                 arp__dst_mac='00:00:00:00:00:00', arp__dst_ip='10.0.0.2'):
+            return [ethernet.ethernet(ethernet__dst, '00:00:00:00:00:01',
+                                      ether.ETH_TYPE_ARP),
+                    arp.arp(opcode=arp__opcode,
+                            src_mac='00:00:00:00:00:01', src_ip='10.0.0.1',
+                            dst_mac=arp__dst_mac, dst_ip=arp__dst_ip)]
+
+        self._test(make, [
+            {'arp__dst_ip': '192.168.1.254'},
+            {'ethernet__dst': '00:00:00:00:00:02',
+             'arp__opcode': arp.ARP_REPLY,
+             'arp__dst_mac': '00:00:00:00:00:02'},
+        ])
+
+    def test_bfd(self):
+        def make(ipv4__identification=1, ipv4__dst='10.0.0.2',
+                 bfd__state=bfd.BFD_STATE_DOWN, bfd__flags=0, bfd__diag=0,
+                 bfd__your_discr=0, bfd__desired_min_tx_interval=1000000):
+            return [ethernet.ethernet('00:00:00:00:00:02',
+                                      '00:00:00:00:00:01'),
+                    ipv4.ipv4(proto=inet.IPPROTO_UDP, src='10.0.0.1',
+                              dst=ipv4__dst, tos=192, ttl=255,
+                              identification=ipv4__identification),
+                    udp.udp(src_port=49152, dst_port=3784),
+                    bfd.bfd(ver=1, diag=bfd__diag, state=bfd__state,
+                            flags=bfd__flags, detect_mult=3, my_discr=1,
+                            your_discr=bfd__your_discr,
+                            desired_min_tx_interval=(
+                                bfd__desired_min_tx_interval),
+                            required_min_rx_interval=1000000,
+                            required_min_echo_rx_interval=0)]
+
+        self._test(make, [
+            {'ipv4__identification': 2},
+            {'ipv4__identification': 0xffff, 'bfd__state': bfd.BFD_STATE_UP,
+             'bfd__flags': bfd.BFD_FLAG_POLL, 'bfd__your_discr': 0x12345678,
+             'bfd__diag': bfd.BFD_DIAG_NEIG_SIG_SESS_DOWN},
+            # a field of the pseudo header
+            {'ipv4__dst': '172.16.255.1', 'bfd__desired_min_tx_interval': 7},
+        ])
+
+    def test_icmp_vlan(self):
+        def make(vlan__vid=10, vlan__pcp=0, ipv4__ttl=64, icmp__code=1):
+            return [ethernet.ethernet(ethertype=ether.ETH_TYPE_8021Q),
+                    vlan.vlan(pcp=vlan__pcp, vid=vlan__vid,
+                              ethertype=ether.ETH_TYPE_IP),
+                    ipv4.ipv4(proto=inet.IPPROTO_ICMP, ttl=ipv4__ttl),
+                    icmp.icmp(type_=icmp.ICMP_DEST_UNREACH, code=icmp__code,
+                              data=icmp.dest_unreach(data=b'\x01' * 27))]
+
+        self._test(make, [
+            {'vlan__vid': 4000, 'vlan__pcp': 7, 'ipv4__ttl': 1,
+             'icmp__code': 3},
+        ])
+
+    def test_tcp_ipv6(self):
+        def make(ipv6__src='2001:db8::1', tcp__seq=0, tcp__bits=tcp.TCP_SYN,
+                 tcp__dst_port=80):
+            return [ethernet.ethernet(ethertype=ether.ETH_TYPE_IPV6),
+                    ipv6.ipv6(nxt=inet.IPPROTO_TCP, src=ipv6__src,
+                              dst='2001:db8::2'),
+                    tcp.tcp(src_port=1, dst_port=tcp__dst_port, seq=tcp__seq,
+                            bits=tcp__bits),
+                    b'\x02' * 101]
+
+        self._test(make, [
+            {'ipv6__src': 'fe80::1234:5678', 'tcp__seq': 0xffffffff,
+             'tcp__bits': tcp.TCP_ACK | tcp.TCP_FIN, 'tcp__dst_port': 443},
+        ])
+
+    def test_icmpv6(self):
+        def make(ipv6__dst='ff02::1', icmpv6__code=0):
+            return [ethernet.ethernet(ethertype=ether.ETH_TYPE_IPV6),
+                    ipv6.ipv6(nxt=inet.IPPROTO_ICMPV6, src='fe80::1',
+                              dst=ipv6__dst),
+                    icmpv6.icmpv6(type_=icmpv6.ICMPV6_ECHO_REQUEST,
+                                  code=icmpv6__code,
+                                  data=icmpv6.echo(id_=1, seq=1))]
+
+        self._test(make, [{'ipv6__dst': 'fe80::2', 'icmpv6__code': 1}])
+
+    def test_update(self):
+        tmpl = packet_template.PacketTemplate(packet.Packet(protocols=[
+            ethernet.ethernet(), ipv4.ipv4(proto=inet.IPPROTO_UDP),
+            udp.udp(src_port=1, dst_port=2)]))
+        data = tmpl.data
+        tmpl.update(ipv4_src='10.0.0.1', udp_src_port=1, udp_dst_port=3)
+        ok_(data is tmpl.data)
+        pkt = packet.Packet(protocols=[
+            ethernet.ethernet(),
+            ipv4.ipv4(proto=inet.IPPROTO_UDP, src='10.0.0.1'),
+            udp.udp(src_port=1, dst_port=3)])
+        pkt.serialize()
+        eq_(bytes(pkt.data), bytes(tmpl.data))
+        eq_(bytes(pkt.data), bytes(tmpl.build(udp_dst_port=3)))
+
+    def test_udp_zero_checksum(self):
+        # no checksum is kept as it is
+        tmpl = packet_template.PacketTemplate(packet.Packet(protocols=[
+            ethernet.ethernet(),
+            ipv4.ipv4(proto=inet.IPPROTO_UDP),
+            udp.udp(csum=0xffff)]))
+        offset = tmpl.offsets['udp_src_port'] + 6
+        tmpl.data[offset:offset + 2] = b'\x00\x00'
+        tmpl['udp_dst_port'] = 53
+        eq_(b'\x00\x00', tmpl.data[offset:offset + 2])
+
+    def test_offsets(self):
+        tmpl = packet_template.PacketTemplate(packet.Packet(protocols=[
+            ethernet.ethernet(), ipv4.ipv4(proto=inet.IPPROTO_UDP),
+            udp.udp()]))
+        eq_(30, tmpl.offsets['ipv4_dst'])
+        eq_(36, tmpl.offsets['udp_dst_port'])
+        ok_('udp_dst_port' in tmpl)
+        ok_('tcp_dst_port' not in tmpl)
+
+    @raises(KeyError)
+    def test_unknown_field(self):
+        tmpl = packet_template.PacketTemplate(packet.Packet(protocols=[
+            ethernet.ethernet()]))
+        tmpl.build(ipv4_dst='10.0.0.1')
@@ -505,6 +505,9 @@ class Switches(app_manager.RyuApp):
                event.EventPortModify,
                event.EventLinkAdd, event.EventLinkDelete,
                event.EventHostAdd]
+    # An LLDP packet sent by a worker is received by the worker of the
+    # peer switch, which does not know the port it was sent from.
+    _SINGLE_WORKER = True
 
     DEFAULT_TTL = 120  # unused. ignored.
     LLDP_PACKET_LEN = len(LLDPPacket.lldp_packet(0, 0, DONTCARE_STR, 0))
@@ -15,7 +15,9 @@
 # limitations under the License.
 
 import importlib
+import io
 import logging
+import mmap
 import os
 import sys
 
@@ -126,3 +128,20 @@ def binary_str(data):
     """
     # convert data into bytearray explicitly
     return ''.join('\\x%02x' % byte for byte in bytearray(data))
+
+
+def map_file(f):
+    """
+    Returns the content of the binary file object f, mapped in memory
+    read-only if f is a regular file, otherwise read at once.
+
+    A compressed file, e.g. bz2.BZ2File, is read since its fileno() is
+    that of the compressed data.  The mapping outlives f.
+    """
+    if isinstance(f, (io.BufferedReader, io.FileIO)):
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (IOError, OSError, ValueError):
+            # e.g. a pipe or an empty file
+            pass
+    return f.read()
@@ -0,0 +1,191 @@
+#! /usr/bin/env python
+
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Compares the throughput of the hub implementations of ryu.lib.hub.
+#
+# usage example:
+#   PYTHONPATH=.. ./hub_benchmark.py
+#   PYTHONPATH=.. ./hub_benchmark.py --hubs asyncio --scale 0.1
+#
+# Every hub type runs in its own process as it is fixed on import.
+
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import struct
+import subprocess
+import sys
+import time
+
+HUB_TYPES = ['eventlet', 'asyncio']
+
+OFP_HEADER = struct.Struct('!BBHI')
+
+
+def bench_spawn(hub, n):
+    def _child():
+        pass
+
+    threads = [hub.spawn(_child) for _i in range(n)]
+    hub.joinall(threads)
+    return n
+
+
+def bench_queue(hub, n):
+    # ping-pong between two threads, two context switches per round
+    q1 = hub.Queue(1)
+    q2 = hub.Queue(1)
+
+    def _pong():
+        for _i in range(n):
+            q2.put(q1.get())
+
+    thr = hub.spawn(_pong)
+    for i in range(n):
+        q1.put(i)
+        q2.get()
+    hub.joinall([thr])
+    return n
+
+
+def _serve(hub, handle):
+    server = hub.StreamServer(('127.0.0.1', 0), handle)
+    thr = hub.spawn(server.serve_forever)
+    port = server.server.getsockname()[1]
+    sock = hub.StreamClient(('127.0.0.1', port)).connect()
+    return thr, sock
+
+
+def bench_stream_bulk(hub, n):
+    # one way transfer of 64KiB writes, returns bytes
+    chunk = b'x' * 0x10000
+    done = hub.Event()
+    received = [0]
+
+    def _sink(sock, _addr):
+        buf = bytearray(0x10000)
+        while received[0] < n * len(chunk):
+            ret = sock.recv_into(buf)
+            if not ret:
+                break
+            received[0] += ret
+        done.set()
+
+    thr, sock = _serve(hub, _sink)
+    for _i in range(n):
+        sock.sendall(chunk)
+    done.wait()
+    sock.close()
+    hub.kill(thr)
+    return received[0]
+
+
+def bench_stream_echo(hub, n):
+    # pipelined OpenFlow echo request/reply of 8 bytes messages
+    window = 64
+
+    def _echo(sock, _addr):
+        buf = bytearray(0x10000)
+        pending = b''
+        while True:
+            ret = sock.recv_into(buf)
+            if not ret:
+                break
+            data = pending + bytes(buf[:ret])
+            end = len(data) - len(data) % OFP_HEADER.size
+            pending = data[end:]
+            replies = bytearray(data[:end])
+            for off in range(0, end, OFP_HEADER.size):
+                replies[off + 1] = 3  # OFPT_ECHO_REPLY
+            sock.sendall(bytes(replies))
+
+    thr, sock = _serve(hub, _echo)
+    req = OFP_HEADER.pack(4, 2, OFP_HEADER.size, 0)
+    sent = replied = 0
+    buf = bytearray(0x10000)
+    while replied < n:
+        burst = min(window - (sent - replied), n - sent)
+        if burst > 0:
+            sock.sendall(req * burst)
+            sent += burst
+        replied += sock.recv_into(buf) // OFP_HEADER.size
+    sock.close()
+    hub.kill(thr)
+    return n
+
+
+BENCHMARKS = [
+    # name, function, number of iterations, unit
+    ('spawn', bench_spawn, 20000, 'threads/s'),
+    ('queue ping-pong', bench_queue, 20000, 'round trips/s'),
+    ('stream bulk', bench_stream_bulk, 4000, 'MB/s'),
+    ('stream echo', bench_stream_echo, 100000, 'messages/s'),
+]
+
+
+def run_benchmarks(scale):
+    from ryu.lib import hub
+    hub.patch()
+
+    results = {}
+    for name, func, n, unit in BENCHMARKS:
+        n = max(1, int(n * scale))
+        start = time.time()
+        count = func(hub, n)
+        elapsed = time.time() - start
+        rate = count / elapsed
+        if unit == 'MB/s':
+            rate /= 1000000
+        results[name] = rate
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='compare the throughput of the hub implementations')
+    parser.add_argument('--hubs', default=','.join(HUB_TYPES),
+                        help='comma separated hub types to compare')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='multiplier of the number of iterations')
+    parser.add_argument('--child', action='store_true',
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        json.dump(run_benchmarks(args.scale), sys.stdout)
+        return
+
+    hubs = args.hubs.split(',')
+    results = {}
+    for hub_type in hubs:
+        env = dict(os.environ, RYU_HUB_TYPE=hub_type)
+        out = subprocess.check_output(
+            [sys.executable, __file__, '--child', '--scale',
+             str(args.scale)], env=env)
+        results[hub_type] = json.loads(out.decode().splitlines()[-1])
+
+    print('%-16s %-14s' % ('benchmark', 'unit') +
+          ''.join('%14s' % h for h in hubs))
+    for name, _func, _n, unit in BENCHMARKS:
+        print('%-16s %-14s' % (name, unit) +
+              ''.join('%14.1f' % results[h][name] for h in hubs))
+
+
+if __name__ == '__main__':
+    main()
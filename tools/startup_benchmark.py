@@ -0,0 +1,97 @@
+#! /usr/bin/env python
+
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Measures the startup time and the resident memory of ryu-manager
+# loading the given applications, until the applications are
+# instantiated.
+#
+# usage example:
+#   PYTHONPATH=.. ./startup_benchmark.py
+#   PYTHONPATH=.. ./startup_benchmark.py --apps ryu.app.ofctl_rest
+#
+# Every run is done in a fresh process; "all versions" additionally
+# imports the modules of every OpenFlow version, as done on import of
+# ryu.ofproto.ofproto_protocol before they were loaded on demand.
+
+from __future__ import print_function
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+
+def run_startup(apps, all_versions):
+    start = time.time()
+    from ryu.base import app_manager
+    from ryu.ofproto import ofproto_protocol
+    if all_versions:
+        for version in ofproto_protocol._versions:
+            ofproto_protocol._versions[version]
+
+    manager = app_manager.AppManager.get_instance()
+    manager.load_apps(apps)
+    contexts = manager.create_contexts()
+    manager.instantiate_apps(**contexts)
+    elapsed = time.time() - start
+
+    # KiB on Linux
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        'time': elapsed * 1000,
+        'maxrss': maxrss / 1024.0,
+        'versions': ofproto_protocol._versions.loaded(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='measure the startup time and memory of ryu-manager')
+    parser.add_argument('--apps', default='ryu.app.simple_switch_13',
+                        help='comma separated applications to load')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='number of runs, the best one is reported')
+    parser.add_argument('--child', choices=['on-demand', 'all'],
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    apps = args.apps.split(',')
+
+    if args.child:
+        result = run_startup(apps, args.child == 'all')
+        json.dump(result, sys.stdout)
+        return
+
+    print('%-16s %10s %12s  %s' % ('versions', 'time (ms)', 'maxrss (MB)',
+                                   'loaded'))
+    for mode, label in [('all', 'all versions'),
+                        ('on-demand', 'on demand')]:
+        results = []
+        for _i in range(args.repeat):
+            out = subprocess.check_output(
+                [sys.executable, __file__, '--child', mode,
+                 '--apps', args.apps], stderr=subprocess.DEVNULL)
+            results.append(json.loads(out.decode().splitlines()[-1]))
+        best = min(results, key=lambda r: r['time'])
+        print('%-16s %10.1f %12.1f  %s' % (
+            label, best['time'], min(r['maxrss'] for r in results),
+            ','.join('0x%x' % v for v in best['versions'])))
+
+
+if __name__ == '__main__':
+    main()